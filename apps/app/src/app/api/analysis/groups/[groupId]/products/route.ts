@@ -0,0 +1,36 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { auth } from '@clerk/nextjs/server';
+import { z } from 'zod';
+import { listWholesaleProducts, searchParamsToObject, wholesaleListQuerySchema } from '@/lib/services/catalog';
+
+// GET /api/analysis/groups/:groupId/products?limit=50&cursor=...&fields=id,name,price&source=...
+// Crawled wholesale products of one saved search, in crawl order.
+export async function GET(req: NextRequest, { params }: { params: Promise<{ groupId: string }> }) {
+    try {
+        const { userId } = await auth();
+        if (!userId) {
+            return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+        }
+
+        const groupId = Number((await params).groupId);
+        if (!Number.isInteger(groupId) || groupId <= 0) {
+            return NextResponse.json({ error: 'Invalid group id' }, { status: 400 });
+        }
+
+        const query = wholesaleListQuerySchema.parse(searchParamsToObject(req.nextUrl.searchParams));
+        const page = await listWholesaleProducts(userId, groupId, query);
+        if (!page) {
+            return NextResponse.json({ error: 'Group not found' }, { status: 404 });
+        }
+        return NextResponse.json(page);
+    } catch (error: any) {
+        if (error instanceof z.ZodError) {
+            return NextResponse.json({ error: 'Invalid query', issues: error.flatten() }, { status: 400 });
+        }
+        console.error('Analysis Group Products API Error:', error);
+        return NextResponse.json(
+            { error: 'Internal Server Error', details: error.message },
+            { status: 500 }
+        );
+    }
+}
@@ -0,0 +1,27 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { auth } from '@clerk/nextjs/server';
+import { z } from 'zod';
+import { groupListQuerySchema, listWholesaleGroups, searchParamsToObject } from '@/lib/services/catalog';
+
+// GET /api/analysis/groups?limit=50&cursor=...&fields=id,keyword,productCount&q=...
+// Saved search results (WholesaleGroup) of the current user, newest first.
+export async function GET(req: NextRequest) {
+    try {
+        const { userId } = await auth();
+        if (!userId) {
+            return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+        }
+
+        const query = groupListQuerySchema.parse(searchParamsToObject(req.nextUrl.searchParams));
+        return NextResponse.json(await listWholesaleGroups(userId, query));
+    } catch (error: any) {
+        if (error instanceof z.ZodError) {
+            return NextResponse.json({ error: 'Invalid query', issues: error.flatten() }, { status: 400 });
+        }
+        console.error('Analysis Groups API Error:', error);
+        return NextResponse.json(
+            { error: 'Internal Server Error', details: error.message },
+            { status: 500 }
+        );
+    }
+}
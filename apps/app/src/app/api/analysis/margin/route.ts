@@ -0,0 +1,93 @@
+import { NextResponse } from 'next/server';
+import { z } from 'zod';
+import {
+    PLATFORM_FEE_RATES,
+    calculateMargin,
+    generatePricingScenariosBatch,
+    type Platform,
+} from '@/features/analysis/lib/pricing-calculator';
+
+// 한 번에 받을 수 있는 최대 상품 수 (카탈로그 전체 재계산용)
+const MAX_BATCH_SIZE = 50000;
+
+const platformSchema = z
+    .enum(Object.keys(PLATFORM_FEE_RATES) as [Platform, ...Platform[]])
+    .default('rocket');
+
+const marginItemSchema = z.object({
+    wholesalePrice: z.number().min(0),
+    sellingPrice: z.number().min(0),
+    platform: platformSchema,
+});
+
+const numberColumn = z.array(z.number()).max(MAX_BATCH_SIZE);
+
+const pricingColumnsSchema = z
+    .object({
+        baseCost: numberColumn,
+        targetMarginRate: numberColumn,
+        platformFeeRate: numberColumn,
+        shippingCost: numberColumn,
+        extraCost: numberColumn,
+    })
+    .refine(
+        (c) => {
+            const n = c.baseCost.length;
+            return [c.targetMarginRate, c.platformFeeRate, c.shippingCost, c.extraCost].every(
+                (col) => col.length === n,
+            );
+        },
+        { message: 'All pricing columns must have the same length' },
+    );
+
+/**
+ * POST /api/analysis/margin (alias: /margin)
+ *
+ * - 단건: { wholesalePrice, sellingPrice, platform } → { marginPercent, netProfit, ... }
+ * - 배치: { items: [{ wholesalePrice, sellingPrice, platform }, ...] } → { results: [...] }
+ * - 가격 시나리오: { columns: { baseCost[], targetMarginRate[], platformFeeRate[], shippingCost[], extraCost[] } }
+ *   → { data: { minPrice[], recPrice[], maxPrice[], breakEvenPrice[], expectedNetProfit[] } }
+ */
+export async function POST(req: Request) {
+    try {
+        const body = await req.json();
+
+        if (body && typeof body === 'object' && 'columns' in body) {
+            const columns = pricingColumnsSchema.parse(body.columns);
+            return NextResponse.json({
+                success: true,
+                count: columns.baseCost.length,
+                data: generatePricingScenariosBatch(columns),
+            });
+        }
+
+        if (body && typeof body === 'object' && 'items' in body) {
+            const items = z.array(marginItemSchema).max(MAX_BATCH_SIZE).parse(body.items);
+            return NextResponse.json({
+                success: true,
+                count: items.length,
+                results: items.map((item) =>
+                    calculateMargin(item.wholesalePrice, item.sellingPrice, item.platform),
+                ),
+            });
+        }
+
+        const item = marginItemSchema.parse(body);
+        return NextResponse.json(calculateMargin(item.wholesalePrice, item.sellingPrice, item.platform));
+    } catch (error: any) {
+        if (error instanceof z.ZodError) {
+            return NextResponse.json(
+                { error: 'Invalid margin request', details: error.issues },
+                { status: 400 },
+            );
+        }
+        if (error instanceof SyntaxError) {
+            return NextResponse.json({ error: 'Invalid JSON body' }, { status: 400 });
+        }
+        console.error('Margin API Error:', error);
+        return NextResponse.json(
+            { error: 'Internal Server Error', details: error.message },
+            { status: 500 },
+        );
+    }
+}
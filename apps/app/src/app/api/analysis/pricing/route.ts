@@ -1,7 +1,11 @@
 import { NextResponse } from 'next/server';
 import { aiService } from '@/lib/services/ai';
+import { metricsService } from '@/lib/services/metrics';
+
+const metrics = metricsService.forRoute('analysis_pricing');
 
 export async function POST(req: Request) {
+    const endTotal = metrics.startSpan('total');
     try {
         const body = await req.json();
         // Validate required fields
@@ -12,7 +16,7 @@ export async function POST(req: Request) {
             );
         }
 
-        const result = await aiService.generatePriceRecommendation({
+        const result = await metrics.time('ai', () => aiService.generatePriceRecommendation({
             totalCost: body.totalCost,
             feeRate: body.feeRate || 10.8, // Default Coupang fee
             shippingCost: body.shippingCost || 3000,
@@ -20,7 +24,7 @@ export async function POST(req: Request) {
             marketPrices: body.marketPrices || [],
             candidatePrices: body.candidatePrices || [],
             unitCount: body.unitCount || 1 // Pass Unit Count
-        });
+        }));
 
         if (!result) {
             return NextResponse.json(
@@ -40,5 +44,7 @@ export async function POST(req: Request) {
             { error: 'Internal Server Error', details: error.message },
             { status: 500 }
         );
+    } finally {
+        endTotal();
     }
 }
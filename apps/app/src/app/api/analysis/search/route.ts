@@ -2,10 +2,14 @@ import { NextResponse } from 'next/server';
 import { crawlerService } from '@/lib/services/crawler';
 import { prisma } from '@myapp/prisma';
 import { auth } from '@clerk/nextjs/server';
+import { metricsService } from '@/lib/services/metrics';
 
 export const maxDuration = 60; // Set max duration for crawling (Vercel limit/Timeouts)
 
+const metrics = metricsService.forRoute('analysis_search');
+
 export async function POST(req: Request) {
+    const endTotal = metrics.startSpan('total');
     try {
         const body = await req.json();
         const { keyword, minPrice, maxPrice } = body;
@@ -23,6 +27,7 @@ export async function POST(req: Request) {
         const PROXY_URL = process.env.COUPANG_PROXY_URL;
         const PROXY_KEY = process.env.COUPANG_PROXY_KEY || '';
 
+        const endCrawl = metrics.startSpan('crawl');
         if (PROXY_URL) {
             console.log('[Analysis] Proxying crawl request to:', PROXY_URL);
             try {
@@ -48,35 +53,34 @@ export async function POST(req: Request) {
         } else {
             products = await crawlerService.crawlAllSites(keyword);
         }
+        endCrawl();
 
         // 2. Save to Database (Transaction)
-        const { userId } = await auth(); // Get logged-in user ID
-
-        // Check if group exists or create new
-        const savedGroup = await prisma.$transaction(async (tx) => {
-            const group = await tx.wholesaleGroup.create({
-                data: {
-                    keyword,
-                    userId, // Save User ID
-                },
-            });
-
-            if (products.length > 0) {
-                await tx.wholesaleProduct.createMany({
-                    data: products.map((p) => ({
-                        wholesaleGroupId: group.id,
-                        name: p.name,
-                        price: p.price,
-                        source: p.site,
-                        rating: 0, // Default as crawler doesn't extract rating yet
-                        minOrder: p.minOrderQuantity || 1,
-                        url: p.sourceUrl || '',
-                    })),
-                });
-            }
+        const { userId } = await metrics.time('auth', () => auth()); // Get logged-in user ID
 
-            return group;
-        });
+        // Group and its crawled products in one nested create (single transaction, one multi-row INSERT)
+        const savedGroup = await metrics.time('persist', () => prisma.wholesaleGroup.create({
+            data: {
+                keyword,
+                userId, // Save User ID
+                ...(products.length > 0 && {
+                    products: {
+                        createMany: {
+                            data: products.map((p) => ({
+                                name: p.name,
+                                price: p.price,
+                                source: p.site,
+                                rating: 0, // Default as crawler doesn't extract rating yet
+                                minOrder: p.minOrderQuantity || 1,
+                                url: p.sourceUrl || '',
+                                userId,
+                            })),
+                        },
+                    },
+                }),
+            },
+            select: { id: true },
+        }));
 
         return NextResponse.json({
             success: true,
@@ -91,5 +95,7 @@ export async function POST(req: Request) {
             { error: 'Internal Server Error', details: error.message },
             { status: 500 }
         );
+    } finally {
+        endTotal();
     }
 }
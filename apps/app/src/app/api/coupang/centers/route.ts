@@ -1,5 +1,7 @@
 import { NextResponse } from 'next/server';
 import { auth } from '@clerk/nextjs/server';
+import { vendorCache } from '@/lib/services/vendor-cache';
+import { getCoupangContext } from '@/lib/services/coupang-context';
 
 const PROXY_URL = process.env.COUPANG_PROXY_URL;
 const PROXY_KEY = process.env.COUPANG_PROXY_KEY || '';
@@ -25,23 +27,16 @@ export async function GET() {
         }
 
         // Direct mode (local dev) - original logic
-        const { CoupangService } = await import('@/lib/services/coupang');
-        const { prisma } = await import('@myapp/prisma');
-        const creds = await prisma.coupangCredential.findFirst({
-            where: { userId, isActive: true }
-        });
-        if (!creds) {
+        const ctx = await getCoupangContext(userId);
+        if (!ctx) {
             return NextResponse.json({ success: false, error: 'No Coupang credentials found' }, { status: 400 });
         }
-        const coupangService = new CoupangService({
-            accessKey: creds.accessKey,
-            secretKey: creds.secretKey,
-            vendorId: creds.vendorId,
-            userId: creds.vendorUserId || creds.userId
-        });
-        const [outbound, returnCenters] = await Promise.all([
-            coupangService.getOutboundShippingCenters(),
-            coupangService.getReturnShippingCenters()
+        const { keys, service: coupangService } = ctx;
+        // 조회 실패 시 서비스가 빈 배열을 돌려주므로 빈 결과는 캐시하지 않음
+        const nonEmpty = (v: any) => Array.isArray(v) ? v.length > 0 : !!v;
+        const [outbound, returnCenters]: any[] = await Promise.all([
+            vendorCache.get(keys.vendorId, 'outbound:centers', () => coupangService.getOutboundShippingCenters(), { shouldCache: nonEmpty }),
+            vendorCache.get(keys.vendorId, 'return:centers', () => coupangService.getReturnShippingCenters(), { shouldCache: nonEmpty })
         ]);
         return NextResponse.json({
             success: true,
@@ -0,0 +1,160 @@
+import { NextResponse } from 'next/server'
+import { auth } from '@clerk/nextjs/server'
+import { metricsService } from '@/lib/services/metrics'
+import { getCoupangContext } from '@/lib/services/coupang-context'
+import { registerCoupangProduct, validateRegisterPayload } from '@/lib/services/coupang-register'
+
+export const runtime = 'nodejs'
+export const maxDuration = 300
+
+const MAX_ITEMS = 500
+const DEFAULT_CONCURRENCY = Number(process.env.COUPANG_BULK_CONCURRENCY || 4)
+const MAX_CONCURRENCY = Number(process.env.COUPANG_BULK_MAX_CONCURRENCY || 8)
+// 상품 1건 = 쿠팡 호출 여러 번 (출고지/반품지는 캐시) — 초당 등록 건수 상한
+const MAX_RATE_PER_SEC = Number(process.env.COUPANG_BULK_RATE_PER_SEC || 5)
+
+const metrics = metricsService.forRoute('coupang_register_bulk')
+
+/** Token bucket shared by the workers of every bulk request for one vendor. */
+class TokenBucket {
+    private tokens: number
+    private updatedAt = Date.now()
+
+    constructor(private readonly rate: number, private readonly burst: number) {
+        this.tokens = burst
+    }
+
+    async acquire() {
+        for (;;) {
+            const now = Date.now()
+            this.tokens = Math.min(this.burst, this.tokens + ((now - this.updatedAt) / 1000) * this.rate)
+            this.updatedAt = now
+            if (this.tokens >= 1) {
+                this.tokens -= 1
+                return
+            }
+            await new Promise((r) => setTimeout(r, ((1 - this.tokens) / this.rate) * 1000))
+        }
+    }
+}
+
+const globalForBulkRegister = globalThis as unknown as { coupangBulkBuckets?: Map<string, TokenBucket> }
+
+// 벤더(쿠팡 계정)당 버킷 하나 — 같은 벤더로 동시에 들어온 bulk 요청들이 MAX_RATE_PER_SEC 를 나눠 쓴다
+const vendorBuckets = globalForBulkRegister.coupangBulkBuckets ?? new Map<string, TokenBucket>()
+globalForBulkRegister.coupangBulkBuckets = vendorBuckets
+
+function vendorBucket(vendorKey: string) {
+    let bucket = vendorBuckets.get(vendorKey)
+    if (!bucket) {
+        bucket = new TokenBucket(MAX_RATE_PER_SEC, Math.max(1, Math.ceil(MAX_RATE_PER_SEC)))
+        vendorBuckets.set(vendorKey, bucket)
+    }
+    return bucket
+}
+
+const clamp = (v: number, min: number, max: number) => Math.min(max, Math.max(min, v))
+
+// POST /api/coupang/register/bulk
+// body: { items: [...register payloads], concurrency?, ratePerSec? } 또는 payload 배열
+// 전체를 먼저 검증하고(하나라도 실패하면 400), 통과하면 건별 결과를 NDJSON 으로 스트리밍한다.
+export async function POST(req: Request) {
+    const { userId } = await metrics.time('auth', () => auth())
+    if (!userId) {
+        return NextResponse.json({ ok: false, error: 'Unauthorized' }, { status: 401 })
+    }
+
+    let body: any
+    try {
+        body = await req.json()
+    } catch {
+        return NextResponse.json({ ok: false, error: 'INVALID_JSON' }, { status: 400 })
+    }
+
+    const items: any[] | undefined = Array.isArray(body) ? body : body?.items
+    if (!Array.isArray(items) || items.length === 0) {
+        return NextResponse.json({ ok: false, error: 'ITEMS_REQUIRED', message: 'items must be a non-empty array' }, { status: 400 })
+    }
+    if (items.length > MAX_ITEMS) {
+        return NextResponse.json({ ok: false, error: 'TOO_MANY_ITEMS', message: `At most ${MAX_ITEMS} items per request` }, { status: 400 })
+    }
+
+    const errors = items
+        .map((item, index) => ({ index, fields: validateRegisterPayload(item) }))
+        .filter((e) => e.fields.length > 0)
+    if (errors.length > 0) {
+        const fields = [...new Set(errors.flatMap((e) => e.fields))]
+        return NextResponse.json({
+            ok: false,
+            error: 'VALIDATION_FAILED',
+            message: `Missing or invalid required fields: ${fields.join(', ')}`,
+            errors,
+        }, { status: 400 })
+    }
+
+    const concurrency = clamp(Math.floor(Number(body?.concurrency) || DEFAULT_CONCURRENCY), 1, MAX_CONCURRENCY)
+    const ratePerSec = Number(body?.ratePerSec) > 0 ? Math.min(Number(body.ratePerSec), MAX_RATE_PER_SEC) : MAX_RATE_PER_SEC
+    // 자격 증명이 없으면 건별로 NO_CREDENTIALS 가 나가므로 userId 로 묶어 둔다
+    const ctx = await metrics.time('credentials', () => getCoupangContext(userId))
+    const bucket = vendorBucket(ctx?.keys.vendorId || `user:${userId}`)
+    // 상한보다 낮게 요청한 경우에만 이 요청 전용 간격을 더한다
+    const requestBucket = ratePerSec < MAX_RATE_PER_SEC ? new TokenBucket(ratePerSec, Math.max(1, Math.ceil(ratePerSec))) : null
+    const encoder = new TextEncoder()
+    const endTotal = metrics.startSpan('total')
+    let cancelled = false
+
+    const stream = new ReadableStream<Uint8Array>({
+        async start(controller) {
+            const started = Date.now()
+            const write = (line: unknown) => {
+                if (cancelled) return
+                try {
+                    controller.enqueue(encoder.encode(JSON.stringify(line) + '\n'))
+                } catch {
+                    cancelled = true
+                }
+            }
+
+            let next = 0
+            let succeeded = 0
+            let failed = 0
+            const worker = async () => {
+                while (!cancelled && next < items.length) {
+                    const index = next++
+                    await requestBucket?.acquire()
+                    await bucket.acquire()
+                    const itemStarted = Date.now()
+                    let result
+                    try {
+                        result = await registerCoupangProduct(userId, items[index])
+                    } catch (err: any) {
+                        console.error('[bulk-register] item failed', index, err)
+                        result = { status: 500, body: { ok: false, error: err?.message || String(err) } }
+                    }
+                    const ok = result.status === 200 && Boolean(result.body?.success)
+                    if (ok) succeeded++
+                    else failed++
+                    write({ type: 'item', index, ok, status: result.status, elapsedMs: Date.now() - itemStarted, result: result.body })
+                }
+            }
+
+            await Promise.all(Array.from({ length: Math.min(concurrency, items.length) }, worker))
+            write({
+                type: 'summary', total: items.length, succeeded, failed,
+                skipped: items.length - succeeded - failed, concurrency, ratePerSec, elapsedMs: Date.now() - started,
+            })
+            endTotal()
+            if (!cancelled) controller.close()
+        },
+        cancel() {
+            cancelled = true
+        },
+    })
+
+    return new Response(stream, {
+        headers: {
+            'Content-Type': 'application/x-ndjson; charset=utf-8',
+            'Cache-Control': 'no-store',
+        },
+    })
+}
@@ -1,5 +1,7 @@
 import { NextResponse } from 'next/server'
 import { auth } from '@clerk/nextjs/server'
+import { vendorCache } from '@/lib/services/vendor-cache'
+import { getCoupangContext } from '@/lib/services/coupang-context'
 
 export const runtime = 'nodejs'
 
@@ -21,38 +23,20 @@ export async function GET() {
         }
 
         // Direct mode (local dev)
-        const crypto = await import('crypto');
-        const { prisma } = await import('@myapp/prisma');
+        const ctx = await getCoupangContext(userId);
+        if (!ctx) return NextResponse.json({ error: 'NO_CREDENTIALS' }, { status: 400 });
+        const { keys } = ctx;
 
-        const creds = await prisma.coupangCredential.findFirst({ where: { userId, isActive: true } });
-        if (!creds) return NextResponse.json({ error: 'NO_CREDENTIALS' }, { status: 400 });
-
-        const keys = {
-            accessKey: creds.accessKey,
-            secretKey: creds.secretKey,
-            vendorId: creds.vendorId,
-            vendorUserId: creds.vendorUserId || creds.userId
-        };
-
-        const BASE_URL = 'https://api-gateway.coupang.com'
         const PATH_PREFIX = '/v2/providers/openapi/apis/api/v5/vendors'
         const path = `${PATH_PREFIX}/${keys.vendorId}/returnShippingCenters`
         const query = 'pageNum=1&pageSize=50'
 
-        const d = new Date()
-        const pad = (n: number) => n.toString().padStart(2, '0')
-        const datetime = d.getUTCFullYear().toString().slice(-2) + pad(d.getUTCMonth() + 1) + pad(d.getUTCDate()) + 'T' + pad(d.getUTCHours()) + pad(d.getUTCMinutes()) + pad(d.getUTCSeconds()) + 'Z'
-        const message = `${datetime}GET${path}${query}`
-        const signature = crypto.createHmac('sha256', keys.secretKey).update(message, 'utf-8').digest('hex')
-        const authorization = `CEA algorithm=HmacSHA256, access-key=${keys.accessKey}, signed-date=${datetime}, signature=${signature}`
-
-        const res = await fetch(`${BASE_URL}${path}?${query}`, {
-            method: 'GET',
-            headers: { Authorization: authorization, 'X-Coupang-Date': datetime, 'X-Requested-By': keys.vendorId },
-        })
-        const json = await res.json().catch(() => ({}))
-        if (!res.ok) {
-            return NextResponse.json({ ok: false, status: res.status, coupang: json }, { status: res.status })
+        const { status, json } = await vendorCache.get(keys.vendorId, 'return:list', async () => {
+            const { res, json } = await ctx.fetch('GET', path, undefined, query)
+            return { status: res.status, json }
+        }, { shouldCache: (r) => r.status === 200 })
+        if (status !== 200) {
+            return NextResponse.json({ ok: false, status, coupang: json }, { status })
         }
         return NextResponse.json({ ok: true, coupang: json })
     } catch (err: any) {
@@ -82,31 +66,14 @@ export async function POST(req: Request) {
         }
 
         // Direct mode (local dev)
-        const crypto = await import('crypto');
-        const { prisma } = await import('@myapp/prisma');
-
-        const creds = await prisma.coupangCredential.findFirst({ where: { userId, isActive: true } });
-        if (!creds) return NextResponse.json({ error: 'NO_CREDENTIALS' }, { status: 400 });
-
-        const keys = {
-            accessKey: creds.accessKey,
-            secretKey: creds.secretKey,
-            vendorId: creds.vendorId,
-            vendorUserId: creds.vendorUserId || creds.userId
-        };
+        const ctx = await getCoupangContext(userId);
+        if (!ctx) return NextResponse.json({ error: 'NO_CREDENTIALS' }, { status: 400 });
+        const { keys } = ctx;
 
         const body = await req.json()
-        const BASE_URL = 'https://api-gateway.coupang.com'
         const PATH_CREATE_PREFIX = '/v2/providers/openapi/apis/api/v5/vendors'
         const pathCreate = `${PATH_CREATE_PREFIX}/${keys.vendorId}/returnShippingCenters`
 
-        const d = new Date()
-        const pad = (n: number) => n.toString().padStart(2, '0')
-        const datetime = d.getUTCFullYear().toString().slice(-2) + pad(d.getUTCMonth() + 1) + pad(d.getUTCDate()) + 'T' + pad(d.getUTCHours()) + pad(d.getUTCMinutes()) + pad(d.getUTCSeconds()) + 'Z'
-        const message = `${datetime}POST${pathCreate}`
-        const signature = crypto.createHmac('sha256', keys.secretKey).update(message, 'utf-8').digest('hex')
-        const authorization = `CEA algorithm=HmacSHA256, access-key=${keys.accessKey}, signed-date=${datetime}, signature=${signature}`
-
         const payload = {
             vendorId: keys.vendorId,
             userId: keys.vendorUserId || body.userId || '',
@@ -115,20 +82,11 @@ export async function POST(req: Request) {
             placeAddresses: body.placeAddresses || [],
         }
 
-        const res = await fetch(`${BASE_URL}${pathCreate}`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                Authorization: authorization,
-                'X-Coupang-Date': datetime,
-                'X-Requested-By': keys.vendorId
-            },
-            body: JSON.stringify(payload),
-        })
-        const json = await res.json().catch(() => ({}))
+        const { res, json } = await ctx.fetch('POST', pathCreate, payload)
         if (!res.ok) {
             return NextResponse.json({ ok: false, status: res.status, coupang: json }, { status: res.status })
         }
+        vendorCache.invalidate(keys.vendorId, 'return:')
         return NextResponse.json({ ok: true, coupang: json })
     } catch (err: any) {
         console.error('[coupang-return-centers-exception]', err)
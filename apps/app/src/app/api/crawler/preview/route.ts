@@ -1,9 +1,13 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { metricsService } from '@/lib/services/metrics';
 
 const PROXY_URL = process.env.COUPANG_PROXY_URL;
 const PROXY_KEY = process.env.COUPANG_PROXY_KEY || '';
 
+const metrics = metricsService.forRoute('crawler_preview');
+
 export async function POST(req: NextRequest) {
+    const endTotal = metrics.startSpan('total');
     try {
         const body = await req.json();
         const { productLink, baseData } = body;
@@ -13,6 +17,7 @@ export async function POST(req: NextRequest) {
         }
 
         if (PROXY_URL) {
+            const endProxy = metrics.startSpan('proxy');
             const res = await fetch(`${PROXY_URL}/api/crawler/preview`, {
                 method: 'POST',
                 headers: {
@@ -22,6 +27,7 @@ export async function POST(req: NextRequest) {
                 body: JSON.stringify({ productLink, baseData }),
             });
             const json = await res.json();
+            endProxy();
             return NextResponse.json(json, { status: res.status });
         }
 
@@ -37,7 +43,7 @@ export async function POST(req: NextRequest) {
             sourceUrl: productLink,
         };
         // @ts-ignore
-        const enriched = await crawlerService.enrichDomeggookProduct(baseProduct);
+        const enriched = await metrics.time('enrich', () => crawlerService.enrichDomeggookProduct(baseProduct));
         return NextResponse.json({ success: true, data: enriched });
 
     } catch (error: any) {
@@ -46,5 +52,7 @@ export async function POST(req: NextRequest) {
             success: false,
             message: error.message || 'Failed to preview product'
         }, { status: 500 });
+    } finally {
+        endTotal();
     }
 }
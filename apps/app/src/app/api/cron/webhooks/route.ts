@@ -0,0 +1,33 @@
+import { NextResponse } from 'next/server'
+import { webhookQueue } from '@/lib/services/webhook-queue'
+import { registerLemonWorker } from '@/app/api/webhooks/lemonsqueezy/_process'
+import { registerClerkWorker } from '@/app/api/webhooks/clerk/_process'
+
+export const runtime = 'nodejs'
+export const dynamic = 'force-dynamic'
+export const maxDuration = 60
+
+const CRON_SECRET = process.env.CRON_SECRET || ''
+
+// Vercel Cron 은 Authorization: Bearer $CRON_SECRET 으로 호출 — 시크릿이 없으면 로컬 개발에서만 허용
+function isAuthorized(req: Request) {
+    if (!CRON_SECRET) return process.env.NODE_ENV !== 'production'
+    return req.headers.get('authorization') === `Bearer ${CRON_SECRET}`
+}
+
+// GET /api/cron/webhooks — 매분 (vercel.json crons)
+// webhook 요청의 after() 가 못 끝낸 이벤트, 재시도 시각이 된 이벤트, lease 가 만료된 배치를 처리하고
+// 보관 기간이 지난 처리 완료 행을 지운다
+export async function GET(req: Request) {
+    if (!isAuthorized(req)) {
+        return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    registerLemonWorker()
+    registerClerkWorker('clerk')
+    registerClerkWorker('clerk-dev')
+
+    const drained = await webhookQueue.drain({ budgetMs: 45 * 1000 })
+    const purged = await webhookQueue.purge()
+    return NextResponse.json({ ok: true, drained, purged })
+}
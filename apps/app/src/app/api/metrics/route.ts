@@ -0,0 +1,41 @@
+import { NextResponse } from 'next/server'
+import { metricsService } from '@/lib/services/metrics'
+import { vendorCache } from '@/lib/services/vendor-cache'
+import { webhookQueue } from '@/lib/services/webhook-queue'
+
+export const runtime = 'nodejs'
+export const dynamic = 'force-dynamic'
+
+const METRICS_TOKEN = process.env.METRICS_TOKEN || ''
+
+// 토큰이 없으면 닫힌 상태 — 로컬 개발(NODE_ENV !== 'production')의 GET 스크레이프만 허용
+function isAuthorized(req: Request, { write = false } = {}) {
+    if (!METRICS_TOKEN) return !write && process.env.NODE_ENV !== 'production'
+    const bearer = req.headers.get('authorization')?.replace(/^Bearer\s+/i, '')
+    return (req.headers.get('x-metrics-token') || bearer) === METRICS_TOKEN
+}
+
+// GET /api/metrics — Prometheus 스크레이프 (route × stage 히스토그램)
+export async function GET(req: Request) {
+    if (!isAuthorized(req)) {
+        return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const body = metricsService.toPrometheus() + vendorCache.toPrometheus() + (await webhookQueue.toPrometheus())
+    return new NextResponse(body, {
+        headers: {
+            'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+            'Cache-Control': 'no-store',
+        },
+    })
+}
+
+// DELETE /api/metrics — 카운터 초기화 (테스트 실행 간 구분용, route 히스토그램 + vendor-cache 적중률)
+export async function DELETE(req: Request) {
+    if (!isAuthorized(req, { write: true })) {
+        return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+    metricsService.reset()
+    vendorCache.resetStats()
+    return NextResponse.json({ ok: true })
+}
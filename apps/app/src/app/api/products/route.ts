@@ -2,6 +2,7 @@ import { auth } from "@clerk/nextjs/server";
 import { prisma } from "@myapp/prisma";
 import { type NextRequest, NextResponse } from "next/server";
 import { z } from "zod";
+import { listProducts, productListQuerySchema, searchParamsToObject } from "@/lib/services/catalog";
 
 const productCreateSchema = z.object({
     name: z.string().min(1),
@@ -13,6 +14,26 @@ const productCreateSchema = z.object({
     sourceUrl: z.string().optional(),
 });
 
+// GET /api/products?limit=50&cursor=...&fields=id,name,status&category=...&status=REGISTERED&q=...
+export async function GET(req: NextRequest) {
+    try {
+        const { userId } = await auth();
+
+        if (!userId) {
+            return new NextResponse("Unauthorized", { status: 401 });
+        }
+
+        const query = productListQuerySchema.parse(searchParamsToObject(req.nextUrl.searchParams));
+        return NextResponse.json(await listProducts(userId, query));
+    } catch (error) {
+        console.error("[PRODUCTS_GET]", error);
+        if (error instanceof z.ZodError) {
+            return NextResponse.json({ error: "Invalid query", issues: error.flatten() }, { status: 400 });
+        }
+        return new NextResponse("Internal Server Error", { status: 500 });
+    }
+}
+
 export async function POST(req: NextRequest) {
     try {
         const { userId } = await auth();
@@ -24,7 +45,7 @@ export async function POST(req: NextRequest) {
         const json = await req.json();
         const body = productCreateSchema.parse(json);
 
-        // Create the product in the database
+        // Product and its PENDING registration are written in one nested create (single transaction)
         // Providing defaults for required fields not in form
         const product = await prisma.product.create({
             data: {
@@ -42,30 +63,22 @@ export async function POST(req: NextRequest) {
                 trend: "N/A",
                 score: 0,
 
-                // Note: Owner relationship is not in strict Product schema shown, 
-                // relying on internal logic or assuming it's fine for now as per schema view.
-                // If we needed to link to User, we'd need to modify schema or use a different model.
-                // Given 'Product' seems to be a catalogue item, maybe 'Registration' is the user link?
-                // Let's create a Registration too if needed. Schema has 'registrations'.
+                userId,
+                registrations: {
+                    create: {
+                        productName: body.name,
+                        category: body.category || "Uncategorized",
+                        recommendedTitle: body.name,
+                        price: body.recommendedPrice,
+                        wholesalePrice: body.wholesalePrice,
+                        status: "PENDING",
+                        platform: "COUPANG", // Default
+                        userId,
+                    },
+                },
             },
         });
 
-        // Also create a Registration record to link to User/Status? 
-        // Schema 'Registration' has 'productId'.
-        // Use dummy values for now to ensure data integrity if needed.
-        await prisma.registration.create({
-            data: {
-                productId: product.id,
-                productName: product.name,
-                category: product.category,
-                recommendedTitle: product.name,
-                price: product.recommendedPrice,
-                wholesalePrice: product.wholesalePrice,
-                status: "PENDING",
-                platform: "COUPANG" // Default
-            }
-        });
-
         return NextResponse.json({ success: true, product });
     } catch (error) {
         console.error("[PRODUCTS_POST]", error);
@@ -1,6 +1,8 @@
 import { NextResponse } from 'next/server';
 import { prisma } from '@myapp/prisma';
 import { auth } from '@clerk/nextjs/server';
+import { vendorCache } from '@/lib/services/vendor-cache';
+import { invalidateCoupangContext } from '@/lib/services/coupang-context';
 
 // LIST credentials
 export async function GET() {
@@ -75,6 +77,10 @@ export async function POST(req: Request) {
             });
         }
 
+        // 새 키로 조회 결과가 달라질 수 있으므로 해당 벤더 캐시 무효화
+        vendorCache.invalidate(vendorId);
+        await invalidateCoupangContext(userId);
+
         return NextResponse.json({ success: true, id: cred.id });
     } catch (error: any) {
         return NextResponse.json({ error: error.message }, { status: 500 });
@@ -115,6 +121,8 @@ export async function PUT(req: Request) {
                 alias: alias !== undefined ? alias : existing.alias
             }
         });
+        vendorCache.invalidate(existing.vendorId);
+        await invalidateCoupangContext(userId);
 
         return NextResponse.json({ success: true, data: updated });
     } catch (error: any) {
@@ -142,6 +150,8 @@ export async function DELETE(req: Request) {
         await prisma.coupangCredential.delete({
             where: { id }
         });
+        vendorCache.invalidate(existing.vendorId);
+        await invalidateCoupangContext(userId);
 
         return NextResponse.json({ success: true });
     } catch (error: any) {
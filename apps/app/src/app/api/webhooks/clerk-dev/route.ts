@@ -1,8 +1,13 @@
 import { Webhook } from "svix";
 import { WebhookEvent } from "@clerk/nextjs/server";
 import { headers } from "next/headers";
-import { prisma } from "@myapp/prisma";
-import { assert, cuid2, isEmptyStringOrNil } from "@myapp/utils";
+import { after } from "next/server";
+import { isEmptyStringOrNil } from "@myapp/utils";
+import { webhookQueue } from "@/lib/services/webhook-queue";
+import { enqueueClerkEvent } from "../clerk/_process";
+
+export const maxDuration = 30;
+export const runtime = "nodejs";
 
 export async function POST(req: Request) {
   const secret = process.env.CLERK_DEV_WEBHOOK_SIGNING_SECRET;
@@ -13,37 +18,21 @@ export async function POST(req: Request) {
   const wh = new Webhook(secret);
   const body = await req.text();
   const headerPayload = await headers();
+  const svixId = headerPayload.get("svix-id")!;
 
   const event = wh.verify(body, {
-    "svix-id": headerPayload.get("svix-id")!,
+    "svix-id": svixId,
     "svix-timestamp": headerPayload.get("svix-timestamp")!,
     "svix-signature": headerPayload.get("svix-signature")!,
   }) as WebhookEvent;
 
-  if (event.type === "user.created") {
-    const { id: clerkId, username, email_addresses } = event.data;
-    const firstEmailAddress = email_addresses[0]?.email_address;
-
-    assert(!isEmptyStringOrNil(username), "username is required");
-    assert(!isEmptyStringOrNil(firstEmailAddress), "email is required");
-
-    if (await prisma.user.findUnique({ where: { clerkId } })) {
-      return new Response("User already exists", { status: 200 });
-    }
-
-    const user = await prisma.user.create({
-      data: {
-        id: `usr_${cuid2()}`,
-        clerkId,
-        username,
-        email: firstEmailAddress,
-      },
-    });
-  } else if (event.type === "user.deleted") {
-    const { id } = event.data;
-    // TODO: soft delete
-    await prisma.user.delete({ where: { clerkId: id } });
+  // DB 반영은 webhook 큐 (../clerk/_process.ts) — 같은 svix-id 재전송은 적재하지 않음
+  if (!(await enqueueClerkEvent("clerk-dev", svixId, event)).queued) {
+    return new Response("Event already processed", { status: 200 });
   }
 
+  // 응답 후 같은 호출 안에서 큐 처리 (재시도 대기분은 /api/cron/webhooks)
+  after(() => webhookQueue.drain());
+
   return new Response("OK");
 }
@@ -0,0 +1,96 @@
+import type { WebhookEvent } from "@clerk/nextjs/server";
+import { prisma } from "@myapp/prisma";
+import { assert, cuid2, isEmptyStringOrNil } from "@myapp/utils";
+import {
+  webhookQueue,
+  type EnqueueResult,
+  type WebhookJob,
+} from "@/lib/services/webhook-queue";
+
+// Clerk webhook 처리 — route 는 svix 서명 검증 후 큐(WebhookJob)에 넣고 바로 응답,
+// DB 반영은 webhook-queue 가 Clerk 사용자 단위로 도착 순서대로 실행한다 (route 의 after(), /api/cron/webhooks).
+// clerk (운영) / clerk-dev (개발 인스턴스) 가 같은 처리를 쓰고, dev 는 username 필수.
+
+export type ClerkSource = "clerk" | "clerk-dev";
+
+interface ClerkOptions {
+  requireUsername: boolean;
+}
+
+const OPTIONS: Record<ClerkSource, ClerkOptions> = {
+  clerk: { requireUsername: false },
+  "clerk-dev": { requireUsername: true },
+};
+
+/** 재시도해도 결과가 같은 입력 오류는 적재 전에 걸러냄 (route 가 500 응답) */
+function validateEvent(event: WebhookEvent, { requireUsername }: ClerkOptions) {
+  if (event.type !== "user.created") return;
+  const { username, email_addresses } = event.data;
+  if (requireUsername) {
+    assert(!isEmptyStringOrNil(username), "username is required");
+  }
+  assert(
+    !isEmptyStringOrNil(email_addresses[0]?.email_address),
+    "email is required"
+  );
+}
+
+async function handleEvent(event: WebhookEvent) {
+  if (event.type === "user.created") {
+    const { id: clerkId, username, email_addresses } = event.data;
+    const firstEmailAddress = email_addresses[0]?.email_address;
+
+    const existingUser = await prisma.user.findUnique({ where: { clerkId } });
+    if (existingUser) {
+      console.log(`User already exists: ${clerkId}`);
+      return;
+    }
+
+    await prisma.user.create({
+      data: {
+        id: `usr_${cuid2()}`,
+        clerkId,
+        username,
+        email: firstEmailAddress,
+      },
+    });
+  } else if (event.type === "user.deleted") {
+    const { id } = event.data;
+    // TODO: soft delete
+    // deleteMany: 재시도 / 재전송으로 두 번 와도 실패하지 않음
+    await prisma.user.deleteMany({ where: { clerkId: id } });
+  }
+}
+
+export async function processClerkBatch(jobs: WebhookJob[]) {
+  for (const job of jobs) {
+    await handleEvent(job.payload as WebhookEvent);
+  }
+}
+
+const registered = new Set<ClerkSource>();
+
+/** 큐에 핸들러 등록 — drain 전에 호출 (route, cron) */
+export function registerClerkWorker(source: ClerkSource) {
+  if (registered.has(source)) return;
+  registered.add(source);
+  webhookQueue.register(source, processClerkBatch);
+}
+
+/** 검증된 이벤트를 큐에 넣음 (중복 판단 id: svix-id) */
+export function enqueueClerkEvent(
+  source: ClerkSource,
+  svixId: string,
+  event: WebhookEvent
+): Promise<EnqueueResult> {
+  validateEvent(event, OPTIONS[source]);
+  registerClerkWorker(source);
+  const userId = (event.data as { id?: string }).id ?? svixId;
+  return webhookQueue.enqueue({
+    source,
+    eventId: svixId,
+    key: `user:${userId}`,
+    name: event.type,
+    payload: event,
+  });
+}
@@ -0,0 +1,605 @@
+import { createHash } from "crypto";
+import {
+  prisma,
+  SubscriptionStatus,
+  SubscriptionPaymentMethod,
+  PaymentStatus,
+} from "@myapp/prisma";
+import { assert, cuid2 } from "@myapp/utils";
+import { VendorCache } from "@/lib/services/vendor-cache";
+import {
+  webhookQueue,
+  type EnqueueResult,
+  type WebhookJob,
+} from "@/lib/services/webhook-queue";
+import { LemonSubscriptionEvent, LemonInvoiceEvent } from "./_type";
+import {
+  coalesceSubscriptionEvents,
+  isPlanChanged,
+  lemonQueueKey,
+  safeString,
+} from "./_util";
+
+// LemonSqueezy webhook 처리 — route 는 서명 검증 후 큐(WebhookJob)에 넣고 바로 응답,
+// 실제 DB 반영은 webhook-queue 가 구독 단위 배치로 실행한다 (route 의 after(), /api/cron/webhooks).
+
+const SOURCE = "lemonsqueezy";
+const PLAN_CACHE_TTL_MS = Number(
+  process.env.LEMONSQUEEZY_PLAN_CACHE_TTL_MS || 5 * 60 * 1000
+);
+
+// variant id → 가입 가능한 플랜 (플랜 변경은 드물어서 TTL 캐시)
+const planCache = new VendorCache({ ttlMs: PLAN_CACHE_TTL_MS, staleMs: 0 });
+
+async function findPlanByVariant(variantId: string | number) {
+  return planCache.get(
+    "plan",
+    String(variantId),
+    () =>
+      prisma.plan.findFirst({
+        where: {
+          lemonSqueezyVariantId: String(variantId),
+          available: true,
+        },
+      }),
+    { shouldCache: (plan) => plan != null }
+  );
+}
+
+async function handleSubscriptionEvent({
+  id,
+  attributes,
+  meta,
+}: LemonSubscriptionEvent) {
+  const { status, variant_id, customer_id, order_id, product_id } = attributes;
+
+  assert(!!meta.custom_data, "custom_data가 존재하지 않습니다.");
+  assert(!!attributes, "attributes가 존재하지 않습니다.");
+
+  const { user_id } = meta.custom_data;
+
+  // @TODO(warms1995): 임시 조치 ( 은행결제하면 어떻게 들어오는지 모름 )
+  const paymentMethod =
+    attributes.payment_processor === "stripe"
+      ? SubscriptionPaymentMethod.CARD
+      : attributes.payment_processor === "paypal"
+        ? SubscriptionPaymentMethod.PAYPAL
+        : SubscriptionPaymentMethod.BANK_TRANSFER;
+
+  switch (meta.event_name) {
+    case "subscription_created": {
+      // 트랜잭션으로 subscription 생성
+      await prisma.$transaction(async (tx) => {
+        // 1. User 확인
+        const user = await tx.user.findUnique({
+          where: { id: user_id },
+          include: { subscription: true },
+        });
+        assert(user != null, "User not found");
+
+        const plan = await findPlanByVariant(variant_id);
+
+        assert(plan != null, "Plan not found: " + variant_id);
+
+        // 이미 구독이 있는지 확인
+        if (
+          user.subscription?.status === SubscriptionStatus.ACTIVE ||
+          user.subscription?.status === SubscriptionStatus.CANCELLED
+        ) {
+          throw new Error("Active subscription already exists");
+        }
+
+        // EXPIRED 구독이 있는 경우 삭제
+        if (user.subscription?.status === SubscriptionStatus.EXPIRED) {
+          await tx.subscription.delete({
+            where: { id: user.subscription.id },
+          });
+          console.log(`기존 EXPIRED 구독 삭제: ${user.subscription.id}`);
+        }
+
+        // 2. Subscription create
+        const newSubscription = await tx.subscription.create({
+          data: {
+            id: `subs_${cuid2()}`,
+            userId: user_id,
+            planId: plan.id,
+            lemonSqueezyId: id,
+            lemonCustomerId: safeString(customer_id) || "",
+            lemonOrderId: safeString(order_id) || "",
+            lemonProductId: safeString(product_id) || "",
+            lemonVariantId: safeString(variant_id) || "",
+            status: mapLemonSqueezyStatus(status),
+            renewsAt: attributes.renews_at
+              ? new Date(attributes.renews_at)
+              : null,
+            endsAt: attributes.ends_at
+              ? new Date(attributes.ends_at)
+              : attributes.renews_at
+                ? new Date(attributes.renews_at)
+                : null,
+            paymentMethod,
+            cardBrand: attributes.card_brand ?? "",
+            cardLast4: attributes.card_last_four ?? "",
+          },
+        });
+
+        console.log(
+          `구독이 성공적으로 생성되었습니다: ${id} - for user(${user_id})`
+        );
+      });
+      break;
+    }
+
+    case "subscription_updated": {
+      console.log("구독 업데이트 처리 시작:", id, "상태:", status);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. 구독 조회
+        const subscription = await tx.subscription.findUnique({
+          where: { lemonSqueezyId: id },
+          include: { plan: true },
+        });
+
+        if (!subscription) {
+          console.error(`구독을 찾을 수 없습니다: ${id}`);
+          return;
+        }
+
+        // Variant ID가 변경되었는지 확인 (플랜 변경 감지)
+        const variantChanged = isPlanChanged(
+          subscription.lemonVariantId,
+          variant_id
+        );
+
+        let newPlan = subscription.plan;
+        if (variantChanged) {
+          // 새로운 플랜 조회
+          const foundPlan = await findPlanByVariant(variant_id);
+
+          if (foundPlan) {
+            newPlan = foundPlan;
+            console.log(
+              `플랜 변경 감지: ${subscription.plan.name} -> ${foundPlan.name}`
+            );
+          }
+        }
+
+        // 2. 구독 정보 업데이트
+        const updateData: any = {
+          status: mapLemonSqueezyStatus(status),
+          renewsAt: attributes.renews_at
+            ? new Date(attributes.renews_at)
+            : null,
+          endsAt: attributes.ends_at ? new Date(attributes.ends_at) : null,
+          cardBrand: attributes.card_brand ?? subscription.cardBrand,
+          cardLast4: attributes.card_last_four ?? subscription.cardLast4,
+        };
+
+        // 플랜이 변경된 경우 추가 필드 업데이트
+        if (variantChanged && newPlan) {
+          updateData.planId = newPlan.id;
+          updateData.lemonVariantId = safeString(variant_id) || "";
+          updateData.lemonProductId = safeString(product_id) || "";
+        }
+
+        await tx.subscription.update({
+          where: { id: subscription.id },
+          data: updateData,
+        });
+
+        console.log(
+          `구독 업데이트 완료: Subscription ${subscription.id}, 새 상태: ${status} ${
+            variantChanged
+              ? `, 플랜 변경: ${subscription.plan.name} -> ${newPlan?.name}`
+              : ""
+          }`
+        );
+      });
+      break;
+    }
+
+    case "subscription_cancelled": {
+      console.log("구독 취소 처리 시작:", id);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. 구독 조회
+        const subscription = await tx.subscription.findUnique({
+          where: { lemonSqueezyId: id },
+        });
+
+        if (!subscription) {
+          console.error(`구독을 찾을 수 없습니다: ${id}`);
+          return;
+        }
+
+        // 2. 구독 상태를 CANCELLED로 업데이트
+        // 주의: 취소되어도 ends_at까지는 계속 사용 가능
+        await tx.subscription.update({
+          where: { id: subscription.id },
+          data: {
+            status: SubscriptionStatus.CANCELLED,
+            endsAt: attributes.ends_at ? new Date(attributes.ends_at) : null,
+          },
+        });
+
+        console.log(
+          `구독 취소 처리 완료: Subscription ${subscription.id}, 만료 예정일: ${attributes.ends_at}`
+        );
+      });
+      break;
+    }
+
+    case "subscription_resumed": {
+      console.log("구독 재개 처리 시작:", id);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. 구독 조회
+        const subscription = await tx.subscription.findUnique({
+          where: { lemonSqueezyId: id },
+          include: {
+            plan: true,
+          },
+        });
+
+        if (!subscription) {
+          console.error(`구독을 찾을 수 없습니다: ${id}`);
+          return;
+        }
+
+        // 2. 구독 상태를 ACTIVE로 업데이트
+        await tx.subscription.update({
+          where: { id: subscription.id },
+          data: {
+            status: SubscriptionStatus.ACTIVE,
+            renewsAt: attributes.renews_at
+              ? new Date(attributes.renews_at)
+              : null,
+            endsAt: null, // 재개되었으므로 종료일 제거
+          },
+        });
+
+        console.log(`구독 재개 처리 완료: Subscription ${subscription.id}`);
+      });
+      break;
+    }
+
+    case "subscription_expired": {
+      console.log("구독 만료 처리 시작:", id);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. 구독 조회
+        const subscription = await tx.subscription.findUnique({
+          where: { lemonSqueezyId: id },
+          include: { plan: true, user: true },
+        });
+
+        if (!subscription) {
+          console.error(`구독을 찾을 수 없습니다: ${id}`);
+          return;
+        }
+
+        // 2. 구독 상태를 EXPIRED로 업데이트
+        await tx.subscription.update({
+          where: { id: subscription.id },
+          data: {
+            status: SubscriptionStatus.EXPIRED,
+            endsAt: new Date(),
+          },
+        });
+
+        console.log(
+          `구독 만료 처리 완료: Subscription ${subscription.id}, User: ${subscription.user.username}`
+        );
+      });
+      break;
+    }
+
+    case "subscription_renewed": {
+      console.log("구독 갱신 처리 시작:", id);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. 구독 정보 조회
+        const subscription = await tx.subscription.findUnique({
+          where: { lemonSqueezyId: id },
+          include: { plan: true },
+        });
+
+        if (!subscription) {
+          console.error(`구독을 찾을 수 없습니다: ${id}`);
+          return;
+        }
+
+        // 2. 구독 상태 업데이트 (갱신 날짜 업데이트)
+        await tx.subscription.update({
+          where: { id: subscription.id },
+          data: {
+            status: SubscriptionStatus.ACTIVE,
+            renewsAt: attributes.renews_at
+              ? new Date(attributes.renews_at)
+              : null,
+          },
+        });
+
+        console.log(`구독 갱신 처리 완료: Subscription ${subscription.id}`);
+      });
+      break;
+    }
+
+    default: {
+      console.log("알 수 없는 구독 이벤트:", meta.event_name);
+      throw new Error("알 수 없는 구독 이벤트: " + meta.event_name);
+    }
+  }
+}
+
+// LemonSqueezy 상태를 우리 DB enum으로 매핑
+function mapLemonSqueezyStatus(lemonStatus: string): SubscriptionStatus {
+  const statusMap: Record<string, SubscriptionStatus> = {
+    active: SubscriptionStatus.ACTIVE,
+    cancelled: SubscriptionStatus.CANCELLED,
+    expired: SubscriptionStatus.EXPIRED,
+    unpaid: SubscriptionStatus.UNPAID,
+    past_due: SubscriptionStatus.PAST_DUE,
+  };
+
+  return statusMap[lemonStatus] || SubscriptionStatus.ACTIVE;
+}
+
+// 결제 이벤트 처리 함수 (구독 인보이스)
+async function handleInvoiceEvent({ id, attributes, meta }: LemonInvoiceEvent) {
+  const {
+    subscription_id,
+    customer_id,
+    user_email,
+    billing_reason,
+    status,
+    status_formatted,
+    currency,
+    currency_rate,
+    subtotal,
+    discount_total,
+    tax,
+    tax_inclusive,
+    total,
+    refunded_amount,
+    subtotal_usd,
+    discount_total_usd,
+    tax_usd,
+    total_usd,
+    refunded_amount_usd,
+    card_brand,
+    card_last_four,
+    urls,
+    test_mode,
+    refunded_at,
+  } = attributes;
+
+  // custom_data가 없으면 처리하지 않음
+  if (!meta.custom_data) {
+    console.error("Invoice event missing custom_data:", id, {
+      event_name: meta.event_name,
+      subscription_id,
+      user_email,
+    });
+    return;
+  }
+
+  const { user_id } = meta.custom_data;
+
+  if (!user_id) {
+    console.error("Invoice event missing user_id in custom_data:", id, {
+      custom_data: meta.custom_data,
+      event_name: meta.event_name,
+      subscription_id,
+    });
+    return;
+  }
+
+  switch (meta.event_name) {
+    case "subscription_payment_success": {
+      console.log(`구독 결제 성공 처리: Invoice ${id}`);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. Organization 확인
+        const user = await tx.user.findUnique({
+          where: { id: user_id },
+        });
+
+        if (!user) {
+          throw new Error(`User not found: ${user_id}`);
+        }
+
+        // 2. PaymentHistory 생성
+        await tx.paymentHistory.create({
+          data: {
+            id: `pmh_${cuid2()}`,
+            userId: user_id,
+            invoiceId: id,
+            subscriptionId: safeString(subscription_id) || "",
+            customerId: safeString(customer_id) || "",
+            userEmail: user_email,
+            billingReason: billing_reason,
+            status: PaymentStatus.SUCCESS,
+            statusFormatted: status_formatted,
+            currency,
+            currencyRate: currency_rate,
+            subtotal,
+            discountTotal: discount_total,
+            tax,
+            taxInclusive: tax_inclusive,
+            total,
+            refundedAmount: refunded_amount,
+            subtotalUsd: subtotal_usd,
+            discountTotalUsd: discount_total_usd,
+            taxUsd: tax_usd,
+            totalUsd: total_usd,
+            refundedAmountUsd: refunded_amount_usd,
+            cardBrand: card_brand,
+            cardLastFour: card_last_four,
+            invoiceUrl: urls.invoice_url,
+            testMode: test_mode,
+            refundedAt: refunded_at ? new Date(refunded_at) : null,
+          },
+        });
+
+        console.log(
+          `결제 내역 저장 완료: Invoice ${id}, User ${user.username}(${user.id})`
+        );
+      });
+      break;
+    }
+
+    case "subscription_payment_failed": {
+      console.log(`구독 결제 실패 처리: Invoice ${id}`);
+
+      await prisma.$transaction(async (tx) => {
+        // 1. User 확인
+        const user = await tx.user.findUnique({
+          where: { id: user_id },
+        });
+
+        if (!user) {
+          throw new Error(`User not found: ${user_id}`);
+        }
+
+        // 2. PaymentHistory 생성
+        await tx.paymentHistory.create({
+          data: {
+            id: `pmh_${cuid2()}`,
+            userId: user_id,
+            invoiceId: id,
+            subscriptionId: safeString(subscription_id) || "",
+            customerId: safeString(customer_id) || "",
+            userEmail: user_email,
+            billingReason: billing_reason,
+            status: PaymentStatus.FAILED,
+            statusFormatted: status_formatted,
+            currency,
+            currencyRate: currency_rate,
+            subtotal,
+            discountTotal: discount_total,
+            tax,
+            taxInclusive: tax_inclusive,
+            total,
+            refundedAmount: refunded_amount,
+            subtotalUsd: subtotal_usd,
+            discountTotalUsd: discount_total_usd,
+            taxUsd: tax_usd,
+            totalUsd: total_usd,
+            refundedAmountUsd: refunded_amount_usd,
+            cardBrand: card_brand,
+            cardLastFour: card_last_four,
+            invoiceUrl: urls.invoice_url,
+            testMode: test_mode,
+            refundedAt: refunded_at ? new Date(refunded_at) : null,
+          },
+        });
+
+        console.log(
+          `결제 실패 내역 저장 완료: Invoice ${id}, User ${user.username}(${user.id})`
+        );
+      });
+      break;
+    }
+
+    default: {
+      console.log("처리하지 않는 인보이스 이벤트:", meta.event_name);
+    }
+  }
+}
+
+async function processEvent(body: any) {
+  const { data, meta } = body;
+  if (data.type === "subscriptions") {
+    await handleSubscriptionEvent({
+      id: data.id,
+      attributes: data.attributes,
+      meta,
+    });
+  } else if (data.type === "subscription-invoices") {
+    await handleInvoiceEvent({
+      id: data.id,
+      type: data.type,
+      attributes: data.attributes,
+      meta,
+    });
+  }
+}
+
+function webhookEventData(body: any) {
+  return {
+    id: `webh_${cuid2()}`,
+    eventId: safeString(body.meta.event_id) || "",
+    eventName: body.meta.event_name,
+    resourceId: safeString(body.data.id) || "",
+    payload: body,
+  };
+}
+
+/**
+ * 같은 구독 키로 쌓인 이벤트 배치 처리
+ * - 이미 처리 기록(webhookEvent)이 있는 이벤트는 건너뜀 (재시도/재전송)
+ * - 연속된 subscription_updated 는 마지막 것만 반영하고 나머지는 처리 기록만 남김
+ * - 처리 기록은 반영에 성공한 뒤에 남김 → 실패하면 워커가 배치를 다시 시도
+ */
+export async function processLemonBatch(jobs: WebhookJob[]) {
+  const bodies = jobs.map((job) => job.payload as any);
+  const { run, skipped } = coalesceSubscriptionEvents(bodies);
+
+  for (const body of run) {
+    const eventId = body.meta?.event_id;
+    if (eventId) {
+      const existingEvent = await prisma.webhookEvent.findUnique({
+        where: { eventId: String(eventId) },
+      });
+      if (existingEvent) {
+        console.log(`Duplicate webhook event detected: ${eventId}`);
+        continue;
+      }
+    }
+
+    await processEvent(body);
+
+    if (eventId) {
+      await prisma.webhookEvent.create({ data: webhookEventData(body) });
+    }
+  }
+
+  const coalesced = skipped.filter((body) => body.meta?.event_id);
+  if (coalesced.length) {
+    await prisma.webhookEvent.createMany({
+      data: coalesced.map(webhookEventData),
+      skipDuplicates: true,
+    });
+    console.log(
+      `구독 이벤트 병합: ${lemonQueueKey(coalesced[0])} 에서 subscription_updated ${coalesced.length}건 생략`
+    );
+  }
+}
+
+let registered = false;
+
+/** 큐에 핸들러 등록 — drain 전에 호출 (route, cron) */
+export function registerLemonWorker() {
+  if (registered) return;
+  registered = true;
+  webhookQueue.register(SOURCE, processLemonBatch);
+}
+
+/**
+ * 검증된 payload 를 큐에 넣음
+ * 중복 판단 id: meta.event_id, 없으면 원본 payload 해시 (프로바이더 재전송은 같은 본문)
+ */
+export function enqueueLemonEvent(payload: string, body: any): Promise<EnqueueResult> {
+  registerLemonWorker();
+  const eventId =
+    safeString(body.meta?.event_id) ||
+    `sha256:${createHash("sha256").update(payload).digest("hex")}`;
+  return webhookQueue.enqueue({
+    source: SOURCE,
+    eventId,
+    key: lemonQueueKey(body),
+    name: body.meta?.event_name ?? "",
+    payload: body,
+  });
+}
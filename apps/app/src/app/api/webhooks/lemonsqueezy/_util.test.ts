@@ -1,5 +1,21 @@
 import { describe, it, expect } from "vitest";
-import { isPlanChanged, safeString, safeNumber, PLAN_DEFAULTS } from "./_util";
+import {
+  isPlanChanged,
+  safeString,
+  safeNumber,
+  PLAN_DEFAULTS,
+  lemonQueueKey,
+  coalesceSubscriptionEvents,
+} from "./_util";
+
+const subEvent = (id: string, event_name: string) => ({
+  data: { id, type: "subscriptions" },
+  meta: { event_name },
+});
+const invoiceEvent = (id: string, subscription_id: number) => ({
+  data: { id, type: "subscription-invoices", attributes: { subscription_id } },
+  meta: { event_name: "subscription_payment_success" },
+});
 
 describe("LemonSqueezy Webhook Utils", () => {
   describe("isPlanChanged", () => {
@@ -187,4 +203,48 @@ describe("LemonSqueezy Webhook Utils", () => {
       expect(testQuantity).toBe(1);
     });
   });
+
+  describe("lemonQueueKey", () => {
+    it("should key subscription events by subscription id", () => {
+      expect(lemonQueueKey(subEvent("42", "subscription_updated"))).toBe("sub:42");
+    });
+
+    it("should key invoice events by their subscription id", () => {
+      expect(lemonQueueKey(invoiceEvent("inv_1", 42))).toBe("sub:42");
+    });
+  });
+
+  describe("coalesceSubscriptionEvents", () => {
+    it("should keep only the last of consecutive subscription_updated events", () => {
+      const events = [
+        subEvent("1", "subscription_updated"),
+        subEvent("1", "subscription_updated"),
+        subEvent("1", "subscription_updated"),
+      ];
+      const { run, skipped } = coalesceSubscriptionEvents(events);
+      expect(run).toEqual([events[2]]);
+      expect(skipped).toEqual([events[0], events[1]]);
+    });
+
+    it("should not merge updates across other subscription events", () => {
+      const events = [
+        subEvent("1", "subscription_created"),
+        subEvent("1", "subscription_updated"),
+        subEvent("1", "subscription_cancelled"),
+        subEvent("1", "subscription_updated"),
+      ];
+      expect(coalesceSubscriptionEvents(events).run).toEqual(events);
+    });
+
+    it("should merge updates across invoice events and keep the invoices", () => {
+      const events = [
+        subEvent("1", "subscription_updated"),
+        invoiceEvent("inv_1", 1),
+        subEvent("1", "subscription_updated"),
+      ];
+      const { run, skipped } = coalesceSubscriptionEvents(events);
+      expect(run).toEqual([events[1], events[2]]);
+      expect(skipped).toEqual([events[0]]);
+    });
+  });
 });
@@ -51,3 +51,49 @@ export const PLAN_DEFAULTS = {
     minQuantity: 1,
   },
 } as const;
+
+interface LemonWebhookBody {
+  data: { id: string; type: string; attributes?: { subscription_id?: number | string } };
+  meta: { event_name: string; event_id?: string | number };
+}
+
+/**
+ * 큐 순서/병합 키 — 같은 구독의 구독 이벤트와 인보이스 이벤트는 같은 키
+ * @param body - webhook payload
+ * @returns 큐 키
+ */
+export function lemonQueueKey(body: LemonWebhookBody): string {
+  if (body.data.type === "subscriptions") return `sub:${body.data.id}`;
+  if (body.data.type === "subscription-invoices") {
+    return `sub:${body.data.attributes?.subscription_id}`;
+  }
+  return `${body.data.type}:${body.data.id}`;
+}
+
+/**
+ * 같은 구독의 대기 이벤트 병합
+ * subscription_updated 는 구독 전체 상태를 담고 있으므로, 사이에 다른 구독 이벤트가 없는
+ * 연속된 subscription_updated 는 마지막 것만 처리한다 (인보이스 이벤트는 구독 행을 바꾸지 않음)
+ * @param events - 도착 순서의 이벤트
+ * @returns run: 처리할 이벤트, skipped: 병합되어 건너뛴 이벤트 (둘 다 도착 순서)
+ */
+export function coalesceSubscriptionEvents<T extends LemonWebhookBody>(
+  events: T[]
+): { run: T[]; skipped: T[] } {
+  const keep = new Array<boolean>(events.length).fill(true);
+  let laterUpdate = false;
+  for (let i = events.length - 1; i >= 0; i--) {
+    const { data, meta } = events[i];
+    if (data.type !== "subscriptions") continue;
+    if (meta.event_name === "subscription_updated") {
+      if (laterUpdate) keep[i] = false;
+      laterUpdate = true;
+    } else {
+      laterUpdate = false;
+    }
+  }
+  return {
+    run: events.filter((_, i) => keep[i]),
+    skipped: events.filter((_, i) => !keep[i]),
+  };
+}
@@ -0,0 +1,63 @@
+import { describe, it, expect } from "vitest";
+import {
+  calculateMargin,
+  generatePricingScenarios,
+  generatePricingScenariosBatch,
+  type PricingInput,
+} from "./pricing-calculator";
+
+describe("Pricing Calculator", () => {
+  describe("generatePricingScenariosBatch", () => {
+    describe("when compared with the scalar scenarios", () => {
+      it("should return the same prices for every row", () => {
+        const inputs: PricingInput[] = [
+          { baseCost: 9000, targetMarginRate: 30, platformFeeRate: 10.8, shippingCost: 3000, extraCost: 0 },
+          { baseCost: 1500, targetMarginRate: 12, platformFeeRate: 6.5, shippingCost: 0, extraCost: 500 },
+          { baseCost: 45000, targetMarginRate: 3, platformFeeRate: 8, shippingCost: 2500, extraCost: 300 },
+          { baseCost: 100, targetMarginRate: 80, platformFeeRate: 10.8, shippingCost: 0, extraCost: 0 },
+        ];
+
+        const batch = generatePricingScenariosBatch({
+          baseCost: inputs.map((i) => i.baseCost),
+          targetMarginRate: inputs.map((i) => i.targetMarginRate),
+          platformFeeRate: inputs.map((i) => i.platformFeeRate),
+          shippingCost: inputs.map((i) => i.shippingCost),
+          extraCost: inputs.map((i) => i.extraCost),
+        });
+
+        inputs.forEach((input, i) => {
+          const scalar = generatePricingScenarios(input);
+          expect(batch.minPrice[i]).toBe(scalar.minPrice);
+          expect(batch.recPrice[i]).toBe(scalar.recPrice);
+          expect(batch.maxPrice[i]).toBe(scalar.maxPrice);
+          expect(batch.breakEvenPrice[i]).toBe(scalar.breakEvenPrice);
+          expect(batch.expectedNetProfit[i]).toBe(scalar.expectedNetProfit);
+        });
+      });
+    });
+
+    describe("when margin and fee exceed 100%", () => {
+      it("should return 0 for the affected scenario", () => {
+        const batch = generatePricingScenariosBatch({
+          baseCost: [1000],
+          targetMarginRate: [80],
+          platformFeeRate: [10.8],
+          shippingCost: [0],
+          extraCost: [0],
+        });
+        expect(batch.maxPrice[0]).toBe(0);
+        expect(batch.recPrice[0]).toBe(10900);
+      });
+    });
+  });
+
+  describe("calculateMargin", () => {
+    it("should apply the rocket fee rate", () => {
+      expect(calculateMargin(100, 150, "rocket")).toMatchObject({ netProfit: 33.8, marginPercent: 22.53 });
+    });
+
+    it("should return 0% margin when selling price is 0", () => {
+      expect(calculateMargin(100, 0, "wing").marginPercent).toBe(0);
+    });
+  });
+});
@@ -19,6 +19,37 @@ export interface PricingResult {
     breakEvenPrice: number;    // 손익분기점
 }
 
+/**
+ * Column-oriented input for batch pricing (one array per field, same length).
+ * Used when repricing a whole catalogue so we avoid one object per product.
+ */
+export interface PricingColumns {
+    baseCost: number[];
+    targetMarginRate: number[];
+    platformFeeRate: number[];
+    shippingCost: number[];
+    extraCost: number[];
+}
+
+export interface PricingColumnsResult {
+    minPrice: number[];
+    recPrice: number[];
+    maxPrice: number[];
+    expectedNetProfit: number[];
+    breakEvenPrice: number[];
+}
+
+/**
+ * Coupang platform fee rates (%) by fulfilment type.
+ */
+export const PLATFORM_FEE_RATES = {
+    rocket: 10.8,
+    wing: 6.5,
+    consignment: 8.0,
+} as const;
+
+export type Platform = keyof typeof PLATFORM_FEE_RATES;
+
 /**
  * Calculates the selling price based on cost and target margin.
  * Formula: Selling Price = (Cost + Shipping + Extra) / (1 - Margin% - Fee%)
@@ -26,7 +57,11 @@ export interface PricingResult {
  */
 export function calculateTargetPrice(input: PricingInput): number {
     const totalCost = input.baseCost + input.shippingCost + input.extraCost;
-    const denominator = 1 - (input.targetMarginRate / 100) - (input.platformFeeRate / 100);
+    return targetPriceFor(totalCost, input.targetMarginRate, input.platformFeeRate);
+}
+
+function targetPriceFor(totalCost: number, targetMarginRate: number, platformFeeRate: number): number {
+    const denominator = 1 - (targetMarginRate / 100) - (platformFeeRate / 100);
 
     if (denominator <= 0) return 0; // Invalid margin/fee combination
 
@@ -50,6 +85,29 @@ export function calculateProfit(sellingPrice: number, input: Omit<PricingInput,
     };
 }
 
+/**
+ * Margin for a given wholesale/selling price pair on a Coupang platform.
+ * Unlike calculateProfit, amounts are kept to 2 decimals (no flooring).
+ */
+export function calculateMargin(wholesalePrice: number, sellingPrice: number, platform: Platform) {
+    const feeRate = PLATFORM_FEE_RATES[platform];
+    const feeAmount = sellingPrice * (feeRate / 100);
+    const netProfit = sellingPrice - wholesalePrice - feeAmount;
+    const marginPercent = sellingPrice > 0 ? (netProfit / sellingPrice) * 100 : 0;
+
+    return {
+        platform,
+        feeRate,
+        feeAmount: round2(feeAmount),
+        netProfit: round2(netProfit),
+        marginPercent: round2(marginPercent),
+    };
+}
+
+function round2(value: number): number {
+    return Math.round(value * 100) / 100;
+}
+
 /**
  * rounds a number to the nearest unit (e.g., 100 KRW)
  */
@@ -58,20 +116,21 @@ function roundToNearest(value: number, unit: number): number {
 }
 
 export function generatePricingScenarios(input: PricingInput): PricingResult {
+    const totalCost = input.baseCost + input.shippingCost + input.extraCost;
+    const margin = input.targetMarginRate;
+    const fee = input.platformFeeRate;
+
     // 1. Recommended Price (Target Margin)
-    const recPrice = calculateTargetPrice(input);
+    const recPrice = targetPriceFor(totalCost, margin, fee);
 
     // 2. Min Price (Lower Margin, e.g., Target - 10%, but not below 5% net)
-    const minMarginInput = { ...input, targetMarginRate: Math.max(5, input.targetMarginRate - 10) };
-    const minPrice = calculateTargetPrice(minMarginInput);
+    const minPrice = targetPriceFor(totalCost, Math.max(5, margin - 10), fee);
 
     // 3. Max Price (Higher Margin, e.g., Target + 10%)
-    const maxMarginInput = { ...input, targetMarginRate: input.targetMarginRate + 15 };
-    const maxPrice = calculateTargetPrice(maxMarginInput);
+    const maxPrice = targetPriceFor(totalCost, margin + 15, fee);
 
     // 4. Break Even (0% Margin)
-    const breakEvenInput = { ...input, targetMarginRate: 0 };
-    const breakEvenPrice = calculateTargetPrice(breakEvenInput);
+    const breakEvenPrice = targetPriceFor(totalCost, 0, fee);
 
     const { netProfit } = calculateProfit(recPrice, input);
 
@@ -83,3 +142,33 @@ export function generatePricingScenarios(input: PricingInput): PricingResult {
         breakEvenPrice,
     };
 }
+
+/**
+ * Batch version of generatePricingScenarios over column arrays.
+ * Same formulas and 100 KRW ceil rounding, one pass, no per-row objects.
+ */
+export function generatePricingScenariosBatch(columns: PricingColumns): PricingColumnsResult {
+    const n = columns.baseCost.length;
+    const result: PricingColumnsResult = {
+        minPrice: new Array(n),
+        recPrice: new Array(n),
+        maxPrice: new Array(n),
+        expectedNetProfit: new Array(n),
+        breakEvenPrice: new Array(n),
+    };
+
+    for (let i = 0; i < n; i++) {
+        const totalCost = columns.baseCost[i] + columns.shippingCost[i] + columns.extraCost[i];
+        const margin = columns.targetMarginRate[i];
+        const fee = columns.platformFeeRate[i];
+
+        const recPrice = targetPriceFor(totalCost, margin, fee);
+        result.recPrice[i] = recPrice;
+        result.minPrice[i] = targetPriceFor(totalCost, Math.max(5, margin - 10), fee);
+        result.maxPrice[i] = targetPriceFor(totalCost, margin + 15, fee);
+        result.breakEvenPrice[i] = targetPriceFor(totalCost, 0, fee);
+        result.expectedNetProfit[i] = Math.floor(recPrice - totalCost - recPrice * (fee / 100));
+    }
+
+    return result;
+}
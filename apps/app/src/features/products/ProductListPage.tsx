@@ -26,12 +26,17 @@ export function ProductListPage() {
     const t = useTranslations("ProductListPage");
     const utils = trpc.useUtils();
 
-    const { data: products, isLoading } = trpc.product.getAll.useQuery();
+    const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } =
+        trpc.product.list.useInfiniteQuery(
+            { limit: 20 },
+            { getNextPageParam: (lastPage) => lastPage.nextCursor }
+        );
+    const products = data?.pages.flatMap((page) => page.items);
 
     const createMutation = trpc.product.create.useMutation({
         onSuccess: () => {
             toast.success("Test product created!");
-            utils.product.getAll.invalidate();
+            utils.product.list.invalidate();
         },
         onError: (err) => {
             toast.error(`Failed to create product: ${err.message}`);
@@ -146,6 +151,18 @@ export function ProductListPage() {
                             )}
                         </TableBody>
                     </Table>
+                    {hasNextPage && (
+                        <div className="mt-4 flex justify-center">
+                            <Button
+                                variant="outline"
+                                onClick={() => fetchNextPage()}
+                                disabled={isFetchingNextPage}
+                            >
+                                {isFetchingNextPage && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                                {t("loadMore")}
+                            </Button>
+                        </div>
+                    )}
                 </CardContent>
             </Card>
         </div>
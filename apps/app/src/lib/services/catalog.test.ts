@@ -0,0 +1,124 @@
+import { describe, it, expect } from "vitest";
+import {
+  MAX_PAGE_SIZE,
+  decodeCursor,
+  encodeCursor,
+  groupListQuerySchema,
+  latestStatusPageSql,
+  productListArgs,
+  productListQuerySchema,
+  toPage,
+  wholesaleListArgs,
+  wholesaleListQuerySchema,
+} from "./catalog";
+
+const rows = (...ids: number[]) => ids.map((id) => ({ id }));
+
+describe("catalog", () => {
+  describe("cursor", () => {
+    it("should round-trip the last id", () => {
+      expect(decodeCursor(encodeCursor(12345))).toBe(12345);
+    });
+
+    it("should reject tampered or malformed cursors", () => {
+      expect(decodeCursor("not-a-cursor")).toBeNull();
+      expect(decodeCursor(Buffer.from(JSON.stringify({ id: "1 OR 1=1" })).toString("base64url"))).toBeNull();
+      expect(decodeCursor(Buffer.from(JSON.stringify({ id: -1 })).toString("base64url"))).toBeNull();
+    });
+  });
+
+  describe("query schemas", () => {
+    it("should apply the default page size and projection", () => {
+      const query = productListQuerySchema.parse({});
+
+      expect(query.limit).toBe(50);
+      expect(query.cursor).toBeNull();
+      expect(query.fields).toMatchObject({ id: true, name: true, createdAt: true });
+      expect(query.fields).not.toHaveProperty("trend");
+    });
+
+    it("should always select id and map virtual fields onto relations", () => {
+      const query = productListQuerySchema.parse({ fields: "name,status" });
+
+      expect(Object.keys(query.fields).sort()).toEqual(["id", "name", "registrations"]);
+      expect(groupListQuerySchema.parse({ fields: "productCount" }).fields).toEqual({
+        id: true,
+        _count: { select: { products: true } },
+      });
+    });
+
+    it("should reject unknown fields, bad cursors and oversized pages", () => {
+      expect(productListQuerySchema.safeParse({ fields: "name,passwordHash" }).success).toBe(false);
+      expect(productListQuerySchema.safeParse({ cursor: "garbage" }).success).toBe(false);
+      expect(productListQuerySchema.safeParse({ limit: String(MAX_PAGE_SIZE + 1) }).success).toBe(false);
+    });
+  });
+
+  describe("query args", () => {
+    it("should page products by id below the cursor within the user's scope", () => {
+      const query = productListQuerySchema.parse({
+        limit: "20",
+        cursor: encodeCursor(500),
+        category: "Living",
+        q: " 텀블러 ",
+      });
+
+      expect(productListArgs("user_1", query)).toMatchObject({
+        where: {
+          userId: "user_1",
+          category: "Living",
+          name: { contains: "텀블러", mode: "insensitive" },
+          id: { lt: 500 },
+        },
+        orderBy: { id: "desc" },
+        take: 21,
+      });
+    });
+
+    it("should leave out filters that were not given", () => {
+      const { where } = productListArgs("user_1", productListQuerySchema.parse({}));
+
+      expect(where).toEqual({ userId: "user_1" });
+    });
+
+    it("should pick status pages by the latest registration with the same keyset and filters", () => {
+      const query = productListQuerySchema.parse({
+        limit: "20",
+        cursor: encodeCursor(500),
+        category: "Living",
+        status: "REGISTERED",
+        q: "100%",
+      });
+      const sql = latestStatusPageSql("user_1", query);
+
+      expect(sql.sql).toContain('ORDER BY r."id" DESC LIMIT 1');
+      expect(sql.values).toEqual(["user_1", "REGISTERED", "Living", "%100\\%%", 500, 21]);
+      expect(productListArgs("user_1", query, [499, 497])).toMatchObject({
+        where: { userId: "user_1", id: { in: [499, 497] } },
+        orderBy: { id: "desc" },
+      });
+    });
+
+    it("should page group items in crawl order", () => {
+      const query = wholesaleListQuerySchema.parse({ cursor: encodeCursor(7), source: "domeggook" });
+
+      expect(wholesaleListArgs(3, query)).toMatchObject({
+        where: { wholesaleGroupId: 3, source: "domeggook", id: { gt: 7 } },
+        orderBy: { id: "asc" },
+      });
+    });
+  });
+
+  describe("toPage", () => {
+    it("should return a cursor for the last item when an extra row was fetched", () => {
+      const page = toPage(rows(10, 9, 8), 2);
+
+      expect(page.items).toEqual(rows(10, 9));
+      expect(decodeCursor(page.nextCursor!)).toBe(9);
+    });
+
+    it("should end pagination on a short page", () => {
+      expect(toPage(rows(2, 1), 2)).toEqual({ items: rows(2, 1), nextCursor: null });
+    });
+  });
+});
@@ -0,0 +1,236 @@
+// Paginated read queries for products and wholesale groups (REST: /api/products, /api/analysis/groups).
+// Keyset pagination on the autoincrement id: each page is `WHERE <scope> AND id < :cursor ORDER BY id DESC LIMIT n+1`,
+// served by the composite (userId, ..., id) indexes, so page N costs the same as page 1 (no OFFSET scan).
+// - cursor: opaque base64url token carrying the last id of the previous page
+// - fields: comma-separated projection from an allowlist, mapped to a Prisma select
+// - filters: products by category / latest registration status / name keyword, groups by keyword, group items by source
+// Only rows with a userId are listed; legacy NULL-owner rows are backfilled by the catalog_keyset_indexes migration.
+
+import { Prisma, prisma } from '@myapp/prisma';
+import { z } from 'zod';
+
+export const DEFAULT_PAGE_SIZE = 50;
+export const MAX_PAGE_SIZE = 200;
+
+export interface Page<T> {
+    items: T[];
+    nextCursor: string | null;
+}
+
+type Select = Record<string, unknown>;
+
+// field name → Prisma select entry; `true` selects the column as-is
+const PRODUCT_FIELDS: Record<string, unknown> = {
+    id: true,
+    name: true,
+    wholesalePrice: true,
+    recommendedPrice: true,
+    margin: true,
+    competition: true,
+    searchVolume: true,
+    category: true,
+    image: true,
+    source: true,
+    trend: true,
+    score: true,
+    createdAt: true,
+    updatedAt: true,
+    // latest registration, flattened to `status` / `platform` on the item
+    status: { registrations: { select: { status: true, platform: true }, orderBy: { id: 'desc' }, take: 1 } },
+};
+const PRODUCT_DEFAULT_FIELDS = ['id', 'name', 'category', 'wholesalePrice', 'recommendedPrice', 'margin', 'image', 'createdAt'];
+
+const GROUP_FIELDS: Record<string, unknown> = {
+    id: true,
+    keyword: true,
+    createdAt: true,
+    updatedAt: true,
+    productCount: { _count: { select: { products: true } } },
+};
+const GROUP_DEFAULT_FIELDS = ['id', 'keyword', 'createdAt', 'productCount'];
+
+const WHOLESALE_FIELDS: Record<string, unknown> = {
+    id: true,
+    name: true,
+    price: true,
+    source: true,
+    rating: true,
+    minOrder: true,
+    url: true,
+    createdAt: true,
+};
+const WHOLESALE_DEFAULT_FIELDS = ['id', 'name', 'price', 'source', 'minOrder', 'url'];
+
+export function encodeCursor(id: number) {
+    return Buffer.from(JSON.stringify({ id })).toString('base64url');
+}
+
+export function decodeCursor(cursor: string): number | null {
+    try {
+        const { id } = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+        return Number.isInteger(id) && id > 0 ? id : null;
+    } catch {
+        return null;
+    }
+}
+
+/** Maps `fields=a,b` onto a Prisma select; `id` is always selected because the next cursor needs it. */
+export function buildSelect(fields: string[], allowed: Record<string, unknown>): Select {
+    const select: Select = { id: true };
+    for (const field of fields) {
+        const entry = allowed[field];
+        if (entry === true) select[field] = true;
+        else Object.assign(select, entry);
+    }
+    return select;
+}
+
+const pageQuery = (allowed: Record<string, unknown>, defaults: string[]) =>
+    z.object({
+        limit: z.coerce.number().int().min(1).max(MAX_PAGE_SIZE).default(DEFAULT_PAGE_SIZE),
+        cursor: z
+            .string()
+            .optional()
+            .transform((value, ctx) => {
+                if (!value) return null;
+                const id = decodeCursor(value);
+                if (id === null) ctx.addIssue({ code: z.ZodIssueCode.custom, message: 'Invalid cursor' });
+                return id;
+            }),
+        fields: z
+            .string()
+            .optional()
+            .transform((value, ctx) => {
+                const fields = value ? value.split(',').map((f) => f.trim()).filter(Boolean) : defaults;
+                const unknown = fields.filter((f) => !(f in allowed));
+                if (unknown.length) ctx.addIssue({ code: z.ZodIssueCode.custom, message: `Unknown fields: ${unknown.join(', ')}` });
+                return buildSelect(fields, allowed);
+            }),
+    });
+
+export const productListQuerySchema = pageQuery(PRODUCT_FIELDS, PRODUCT_DEFAULT_FIELDS).extend({
+    category: z.string().min(1).optional(),
+    status: z.string().min(1).optional(), // status of the latest registration (the one returned as `status`)
+    q: z.string().trim().min(1).max(100).optional(),
+});
+
+export const groupListQuerySchema = pageQuery(GROUP_FIELDS, GROUP_DEFAULT_FIELDS).extend({
+    q: z.string().trim().min(1).max(100).optional(),
+});
+
+export const wholesaleListQuerySchema = pageQuery(WHOLESALE_FIELDS, WHOLESALE_DEFAULT_FIELDS).extend({
+    source: z.string().min(1).optional(),
+});
+
+export type ProductListQuery = z.infer<typeof productListQuerySchema>;
+export type GroupListQuery = z.infer<typeof groupListQuerySchema>;
+export type WholesaleListQuery = z.infer<typeof wholesaleListQuerySchema>;
+
+/** URLSearchParams → plain object for the schemas above (repeated keys: last one wins). */
+export function searchParamsToObject(params: URLSearchParams) {
+    return Object.fromEntries(params.entries());
+}
+
+/** `ids`: the page already picked by latestStatusPageSql (status filter) — only those rows are fetched. */
+export function productListArgs(userId: string, query: ProductListQuery, ids?: number[]) {
+    return {
+        where: ids
+            ? { userId, id: { in: ids } }
+            : {
+                  userId,
+                  ...(query.category && { category: query.category }),
+                  ...(query.q && { name: { contains: query.q, mode: 'insensitive' as const } }),
+                  ...(query.cursor && { id: { lt: query.cursor } }),
+              },
+        orderBy: { id: 'desc' as const },
+        take: query.limit + 1,
+        select: query.fields,
+    };
+}
+
+const likePattern = (q: string) => `%${q.replace(/[\\%_]/g, '\\$&')}%`;
+
+/**
+ * Ids for one page of products whose latest registration has `query.status`.
+ * Prisma can only filter a relation with some/every/none, i.e. on any registration, while the item's `status`
+ * is the latest one — so the page is picked here (LATERAL on (productId, id)) with the same keyset and filters.
+ */
+export function latestStatusPageSql(userId: string, query: ProductListQuery) {
+    return Prisma.sql`
+        SELECT p."id" FROM "Product" p
+        CROSS JOIN LATERAL (
+            SELECT r."status" FROM "Registration" r WHERE r."productId" = p."id" ORDER BY r."id" DESC LIMIT 1
+        ) latest
+        WHERE p."userId" = ${userId} AND latest."status" = ${query.status}
+        ${query.category ? Prisma.sql`AND p."category" = ${query.category}` : Prisma.empty}
+        ${query.q ? Prisma.sql`AND p."name" ILIKE ${likePattern(query.q)}` : Prisma.empty}
+        ${query.cursor ? Prisma.sql`AND p."id" < ${query.cursor}` : Prisma.empty}
+        ORDER BY p."id" DESC
+        LIMIT ${query.limit + 1}`;
+}
+
+export function groupListArgs(userId: string, query: GroupListQuery) {
+    return {
+        where: {
+            userId,
+            ...(query.q && { keyword: { contains: query.q, mode: 'insensitive' as const } }),
+            ...(query.cursor && { id: { lt: query.cursor } }),
+        },
+        orderBy: { id: 'desc' as const },
+        take: query.limit + 1,
+        select: query.fields,
+    };
+}
+
+/** Group items come back in crawl order (id ascending). */
+export function wholesaleListArgs(groupId: number, query: WholesaleListQuery) {
+    return {
+        where: {
+            wholesaleGroupId: groupId,
+            ...(query.source && { source: query.source }),
+            ...(query.cursor && { id: { gt: query.cursor } }),
+        },
+        orderBy: { id: 'asc' as const },
+        take: query.limit + 1,
+        select: query.fields,
+    };
+}
+
+/** Rows were fetched with take = limit + 1; the extra row only tells us another page exists. */
+export function toPage<T extends { id: number }>(rows: T[], limit: number): Page<T> {
+    const items = rows.length > limit ? rows.slice(0, limit) : rows;
+    const nextCursor = rows.length > limit ? encodeCursor(items[items.length - 1].id) : null;
+    return { items, nextCursor };
+}
+
+/** Flattens the projected relations (`registrations`, `_count`) into the field names the client asked for. */
+function flatten(row: Record<string, any>) {
+    const { registrations, _count, ...rest } = row;
+    if (registrations) {
+        rest.status = registrations[0]?.status ?? null;
+        rest.platform = registrations[0]?.platform ?? null;
+    }
+    if (_count) rest.productCount = _count.products;
+    return rest as { id: number } & Record<string, unknown>;
+}
+
+export async function listProducts(userId: string, query: ProductListQuery) {
+    const ids = query.status
+        ? (await prisma.$queryRaw<{ id: number }[]>(latestStatusPageSql(userId, query))).map((row) => row.id)
+        : undefined;
+    const rows = await prisma.product.findMany(productListArgs(userId, query, ids) as any);
+    return toPage((rows as Record<string, any>[]).map(flatten), query.limit);
+}
+
+export async function listWholesaleGroups(userId: string, query: GroupListQuery) {
+    const rows = await prisma.wholesaleGroup.findMany(groupListArgs(userId, query) as any);
+    return toPage((rows as Record<string, any>[]).map(flatten), query.limit);
+}
+
+/** null when the group does not exist or belongs to another user. */
+export async function listWholesaleProducts(userId: string, groupId: number, query: WholesaleListQuery) {
+    const group = await prisma.wholesaleGroup.findFirst({ where: { id: groupId, userId }, select: { id: true } });
+    if (!group) return null;
+    const rows = await prisma.wholesaleProduct.findMany(wholesaleListArgs(groupId, query) as any);
+    return toPage(rows as unknown as { id: number }[], query.limit);
+}
@@ -0,0 +1,25 @@
+import crypto from "crypto";
+import { describe, it, expect } from "vitest";
+import { createCoupangContext, signedDate } from "./coupang-context";
+
+const keys = { accessKey: "ak-test", secretKey: "sk-test", vendorId: "A00012345" };
+
+describe("signedDate", () => {
+  it("should format as YYMMDDThhmmssZ in UTC", () => {
+    expect(signedDate(new Date(Date.UTC(2025, 0, 2, 3, 4, 5)))).toBe("250102T030405Z");
+  });
+});
+
+describe("createCoupangContext", () => {
+  it("should sign with the same HMAC as a per-request secret", () => {
+    const ctx = createCoupangContext(keys, "user_1");
+    const { datetime, authorization } = ctx.sign("GET", "/v2/test", "pageNum=1");
+    const expected = crypto.createHmac("sha256", keys.secretKey).update(`${datetime}GET/v2/testpageNum=1`, "utf-8").digest("hex");
+    expect(authorization).toBe(`CEA algorithm=HmacSHA256, access-key=${keys.accessKey}, signed-date=${datetime}, signature=${expected}`);
+  });
+
+  it("should refuse to sign without keys", () => {
+    const ctx = createCoupangContext({ ...keys, secretKey: "" }, "user_1");
+    expect(() => ctx.sign("GET", "/v2/test")).toThrow("COUPANG_ACCESS_KEY/SECRET_KEY missing");
+  });
+});
@@ -0,0 +1,112 @@
+// Per-user Coupang signing context: active credential + CoupangService + signed fetch.
+// Cached per user (TTL) so repeated calls skip the credential query and client setup;
+// /api/settings/coupang invalidates the user's entry on every write.
+import crypto, { type KeyObject } from 'crypto'
+import { prisma } from '@myapp/prisma'
+import { CoupangService } from './coupang'
+import { VendorCache } from './vendor-cache'
+
+const PROXY_URL = process.env.COUPANG_PROXY_URL
+const PROXY_KEY = process.env.COUPANG_PROXY_KEY || ''
+const BASE_URL = process.env.COUPANG_API_BASE_URL || 'https://api-gateway.coupang.com'
+const CONTEXT_TTL_MS = Number(process.env.COUPANG_CREDENTIAL_CACHE_TTL_MS || 5 * 60 * 1000)
+const CONTEXT_RESOURCE = 'context'
+
+export interface CoupangKeys {
+    accessKey: string
+    secretKey: string
+    vendorId: string
+    vendorUserId?: string
+}
+
+export interface CoupangContext {
+    keys: CoupangKeys
+    service: CoupangService
+    sign(method: string, path: string, query?: string): { datetime: string; authorization: string }
+    fetch(method: 'GET' | 'POST', path: string, body?: any, query?: string): Promise<{ res: Response; json: any }>
+}
+
+/** Coupang CEA signed-date (YYMMDDThhmmssZ, UTC). */
+export function signedDate(d = new Date()) {
+    const pad = (n: number) => n.toString().padStart(2, '0')
+    return d.getUTCFullYear().toString().slice(-2) + pad(d.getUTCMonth() + 1) + pad(d.getUTCDate()) + 'T' + pad(d.getUTCHours()) + pad(d.getUTCMinutes()) + pad(d.getUTCSeconds()) + 'Z'
+}
+
+export function createCoupangContext(keys: CoupangKeys, userId: string): CoupangContext {
+    // HMAC key is imported once per context instead of per signature
+    const hmacKey: KeyObject | null = keys.secretKey ? crypto.createSecretKey(Buffer.from(keys.secretKey, 'utf-8')) : null
+    const authPrefix = `CEA algorithm=HmacSHA256, access-key=${keys.accessKey}, signed-date=`
+
+    const sign = (method: string, path: string, query = '') => {
+        if (!keys.accessKey || !hmacKey) throw new Error('COUPANG_ACCESS_KEY/SECRET_KEY missing')
+        const datetime = signedDate()
+        const signature = crypto.createHmac('sha256', hmacKey).update(`${datetime}${method}${path}${query}`, 'utf-8').digest('hex')
+        return { datetime, authorization: `${authPrefix}${datetime}, signature=${signature}` }
+    }
+
+    const signedFetch = async (method: 'GET' | 'POST', path: string, body?: any, query = '') => {
+        const { datetime, authorization } = sign(method, path, query)
+        const init: RequestInit = {
+            method,
+            headers: {
+                'Content-Type': 'application/json',
+                Authorization: authorization,
+                'X-Coupang-Date': datetime,
+                'X-Requested-By': keys.vendorId
+            },
+        }
+        if (body && method !== 'GET') init.body = JSON.stringify(body)
+        const res = await fetch(`${BASE_URL}${query ? `${path}?${query}` : path}`, init)
+        const json = await res.json().catch(() => ({}))
+        return { res, json }
+    }
+
+    const service = new CoupangService({
+        accessKey: keys.accessKey,
+        secretKey: keys.secretKey,
+        vendorId: keys.vendorId,
+        userId: keys.vendorUserId || userId
+    })
+
+    return { keys, service, sign, fetch: signedFetch }
+}
+
+const globalForCoupangContext = globalThis as unknown as { coupangContextCache?: VendorCache }
+
+// Keyed by Clerk userId (VendorCache's vendor slot); no stale window — an expired
+// entry is reloaded so a deactivated credential is never served past the TTL.
+export const coupangContextCache = globalForCoupangContext.coupangContextCache ?? new VendorCache({ ttlMs: CONTEXT_TTL_MS, staleMs: 0 })
+globalForCoupangContext.coupangContextCache = coupangContextCache
+
+/** Signing context for the user's active credential, or null when none is active. */
+export function getCoupangContext(userId: string): Promise<CoupangContext | null> {
+    return coupangContextCache.get<CoupangContext | null>(userId, CONTEXT_RESOURCE, async () => {
+        const creds = await prisma.coupangCredential.findFirst({
+            where: { userId, isActive: true }
+        })
+        if (!creds) return null
+        return createCoupangContext({
+            accessKey: creds.accessKey,
+            secretKey: creds.secretKey,
+            vendorId: creds.vendorId,
+            vendorUserId: creds.vendorUserId || creds.userId
+        }, userId)
+    }, { shouldCache: (ctx) => ctx !== null })
+}
+
+/**
+ * Drop the user's cached context after a credential write. In proxy mode the proxy
+ * keeps its own per-user cache, so it is told as well (best effort — its TTL bounds staleness).
+ */
+export async function invalidateCoupangContext(userId: string) {
+    coupangContextCache.invalidate(userId)
+    if (!PROXY_URL) return
+    try {
+        await fetch(`${PROXY_URL}/api/coupang/credentials/invalidate`, {
+            method: 'POST',
+            headers: { 'x-proxy-key': PROXY_KEY, 'x-user-id': userId },
+        })
+    } catch (e) {
+        console.warn('[coupang-context] proxy invalidation failed', e)
+    }
+}
@@ -0,0 +1,41 @@
+import { describe, it, expect } from "vitest";
+import { validateRegisterPayload } from "./coupang-register";
+
+describe("validateRegisterPayload", () => {
+  it("should accept a complete payload", () => {
+    expect(validateRegisterPayload({ productName: "Test Product", wholesalePrice: 10000, price: 15000 })).toEqual([]);
+  });
+
+  it("should read manual edits from overrides", () => {
+    expect(
+      validateRegisterPayload({ overrides: { productName: "수정 상품명", price: 15000, supplyPrice: 9000 } }),
+    ).toEqual([]);
+  });
+
+  it("should fall back past empty overrides like the register logic", () => {
+    expect(
+      validateRegisterPayload({ overrides: { productName: "", price: 0 }, productName: "Test Product", supplyPrice: 0, price: 15000 }),
+    ).toEqual([]);
+  });
+
+  describe("when required fields are missing (TC002)", () => {
+    it.each([
+      [{ wholesalePrice: 1000, price: 1500 }, ["productName"]],
+      [{ productName: "Test Product", price: 1500 }, ["wholesalePrice"]],
+      [{ productName: "Test Product", wholesalePrice: 1000 }, ["price"]],
+      [{ platform: "rocket" }, ["productName", "wholesalePrice", "price"]],
+    ])("should report %j", (payload, fields) => {
+      expect(validateRegisterPayload(payload)).toEqual(fields);
+    });
+  });
+
+  describe("when values are present but invalid", () => {
+    it("should reject a blank name and a non-positive price", () => {
+      expect(validateRegisterPayload({ productName: "  ", wholesalePrice: 0, price: 0 })).toEqual(["productName", "price"]);
+    });
+
+    it("should reject a non-object payload", () => {
+      expect(validateRegisterPayload(null)).toEqual(["productName", "wholesalePrice", "price"]);
+    });
+  });
+});
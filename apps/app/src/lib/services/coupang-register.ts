@@ -0,0 +1,418 @@
+// Single Coupang product registration (outbound/return place → product create → DB save).
+// Shared by /api/coupang/register and /api/coupang/register/bulk.
+import { prisma } from '@myapp/prisma'
+import { sanitizeDetailHtml } from '@myapp/utils/sanitizeHtml'
+import { aiService } from './ai'
+import { getCoupangContext } from './coupang-context'
+import { metricsService } from './metrics'
+import { vendorCache } from './vendor-cache'
+
+const PROXY_URL = process.env.COUPANG_PROXY_URL
+const PROXY_KEY = process.env.COUPANG_PROXY_KEY || ''
+
+const metrics = metricsService.forRoute('coupang_register')
+
+export interface RegisterResult {
+    status: number
+    body: any
+}
+
+const isNonNegativeNumber = (v: unknown) =>
+    v !== null && v !== undefined && v !== '' && Number.isFinite(Number(v)) && Number(v) >= 0
+
+// `a || b || c` as the register logic reads overrides/fields, but keeps an explicit 0 or '' when nothing is truthy
+const firstFilled = (...values: unknown[]) => values.find(Boolean) ?? values.find((v) => v !== null && v !== undefined)
+
+/**
+ * Required-field check for a register payload (same rules as TC002).
+ * Returns the names of missing/invalid fields; empty when the payload is valid.
+ */
+export function validateRegisterPayload(payload: any): string[] {
+    if (!payload || typeof payload !== 'object' || Array.isArray(payload)) return ['productName', 'wholesalePrice', 'price']
+    const errors: string[] = []
+    const productName = firstFilled(payload.overrides?.productName, payload.productName)
+    if (typeof productName !== 'string' || !productName.trim()) errors.push('productName')
+    const wholesalePrice = firstFilled(payload.overrides?.supplyPrice, payload.supplyPrice, payload.wholesalePrice)
+    if (!isNonNegativeNumber(wholesalePrice)) errors.push('wholesalePrice')
+    const price = firstFilled(payload.overrides?.price, payload.sellPrice, payload.price)
+    if (!(Number(price) > 0)) errors.push('price')
+    return errors
+}
+
+export async function registerCoupangProduct(userId: string, payload: any): Promise<RegisterResult> {
+    if (PROXY_URL) {
+        // Forward entire payload to proxy server
+        const endProxy = metrics.startSpan('proxy')
+        const res = await fetch(`${PROXY_URL}/api/coupang/register`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'x-proxy-key': PROXY_KEY,
+                'x-user-id': userId,
+            },
+            body: JSON.stringify(payload),
+        });
+        const json = await res.json();
+        endProxy()
+        return { status: res.status, body: json }
+    }
+
+    // Direct mode (local dev) - full registration logic
+    const ctx = await metrics.time('credentials', () => getCoupangContext(userId));
+    if (!ctx) {
+        return {
+            status: 400,
+            body: {
+                ok: false,
+                error: 'NO_CREDENTIALS',
+                message: '사용 중인 쿠팡 계정이 없습니다. 설정 페이지에서 사용할 계정을 선택해주세요.'
+            }
+        };
+    }
+
+    const { keys, service: coupangService, fetch: coupangFetch } = ctx;
+
+    const VENDOR_ID = keys.vendorId;
+    const USER_ID = keys.vendorUserId || userId;
+    const DEFAULT_CONTACT = '+821024843810'
+    const DEFAULT_ZIP = '00000'
+    const DEFAULT_ADDR = '주소 미입력'
+    const DEFAULT_ADDR_DETAIL = '상세주소 미입력'
+    const DEFAULT_RETURN_FEE = 5000
+    const FIXED_RETURN_NAME = process.env.COUPANG_RETURN_CHARGE_NAME || '로드'
+    const FIXED_RETURN_CONTACT = process.env.COUPANG_RETURN_CONTACT || DEFAULT_CONTACT
+    const FIXED_RETURN_ZIP = process.env.COUPANG_RETURN_ZIPCODE || DEFAULT_ZIP
+    const FIXED_RETURN_ADDR = process.env.COUPANG_RETURN_ADDRESS || DEFAULT_ADDR
+    const FIXED_RETURN_ADDR_DETAIL = process.env.COUPANG_RETURN_ADDRESS_DETAIL || DEFAULT_ADDR_DETAIL
+
+    function toE164(phone: string | undefined) {
+        if (!phone) return DEFAULT_CONTACT
+        const digits = phone.replace(/[^0-9]/g, '')
+        if (phone.startsWith('+')) return phone
+        if (digits.startsWith('82')) return `+${digits}`
+        if (digits.startsWith('0')) return `+82${digits.slice(1)}`
+        if (digits.length < 8) return DEFAULT_CONTACT
+        return `+82${digits}`
+    }
+
+    const supplier = payload?.supplier || {}
+    const supplierName = supplier.shippingPlaceName || supplier.supplierName || supplier.vendorName || supplier.name || payload?.supplierName || payload?.vendorName || ''
+    let supplierContact = supplier.supplierContact || supplier.contact || supplier.phone || supplier.tel || payload?.supplierContact || ''
+    let supplierAddress = supplier.supplierAddress || supplier.address || supplier.address1 || supplier.addr || payload?.supplierAddress || ''
+    let supplierAddressDetail = supplier.addressDetail || supplier.addrDetail || payload?.supplierAddressDetail || ''
+    let supplierZip = supplier.zipCode || supplier.zip || supplier.postCode || payload?.supplierZip || payload?.zipCode || ''
+    if (!supplierZip && supplierAddress) {
+        const m = supplierAddress.match(/\b(\d{5,6})\b/)
+        if (m) supplierZip = m[1]
+    }
+
+    const cleanedSupplierName = (() => {
+        let n = (supplierName || '').trim()
+        n = n.replace(/^\([^)]*\)\s*/, '').trim()
+        const parts = n.split(/\s+/)
+        if (parts.length > 1 && /^[a-z0-9_-]+$/i.test(parts[0])) n = parts.slice(1).join(' ').trim()
+        return n || supplierName
+    })()
+
+    const inboundName = payload?.shippingPlaceName
+    const isGenericName = (name?: string) => {
+        if (!name) return true
+        return ['기본출고지', '출고지', '기본반품지', '반품지'].includes(name.trim())
+    }
+    const shippingPlaceName = !isGenericName(inboundName) && inboundName?.trim()
+        ? inboundName.trim()
+        : cleanedSupplierName ? `${cleanedSupplierName}_출고지` : '출고지'
+    const returnPlaceName = FIXED_RETURN_NAME || (cleanedSupplierName ? `${cleanedSupplierName}_반품지` : '반품지')
+
+    const {
+        companyContactNumber = supplierContact || DEFAULT_CONTACT,
+        outboundZipCode = supplierZip || DEFAULT_ZIP,
+        outboundAddress = supplierAddress || DEFAULT_ADDR,
+        outboundAddressDetail = supplierAddressDetail || DEFAULT_ADDR_DETAIL,
+        returnZipCode = FIXED_RETURN_ZIP,
+        returnAddress = FIXED_RETURN_ADDR,
+        returnAddressDetail = FIXED_RETURN_ADDR_DETAIL,
+        remoteInfos = [],
+    } = payload || {}
+
+    const trimStr = (v: any) => (typeof v === 'string' ? v.trim() : '')
+    const safeOutboundZip = trimStr(outboundZipCode) || trimStr(supplierZip) || DEFAULT_ZIP
+    const safeOutboundAddr = trimStr(outboundAddress) || trimStr(supplierAddress) || DEFAULT_ADDR
+    const safeOutboundAddrDetail = trimStr(outboundAddressDetail) || trimStr(supplierAddressDetail) || DEFAULT_ADDR_DETAIL
+    const safeReturnZip = trimStr(FIXED_RETURN_ZIP) || DEFAULT_ZIP
+    const safeReturnAddr = trimStr(FIXED_RETURN_ADDR) || DEFAULT_ADDR
+    const safeReturnAddrDetail = trimStr(FIXED_RETURN_ADDR_DETAIL) || DEFAULT_ADDR_DETAIL
+
+    if (!shippingPlaceName || !safeOutboundAddr || !safeOutboundZip) {
+        return { status: 400, body: { ok: false, error: '출고지명/주소/우편번호가 비어 있습니다.' } }
+    }
+
+    const formattedPhone = toE164(companyContactNumber)
+    const normalizedReturnContact = toE164(FIXED_RETURN_CONTACT || companyContactNumber)
+
+    const outboundAddressObj = {
+        addressType: 'JIBUN', countryCode: 'KR',
+        companyContactNumber: formattedPhone, phoneNumber2: formattedPhone,
+        returnZipCode: safeOutboundZip, returnAddress: safeOutboundAddr, returnAddressDetail: safeOutboundAddrDetail,
+    }
+    const outboundPath = `/v2/providers/openapi/apis/api/v5/vendors/${VENDOR_ID}/outboundShippingCenters`
+    const outboundListPath = `/v2/providers/marketplace_openapi/apis/api/v2/vendor/shipping-place/outbound`
+    const returnPath = `/v2/providers/openapi/apis/api/v5/vendors/${VENDOR_ID}/returnShippingCenters`
+    const returnListPath = `/v2/providers/openapi/apis/api/v4/vendors/${VENDOR_ID}/returnShippingCenters`
+
+    const endShippingPlace = metrics.startSpan('shipping_place')
+    let outRes: any = { ok: false, status: 0 }
+    let outJson: any = {}
+    const outboundCacheKey = `outbound:${shippingPlaceName}`
+    try {
+        // 출고지/반품지는 벤더별로 거의 바뀌지 않으므로 캐시 (찾은 경우만 저장)
+        const outMatch: any = await vendorCache.get(VENDOR_ID, outboundCacheKey, async () => {
+            const { json: outListJson } = await coupangFetch('GET', outboundListPath, undefined, `pageNum=1&pageSize=50&placeNames=${encodeURIComponent(shippingPlaceName)}`)
+            return Array.isArray(outListJson?.content) ? outListJson.content.find((c: any) => c.shippingPlaceName === shippingPlaceName) || null : null
+        }, { shouldCache: (m: any) => !!m?.outboundShippingPlaceCode })
+        if (outMatch?.outboundShippingPlaceCode) {
+            outRes = { ok: true, status: 200 }
+            outJson = { code: 'EXIST', data: outMatch }
+        }
+    } catch (e) { console.error('[출고지-조회-에러]', e) }
+
+    if (!outRes.ok) {
+        const outboundBody = {
+            vendorId: VENDOR_ID, userId: USER_ID, shippingPlaceName, global: false, usable: true,
+            placeAddresses: [outboundAddressObj],
+            remoteInfos: remoteInfos.length > 0
+                ? remoteInfos.map((r: any) => ({ deliveryCode: r.deliveryCode || 'CJGLS', jeju: { amount: Number(r.jeju) || 0, currencyCode: 'KRW' }, notJeju: { amount: Number(r.notJeju) || 0, currencyCode: 'KRW' } }))
+                : [{ deliveryCode: 'CJGLS', jeju: { amount: 5000, currencyCode: 'KRW' }, notJeju: { amount: 2500, currencyCode: 'KRW' } }],
+        }
+        const outCreate = await coupangFetch('POST', outboundPath, outboundBody)
+        outRes = outCreate.res
+        outJson = outCreate.json
+        const createdCode = outJson?.data?.outboundShippingPlaceCode
+        if (outRes.ok && createdCode) {
+            vendorCache.set(VENDOR_ID, outboundCacheKey, { shippingPlaceName, outboundShippingPlaceCode: createdCode })
+        }
+    }
+    endShippingPlace()
+
+    let retRes: any = { ok: false, status: 0 }
+    let retJson: any = {}
+    const explicitReturnCode = payload.shipping?.returnCode
+    if (explicitReturnCode) {
+        retRes = { ok: true, status: 200 }
+        retJson = { code: 'SUCCESS', data: { returnCenterCode: explicitReturnCode, returnCenterId: explicitReturnCode } }
+    } else {
+        try {
+            const target: any = await metrics.time('return_center', () => vendorCache.get(VENDOR_ID, `return:${FIXED_RETURN_NAME}`, async () => {
+                const { json: listJson } = await coupangFetch('GET', returnListPath, undefined, 'pageNum=1&pageSize=50')
+                const list = Array.isArray(listJson?.data?.content) ? listJson.data.content : listJson?.content
+                return Array.isArray(list) ? list.find((c: any) => c.shippingPlaceName === FIXED_RETURN_NAME) || null : null
+            }, { shouldCache: (t: any) => !!t?.returnCenterCode }))
+            if (target?.returnCenterCode) {
+                retRes = { ok: true, status: 200 }
+                retJson = { code: 'EXIST', data: target }
+            } else {
+                return { status: 400, body: { ok: false, error: 'RETURN_CENTER_NOT_FOUND', message: `반품지(${FIXED_RETURN_NAME}) 코드가 없습니다.` } }
+            }
+        } catch (e) {
+            return { status: 500, body: { ok: false, error: 'RETURN_CENTER_LOOKUP_FAILED', detail: String(e) } }
+        }
+    }
+
+    let outboundShippingPlaceCode = outJson?.data?.outboundShippingPlaceCode || outJson?.data?.shippingPlaceId
+    if (!outboundShippingPlaceCode) {
+        try {
+            const { json: refetchJson } = await metrics.time('shipping_place_refetch', () => coupangFetch('GET', outboundListPath, undefined, `pageNum=1&pageSize=20&placeNames=${encodeURIComponent(shippingPlaceName)}`))
+            const listContent = refetchJson?.data?.content || refetchJson?.content
+            const match = Array.isArray(listContent) ? listContent.find((c: any) => c.shippingPlaceName === shippingPlaceName) : null
+            outboundShippingPlaceCode = match?.outboundShippingPlaceCode || match?.shippingPlaceId || outboundShippingPlaceCode
+            if (outboundShippingPlaceCode) {
+                outJson.data = outJson.data || {}; outJson.data.outboundShippingPlaceCode = outboundShippingPlaceCode; outRes.ok = true
+                vendorCache.set(VENDOR_ID, outboundCacheKey, { shippingPlaceName, outboundShippingPlaceCode })
+            }
+        } catch (e) { console.warn('[출고지-재조회-실패]', e) }
+    }
+    const returnCenterCode = retJson?.data?.returnCenterCode || retJson?.data?.returnCenterId
+
+    let productResult: any = null
+    let productName = payload.overrides?.productName || payload.productName
+    let sellPrice = payload.overrides?.price || payload.sellPrice || payload.price
+
+    const useAiPrompts = payload?.useAiPrompts || payload?.aiPrompts || payload?.aiOptimize
+    if (useAiPrompts) {
+        const endAi = metrics.startSpan('ai')
+        try {
+            const context = `[상품정보]\n- 상품명: ${productName}\n- 브랜드: ${payload.brand || '없음'}\n- 특징/옵션: ${JSON.stringify(payload.attributes || payload.options || {})}`
+            const meta = await aiService.generateProductMetadata(context)
+            if (meta?.optimizedName) productName = meta.optimizedName
+            const priceInput = {
+                totalCost: Number(payload.supplyPrice || payload.wholesalePrice || payload.cost || 0),
+                feeRate: Number(payload.feeRate || 10.9),
+                shippingCost: Number(payload.shippingCost || payload.deliveryCharge || 0),
+                adOnOff: Boolean(payload.adOnOff),
+                marketPrices: Array.isArray(payload.marketPrices) ? payload.marketPrices : [],
+                candidatePrices: Array.isArray(payload.candidatePrices) ? payload.candidatePrices : [Number(sellPrice || 0)],
+                unitCount: Number(payload.unitCount || payload.minOrderQuantity || 1)
+            }
+            const priceRec = await aiService.generatePriceRecommendation(priceInput)
+            if (priceRec?.recommendedPrice) sellPrice = priceRec.recommendedPrice
+        } catch (e) { console.warn('[AI skipped]', e) }
+        endAi()
+    }
+
+    if (!productName) {
+        return { status: 400, body: { ok: false, error: 'PRODUCT_NAME_MISSING' } }
+    }
+
+    if (productName && retRes.ok && outRes.ok) {
+        try {
+            if (!outboundShippingPlaceCode) throw new Error('출고지 코드 없음')
+            if (!returnCenterCode) throw new Error('반품지 코드 없음')
+
+            let mainImage = payload.overrides?.imageUrl || payload.mainImage || payload.imageUrl
+            if (!mainImage && Array.isArray(payload.detailImages) && payload.detailImages.length > 0) mainImage = payload.detailImages[0]
+
+            const getSafeVendorPath = (url: string | undefined | null) => {
+                if (!url) return null
+                if (url.length <= 200) return url
+                const noQuery = url.split('?')[0]
+                if (noQuery.length <= 200) return noQuery
+                return null
+            }
+
+            const images: any[] = []
+            let imgCount = 0
+            const safeMain = getSafeVendorPath(mainImage)
+            if (safeMain) images.push({ imageOrder: imgCount++, imageType: 'REPRESENTATION', vendorPath: safeMain })
+
+            const itemPrice = Number(sellPrice) || 0
+            const itemName = `${productName}_1`
+            const sanitizeSearchTags = (tags: any) => {
+                if (!Array.isArray(tags)) return []
+                return tags.map((t: any) => (typeof t === 'string' ? t.trim() : '')).filter((t: string) => t.length > 0).map((t: string) => (t.length > 20 ? t.slice(0, 20) : t)).slice(0, 20)
+            }
+            const normalizedSearchTags = sanitizeSearchTags(payload.keywords)
+
+            const buildFallbackHtml = () => {
+                const imgs: string[] = []
+                if (Array.isArray(payload.detailImages)) payload.detailImages.filter((v: string) => !!v).forEach((v: string) => imgs.push(v))
+                if (imgs.length === 0 && payload.mainImage) imgs.push(payload.mainImage)
+                if (imgs.length === 0) return `<div>${payload.productName || '상품 상세설명'}</div>`
+                return `<div><h3>${payload.productName || '상품 상세설명'}</h3>${imgs.slice(0, 10).map((src) => `<p><img src="${src}" style="max-width:100%;height:auto;" /></p>`).join('')}</div>`
+            }
+
+            const primaryOption = Array.isArray(payload.options) ? payload.options.find((o: any) => Array.isArray(o.values) && o.values.length > 0) : null
+            const baseItem = (optValue?: string) => ({
+                itemName: optValue ? `${payload.productName}_${optValue}` : itemName,
+                originalPrice: payload.overrides?.originalPrice || itemPrice,
+                salePrice: itemPrice,
+                maximumBuyCount: 99999, maximumBuyForPerson: 0, maximumBuyForPersonPeriod: 1, outboundShippingTimeDay: 2, unitCount: 1,
+                adultOnly: 'EVERYONE', taxType: 'TAX', parallelImported: 'NOT_PARALLEL_IMPORTED', overseasPurchased: 'NOT_OVERSEAS_PURCHASED',
+                pccNeeded: false, barcode: '', emptyBarcode: true, emptyBarcodeReason: '바코드 없음',
+                certifications: [{ certificationType: 'NOT_REQUIRED', certificationCode: '' }],
+                attributes: optValue
+                    ? [{ attributeTypeName: primaryOption?.name || primaryOption?.title || '옵션', attributeValueName: optValue, exposed: 'EXPOSED' }]
+                    : [{ attributeTypeName: '수량', attributeValueName: '1개' }],
+                notices: [], searchTags: normalizedSearchTags, images
+            })
+
+            const items = primaryOption ? primaryOption.values.slice(0, 50).map((v: string) => baseItem(v)) : [baseItem()]
+
+            let incomingCategory = (payload.categoryCode ?? payload.displayCategoryCode ?? '').toString().trim()
+            if (!incomingCategory || incomingCategory === 'undefined') {
+                try {
+                    const searchName = productName || payload.category
+                    if (searchName) {
+                        const predicted = await metrics.time('category_predict', () => coupangService.predictCategory({ productName: searchName }))
+                        if (predicted && predicted.predictedCategoryId) incomingCategory = predicted.predictedCategoryId
+                    }
+                } catch (e) { console.warn('[Category Prediction Failed]', e) }
+                if (!incomingCategory || incomingCategory === 'undefined') incomingCategory = '81283'
+            }
+
+            const normalizedReturnFee = Number(payload.deliveryChargeOnReturn ?? payload.returnCharge ?? DEFAULT_RETURN_FEE) || DEFAULT_RETURN_FEE
+            const saleStartIso = payload.saleStartedAt || new Date().toISOString().slice(0, 19)
+            const saleEndIso = payload.saleEndedAt || '2099-01-01T23:59:59'
+            const rawContentHtml = payload.detailHtml || payload.summary || buildFallbackHtml()
+            const endSanitize = metrics.startSpan('sanitize')
+            const contentHtml = sanitizeDetailHtml(rawContentHtml) || buildFallbackHtml()
+            endSanitize()
+
+            const fallbackNotices = [
+                { noticeCategoryName: '기타재화', noticeCategoryDetailName: '품명 및 모델명', content: payload.productName || '상품명 미기재' },
+                { noticeCategoryName: '기타재화', noticeCategoryDetailName: '법에 의한 인증·허가 등을 받았음을 확인할 수 있는 경우 그에 대한 사항', content: '해당사항없음' },
+                { noticeCategoryName: '기타재화', noticeCategoryDetailName: '제조국 또는 원산지', content: '상세페이지 참조' },
+                { noticeCategoryName: '기타재화', noticeCategoryDetailName: '제조자, 수입품의 경우 수입자를 함께 표기', content: payload.supplier?.supplierName || '상세페이지 참조' },
+                { noticeCategoryName: '기타재화', noticeCategoryDetailName: 'A/S 책임자와 전화번호', content: payload.companyContactNumber || FIXED_RETURN_CONTACT }
+            ]
+            const contentsForItem = [{ contentsType: 'TEXT', contentDetails: [{ content: contentHtml, detailType: 'TEXT' }] }]
+            items.forEach((it: any) => { it.notices = fallbackNotices; (it as any).contents = contentsForItem })
+
+            const productPayload = {
+                vendorId: VENDOR_ID, displayCategoryCode: incomingCategory,
+                sellerProductName: payload.originalProductName || payload.sellerProductName || productName,
+                displayProductName: productName, generalProductName: productName, brand: payload.brand || payload.productName,
+                saleStartedAt: saleStartIso, saleEndedAt: saleEndIso, deliveryMethod: 'SEQUENCIAL',
+                deliveryCompanyCode: payload.deliveryCompanyCode || 'KDEXP', deliveryChargeType: payload.deliveryChargeType || 'FREE',
+                deliveryCharge: payload.deliveryCharge ?? 0, freeShipOverAmount: payload.freeShipOverAmount ?? 0,
+                deliveryChargeOnReturn: normalizedReturnFee, returnCharge: Number(payload.returnCharge ?? normalizedReturnFee) || normalizedReturnFee,
+                remoteAreaDeliverable: payload.remoteAreaDeliverable || 'N', unionDeliveryType: payload.unionDeliveryType || 'UNION_DELIVERY',
+                returnCenterCode, returnChargeName: payload.returnChargeName || returnPlaceName,
+                companyContactNumber: FIXED_RETURN_CONTACT, returnZipCode: safeReturnZip, returnAddress: safeReturnAddr, returnAddressDetail: safeReturnAddrDetail,
+                outboundShippingPlaceCode: payload.outboundShippingPlaceCode || outboundShippingPlaceCode,
+                vendorUserId: USER_ID, requested: true, items, images, contents: contentsForItem, notices: []
+            }
+
+            const productPath = '/v2/providers/seller_api/apis/api/v1/marketplace/seller-products'
+            const { res: prodRes, json: prodJson } = await metrics.time('coupang_product', () => coupangFetch('POST', productPath, productPayload))
+            productResult = { status: prodRes.status, body: prodJson }
+
+            if (prodRes.ok && (prodJson.code === 'SUCCESS' || prodJson.data?.content?.code === 'SUCCESS')) {
+                const endPersist = metrics.startSpan('persist')
+                try {
+                    const pName = payload.overrides?.productName || payload.productName || 'Unknown'
+                    const pPrice = Number(payload.overrides?.price || payload.sellPrice || payload.price || 0)
+                    const pSupplyPrice = Number(payload.overrides?.supplyPrice || payload.supplyPrice || 0)
+                    const pOriginalPrice = Number(payload.overrides?.originalPrice || pPrice)
+                    const pCategory = String(incomingCategory || '81283')
+                    const pImage = mainImage || ''
+
+                    // product + registration in one nested create (single transaction)
+                    await prisma.product.create({
+                        data: {
+                            name: pName, wholesalePrice: pSupplyPrice, recommendedPrice: pOriginalPrice,
+                            margin: 0, competition: 'Coupang', searchVolume: 0, category: pCategory,
+                            image: pImage, source: 'Domeggook', trend: 'New', score: 80, userId: userId || undefined,
+                            registrations: {
+                                create: {
+                                    productName: pName, category: pCategory,
+                                    recommendedTitle: pName, price: pPrice, wholesalePrice: pSupplyPrice,
+                                    status: 'REGISTERED', platform: 'COUPANG', userId: userId || undefined,
+                                    sourceProductId: payload.sourceProductId || '', externalProductId: String(prodJson.data || ''),
+                                }
+                            },
+                        },
+                        select: { id: true },
+                    })
+                } catch (dbError) { console.error('[Persistence Failed]', dbError) }
+                endPersist()
+            }
+        } catch (err: any) {
+            console.error('[상품생성-에러]', err)
+            productResult = { error: err?.message || String(err) }
+        }
+    }
+
+    const isProductSuccess = productResult?.status === 200 && (productResult?.body?.code === 'SUCCESS' || productResult?.body?.data?.content?.code === 'SUCCESS')
+    const finalSuccess = outRes.ok && retRes.ok && isProductSuccess
+
+    return {
+        status: 200,
+        body: {
+            ok: finalSuccess, success: finalSuccess,
+            message: finalSuccess ? '상품이 성공적으로 등록되었습니다.' : `등록 실패: ${productResult?.error || productResult?.body?.message || '상세 결과 확인 필요'}`,
+            outbound: { success: outRes.ok, data: outJson, code: outboundShippingPlaceCode },
+            returnCenter: { success: retRes.ok, data: retJson, code: returnCenterCode },
+            coupang: productResult
+        }
+    }
+}
@@ -18,7 +18,7 @@ export class CoupangService {
             secretKey: (config.secretKey || process.env.COUPANG_SECRET_KEY || '').trim(),
             vendorId: (config.vendorId || process.env.COUPANG_VENDOR_ID || '').trim(),
             userId: (config.userId || process.env.COUPANG_VENDOR_USER_ID || '').trim(),
-            baseUrl: 'https://api-gateway.coupang.com',
+            baseUrl: process.env.COUPANG_API_BASE_URL || 'https://api-gateway.coupang.com',
             ...config,
         };
 
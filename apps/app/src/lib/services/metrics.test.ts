@@ -0,0 +1,70 @@
+import { describe, it, expect } from "vitest";
+import { MetricsService } from "./metrics";
+
+describe("MetricsService", () => {
+  describe("observe", () => {
+    it("should place samples into cumulative buckets", () => {
+      const metrics = new MetricsService([10, 100]);
+      metrics.observe("coupang_register", "credentials", 5);
+      metrics.observe("coupang_register", "credentials", 10);
+      metrics.observe("coupang_register", "credentials", 50);
+      metrics.observe("coupang_register", "credentials", 500);
+
+      const [h] = metrics.snapshot();
+      expect(h.buckets.map((b) => b.count)).toEqual([2, 3, 4]);
+      expect(h.buckets[2].le).toBe(Infinity);
+      expect(h.count).toBe(4);
+      expect(h.sum).toBe(565);
+    });
+
+    it("should keep one histogram per route and stage", () => {
+      const metrics = new MetricsService([10]);
+      metrics.observe("coupang_register", "ai", 1);
+      metrics.observe("analysis_pricing", "ai", 1);
+      metrics.observe("coupang_register", "ai", 1);
+
+      expect(metrics.snapshot().map((h) => [h.route, h.count])).toEqual([
+        ["coupang_register", 2],
+        ["analysis_pricing", 1],
+      ]);
+    });
+  });
+
+  describe("time", () => {
+    describe("when the wrapped call throws", () => {
+      it("should still record the span", async () => {
+        const metrics = new MetricsService();
+        await expect(
+          metrics.time("crawler_preview", "enrich", async () => {
+            throw new Error("boom");
+          }),
+        ).rejects.toThrow("boom");
+        expect(metrics.snapshot()[0].count).toBe(1);
+      });
+    });
+  });
+
+  describe("startSpan", () => {
+    it("should record only once when ended twice", () => {
+      const metrics = new MetricsService();
+      const end = metrics.startSpan("analysis_search", "crawl");
+      end();
+      end();
+      expect(metrics.snapshot()[0].count).toBe(1);
+    });
+  });
+
+  describe("toPrometheus", () => {
+    it("should export seconds with route and stage labels", () => {
+      const metrics = new MetricsService([100]);
+      metrics.observe("coupang_register", "total", 250);
+
+      const text = metrics.toPrometheus();
+      expect(text).toContain("# TYPE selpix_stage_duration_seconds histogram");
+      expect(text).toContain('selpix_stage_duration_seconds_bucket{route="coupang_register",stage="total",le="0.1"} 0');
+      expect(text).toContain('selpix_stage_duration_seconds_bucket{route="coupang_register",stage="total",le="+Inf"} 1');
+      expect(text).toContain('selpix_stage_duration_seconds_sum{route="coupang_register",stage="total"} 0.25');
+      expect(text).toContain('selpix_stage_duration_seconds_count{route="coupang_register",stage="total"} 1');
+    });
+  });
+});
@@ -0,0 +1,115 @@
+// Hot-path timing spans (route × stage histograms) exposed at /api/metrics
+// in Prometheus text format.
+
+// Upper bounds in milliseconds. Coupang / OpenAI round trips land in the 100ms–10s range.
+export const DEFAULT_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000];
+
+export interface HistogramSnapshot {
+    route: string;
+    stage: string;
+    buckets: { le: number; count: number }[]; // cumulative, last entry is +Inf
+    sum: number; // ms
+    count: number;
+}
+
+interface Histogram {
+    route: string;
+    stage: string;
+    counts: number[]; // per bucket (non-cumulative), last slot is +Inf
+    sum: number;
+    count: number;
+}
+
+const METRIC_NAME = 'selpix_stage_duration_seconds';
+
+const escapeLabel = (v: string) => v.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+export class MetricsService {
+    private histograms = new Map<string, Histogram>();
+
+    constructor(private readonly bucketsMs: number[] = DEFAULT_BUCKETS_MS) {}
+
+    observe(route: string, stage: string, ms: number) {
+        const key = `${route}\u0000${stage}`;
+        let h = this.histograms.get(key);
+        if (!h) {
+            h = { route, stage, counts: new Array(this.bucketsMs.length + 1).fill(0), sum: 0, count: 0 };
+            this.histograms.set(key, h);
+        }
+        let i = 0;
+        while (i < this.bucketsMs.length && ms > this.bucketsMs[i]) i++;
+        h.counts[i]++;
+        h.sum += ms;
+        h.count++;
+    }
+
+    /** Starts a span; the returned function records it and returns the elapsed ms. */
+    startSpan(route: string, stage: string) {
+        const start = performance.now();
+        let done = false;
+        return () => {
+            const ms = performance.now() - start;
+            if (!done) {
+                done = true;
+                this.observe(route, stage, ms);
+            }
+            return ms;
+        };
+    }
+
+    async time<T>(route: string, stage: string, fn: () => Promise<T> | T): Promise<T> {
+        const end = this.startSpan(route, stage);
+        try {
+            return await fn();
+        } finally {
+            end();
+        }
+    }
+
+    /** Binds a route name so handlers only pass the stage. */
+    forRoute(route: string) {
+        return {
+            startSpan: (stage: string) => this.startSpan(route, stage),
+            time: <T>(stage: string, fn: () => Promise<T> | T) => this.time(route, stage, fn),
+        };
+    }
+
+    snapshot(): HistogramSnapshot[] {
+        return [...this.histograms.values()].map((h) => {
+            let cumulative = 0;
+            const buckets = h.counts.map((c, i) => {
+                cumulative += c;
+                return { le: i < this.bucketsMs.length ? this.bucketsMs[i] : Infinity, count: cumulative };
+            });
+            return { route: h.route, stage: h.stage, buckets, sum: h.sum, count: h.count };
+        });
+    }
+
+    toPrometheus() {
+        const lines = [
+            `# HELP ${METRIC_NAME} Duration of hot-path stages per API route.`,
+            `# TYPE ${METRIC_NAME} histogram`,
+        ];
+        for (const h of this.snapshot()) {
+            const labels = `route="${escapeLabel(h.route)}",stage="${escapeLabel(h.stage)}"`;
+            for (const b of h.buckets) {
+                const le = b.le === Infinity ? '+Inf' : String(b.le / 1000);
+                lines.push(`${METRIC_NAME}_bucket{${labels},le="${le}"} ${b.count}`);
+            }
+            lines.push(`${METRIC_NAME}_sum{${labels}} ${h.sum / 1000}`);
+            lines.push(`${METRIC_NAME}_count{${labels}} ${h.count}`);
+        }
+        return lines.join('\n') + '\n';
+    }
+
+    reset() {
+        this.histograms.clear();
+    }
+}
+
+// Route modules can be bundled separately (and re-evaluated on HMR in dev),
+// so keep one registry per process.
+const globalForMetrics = globalThis as unknown as { metricsService?: MetricsService };
+
+export const metricsService = globalForMetrics.metricsService ?? new MetricsService();
+globalForMetrics.metricsService = metricsService;
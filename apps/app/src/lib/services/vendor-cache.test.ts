@@ -0,0 +1,138 @@
+import { describe, it, expect, vi } from "vitest";
+import { VendorCache } from "./vendor-cache";
+
+const makeCache = (options: { ttlMs?: number; staleMs?: number; maxEntries?: number } = {}) => {
+  let now = 0;
+  const cache = new VendorCache({ ttlMs: 1000, staleMs: 5000, ...options, now: () => now });
+  return { cache, advance: (ms: number) => { now += ms; } };
+};
+
+describe("VendorCache", () => {
+  describe("get", () => {
+    it("should call the loader once while the entry is fresh", async () => {
+      const { cache } = makeCache();
+      const loader = vi.fn().mockResolvedValue({ outboundShippingPlaceCode: 1 });
+
+      for (let i = 0; i < 50; i++) await cache.get("A001", "outbound:place", loader);
+
+      expect(loader).toHaveBeenCalledTimes(1);
+      expect(cache.stats()).toMatchObject({ hits: 49, misses: 1 });
+    });
+
+    it("should share one upstream call between concurrent misses", async () => {
+      const { cache } = makeCache();
+      const loader = vi.fn().mockResolvedValue("value");
+
+      await Promise.all([1, 2, 3].map(() => cache.get("A001", "return:list", loader)));
+
+      expect(loader).toHaveBeenCalledTimes(1);
+    });
+
+    it("should not cache values rejected by shouldCache", async () => {
+      const { cache } = makeCache();
+      const loader = vi.fn().mockResolvedValue(null);
+
+      await cache.get("A001", "outbound:place", loader, { shouldCache: (v) => v !== null });
+      await cache.get("A001", "outbound:place", loader, { shouldCache: (v) => v !== null });
+
+      expect(loader).toHaveBeenCalledTimes(2);
+    });
+
+    describe("when the entry is stale", () => {
+      it("should return the old value and refresh in the background", async () => {
+        const { cache, advance } = makeCache();
+        const loader = vi.fn().mockResolvedValueOnce("old").mockResolvedValueOnce("new");
+
+        await cache.get("A001", "return:list", loader);
+        advance(2000);
+
+        expect(await cache.get("A001", "return:list", loader)).toBe("old");
+        await Promise.resolve();
+        expect(loader).toHaveBeenCalledTimes(2);
+        expect(cache.peek("A001", "return:list")).toBe("new");
+        expect(cache.stats().staleHits).toBe(1);
+      });
+    });
+
+    describe("when the entry is past the stale window", () => {
+      it("should load again", async () => {
+        const { cache, advance } = makeCache();
+        const loader = vi.fn().mockResolvedValueOnce("old").mockResolvedValueOnce("new");
+
+        await cache.get("A001", "return:list", loader);
+        advance(10000);
+
+        expect(await cache.get("A001", "return:list", loader)).toBe("new");
+        expect(cache.stats().misses).toBe(2);
+      });
+    });
+  });
+
+  describe("resetStats", () => {
+    it("should zero the counters but keep the entries", async () => {
+      const { cache } = makeCache();
+      await cache.get("A001", "outbound", async () => "v");
+      await cache.get("A001", "outbound", async () => "v");
+
+      cache.resetStats();
+
+      expect(cache.stats()).toMatchObject({ hits: 0, misses: 0, size: 1 });
+      expect(cache.peek("A001", "outbound")).toBe("v");
+    });
+  });
+
+  describe("LRU eviction", () => {
+    it("should evict the least recently used entry", async () => {
+      const { cache } = makeCache({ maxEntries: 2 });
+      cache.set("A001", "a", 1);
+      cache.set("A001", "b", 2);
+      await cache.get("A001", "a", async () => 0);
+      cache.set("A001", "c", 3);
+
+      expect(cache.peek("A001", "a")).toBe(1);
+      expect(cache.peek("A001", "b")).toBeUndefined();
+      expect(cache.stats().evictions).toBe(1);
+    });
+  });
+
+  describe("invalidate", () => {
+    it("should drop only the given vendor's entries", () => {
+      const { cache } = makeCache();
+      cache.set("A001", "outbound:x", 1);
+      cache.set("A001", "return:list", 2);
+      cache.set("B002", "outbound:x", 3);
+
+      cache.invalidate("A001", "outbound:");
+      expect(cache.peek("A001", "outbound:x")).toBeUndefined();
+      expect(cache.peek("A001", "return:list")).toBe(2);
+
+      cache.invalidate("A001");
+      expect(cache.peek("A001", "return:list")).toBeUndefined();
+      expect(cache.peek("B002", "outbound:x")).toBe(3);
+    });
+
+    it("should not re-insert a value loaded before the invalidation", async () => {
+      const { cache } = makeCache();
+      let resolve!: (v: string) => void;
+      const pending = cache.get("A001", "outbound:x", () => new Promise<string>((r) => { resolve = r; }));
+
+      cache.invalidate("A001");
+      resolve("old-credentials");
+      await pending;
+
+      expect(cache.peek("A001", "outbound:x")).toBeUndefined();
+    });
+
+    it("should still cache other vendors' in-flight loads", async () => {
+      const { cache } = makeCache();
+      let resolve!: (v: string) => void;
+      const pending = cache.get("A001", "outbound:x", () => new Promise<string>((r) => { resolve = r; }));
+
+      cache.invalidate("B002");
+      resolve("credentials");
+      await pending;
+
+      expect(cache.peek("A001", "outbound:x")).toBe("credentials");
+    });
+  });
+});
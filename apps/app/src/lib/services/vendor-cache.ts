@@ -0,0 +1,188 @@
+// Per-vendor cache for Coupang lookups that rarely change (shipping places, return centers).
+// TTL + LRU eviction + stale-while-revalidate, with explicit invalidation per vendor.
+
+const DEFAULT_TTL_MS = Number(process.env.COUPANG_PLACE_CACHE_TTL_MS || 10 * 60 * 1000);
+const DEFAULT_STALE_MS = Number(process.env.COUPANG_PLACE_CACHE_STALE_MS || 60 * 60 * 1000);
+const DEFAULT_MAX_ENTRIES = 1000;
+
+interface Entry<T = unknown> {
+    value: T;
+    expiresAt: number; // fresh until
+    staleUntil: number; // served (and refreshed in background) until
+}
+
+export interface VendorCacheOptions {
+    ttlMs?: number;
+    staleMs?: number;
+    maxEntries?: number;
+    now?: () => number;
+}
+
+export interface CacheGetOptions<T> {
+    ttlMs?: number;
+    /** Return false to skip caching a loaded value (e.g. "not found" or an error body). */
+    shouldCache?: (value: T) => boolean;
+}
+
+export interface VendorCacheStats {
+    hits: number;
+    misses: number;
+    staleHits: number;
+    refreshes: number;
+    refreshErrors: number;
+    evictions: number;
+    invalidations: number;
+    size: number;
+}
+
+export class VendorCache {
+    private entries = new Map<string, Entry>(); // Map keeps insertion order → oldest first for LRU
+    private inflight = new Map<string, Promise<unknown>>();
+    // bumped on invalidation so in-flight loads don't re-insert old data; per vendor, so
+    // invalidating one vendor doesn't stop other vendors' loads from being cached
+    private epochs = new Map<string, number>();
+    private epoch = 0; // last epoch handed out; clear() bumps it for every vendor
+    private clearedAt = 0;
+    private readonly ttlMs: number;
+    private readonly staleMs: number;
+    private readonly maxEntries: number;
+    private readonly now: () => number;
+    private counters = { hits: 0, misses: 0, staleHits: 0, refreshes: 0, refreshErrors: 0, evictions: 0, invalidations: 0 };
+
+    constructor(options: VendorCacheOptions = {}) {
+        this.ttlMs = options.ttlMs ?? DEFAULT_TTL_MS;
+        this.staleMs = options.staleMs ?? DEFAULT_STALE_MS;
+        this.maxEntries = options.maxEntries ?? DEFAULT_MAX_ENTRIES;
+        this.now = options.now ?? Date.now;
+    }
+
+    private key(vendorId: string, resource: string) {
+        return `${vendorId}\u0000${resource}`;
+    }
+
+    async get<T>(vendorId: string, resource: string, loader: () => Promise<T>, options: CacheGetOptions<T> = {}): Promise<T> {
+        const key = this.key(vendorId, resource);
+        const entry = this.entries.get(key) as Entry<T> | undefined;
+        const now = this.now();
+
+        if (entry && now < entry.expiresAt) {
+            this.counters.hits++;
+            this.touch(key, entry);
+            return entry.value;
+        }
+
+        if (entry && now < entry.staleUntil) {
+            this.counters.staleHits++;
+            this.touch(key, entry);
+            if (!this.inflight.has(key)) {
+                this.counters.refreshes++;
+                this.load(vendorId, key, loader, options).catch((e) => {
+                    this.counters.refreshErrors++;
+                    console.warn('[vendor-cache] background refresh failed', resource, e);
+                });
+            }
+            return entry.value;
+        }
+
+        this.counters.misses++;
+        return this.load(vendorId, key, loader, options);
+    }
+
+    /** Concurrent misses for the same key share one upstream call. */
+    private load<T>(vendorId: string, key: string, loader: () => Promise<T>, options: CacheGetOptions<T>): Promise<T> {
+        const pending = this.inflight.get(key) as Promise<T> | undefined;
+        if (pending) return pending;
+
+        const epoch = this.epochs.get(vendorId) ?? 0;
+        const clearedAt = this.clearedAt;
+        const promise = loader()
+            .then((value) => {
+                const cacheable = !options.shouldCache || options.shouldCache(value);
+                const current = epoch === (this.epochs.get(vendorId) ?? 0) && clearedAt === this.clearedAt;
+                if (cacheable && current) this.store(key, value, options.ttlMs);
+                return value;
+            })
+            .finally(() => {
+                if (this.inflight.get(key) === promise) this.inflight.delete(key);
+            });
+        this.inflight.set(key, promise);
+        return promise;
+    }
+
+    set<T>(vendorId: string, resource: string, value: T, ttlMs?: number) {
+        this.store(this.key(vendorId, resource), value, ttlMs);
+    }
+
+    peek<T>(vendorId: string, resource: string): T | undefined {
+        return (this.entries.get(this.key(vendorId, resource)) as Entry<T> | undefined)?.value;
+    }
+
+    /** Drops every entry for the vendor, or only resources starting with `prefix`. */
+    invalidate(vendorId: string, prefix = '') {
+        const start = this.key(vendorId, prefix);
+        for (const key of [...this.entries.keys()]) {
+            if (key.startsWith(start)) this.entries.delete(key);
+        }
+        for (const key of [...this.inflight.keys()]) {
+            if (key.startsWith(start)) this.inflight.delete(key);
+        }
+        this.epochs.set(vendorId, ++this.epoch);
+        this.counters.invalidations++;
+    }
+
+    clear() {
+        this.entries.clear();
+        this.inflight.clear();
+        this.epochs.clear();
+        this.clearedAt = ++this.epoch;
+    }
+
+    stats(): VendorCacheStats {
+        return { ...this.counters, size: this.entries.size };
+    }
+
+    /** Zeroes the counters (DELETE /api/metrics); cached entries stay. */
+    resetStats() {
+        for (const key of Object.keys(this.counters) as (keyof typeof this.counters)[]) this.counters[key] = 0;
+    }
+
+    toPrometheus() {
+        const s = this.stats();
+        return [
+            '# HELP selpix_vendor_cache_lookups_total Per-vendor Coupang lookup cache results.',
+            '# TYPE selpix_vendor_cache_lookups_total counter',
+            `selpix_vendor_cache_lookups_total{result="hit"} ${s.hits}`,
+            `selpix_vendor_cache_lookups_total{result="stale"} ${s.staleHits}`,
+            `selpix_vendor_cache_lookups_total{result="miss"} ${s.misses}`,
+            '# TYPE selpix_vendor_cache_refresh_errors_total counter',
+            `selpix_vendor_cache_refresh_errors_total ${s.refreshErrors}`,
+            '# TYPE selpix_vendor_cache_evictions_total counter',
+            `selpix_vendor_cache_evictions_total ${s.evictions}`,
+            '# TYPE selpix_vendor_cache_invalidations_total counter',
+            `selpix_vendor_cache_invalidations_total ${s.invalidations}`,
+            '# TYPE selpix_vendor_cache_entries gauge',
+            `selpix_vendor_cache_entries ${s.size}`,
+        ].join('\n') + '\n';
+    }
+
+    private store(key: string, value: unknown, ttlMs = this.ttlMs) {
+        const now = this.now();
+        this.entries.delete(key);
+        this.entries.set(key, { value, expiresAt: now + ttlMs, staleUntil: now + ttlMs + this.staleMs });
+        while (this.entries.size > this.maxEntries) {
+            const oldest = this.entries.keys().next().value as string;
+            this.entries.delete(oldest);
+            this.counters.evictions++;
+        }
+    }
+
+    private touch(key: string, entry: Entry) {
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+    }
+}
+
+const globalForVendorCache = globalThis as unknown as { vendorCache?: VendorCache };
+
+export const vendorCache = globalForVendorCache.vendorCache ?? new VendorCache();
+globalForVendorCache.vendorCache = vendorCache;
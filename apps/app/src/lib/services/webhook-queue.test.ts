@@ -0,0 +1,91 @@
+import { describe, it, expect, vi } from "vitest";
+import { WebhookQueue, groupBatches, type WebhookJob } from "./webhook-queue";
+
+let nextId = 0;
+
+const job = (eventId: string, key = "sub:1", attempts = 1): WebhookJob => ({
+  id: ++nextId,
+  source: "lemonsqueezy",
+  eventId,
+  key,
+  name: "subscription_updated",
+  payload: { eventId },
+  attempts,
+  createdAt: new Date(),
+});
+
+// claimed rows per drain round, then an empty claim ends the drain
+const makeQueue = (...rounds: WebhookJob[][]) => {
+  const $queryRaw = vi.fn().mockResolvedValue([]);
+  for (const rows of rounds) $queryRaw.mockResolvedValueOnce(rows);
+  const db = {
+    $queryRaw,
+    webhookJob: {
+      createMany: vi.fn().mockResolvedValue({ count: 1 }),
+      updateMany: vi.fn().mockResolvedValue({ count: 1 }),
+      deleteMany: vi.fn().mockResolvedValue({ count: 0 }),
+    },
+  };
+  return { db, queue: new WebhookQueue({ db: db as any, retryBaseMs: 1000, maxAttempts: 3 }) };
+};
+
+describe("WebhookQueue", () => {
+  it("should report an event id that is already stored as a duplicate", async () => {
+    const { db, queue } = makeQueue();
+    db.webhookJob.createMany.mockResolvedValueOnce({ count: 1 }).mockResolvedValueOnce({ count: 0 });
+    const input = { source: "lemonsqueezy", eventId: "evt_1", key: "sub:1", name: "subscription_updated", payload: {} };
+
+    expect(await queue.enqueue(input)).toEqual({ queued: true });
+    expect(await queue.enqueue(input)).toEqual({ queued: false, reason: "duplicate" });
+    expect(db.webhookJob.createMany.mock.calls[0][0]).toMatchObject({ skipDuplicates: true });
+  });
+
+  it("should not claim anything before a handler is registered", async () => {
+    const { db, queue } = makeQueue([job("evt_1")]);
+
+    expect(await queue.drain()).toEqual({ batches: 0, processed: 0, retried: 0, failed: 0 });
+    expect(db.$queryRaw).toHaveBeenCalledTimes(0);
+  });
+
+  it("should hand every job claimed for a key to the handler in one batch", async () => {
+    const [a, b, c, d] = [job("evt_1"), job("evt_2"), job("evt_3", "sub:2"), job("evt_4")];
+    const { db, queue } = makeQueue([d, c, b, a]);
+    const batches: string[][] = [];
+    queue.register("lemonsqueezy", async (jobs) => {
+      batches.push(jobs.map((j) => j.eventId));
+    });
+
+    expect(await queue.drain()).toEqual({ batches: 2, processed: 4, retried: 0, failed: 0 });
+    expect(batches).toEqual([["evt_1", "evt_2", "evt_4"], ["evt_3"]]);
+    expect(db.webhookJob.updateMany.mock.calls[0][0]).toEqual({
+      where: { id: { in: [a.id, b.id, d.id] } },
+      data: { status: "DONE", lockedUntil: null, lastError: null },
+    });
+  });
+
+  it("should schedule a failed batch with backoff and park it after maxAttempts", async () => {
+    const { db, queue } = makeQueue([job("evt_1", "sub:1", 2)], [job("evt_2", "sub:2", 3)]);
+    queue.register("lemonsqueezy", vi.fn().mockRejectedValue(new Error("Plan not found")));
+    vi.spyOn(console, "warn").mockImplementation(() => {});
+    vi.spyOn(console, "error").mockImplementation(() => {});
+    const before = Date.now();
+
+    expect(await queue.drain()).toEqual({ batches: 2, processed: 0, retried: 1, failed: 1 });
+    const [retry, park] = db.webhookJob.updateMany.mock.calls.map((call: any[]) => call[0].data);
+    expect(retry).toMatchObject({ lockedUntil: null, lastError: "Plan not found" });
+    expect(retry.nextAttemptAt.getTime()).toBeGreaterThanOrEqual(before + 2000);
+    expect(park).toEqual({ status: "FAILED", lockedUntil: null, lastError: "Plan not found" });
+    vi.restoreAllMocks();
+  });
+
+  it("should group claimed rows by source and key in arrival order", () => {
+    const first = job("evt_1");
+    const other = { ...job("evt_2"), source: "clerk" };
+    const second = job("evt_3");
+
+    expect(groupBatches([second, other, first]).map((jobs) => jobs.map((j) => j.eventId))).toEqual([
+      ["evt_1", "evt_3"],
+      ["evt_2"],
+    ]);
+  });
+});
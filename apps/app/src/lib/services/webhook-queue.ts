@@ -0,0 +1,228 @@
+// Webhook event queue (LemonSqueezy, Clerk) kept in Postgres (WebhookJob).
+// The route verifies the signature, inserts the event and acks; the rows are drained by after() in the
+// same invocation and by the /api/cron/webhooks sweep, so nothing depends on a long-lived process or local disk.
+// - dedup by (source, event id) at insert (unique index, ON CONFLICT DO NOTHING)
+// - jobs sharing a key (one subscription, one user) run in arrival order, one batch at a time:
+//   a worker claims the oldest pending row of each key with FOR UPDATE SKIP LOCKED and leases every
+//   pending row of that key; the handler receives them all so it can coalesce them
+// - failed batches retry with exponential backoff (nextAttemptAt), then are parked as FAILED;
+//   a batch whose worker died is picked up again once its lease runs out
+
+import { Prisma, prisma } from '@myapp/prisma';
+
+const DEFAULT_CONCURRENCY = Number(process.env.WEBHOOK_QUEUE_CONCURRENCY || 4);
+const DEFAULT_MAX_ATTEMPTS = Number(process.env.WEBHOOK_QUEUE_MAX_ATTEMPTS || 5);
+const DEFAULT_RETRY_BASE_MS = Number(process.env.WEBHOOK_QUEUE_RETRY_BASE_MS || 30 * 1000);
+const DEFAULT_LEASE_MS = 5 * 60 * 1000; // longer than any route's maxDuration
+const DEFAULT_RETENTION_MS = 7 * 24 * 60 * 60 * 1000; // DONE rows kept this long (dedup window)
+
+// timestamp(3) columns hold UTC (as Prisma writes them); compare in UTC whatever the session time zone
+const NOW = Prisma.raw(`(now() AT TIME ZONE 'UTC')`);
+
+export interface WebhookJob<T = unknown> {
+    id: number;
+    source: string; // handler name, e.g. "lemonsqueezy"
+    eventId: string; // provider event id (dedup)
+    key: string; // ordering / coalescing key, e.g. "sub:123"
+    name: string; // event name, for logs
+    payload: T;
+    attempts: number; // including the current one
+    createdAt: Date;
+}
+
+export type EnqueueInput<T = unknown> = Pick<WebhookJob<T>, 'source' | 'eventId' | 'key' | 'name' | 'payload'>;
+
+export type EnqueueResult = { queued: true } | { queued: false; reason: 'duplicate' };
+
+/** Receives all jobs queued for one key, oldest first. Throwing retries the whole batch. */
+export type WebhookHandler = (jobs: WebhookJob[]) => Promise<void>;
+
+type QueueClient = Pick<typeof prisma, '$queryRaw' | 'webhookJob'>;
+
+export interface WebhookQueueOptions {
+    db?: QueueClient;
+    /** keys claimed (batches run in parallel) per round */
+    concurrency?: number;
+    maxAttempts?: number;
+    retryBaseMs?: number;
+    leaseMs?: number;
+}
+
+export interface DrainResult {
+    batches: number;
+    processed: number;
+    retried: number;
+    failed: number;
+}
+
+export interface WebhookQueueStats {
+    queued: number; // rows kept (pending + running + processed + failed)
+    pending: number;
+    running: number;
+    processed: number;
+    failed: number;
+    retries: number;
+}
+
+export class WebhookQueue {
+    private handlers = new Map<string, WebhookHandler>();
+    private readonly db: QueueClient;
+    private readonly concurrency: number;
+    private readonly maxAttempts: number;
+    private readonly retryBaseMs: number;
+    private readonly leaseMs: number;
+
+    constructor(options: WebhookQueueOptions = {}) {
+        this.db = options.db ?? prisma;
+        this.concurrency = Math.max(1, options.concurrency ?? DEFAULT_CONCURRENCY);
+        this.maxAttempts = Math.max(1, options.maxAttempts ?? DEFAULT_MAX_ATTEMPTS);
+        this.retryBaseMs = options.retryBaseMs ?? DEFAULT_RETRY_BASE_MS;
+        this.leaseMs = options.leaseMs ?? DEFAULT_LEASE_MS;
+    }
+
+    /** Only sources with a handler are claimed by drain(). */
+    register(source: string, handler: WebhookHandler) {
+        this.handlers.set(source, handler);
+    }
+
+    async enqueue<T>(input: EnqueueInput<T>): Promise<EnqueueResult> {
+        const { count } = await this.db.webhookJob.createMany({
+            data: [{ ...input, payload: input.payload as Prisma.InputJsonValue }],
+            skipDuplicates: true,
+        });
+        return count ? { queued: true } : { queued: false, reason: 'duplicate' };
+    }
+
+    /**
+     * Claims and runs due batches until none are left or `budgetMs` has passed.
+     * Retries scheduled in the future are left for a later drain (next webhook or the cron sweep).
+     */
+    async drain({ budgetMs = 20 * 1000 } = {}): Promise<DrainResult> {
+        const result: DrainResult = { batches: 0, processed: 0, retried: 0, failed: 0 };
+        const deadline = Date.now() + budgetMs;
+        while (Date.now() < deadline) {
+            const batches = await this.claim();
+            if (!batches.length) break;
+            const outcomes = await Promise.all(batches.map((jobs) => this.run(jobs)));
+            batches.forEach((jobs, i) => {
+                result.batches++;
+                result[outcomes[i]] += jobs.length;
+            });
+        }
+        return result;
+    }
+
+    async stats(): Promise<WebhookQueueStats> {
+        const [row] = await this.db.$queryRaw<WebhookQueueStats[]>(Prisma.sql`
+            SELECT
+                count(*)::int AS "queued",
+                count(*) FILTER (WHERE "status" = 'PENDING' AND ("lockedUntil" IS NULL OR "lockedUntil" <= ${NOW}))::int AS "pending",
+                count(*) FILTER (WHERE "status" = 'PENDING' AND "lockedUntil" > ${NOW})::int AS "running",
+                count(*) FILTER (WHERE "status" = 'DONE')::int AS "processed",
+                count(*) FILTER (WHERE "status" = 'FAILED')::int AS "failed",
+                COALESCE(sum(GREATEST("attempts" - 1, 0)), 0)::int AS "retries"
+            FROM "WebhookJob"`);
+        return row;
+    }
+
+    async toPrometheus() {
+        const s = await this.stats();
+        return [
+            '# HELP selpix_webhook_jobs Webhook jobs in the queue table by status.',
+            '# TYPE selpix_webhook_jobs gauge',
+            `selpix_webhook_jobs{status="pending"} ${s.pending}`,
+            `selpix_webhook_jobs{status="running"} ${s.running}`,
+            `selpix_webhook_jobs{status="processed"} ${s.processed}`,
+            `selpix_webhook_jobs{status="failed"} ${s.failed}`,
+            '# TYPE selpix_webhook_retries gauge',
+            `selpix_webhook_retries ${s.retries}`,
+        ].join('\n') + '\n';
+    }
+
+    /** Deletes processed rows older than the dedup window (cron sweep). */
+    async purge(retentionMs = DEFAULT_RETENTION_MS) {
+        const { count } = await this.db.webhookJob.deleteMany({
+            where: { status: 'DONE', updatedAt: { lt: new Date(Date.now() - retentionMs) } },
+        });
+        return count;
+    }
+
+    // ── worker ───────────────────────────────────────────────
+
+    /** Leases every pending row of up to `concurrency` due keys → batches, oldest first within a key. */
+    private async claim(): Promise<WebhookJob[][]> {
+        const sources = [...this.handlers.keys()];
+        if (!sources.length) return [];
+        const rows = await this.db.$queryRaw<WebhookJob[]>(Prisma.sql`
+            WITH heads AS (
+                SELECT h."source", h."key" FROM "WebhookJob" h
+                WHERE h."status" = 'PENDING'
+                  AND h."source" IN (${Prisma.join(sources)})
+                  AND h."nextAttemptAt" <= ${NOW}
+                  AND (h."lockedUntil" IS NULL OR h."lockedUntil" <= ${NOW})
+                  AND NOT EXISTS (
+                      SELECT 1 FROM "WebhookJob" o
+                      WHERE o."source" = h."source" AND o."key" = h."key" AND o."status" = 'PENDING' AND o."id" < h."id"
+                  )
+                ORDER BY h."id"
+                LIMIT ${this.concurrency}
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE "WebhookJob" j
+            SET "lockedUntil" = ${NOW} + ${this.leaseMs}::integer * interval '1 millisecond',
+                "attempts" = j."attempts" + 1,
+                "updatedAt" = ${NOW}
+            FROM heads
+            WHERE j."source" = heads."source" AND j."key" = heads."key" AND j."status" = 'PENDING'
+            RETURNING j."id", j."source", j."eventId", j."key", j."name", j."payload", j."attempts", j."createdAt"`);
+        return groupBatches(rows);
+    }
+
+    private async run(jobs: WebhookJob[]): Promise<'processed' | 'retried' | 'failed'> {
+        const { source, key } = jobs[0];
+        const where = { id: { in: jobs.map((job) => job.id) } };
+        try {
+            await this.handlers.get(source)!(jobs);
+            await this.db.webhookJob.updateMany({ where, data: { status: 'DONE', lockedUntil: null, lastError: null } });
+            return 'processed';
+        } catch (e) {
+            const message = e instanceof Error ? e.message : String(e);
+            const attempt = jobs[0].attempts; // the oldest row has been tried the most
+            if (attempt >= this.maxAttempts) {
+                console.error(`[webhook-queue] ${source} ${key}: giving up after ${attempt} attempts`, message);
+                await this.db.webhookJob.updateMany({
+                    where,
+                    data: { status: 'FAILED', lockedUntil: null, lastError: message },
+                });
+                return 'failed';
+            }
+            console.warn(`[webhook-queue] ${source} ${key}: attempt ${attempt} failed, retrying`, message);
+            await this.db.webhookJob.updateMany({
+                where,
+                data: {
+                    lockedUntil: null,
+                    lastError: message,
+                    nextAttemptAt: new Date(Date.now() + this.retryBaseMs * 2 ** (attempt - 1)),
+                },
+            });
+            return 'retried';
+        }
+    }
+}
+
+/** Claimed rows → one batch per (source, key), batches in order of their oldest row. */
+export function groupBatches(rows: WebhookJob[]): WebhookJob[][] {
+    const batches = new Map<string, WebhookJob[]>();
+    for (const row of [...rows].sort((a, b) => a.id - b.id)) {
+        const id = `${row.source}\u0000${row.key}`;
+        const jobs = batches.get(id);
+        if (jobs) jobs.push(row);
+        else batches.set(id, [row]);
+    }
+    return [...batches.values()];
+}
+
+const globalForWebhookQueue = globalThis as unknown as { webhookQueue?: WebhookQueue };
+
+export const webhookQueue = globalForWebhookQueue.webhookQueue ?? new WebhookQueue();
+globalForWebhookQueue.webhookQueue = webhookQueue;
@@ -6,6 +6,11 @@ import { NextResponse } from "next/server";
 const intlMiddleware = createMiddleware(routing);
 
 export default clerkMiddleware(async (auth, req) => {
+  // 마진 계산기 API 별칭 (/margin → /api/analysis/margin)
+  if (req.nextUrl.pathname === "/margin" && req.method === "POST") {
+    return NextResponse.rewrite(new URL("/api/analysis/margin", req.url));
+  }
+
   // API 경로는 별도 인증 방식 사용 (Clerk 인증 건너뛰기)
   if (
     req.nextUrl.pathname.startsWith("/api") ||
@@ -2,12 +2,33 @@ import { z } from "zod";
 import { createTRPCRouter, protectedProcedure } from "../trpc";
 
 export const productRouter = createTRPCRouter({
-    getAll: protectedProcedure.query(({ ctx }) => {
-        return ctx.prisma.product.findMany({
-            orderBy: { createdAt: "desc" },
-            take: 50,
-        });
-    }),
+    // keyset pagination for useInfiniteQuery: newest first, cursor = last id of the previous page
+    list: protectedProcedure
+        .input(
+            z.object({
+                limit: z.number().int().min(1).max(100).default(20),
+                cursor: z.number().int().nullish(),
+                category: z.string().optional(),
+            })
+        )
+        .query(async ({ ctx, input }) => {
+            const items = await ctx.prisma.product.findMany({
+                where: {
+                    userId: ctx.auth.userId,
+                    ...(input.category && { category: input.category }),
+                    ...(input.cursor && { id: { lt: input.cursor } }),
+                },
+                orderBy: { id: "desc" },
+                take: input.limit + 1,
+            });
+
+            let nextCursor: number | undefined;
+            if (items.length > input.limit) {
+                items.pop();
+                nextCursor = items[items.length - 1]!.id;
+            }
+            return { items, nextCursor };
+        }),
 
     getById: protectedProcedure
         .input(z.object({ id: z.number() }))
@@ -40,7 +61,7 @@ export const productRouter = createTRPCRouter({
         )
         .mutation(({ ctx, input }) => {
             return ctx.prisma.product.create({
-                data: input,
+                data: { ...input, userId: ctx.auth.userId },
             });
         }),
 
@@ -0,0 +1,45 @@
+-- "userId" on these tables was added to schema.prisma with `db push` and never migrated;
+-- add it here (no-op where it already exists) so the indexes below apply on a fresh database.
+ALTER TABLE "public"."Product" ADD COLUMN IF NOT EXISTS "userId" TEXT;
+ALTER TABLE "public"."WholesaleProduct" ADD COLUMN IF NOT EXISTS "userId" TEXT;
+ALTER TABLE "public"."WholesaleGroup" ADD COLUMN IF NOT EXISTS "userId" TEXT;
+ALTER TABLE "public"."Registration" ADD COLUMN IF NOT EXISTS "userId" TEXT;
+
+-- Backfill owners for rows written before "userId" existed, or the per-user lists (GET /api/products,
+-- product.list, /api/analysis/groups) would hide them: a product takes the owner of its latest registration,
+-- a group the owner of its crawled items. Rows with no owner to derive (never registered / never crawled
+-- by a signed-in user) keep NULL and stay out of the per-user lists; assign them by hand if they matter.
+UPDATE "public"."Product" p
+SET "userId" = r."userId"
+FROM (
+    SELECT DISTINCT ON ("productId") "productId", "userId"
+    FROM "public"."Registration"
+    WHERE "productId" IS NOT NULL AND "userId" IS NOT NULL
+    ORDER BY "productId", "id" DESC
+) r
+WHERE p."id" = r."productId" AND p."userId" IS NULL;
+
+UPDATE "public"."WholesaleGroup" g
+SET "userId" = w."userId"
+FROM (
+    SELECT DISTINCT ON ("wholesaleGroupId") "wholesaleGroupId", "userId"
+    FROM "public"."WholesaleProduct"
+    WHERE "userId" IS NOT NULL
+    ORDER BY "wholesaleGroupId", "id" DESC
+) w
+WHERE g."id" = w."wholesaleGroupId" AND g."userId" IS NULL;
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "Product_userId_id_idx" ON "public"."Product"("userId", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "Product_userId_category_id_idx" ON "public"."Product"("userId", "category", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "WholesaleProduct_wholesaleGroupId_id_idx" ON "public"."WholesaleProduct"("wholesaleGroupId", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "WholesaleGroup_userId_id_idx" ON "public"."WholesaleGroup"("userId", "id");
+
+-- CreateIndex
+CREATE INDEX IF NOT EXISTS "Registration_productId_id_idx" ON "public"."Registration"("productId", "id");
@@ -0,0 +1,30 @@
+-- CreateEnum
+CREATE TYPE "public"."WebhookJobStatus" AS ENUM ('PENDING', 'DONE', 'FAILED');
+
+-- CreateTable
+CREATE TABLE "public"."WebhookJob" (
+    "id" SERIAL NOT NULL,
+    "source" TEXT NOT NULL,
+    "eventId" TEXT NOT NULL,
+    "key" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+    "payload" JSONB NOT NULL,
+    "status" "public"."WebhookJobStatus" NOT NULL DEFAULT 'PENDING',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "nextAttemptAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "lockedUntil" TIMESTAMP(3),
+    "lastError" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "WebhookJob_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "WebhookJob_source_eventId_key" ON "public"."WebhookJob"("source", "eventId");
+
+-- CreateIndex
+CREATE INDEX "WebhookJob_status_nextAttemptAt_idx" ON "public"."WebhookJob"("status", "nextAttemptAt");
+
+-- CreateIndex
+CREATE INDEX "WebhookJob_source_key_id_idx" ON "public"."WebhookJob"("source", "key", "id");
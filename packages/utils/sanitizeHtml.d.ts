@@ -0,0 +1,8 @@
+export declare const ALLOWED_TAGS: ReadonlySet<string>;
+export declare const ALLOWED_ATTRIBUTES: ReadonlySet<string>;
+
+/** Single-pass allowlist sanitize (newlines removed, not trimmed). */
+export declare function sanitizeHtml(html: string): string;
+
+/** Detail page HTML → safe single-line HTML ("" for empty input). */
+export declare function sanitizeDetailHtml(html?: string | null): string;
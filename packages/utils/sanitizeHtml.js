@@ -0,0 +1,299 @@
+// Allowlist HTML sanitizer for Coupang detail pages.
+//
+// One linear pass over the input: text is copied through, every tag is
+// tokenized (name + attributes) and re-serialized only if both the tag and the
+// attribute are on the allowlist. Everything else is dropped:
+//   - script/style/iframe/object/... are removed together with their content
+//   - unknown tags (html, body, form, input, ...) lose the tag, keep the text
+//   - on* handlers, data-* and any other unlisted attribute
+//   - href/src with a scheme other than http(s)/mailto/tel ("#" instead)
+//   - comments, doctype, processing instructions, stray "<" (escaped)
+// Newlines are removed and the result trimmed, as Coupang expects single-line
+// content.
+//
+// CommonJS on purpose: shared by the Next app (coupang-register.ts) and the
+// plain-Node proxy (proxy/server.js).
+//
+// CLI (used by testsprite_tests/TC003 for the fuzz corpus):
+//   node packages/utils/sanitizeHtml.js eval < input.json
+//   input {"inputs": ["<p>..</p>", ...]} -> {"outputs": [...], "allowedTags": [...], "allowedAttributes": [...]}
+
+const ALLOWED_TAGS = new Set([
+  "a", "abbr", "area", "article", "aside", "b", "big", "blockquote", "br",
+  "caption", "center", "cite", "code", "col", "colgroup", "dd", "del", "div",
+  "dl", "dt", "em", "figcaption", "figure", "font", "footer", "h1", "h2", "h3",
+  "h4", "h5", "h6", "header", "hr", "i", "img", "ins", "label", "li", "map",
+  "mark", "ol", "p", "pre", "q", "s", "section", "small", "span", "strike",
+  "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th", "thead", "tr",
+  "tt", "u", "ul", "wbr",
+]);
+
+const ALLOWED_ATTRIBUTES = new Set([
+  "align", "alt", "bgcolor", "border", "cellpadding", "cellspacing", "class",
+  "color", "colspan", "coords", "dir", "face", "height", "href", "hspace", "id",
+  "lang", "name", "rowspan", "shape", "size", "span", "src", "start", "style",
+  "target", "title", "type", "usemap", "valign", "vspace", "width",
+]);
+
+// Dropped together with everything up to the matching close tag (or the end
+// of the input when it is never closed, which is what a browser would do for
+// raw-text elements like <script>).
+const DROP_CONTENT_TAGS = new Set([
+  "applet", "frameset", "iframe", "math", "noembed", "noframes", "noscript",
+  "object", "script", "select", "style", "svg", "template", "textarea",
+  "title", "xmp",
+]);
+
+const URL_ATTRIBUTES = new Set(["href", "src"]);
+const SAFE_SCHEMES = new Set(["http", "https", "mailto", "tel"]);
+const UNSAFE_STYLE = /expression|javascript|vbscript|behavior|-moz-binding|@import|\\/i;
+const STYLE_SUSPECT = /[(\\@&]/;
+const NEWLINE = /[\r\n]/;
+const NEWLINES = /[\r\n]/g;
+const ATTRIBUTE_SPECIAL = /["<>\r\n]/;
+const ATTRIBUTE_ESCAPES = /["<>]/g;
+const ESCAPES = { "\"": "&quot;", "<": "&lt;", ">": "&gt;" };
+
+const NAMED_ENTITIES = { colon: ":", tab: "\t", newline: "\n", lpar: "(", rpar: ")", bsol: "\\" };
+
+// Entity-decode just enough to see what scheme/CSS a browser would see.
+function decodeAttribute(value) {
+  if (value.indexOf("&") === -1) return value;
+  return value.replace(/&(?:#x([0-9a-f]+)|#(\d+)|([a-z]+));?/gi, (m, hex, dec, named) => {
+    if (named) return NAMED_ENTITIES[named.toLowerCase()] ?? m;
+    const code = hex ? parseInt(hex, 16) : parseInt(dec, 10);
+    return code > 0 && code <= 0x10ffff ? String.fromCodePoint(code) : "";
+  });
+}
+
+const CLOSE_TAG_RE = new Map(
+  [...DROP_CONTENT_TAGS].map((name) => [name, new RegExp(`</${name}(?=[\\s/>]|$)`, "gi")])
+);
+
+// Index just past the matching close tag, or the end of the input.
+function skipPastClose(html, name, from) {
+  const re = CLOSE_TAG_RE.get(name);
+  re.lastIndex = from;
+  const m = re.exec(html);
+  if (!m) return html.length;
+  const end = html.indexOf(">", re.lastIndex);
+  return end === -1 ? html.length : end + 1;
+}
+
+function isSafeUrl(value, attr, tag) {
+  if (value.startsWith("https://") || value.startsWith("http://")) return true;
+  // Browsers ignore control chars and whitespace inside the scheme.
+  const url = decodeAttribute(value).replace(/[\u0000- \u007f]+/g, "").toLowerCase();
+  const scheme = /^([a-z][a-z0-9+.-]*):/.exec(url);
+  if (!scheme) return true; // relative or protocol-relative
+  if (SAFE_SCHEMES.has(scheme[1])) return true;
+  return tag === "img" && attr === "src" && url.startsWith("data:image/");
+}
+
+function isSafeAttribute(tag, attr, value) {
+  if (URL_ATTRIBUTES.has(attr)) return isSafeUrl(value, attr, tag);
+  // Every UNSAFE_STYLE construct needs "(", "\", "@" or an entity that decodes to one.
+  if (attr === "style") return !STYLE_SUSPECT.test(value) || !UNSAFE_STYLE.test(decodeAttribute(value));
+  return true;
+}
+
+function isSpace(c) {
+  return c === 32 || c === 9 || c === 10 || c === 12 || c === 13;
+}
+
+function isAsciiAlpha(c) {
+  return (c >= 65 && c <= 90) || (c >= 97 && c <= 122);
+}
+
+function indexOr(text, search, from, fallback) {
+  const at = text.indexOf(search, from);
+  return at === -1 ? fallback : at;
+}
+
+function stripNewlines(text) {
+  return NEWLINE.test(text) ? text.replace(NEWLINES, "") : text;
+}
+
+function escapeAttribute(value) {
+  return ATTRIBUTE_SPECIAL.test(value) ? stripNewlines(value).replace(ATTRIBUTE_ESCAPES, (c) => ESCAPES[c]) : value;
+}
+
+function lookupAttribute(raw) {
+  if (ALLOWED_ATTRIBUTES.has(raw)) return raw;
+  const name = raw.toLowerCase();
+  return ALLOWED_ATTRIBUTES.has(name) ? name : null;
+}
+
+// Attributes kept on the current tag: [name, value|null, ...] (reused between tags)
+const kept = [];
+let keptLength = 0;
+
+function keep(attr, value) {
+  kept[keptLength++] = attr;
+  kept[keptLength++] = value;
+}
+
+function serializeTag(name, selfClosing) {
+  let tag = `<${name}`;
+  for (let a = 0; a < keptLength; a += 2) {
+    tag += kept[a + 1] === null ? ` ${kept[a]}` : ` ${kept[a]}="${kept[a + 1]}"`;
+  }
+  return tag + (selfClosing ? " />" : ">");
+}
+
+/**
+ * Single left-to-right pass. Input that is already in the canonical safe form
+ * (allowed lower-case tags, one space before each allowed attribute, safe
+ * double-quoted values, no newlines) is not rebuilt: it is copied over in
+ * whole runs, and only the pieces that change are spliced in.
+ */
+function sanitizeHtml(html) {
+  const n = html.length;
+  let out = "";
+  let from = 0; // html[from, lt) is still to be copied as-is
+  let nl = -1; // next "\n" / "\r" at or after i (n when none left)
+  let cr = -1;
+  let i = 0;
+  while (i < n) {
+    let lt = html.indexOf("<", i);
+    if (lt === -1) lt = n;
+    if (nl < i) nl = indexOr(html, "\n", i, n);
+    if (cr < i) cr = indexOr(html, "\r", i, n);
+    if (nl < lt || cr < lt) {
+      out += html.slice(from, i) + html.slice(i, lt).replace(NEWLINES, "");
+      from = lt;
+    }
+    if (lt === n) break;
+    i = lt;
+    const c = html.charCodeAt(i + 1);
+    let replacement = "";
+
+    if (c === 33 || c === 63) {
+      // <!-- comment -->, <!doctype>, <![CDATA[ ]]>, <?xml ?> — never emitted
+      const comment = html.startsWith("<!--", i);
+      const close = comment ? html.indexOf("-->", i + 4) : html.indexOf(">", i + 2);
+      i = close === -1 ? n : close + (comment ? 3 : 1);
+    } else if (!isAsciiAlpha(html.charCodeAt(c === 47 ? i + 2 : i + 1))) {
+      replacement = "&lt;"; // not a tag for the browser either
+      i++;
+    } else {
+      const closing = c === 47;
+      const nameStart = closing ? i + 2 : i + 1;
+      let k = nameStart + 1;
+      while (k < n) {
+        const d = html.charCodeAt(k);
+        if (isSpace(d) || d === 47 || d === 62) break;
+        k++;
+      }
+      const raw = html.slice(nameStart, k);
+      const name = ALLOWED_TAGS.has(raw) ? raw : raw.toLowerCase();
+      const allowed = ALLOWED_TAGS.has(name);
+      const emit = allowed && !closing;
+      let verbatim = allowed && name === raw;
+
+      // Attributes are always tokenized (quotes decide where the tag ends),
+      // but only checked and kept for allowed tags.
+      keptLength = 0;
+      let tokenEnd = k; // end of the last name/attribute/"/"
+      let selfClosing = false;
+      let end = -1;
+      while (k < n) {
+        const d = html.charCodeAt(k);
+        if (d === 62) { // >
+          end = k + 1;
+          verbatim = verbatim && k === tokenEnd;
+          break;
+        }
+        if (isSpace(d)) {
+          k++;
+          continue;
+        }
+        if (d === 47) { // /
+          selfClosing = html.charCodeAt(k + 1) === 62;
+          verbatim = verbatim && selfClosing && !closing && k === tokenEnd + 1 && html.charCodeAt(tokenEnd) === 32;
+          tokenEnd = ++k;
+          continue;
+        }
+        const attrStart = k++;
+        while (k < n) {
+          const e = html.charCodeAt(k);
+          if (isSpace(e) || e === 47 || e === 62 || e === 61) break;
+          k++;
+        }
+        const attrRaw = emit ? html.slice(attrStart, k) : "";
+        const attr = emit ? lookupAttribute(attrRaw) : null;
+        verbatim = verbatim && attr === attrRaw && attrStart === tokenEnd + 1 && html.charCodeAt(tokenEnd) === 32;
+        const nameEnd = k;
+        while (k < n && isSpace(html.charCodeAt(k))) k++;
+        if (html.charCodeAt(k) !== 61) { // no value
+          if (attr) keep(attr, null);
+          tokenEnd = nameEnd;
+          continue;
+        }
+        verbatim = verbatim && k === nameEnd;
+        k++;
+        const valueAt = k;
+        while (k < n && isSpace(html.charCodeAt(k))) k++;
+        const q = html.charCodeAt(k);
+        let value;
+        if (q === 34 || q === 39) {
+          const close = html.indexOf(q === 34 ? "\"" : "'", k + 1);
+          if (close === -1) break; // input ends inside the value
+          if (attr) value = html.slice(k + 1, close);
+          verbatim = verbatim && q === 34 && k === valueAt;
+          k = close + 1;
+        } else {
+          const valueStart = k;
+          while (k < n && !isSpace(html.charCodeAt(k)) && html.charCodeAt(k) !== 62) k++;
+          if (attr) value = html.slice(valueStart, k);
+          verbatim = false;
+        }
+        tokenEnd = k;
+        if (!attr) continue;
+        if (isSafeAttribute(name, attr, value)) {
+          const escaped = escapeAttribute(value);
+          verbatim = verbatim && escaped === value;
+          keep(attr, escaped);
+        } else {
+          verbatim = false;
+          if (URL_ATTRIBUTES.has(attr)) keep(attr, "#");
+        }
+      }
+      if (end === -1) { // input ends inside the tag — a browser drops it too
+        out += html.slice(from, lt);
+        from = n;
+        break;
+      }
+      i = end;
+      if (verbatim) continue;
+      if (emit) replacement = serializeTag(name, selfClosing);
+      else if (allowed) replacement = `</${name}>`;
+      else if (!closing && !selfClosing && DROP_CONTENT_TAGS.has(name)) i = skipPastClose(html, name, i);
+    }
+    out += html.slice(from, lt) + replacement;
+    from = i;
+  }
+  return from === 0 ? html : from >= n ? out : out + html.slice(from);
+}
+
+/**
+ * Detail page HTML → safe single-line HTML ("" for empty input).
+ */
+function sanitizeDetailHtml(html) {
+  if (!html) return "";
+  return sanitizeHtml(String(html)).trim();
+}
+
+module.exports = { sanitizeDetailHtml, sanitizeHtml, ALLOWED_TAGS, ALLOWED_ATTRIBUTES };
+
+if (require.main === module) {
+  const [cmd] = process.argv.slice(2);
+  if (cmd === "eval") {
+    const input = JSON.parse(require("fs").readFileSync(0, "utf8"));
+    console.log(JSON.stringify({
+      outputs: (input.inputs || []).map(sanitizeDetailHtml),
+      allowedTags: [...ALLOWED_TAGS],
+      allowedAttributes: [...ALLOWED_ATTRIBUTES],
+    }));
+  }
+}
@@ -0,0 +1,65 @@
+/**
+ * 도매꾹 키워드 일괄 크롤링 CLI (crawler farm)
+ *
+ * 사용 예:
+ *   node crawl_batch.js --keywords 양말,장갑,우산 --pool 4
+ *   DOMEGGOOK_BASE_URL=http://127.0.0.1:8788 node crawl_batch.js --keywords a,b --pool 8 --host-rps 0 --json
+ *
+ * --json 이면 마지막 줄에 요약 JSON (testsprite_tests/crawler_bench.py 가 파싱)
+ */
+
+const { CrawlerService } = require('./crawler');
+
+function parseArgs(argv) {
+  const args = { keywords: [], pool: undefined, hostRps: undefined, pageMaxUses: undefined, json: false };
+  for (let i = 0; i < argv.length; i++) {
+    const a = argv[i];
+    if (a === '--keywords') args.keywords = argv[++i].split(',').map((s) => s.trim()).filter(Boolean);
+    else if (a === '--pool') args.pool = parseInt(argv[++i], 10);
+    else if (a === '--host-rps') args.hostRps = parseFloat(argv[++i]);
+    else if (a === '--page-max-uses') args.pageMaxUses = parseInt(argv[++i], 10);
+    else if (a === '--json') args.json = true;
+  }
+  return args;
+}
+
+(async () => {
+  const args = parseArgs(process.argv.slice(2));
+  if (args.keywords.length === 0) {
+    console.error('--keywords 가 필요합니다');
+    process.exit(1);
+  }
+  // 크롤러의 console.info 진행 로그 → stderr (stdout 은 요약 JSON 한 줄)
+  if (args.json) console.info = (...m) => console.error(...m);
+
+  const crawler = new CrawlerService({ poolSize: args.pool, hostRps: args.hostRps, pageMaxUses: args.pageMaxUses });
+  let exitCode = 0;
+  try {
+    // 브라우저 기동 비용은 측정에서 제외
+    await crawler.init();
+    const started = Date.now();
+    const results = await crawler.crawlKeywords(args.keywords);
+    const elapsedMs = Date.now() - started;
+    const items = results.reduce((sum, r) => sum + r.products.length, 0);
+    const summary = {
+      keywords: results.length,
+      pages: results.length,
+      items,
+      empty: results.filter((r) => r.products.length === 0).length,
+      elapsedMs,
+      pagesPerSec: results.length / Math.max(elapsedMs / 1000, 0.001),
+      pool: { size: crawler.pool.size, ...crawler.pool.stats },
+    };
+    if (args.json) console.log(JSON.stringify(summary));
+    else {
+      results.forEach((r) => console.log(`${r.keyword}: ${r.products.length}개`));
+      console.log(`\n${summary.pages}페이지 / ${items}개 상품, ${elapsedMs}ms (${summary.pagesPerSec.toFixed(2)} pages/s)`);
+    }
+  } catch (error) {
+    console.error('크롤링 실패:', error);
+    exitCode = 1;
+  } finally {
+    await crawler.close();
+  }
+  process.exit(exitCode);
+})();
@@ -1,6 +1,11 @@
 /**
  * Domeggook Crawler (Plain JS for proxy server)
  * Ported from apps/app/src/lib/services/crawler.ts
+ *
+ * Crawler farm: a bounded pool of warm browser contexts (one reusable page each),
+ * recycled after CRAWLER_PAGE_MAX_USES navigations or on error, with per-host
+ * rate limiting. Keyword search navigates straight to the search URL instead of
+ * typing into the main page form.
  */
 
 const puppeteer = require('puppeteer');
@@ -9,10 +14,125 @@ const cheerio = require('cheerio');
 const DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36';
 const HEADLESS_MODE = (process.env.PUPPETEER_HEADLESS ?? 'true').toLowerCase() !== 'false';
 const EXECUTABLE_PATH = process.env.PUPPETEER_EXECUTABLE_PATH;
+const DOMEGGOOK_BASE_URL = (process.env.DOMEGGOOK_BASE_URL || 'https://domeggook.com').replace(/\/+$/, '');
+const POOL_SIZE = parseInt(process.env.CRAWLER_POOL_SIZE || '4', 10);
+const PAGE_MAX_USES = parseInt(process.env.CRAWLER_PAGE_MAX_USES || '25', 10);
+const HOST_RPS = parseFloat(process.env.CRAWLER_HOST_RPS || '2');
+const SEARCH_RESULT_LIMIT = 30;
+const BLOCKED_RESOURCE_TYPES = ['font', 'media', 'imageset'];
+
+/**
+ * Per-host request spacing (rps <= 0 disables it).
+ * Reserves the next slot synchronously so concurrent callers queue up in order.
+ */
+class HostRateLimiter {
+  constructor(rps = HOST_RPS) {
+    this.interval = rps > 0 ? 1000 / rps : 0;
+    this.nextSlot = new Map();
+  }
+
+  async wait(url) {
+    if (!this.interval) return;
+    let host;
+    try { host = new URL(url).host; } catch (e) { return; }
+    const now = Date.now();
+    const slot = Math.max(now, this.nextSlot.get(host) || 0);
+    this.nextSlot.set(host, slot + this.interval);
+    if (slot > now) await new Promise((r) => setTimeout(r, slot - now));
+  }
+}
+
+/**
+ * Bounded pool of warm browser contexts. Each slot keeps one configured page that is
+ * reused across navigations; the page is replaced after `maxUses` navigations and the
+ * whole context is dropped when a job fails or the browser was relaunched.
+ */
+class PagePool {
+  constructor(getBrowser, { size = POOL_SIZE, maxUses = PAGE_MAX_USES, setupPage } = {}) {
+    this.getBrowser = getBrowser;
+    this.size = Math.max(1, size);
+    this.maxUses = Math.max(1, maxUses);
+    this.setupPage = setupPage;
+    this.slots = [];
+    this.idle = [];
+    this.waiters = [];
+    this.stats = { acquired: 0, pagesCreated: 0, contextsCreated: 0, recycled: 0 };
+  }
+
+  async acquire() {
+    let slot = this.idle.pop();
+    if (!slot && this.slots.length < this.size) {
+      slot = { browser: null, context: null, page: null, uses: 0 };
+      this.slots.push(slot);
+    }
+    if (!slot) slot = await new Promise((resolve) => this.waiters.push(resolve));
+    try {
+      await this.prepare(slot);
+    } catch (e) {
+      this.release(slot, true);
+      throw e;
+    }
+    this.stats.acquired++;
+    return slot;
+  }
+
+  async prepare(slot) {
+    const browser = await this.getBrowser();
+    if (slot.browser !== browser) {
+      slot.browser = browser;
+      slot.context = null;
+      slot.page = null;
+    }
+    if (!slot.context) {
+      slot.context = await browser.createBrowserContext();
+      this.stats.contextsCreated++;
+    }
+    if (!slot.page || slot.page.isClosed()) {
+      slot.page = await slot.context.newPage();
+      slot.uses = 0;
+      if (this.setupPage) await this.setupPage(slot.page);
+      this.stats.pagesCreated++;
+    }
+  }
+
+  release(slot, broken = false) {
+    slot.uses++;
+    if (broken || slot.uses >= this.maxUses) {
+      const { page, context } = slot;
+      slot.page = null;
+      slot.uses = 0;
+      if (broken) slot.context = null;
+      this.stats.recycled++;
+      if (page) page.close().catch(() => { });
+      if (broken && context) context.close().catch(() => { });
+    }
+    const waiter = this.waiters.shift();
+    if (waiter) waiter(slot);
+    else this.idle.push(slot);
+  }
+
+  async close() {
+    const contexts = this.slots.map((s) => s.context).filter(Boolean);
+    this.slots = [];
+    this.idle = [];
+    await Promise.all(contexts.map((c) => c.close().catch(() => { })));
+  }
+}
 
 class CrawlerService {
-  constructor() {
+  constructor(options = {}) {
     this.browser = null;
+    this.imageBlockedPages = new WeakSet();
+    this.limiter = new HostRateLimiter(options.hostRps ?? HOST_RPS);
+    this.pool = new PagePool(async () => {
+      await this.init();
+      if (!this.browser) throw new Error('Browser not initialized');
+      return this.browser;
+    }, {
+      size: options.poolSize ?? POOL_SIZE,
+      maxUses: options.pageMaxUses ?? PAGE_MAX_USES,
+      setupPage: (page) => this.setupPage(page),
+    });
   }
 
   async init() {
@@ -31,6 +151,7 @@ class CrawlerService {
   }
 
   async close() {
+    await this.pool.close();
     if (this.browser) { await this.browser.close(); this.browser = null; }
   }
 
@@ -38,11 +159,46 @@ class CrawlerService {
     await page.setRequestInterception(true);
     page.on('request', (req) => {
       const rt = req.resourceType();
-      if (['font', 'media', 'imageset'].includes(rt)) req.abort();
+      // Search result jobs only read <img> attributes (src/data-original), never the pixels.
+      if (BLOCKED_RESOURCE_TYPES.includes(rt) || (rt === 'image' && this.imageBlockedPages.has(page))) req.abort();
       else req.continue();
     });
   }
 
+  async setupPage(page) {
+    await page.setViewport({ width: 1280, height: 800 });
+    await page.setUserAgent(process.env.USER_AGENT || DEFAULT_USER_AGENT);
+    await this.optimizePage(page);
+  }
+
+  /**
+   * Runs fn(page) on a pooled page; a throwing job discards its context.
+   * `blockImages` aborts image requests for this job only (search result pages).
+   */
+  async withPage(fn, { blockImages = false } = {}) {
+    const slot = await this.pool.acquire();
+    let broken = false;
+    if (blockImages) this.imageBlockedPages.add(slot.page);
+    else this.imageBlockedPages.delete(slot.page);
+    try {
+      return await fn(slot.page);
+    } catch (e) {
+      broken = true;
+      throw e;
+    } finally {
+      this.pool.release(slot, broken);
+    }
+  }
+
+  async goto(page, url, options) {
+    await this.limiter.wait(url);
+    return page.goto(url, options);
+  }
+
+  searchUrl(keyword) {
+    return `${DOMEGGOOK_BASE_URL}/main/item/itemList.php?sw=${encodeURIComponent(keyword)}`;
+  }
+
   normalizeDomeggookUrl(url) {
     if (!url) return null;
     const trimmed = url.trim();
@@ -64,180 +220,180 @@ class CrawlerService {
 
   async crawlDomeggook(keyword, minPrice = 0, maxPrice = 1000000) {
     const products = [];
-    let page = null;
     try {
-      await this.init();
-      if (!this.browser) throw new Error('Browser not initialized');
-      page = await this.browser.newPage();
-      await page.setViewport({ width: 1280, height: 800 });
-      await page.setUserAgent(process.env.USER_AGENT || DEFAULT_USER_AGENT);
-      await this.optimizePage(page);
-      await page.goto('https://www.domeggook.com/main', { waitUntil: 'domcontentloaded', timeout: 30000 });
-      const inputSelector = '#searchWordForm, input[name="searchword"], input#searchWord';
-      await page.waitForSelector(inputSelector, { timeout: 10000 });
-      await page.type(inputSelector, keyword);
-      await Promise.all([
-        page.keyboard.press('Enter'),
-        page.waitForNavigation({ waitUntil: 'domcontentloaded', timeout: 60000 }),
-      ]);
-      try { await page.waitForSelector('ol.lItemList > li', { timeout: 15000 }); } catch (e) { }
-
-      const scraped = await page.evaluate((min, max, kw) => {
-        const items = document.querySelectorAll('ol.lItemList > li');
-        const results = [];
-        items.forEach((item) => {
-          if (results.length >= 30) return;
-          const titleEl = item.querySelector('a.title');
-          const priceEl = item.querySelector('div.amtqty.amtQtyMargin > div.amt > b');
-          const imgEl = item.querySelector('a.thumb img');
-          const unitQtyEl = item.querySelector('div.amtqty.amtQtyMargin .unitQty');
-          const shippingEl = item.querySelector('div.amtqty.amtQtyMargin .infoDeli');
-          const sellerEl = item.querySelector('.seller .nick a') || item.querySelector('a[href*="sf=id"]');
-          const name = titleEl?.textContent?.trim();
-          const priceText = priceEl?.textContent?.trim();
-          const supplierName = sellerEl ? sellerEl.textContent?.trim() : undefined;
-          const normalizePrice = (text) => { if (!text) return null; const n = parseInt(text.replace(/[^0-9]/g, ''), 10); return Number.isNaN(n) ? null : n; };
-          const numericPrice = normalizePrice(priceText);
-          if (!name || numericPrice === null) return;
-          if (numericPrice < min || numericPrice > max) return;
-          const rawHref = titleEl?.getAttribute('href') || '';
-          const sourceUrl = rawHref.startsWith('http') ? rawHref : `https://www.domeggook.com/${rawHref.replace(/^\/+/, '')}`;
-          const productNoMatch = sourceUrl.match(/(?:no=|itemno=|itemNo=)(\d{4,})/i);
-          let imageUrl = imgEl?.getAttribute('data-original') || imgEl?.getAttribute('data-src') || imgEl?.getAttribute('src') || null;
-          if (imageUrl && !imageUrl.startsWith('http')) imageUrl = `https://cdn1.domeggook.com/${imageUrl.replace(/^\/+/, '')}`;
-          results.push({
-            name, price: numericPrice, priceText, imageUrl, sourceUrl,
-            productNo: productNoMatch ? productNoMatch[1] : null,
-            shippingCost: normalizePrice(shippingEl?.textContent) || (shippingEl?.textContent?.includes('무료') ? 0 : 3000),
-            shippingText: shippingEl?.textContent?.trim() || null,
-            site: 'domeggook', category: kw, currency: 'KRW',
-            minOrderQuantity: normalizePrice(unitQtyEl?.textContent) || 1,
-            supplierName,
+      const scraped = await this.withPage(async (page) => {
+        await this.goto(page, this.searchUrl(keyword), { waitUntil: 'domcontentloaded', timeout: 30000 });
+        // The list is server-rendered; only wait when the container is not in the DOM yet.
+        if (!(await page.$('ol.lItemList'))) {
+          try { await page.waitForSelector('ol.lItemList > li', { timeout: 5000 }); } catch (e) { }
+        }
+
+        return page.evaluate((min, max, kw, limit) => {
+          const items = document.querySelectorAll('ol.lItemList > li');
+          const results = [];
+          items.forEach((item) => {
+            if (results.length >= limit) return;
+            const titleEl = item.querySelector('a.title');
+            const priceEl = item.querySelector('div.amtqty.amtQtyMargin > div.amt > b');
+            const imgEl = item.querySelector('a.thumb img');
+            const unitQtyEl = item.querySelector('div.amtqty.amtQtyMargin .unitQty');
+            const shippingEl = item.querySelector('div.amtqty.amtQtyMargin .infoDeli');
+            const sellerEl = item.querySelector('.seller .nick a') || item.querySelector('a[href*="sf=id"]');
+            const name = titleEl?.textContent?.trim();
+            const priceText = priceEl?.textContent?.trim();
+            const supplierName = sellerEl ? sellerEl.textContent?.trim() : undefined;
+            const normalizePrice = (text) => { if (!text) return null; const n = parseInt(text.replace(/[^0-9]/g, ''), 10); return Number.isNaN(n) ? null : n; };
+            const numericPrice = normalizePrice(priceText);
+            if (!name || numericPrice === null) return;
+            if (numericPrice < min || numericPrice > max) return;
+            const rawHref = titleEl?.getAttribute('href') || '';
+            const sourceUrl = rawHref.startsWith('http') ? rawHref : `https://www.domeggook.com/${rawHref.replace(/^\/+/, '')}`;
+            const productNoMatch = sourceUrl.match(/(?:no=|itemno=|itemNo=)(\d{4,})/i);
+            let imageUrl = imgEl?.getAttribute('data-original') || imgEl?.getAttribute('data-src') || imgEl?.getAttribute('src') || null;
+            if (imageUrl && !imageUrl.startsWith('http')) imageUrl = `https://cdn1.domeggook.com/${imageUrl.replace(/^\/+/, '')}`;
+            results.push({
+              name, price: numericPrice, priceText, imageUrl, sourceUrl,
+              productNo: productNoMatch ? productNoMatch[1] : null,
+              shippingCost: normalizePrice(shippingEl?.textContent) || (shippingEl?.textContent?.includes('무료') ? 0 : 3000),
+              shippingText: shippingEl?.textContent?.trim() || null,
+              site: 'domeggook', category: kw, currency: 'KRW',
+              minOrderQuantity: normalizePrice(unitQtyEl?.textContent) || 1,
+              supplierName,
+            });
           });
-        });
-        return results;
-      }, minPrice, maxPrice, keyword);
+          return results;
+        }, minPrice, maxPrice, keyword, SEARCH_RESULT_LIMIT);
+      }, { blockImages: true });
       products.push(...scraped);
       console.info(`Domeggook crawl: ${keyword} -> ${products.length} items`);
     } catch (error) {
       console.error('Domeggook crawl failed:', error);
-    } finally {
-      if (page) await page.close();
     }
     return products;
   }
 
+  /**
+   * Crawls many keywords concurrently on the page pool.
+   * Returns [{ keyword, products }] in input order.
+   */
+  async crawlKeywords(keywords, minPrice = 0, maxPrice = 1000000, { concurrency = this.pool.size } = {}) {
+    const results = new Array(keywords.length);
+    let next = 0;
+    const worker = async () => {
+      while (next < keywords.length) {
+        const i = next++;
+        results[i] = { keyword: keywords[i], products: await this.crawlDomeggook(keywords[i], minPrice, maxPrice) };
+      }
+    };
+    await Promise.all(Array.from({ length: Math.max(1, Math.min(concurrency, keywords.length)) }, worker));
+    return results;
+  }
+
   async enrichDomeggookProduct(product) {
     if (!product?.sourceUrl) {
       return { ...product, detailImages: [], imageUsageText: null, imageUsageStatus: 'unknown' };
     }
-    let detailPage = null;
     try {
-      await this.init();
-      if (!this.browser) throw new Error('Browser not initialized');
-      detailPage = await this.browser.newPage();
-      await detailPage.setViewport({ width: 1280, height: 1600 });
-      await detailPage.setUserAgent(process.env.USER_AGENT || DEFAULT_USER_AGENT);
-      await this.optimizePage(detailPage);
-      await detailPage.goto(product.sourceUrl, { waitUntil: 'domcontentloaded', timeout: 30000 });
-      try { await detailPage.waitForSelector('#lInfoViewItemContents', { timeout: 10000 }); } catch (e) { }
-
-      const containerHtml = await detailPage.$eval('#lInfoViewItemContents', (el) => el.innerHTML).catch(() => null);
-      const fullHtml = await detailPage.content();
-      const $full = cheerio.load(fullHtml);
-
-      let scrapedProductNo = null;
-      const infoHeaderRaw = $full('#lInfoHeader').text();
-      const noMatch = infoHeaderRaw.match(/상품번호\s*[:：]?\s*(\d+)/);
-      if (noMatch) scrapedProductNo = noMatch[1];
-      if (!scrapedProductNo || scrapedProductNo.length < 5) {
-        scrapedProductNo = product.productNo || this.extractDomeItemNo(fullHtml) || this.extractDomeItemNo(product.sourceUrl);
-      }
+      return await this.withPage((detailPage) => this.scrapeDomeggookDetail(detailPage, product));
+    } catch (error) {
+      console.warn(`Failed to enrich Domeggook product: ${error}`);
+      return product;
+    }
+  }
 
-      const thumbSrc = await detailPage.$eval('#lThumbImg', (img) => img.getAttribute('src')).catch(() => null);
-      const normalizedThumb = this.normalizeDomeggookUrl(thumbSrc);
-      const detailContent = this.extractDetailContent(containerHtml);
-      const imageUsageText = this.extractImageUsageText($full);
-      const supplierInfo = this.extractSupplierInfo($full);
-      const domItemNo = scrapedProductNo;
-
-      let options = this.extractOptionsFromDocument($full);
-      if ((!options || options.length === 0) && domItemNo && domItemNo.length >= 5) {
-        const popupOptions = await this.fetchOptionsFromPopup(domItemNo);
-        if (popupOptions.length) options = popupOptions;
-      }
+  async scrapeDomeggookDetail(detailPage, product) {
+    await this.goto(detailPage, product.sourceUrl, { waitUntil: 'domcontentloaded', timeout: 30000 });
+    try { await detailPage.waitForSelector('#lInfoViewItemContents', { timeout: 10000 }); } catch (e) { }
 
-      const fallbackDescription = `${product.site ? product.site.toUpperCase() : '도매'} 소싱 상품`;
-      const description = (detailContent.text || fallbackDescription || '').trim();
-      const detailImagesRaw = detailContent.images.length ? detailContent.images : this.extractDetailImagesFromDocument($full);
-      const detailImages = normalizedThumb ? [normalizedThumb, ...detailImagesRaw] : detailImagesRaw;
-      const primaryImage = product.imageUrl || normalizedThumb || null;
+    const containerHtml = await detailPage.$eval('#lInfoViewItemContents', (el) => el.innerHTML).catch(() => null);
+    const fullHtml = await detailPage.content();
+    const $full = cheerio.load(fullHtml);
 
-      let name = product.name;
-      let price = product.price;
-      if (!name || name === 'Unknown') {
-        name = $full('h1').text().trim() || $full('.lInfoTitle').text().trim() || $full('meta[property="og:title"]').attr('content') || '';
-      }
-      if (!price || price === 0) {
-        const priceText = $full('#lBaseAmtVal').text() || $full('.lInfoPrice .price strong').text() || $full('.lInfoPrice').text();
-        const numeric = parseInt(priceText.replace(/[^0-9]/g, ''), 10);
-        if (!isNaN(numeric)) price = numeric;
-      }
+    let scrapedProductNo = null;
+    const infoHeaderRaw = $full('#lInfoHeader').text();
+    const noMatch = infoHeaderRaw.match(/상품번호\s*[:：]?\s*(\d+)/);
+    if (noMatch) scrapedProductNo = noMatch[1];
+    if (!scrapedProductNo || scrapedProductNo.length < 5) {
+      scrapedProductNo = product.productNo || this.extractDomeItemNo(fullHtml) || this.extractDomeItemNo(product.sourceUrl);
+    }
 
-      const metaKeywords = $full('meta[name="keywords"]').attr('content');
-      const tags = metaKeywords ? metaKeywords.split(',').map((s) => s.trim()).filter(Boolean) : [];
+    const thumbSrc = await detailPage.$eval('#lThumbImg', (img) => img.getAttribute('src')).catch(() => null);
+    const normalizedThumb = this.normalizeDomeggookUrl(thumbSrc);
+    const detailContent = this.extractDetailContent(containerHtml);
+    const imageUsageText = this.extractImageUsageText($full);
+    const supplierInfo = this.extractSupplierInfo($full);
+    const domItemNo = scrapedProductNo;
 
-      let shippingCost = product.shippingCost;
-      let shippingText = product.shippingText;
-      if (shippingCost === undefined) {
-        const deliveryRow = $full('table.lTbl tr, table.lInfoViewTbl tr').filter((i, el) => {
-          const text = $full(el).text();
-          return text.includes('배송') || text.includes('택배');
-        });
-        const deliveryText = deliveryRow.text();
-        if (deliveryText.includes('무료')) { shippingCost = 0; shippingText = '무료배송'; }
-        else {
-          const costMatch = deliveryText.match(/([\d,]+)원/);
-          if (costMatch) { shippingCost = parseInt(costMatch[1].replace(/,/g, ''), 10); shippingText = `${shippingCost.toLocaleString()}원`; }
-          else { shippingCost = 3000; shippingText = '3,000원'; }
-        }
-      }
+    let options = this.extractOptionsFromDocument($full);
+    if ((!options || options.length === 0) && domItemNo && domItemNo.length >= 5) {
+      // Everything needed from the detail page has been read; reuse it for the popup
+      // instead of taking a second pooled page (which could wait on ourselves).
+      const popupOptions = await this.fetchOptionsFromPopup(domItemNo, detailPage);
+      if (popupOptions.length) options = popupOptions;
+    }
+
+    const fallbackDescription = `${product.site ? product.site.toUpperCase() : '도매'} 소싱 상품`;
+    const description = (detailContent.text || fallbackDescription || '').trim();
+    const detailImagesRaw = detailContent.images.length ? detailContent.images : this.extractDetailImagesFromDocument($full);
+    const detailImages = normalizedThumb ? [normalizedThumb, ...detailImagesRaw] : detailImagesRaw;
+    const primaryImage = product.imageUrl || normalizedThumb || null;
+
+    let name = product.name;
+    let price = product.price;
+    if (!name || name === 'Unknown') {
+      name = $full('h1').text().trim() || $full('.lInfoTitle').text().trim() || $full('meta[property="og:title"]').attr('content') || '';
+    }
+    if (!price || price === 0) {
+      const priceText = $full('#lBaseAmtVal').text() || $full('.lInfoPrice .price strong').text() || $full('.lInfoPrice').text();
+      const numeric = parseInt(priceText.replace(/[^0-9]/g, ''), 10);
+      if (!isNaN(numeric)) price = numeric;
+    }
+
+    const metaKeywords = $full('meta[name="keywords"]').attr('content');
+    const tags = metaKeywords ? metaKeywords.split(',').map((s) => s.trim()).filter(Boolean) : [];
 
-      let minOrderQuantity = product.minOrderQuantity || 1;
-      const moqRow = $full('table.lTbl tr, table.lInfoViewTbl tr').filter((i, el) => {
-        return $full(el).text().includes('최소구매수량') || $full(el).text().includes('구매수량');
+    let shippingCost = product.shippingCost;
+    let shippingText = product.shippingText;
+    if (shippingCost === undefined) {
+      const deliveryRow = $full('table.lTbl tr, table.lInfoViewTbl tr').filter((i, el) => {
+        const text = $full(el).text();
+        return text.includes('배송') || text.includes('택배');
       });
-      const moqMatch = moqRow.text().match(/(\d+)개/);
-      if (moqMatch) minOrderQuantity = parseInt(moqMatch[1], 10);
-
-      return {
-        ...product, name, price, shippingCost, shippingText, imageUrl: primaryImage, detailImages,
-        detailHtml: detailContent.html, detailText: detailContent.text, description, imageUsageText,
-        productNo: domItemNo || null,
-        optionPopupUrl: domItemNo ? `https://domeggook.com/main/popup/item/popup_itemOptionView.php?no=${domItemNo}&market=dome` : null,
-        options, tags,
-        supplierName: supplierInfo.supplierName, supplierContact: supplierInfo.supplierContact,
-        supplierEmail: supplierInfo.supplierEmail, supplierAddress: supplierInfo.supplierAddress,
-        supplierBizNo: supplierInfo.supplierBizNo,
-      };
-    } catch (error) {
-      console.warn(`Failed to enrich Domeggook product: ${error}`);
-      return product;
-    } finally {
-      if (detailPage) await detailPage.close();
+      const deliveryText = deliveryRow.text();
+      if (deliveryText.includes('무료')) { shippingCost = 0; shippingText = '무료배송'; }
+      else {
+        const costMatch = deliveryText.match(/([\d,]+)원/);
+        if (costMatch) { shippingCost = parseInt(costMatch[1].replace(/,/g, ''), 10); shippingText = `${shippingCost.toLocaleString()}원`; }
+        else { shippingCost = 3000; shippingText = '3,000원'; }
+      }
     }
+
+    let minOrderQuantity = product.minOrderQuantity || 1;
+    const moqRow = $full('table.lTbl tr, table.lInfoViewTbl tr').filter((i, el) => {
+      return $full(el).text().includes('최소구매수량') || $full(el).text().includes('구매수량');
+    });
+    const moqMatch = moqRow.text().match(/(\d+)개/);
+    if (moqMatch) minOrderQuantity = parseInt(moqMatch[1], 10);
+
+    return {
+      ...product, name, price, shippingCost, shippingText, imageUrl: primaryImage, detailImages,
+      detailHtml: detailContent.html, detailText: detailContent.text, description, imageUsageText,
+      productNo: domItemNo || null,
+      optionPopupUrl: domItemNo ? `https://domeggook.com/main/popup/item/popup_itemOptionView.php?no=${domItemNo}&market=dome` : null,
+      options, tags,
+      supplierName: supplierInfo.supplierName, supplierContact: supplierInfo.supplierContact,
+      supplierEmail: supplierInfo.supplierEmail, supplierAddress: supplierInfo.supplierAddress,
+      supplierBizNo: supplierInfo.supplierBizNo,
+    };
   }
 
-  async fetchOptionsFromPopup(productNo) {
+  /** Reads the option popup on `page`, or on a pooled page when none is given. */
+  async fetchOptionsFromPopup(productNo, page = null) {
     if (!productNo) return [];
-    let page = null;
+    if (!page) return this.withPage((pooled) => this.fetchOptionsFromPopup(productNo, pooled)).catch(() => []);
     try {
-      await this.init();
-      if (!this.browser) return [];
-      page = await this.browser.newPage();
-      await this.optimizePage(page);
-      const popupUrl = `https://domeggook.com/main/popup/item/popup_itemOptionView.php?no=${productNo}&market=dome`;
-      try { await page.goto(popupUrl, { waitUntil: 'domcontentloaded', timeout: 8000 }); } catch (e) { }
+      const popupUrl = `${DOMEGGOOK_BASE_URL}/main/popup/item/popup_itemOptionView.php?no=${productNo}&market=dome`;
+      try { await this.goto(page, popupUrl, { waitUntil: 'domcontentloaded', timeout: 8000 }); } catch (e) { }
       const html = await page.content();
       const $ = cheerio.load(html);
       const values = [];
@@ -272,7 +428,6 @@ class CrawlerService {
       const unique = Array.from(new Set(values));
       return unique.length ? [{ name: '옵션', type: 'select', values: unique }] : [];
     } catch (e) { return []; }
-    finally { if (page) await page.close(); }
   }
 
   extractDetailContent(containerHtml) {
@@ -349,4 +504,4 @@ class CrawlerService {
   }
 }
 
-module.exports = { CrawlerService };
+module.exports = { CrawlerService, PagePool, HostRateLimiter };
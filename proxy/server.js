@@ -15,13 +15,14 @@ const express = require('express');
 const crypto = require('crypto');
 const cors = require('cors');
 const { PrismaClient } = require('../node_modules/@prisma/client');
+const { sanitizeDetailHtml } = require('../packages/utils/sanitizeHtml');
 
 const app = express();
 const prisma = new PrismaClient();
 const PORT = process.env.PROXY_PORT || 4000;
 const PROXY_API_KEY = process.env.COUPANG_PROXY_KEY || '2c2ea54a9a6715e28865f855a9b0b7e7fed20c0d86d7c8e77f33b38327a61636';
 
-const BASE_URL = 'https://api-gateway.coupang.com';
+const BASE_URL = process.env.COUPANG_API_BASE_URL || 'https://api-gateway.coupang.com';
 
 // Fixed return center values (same as in register/route.ts)
 const FIXED_RETURN_NAME = process.env.COUPANG_RETURN_CHARGE_NAME || '로드';
@@ -31,6 +32,7 @@ const FIXED_RETURN_ADDR = process.env.COUPANG_RETURN_ADDRESS || '주소 미입
 const FIXED_RETURN_ADDR_DETAIL = process.env.COUPANG_RETURN_ADDRESS_DETAIL || '상세주소 미입력';
 const DEFAULT_RETURN_FEE = 5000;
 const DEFAULT_CONTACT = '+821024843810';
+const CREDENTIAL_CACHE_TTL_MS = Number(process.env.COUPANG_CREDENTIAL_CACHE_TTL_MS || 5 * 60 * 1000);
 
 // --- Middleware ---
 app.use(express.json({ limit: '10mb' }));
@@ -56,7 +58,7 @@ app.use('/api/coupang', authMiddleware);
 
 // --- Coupang Signing ---
 function sign(method, path, keys, query = '') {
-  const { accessKey, secretKey } = keys;
+  const { accessKey, secretKey, hmacKey } = keys;
   const d = new Date();
   const pad = (n) => n.toString().padStart(2, '0');
   const datetime =
@@ -69,7 +71,7 @@ function sign(method, path, keys, query = '') {
     pad(d.getUTCSeconds()) +
     'Z';
   const message = `${datetime}${method}${path}${query}`;
-  const signature = crypto.createHmac('sha256', secretKey).update(message, 'utf-8').digest('hex');
+  const signature = crypto.createHmac('sha256', hmacKey || secretKey).update(message, 'utf-8').digest('hex');
   const authorization = `CEA algorithm=HmacSHA256, access-key=${accessKey}, signed-date=${datetime}, signature=${signature}`;
   return { datetime, authorization };
 }
@@ -95,7 +97,12 @@ async function coupangFetch(method, path, keys, body, query = '') {
 }
 
 // --- Helper: Get user credentials from DB ---
-async function getCredentials(userId) {
+// userId -> { keys, expiresAt }. 앱이 /api/settings/coupang 저장 시 invalidate 를 호출하고,
+// 호출이 유실돼도 TTL 이 지나면 다시 조회한다. 계정 없음(null)은 캐시하지 않음.
+const credentialCache = new Map();
+const credentialInflight = new Map();
+
+async function loadCredentials(userId) {
   const creds = await prisma.coupangCredential.findFirst({
     where: { userId, isActive: true },
   });
@@ -105,14 +112,51 @@ async function getCredentials(userId) {
     secretKey: creds.secretKey,
     vendorId: creds.vendorId,
     vendorUserId: creds.vendorUserId || creds.userId,
+    // HMAC 키는 서명마다 만들지 않고 계정당 한 번만
+    hmacKey: creds.secretKey ? crypto.createSecretKey(Buffer.from(creds.secretKey, 'utf-8')) : null,
   };
 }
 
+async function getCredentials(userId) {
+  const hit = credentialCache.get(userId);
+  if (hit && hit.expiresAt > Date.now()) return hit.keys;
+
+  const pending = credentialInflight.get(userId);
+  if (pending) return pending;
+
+  const promise = loadCredentials(userId)
+    .then((keys) => {
+      // 조회 도중 invalidate 됐으면 결과는 돌려주되 캐시에는 넣지 않음
+      if (credentialInflight.get(userId) !== promise) return keys;
+      if (keys) credentialCache.set(userId, { keys, expiresAt: Date.now() + CREDENTIAL_CACHE_TTL_MS });
+      else credentialCache.delete(userId);
+      return keys;
+    })
+    .finally(() => {
+      if (credentialInflight.get(userId) === promise) credentialInflight.delete(userId);
+    });
+  credentialInflight.set(userId, promise);
+  return promise;
+}
+
+function invalidateCredentials(userId) {
+  credentialCache.delete(userId);
+  credentialInflight.delete(userId);
+}
+
 // --- Health check ---
 app.get('/health', (req, res) => {
   res.json({ ok: true, service: 'coupang-proxy', timestamp: new Date().toISOString() });
 });
 
+// 자격증명 변경 알림 (앱 /api/settings/coupang 저장 시 호출)
+app.post('/api/coupang/credentials/invalidate', (req, res) => {
+  const userId = req.headers['x-user-id'];
+  if (!userId) return res.status(401).json({ ok: false, error: 'No userId' });
+  invalidateCredentials(userId);
+  res.json({ ok: true });
+});
+
 // ============================
 // 1. GET /api/coupang/centers
 // ============================
@@ -531,23 +575,6 @@ app.post('/api/coupang/register', async (req, res) => {
         };
         const normalizedSearchTags = sanitizeSearchTags(payload.keywords);
 
-        // HTML sanitizer
-        function sanitizeDetailHtml(html) {
-          if (!html) return '';
-          let clean = html;
-          clean = clean.replace(/<script[\s\S]*?<\/script>/gi, '');
-          clean = clean.replace(/<iframe[\s\S]*?<\/iframe>/gi, '');
-          clean = clean.replace(/<object[\s\S]*?<\/object>/gi, '');
-          clean = clean.replace(/<embed[^>]*>/gi, '');
-          clean = clean.replace(/<style[\s\S]*?<\/style>/gi, '');
-          clean = clean.replace(/\son[a-z]+\s*=\s*"[^"]*"/gi, '');
-          clean = clean.replace(/\son[a-z]+\s*=\s*'[^']*'/gi, '');
-          clean = clean.replace(/\son[a-z]+\s*=\s*[^\s>]+/gi, '');
-          clean = clean.replace(/(href|src)\s*=\s*"(javascript:[^"]*)"/gi, '$1="#"');
-          clean = clean.replace(/(\r\n|\n|\r)/gm, '');
-          return clean.trim();
-        }
-
         const buildFallbackHtml = () => {
           const imgs = [];
           if (Array.isArray(payload.detailImages)) {
@@ -776,6 +803,33 @@ app.get('/api/crawler/top', authMiddleware, async (req, res) => {
   }
 });
 
+// 5-1. POST /api/crawler/batch (도매꾹 키워드 일괄 검색 — 페이지 풀에서 병렬 처리)
+const CRAWLER_BATCH_MAX_KEYWORDS = 100;
+
+// 숫자가 아니거나 비어 있으면 undefined — 명시적인 0 은 그대로 둔다
+const toPriceParam = (v) => (v === null || v === '' || !Number.isFinite(Number(v)) ? undefined : Number(v));
+
+app.post('/api/crawler/batch', authMiddleware, async (req, res) => {
+  try {
+    const { keywords, minPrice, maxPrice } = req.body || {};
+    const list = Array.isArray(keywords) ? keywords.map((k) => String(k).trim()).filter(Boolean) : [];
+    if (list.length === 0) {
+      return res.status(400).json({ success: false, message: 'keywords array is required' });
+    }
+    if (list.length > CRAWLER_BATCH_MAX_KEYWORDS) {
+      return res.status(400).json({ success: false, message: `Too many keywords (max ${CRAWLER_BATCH_MAX_KEYWORDS})` });
+    }
+    console.log(`[proxy] Crawling Domeggook batch: ${list.length} keywords`);
+    const crawler = await getCrawlerService();
+    const started = Date.now();
+    const results = await crawler.crawlKeywords(list, toPriceParam(minPrice) ?? 0, toPriceParam(maxPrice) ?? 1000000);
+    res.json({ success: true, data: results, elapsedMs: Date.now() - started, pool: crawler.pool.stats });
+  } catch (error) {
+    console.error('[proxy] crawler/batch error:', error);
+    res.status(500).json({ success: false, message: error.message });
+  }
+});
+
 // ============================
 // 6. POST /api/crawler/preview (도매꾹 상품 상세)
 // ============================
@@ -1,18 +1,29 @@
 #!/usr/bin/env node
 /**
- * competitor_analysis.js — 다나와 curl 기반 경쟁사 가격 분석
+ * competitor_analysis.js — 다나와 경쟁사 가격 분석
  *
- * 실행: node scripts/competitor_analysis.js [--limit=N]
+ * 실행: node scripts/competitor_analysis.js [--limit=N] [--concurrency=N] [--no-cache]
+ *   --input=파일     분석할 상품 목록 (기본 data/our_products_detail.json)
+ *   --no-report      보고서 파일 저장 안 함
+ *   --json           진행 로그는 stderr, 마지막 줄에 요약 JSON (testsprite_tests/danawa_bench.py 가 파싱)
+ *
+ * 조회는 lib/danawa_pricing.js (keep-alive + 동시 요청 제한 + 검색어 캐시)
  */
-const { execSync } = require('child_process');
 const fs = require('fs');
 const path = require('path');
+const { DanawaPricing } = require('./lib/danawa_pricing');
+const { createLogger, JSON_MODE } = require('./lib/progress_log');
 
 const OUR_PATH = path.join(__dirname, '..', 'data', 'our_products_detail.json');
 const REPORT_PATH = path.join(__dirname, '..', 'data', 'competitor_report.json');
 const MD_REPORT_PATH = path.join(__dirname, '..', 'data', 'competitor_report.md');
 
-const LIMIT = parseInt(process.argv.find(a => a.startsWith('--limit='))?.split('=')[1] || '999');
+const arg = (name) => process.argv.find(a => a.startsWith(`--${name}=`))?.split('=').slice(1).join('=');
+const LIMIT = parseInt(arg('limit') || '999');
+const CONCURRENCY = arg('concurrency') ? parseInt(arg('concurrency')) : undefined;
+const INPUT_PATH = arg('input') || OUR_PATH;
+const NO_CACHE = process.argv.includes('--no-cache');
+const NO_REPORT = process.argv.includes('--no-report');
 
 /**
  * 상품명에서 다나와 검색 키워드 추출 (2-3단어, 제품 유형 중심)
@@ -31,55 +42,6 @@ function extractSearchQuery(displayName) {
   return words.slice(0, 3).join(' ');
 }
 
-/**
- * 다나와 검색 (curl 기반, 빠르고 안정적)
- */
-function searchDanawa(query) {
-  const url = `https://search.danawa.com/dsearch.php?query=${encodeURIComponent(query)}&tab=goods`;
-  try {
-    const html = execSync(
-      `curl -sL "${url}" -H "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"`,
-      { timeout: 15000, encoding: 'utf-8', maxBuffer: 2 * 1024 * 1024 }
-    );
-
-    // 실판매가 추출: 쇼핑몰 가격 (통합검색_상품블로그_유입 뒤) + 와우할인가
-    const allPrices = [];
-    let m;
-
-    // 패턴 1: 쇼핑몰 실판매가 (통합검색_상품블로그_유입 뒤 가격)
-    const shopPattern = /통합검색_상품블로그_유입[^>]*>[^<]*?(\d{1,3}(?:,\d{3})+)원/g;
-    while ((m = shopPattern.exec(html)) !== null) {
-      allPrices.push(parseInt(m[1].replace(/,/g, '')));
-    }
-
-    // 패턴 2: 와우할인가 (쿠팡)
-    const wowPattern = /와우할인가<\/em><\/span>(\d{1,3}(?:,\d{3})+)원/g;
-    while ((m = wowPattern.exec(html)) !== null) {
-      allPrices.push(parseInt(m[1].replace(/,/g, '')));
-    }
-
-    // 패턴 3: 일반 최저가 표시 (low-price 클래스 근처)
-    const lowPattern = /low-price[^>]*>(?:<[^>]+>)*\s*(\d{1,3}(?:,\d{3})+)원/g;
-    while ((m = lowPattern.exec(html)) !== null) {
-      allPrices.push(parseInt(m[1].replace(/,/g, '')));
-    }
-
-    // 가격 범위 필터 + 중복 제거
-    const prices = [...new Set(allPrices.filter(p => p >= 1000 && p <= 3000000))].slice(0, 30);
-
-    // 상품명 추출
-    const namePattern = /prod\.danawa\.com[^"]*"[^>]*title="([^"]{5,80})"/g;
-    const products = [];
-    while ((m = namePattern.exec(html)) !== null) {
-      products.push(m[1].replace(/&amp;/g, '&').trim());
-    }
-
-    return { prices, products, resultCount: prices.length };
-  } catch (e) {
-    return { prices: [], products: [], resultCount: 0, error: e.message?.slice(0, 80) };
-  }
-}
-
 function priceStats(prices) {
   if (!prices.length) return null;
   const sorted = [...prices].sort((a, b) => a - b);
@@ -105,42 +67,57 @@ function assessCompetitiveness(ourPrice, stats) {
   return { grade: '💰', comment: `시장가 대비 ${((1 - ratio) * 100).toFixed(0)}% 저렴`, ratio };
 }
 
+const log = createLogger();
+
 async function main() {
-  const ourProducts = JSON.parse(fs.readFileSync(OUR_PATH, 'utf-8'))
+  const ourProducts = JSON.parse(fs.readFileSync(INPUT_PATH, 'utf-8'))
     .filter(p => !p.error)
     .slice(0, LIMIT);
 
-  console.log(`\n📊 경쟁사 가격 분석 시작 (${ourProducts.length}개 상품)\n`);
-  const results = [];
+  log(`\n📊 경쟁사 가격 분석 시작 (${ourProducts.length}개 상품)\n`);
 
-  for (let i = 0; i < ourProducts.length; i++) {
-    const prod = ourProducts[i];
-    const query = extractSearchQuery(prod.displayName);
-    process.stdout.write(`[${i + 1}/${ourProducts.length}] ${prod.displayName.slice(0, 40)}... `);
+  const pricing = new DanawaPricing({ concurrency: CONCURRENCY, useCache: !NO_CACHE });
+  const queries = ourProducts.map(p => extractSearchQuery(p.displayName));
+  const started = Date.now();
+  let done = 0;
 
-    const danawa = searchDanawa(query);
+  const results = (await pricing.scan(queries, (i, danawa) => {
+    const prod = ourProducts[i];
     const stats = priceStats(danawa.prices);
     const assessment = assessCompetitiveness(prod.minPrice, stats);
-
-    results.push({
+    const head = `[${++done}/${ourProducts.length}] ${prod.displayName.slice(0, 40)}... `;
+    if (stats && stats.count >= 2) {
+      log(`${head}${assessment.grade} ₩${prod.minPrice.toLocaleString()} vs 중간 ₩${stats.median.toLocaleString()} (${stats.count}개)`);
+    } else {
+      log(`${head}❓ 비교데이터 부족 (${danawa.prices.length}건)${danawa.error ? ` — ${danawa.error}` : ''}`);
+    }
+  })).map((danawa, i) => {
+    const prod = ourProducts[i];
+    const stats = priceStats(danawa.prices);
+    return {
       pid: prod.pid,
       displayName: prod.displayName,
       ourPrice: prod.minPrice,
-      searchQuery: query,
+      searchQuery: queries[i],
       market: stats,
-      assessment,
+      assessment: assessCompetitiveness(prod.minPrice, stats),
       sampleProducts: danawa.products.slice(0, 5),
-    });
-
-    if (stats && stats.count >= 2) {
-      console.log(`${assessment.grade} ₩${prod.minPrice.toLocaleString()} vs 중간 ₩${stats.median.toLocaleString()} (${stats.count}개)`);
-    } else {
-      console.log(`❓ 비교데이터 부족 (${danawa.prices.length}건)`);
-    }
-
-    // Rate limit — 1초 간격
-    await new Promise(r => setTimeout(r, 1000));
+    };
+  });
+  const elapsedMs = Date.now() - started;
+  pricing.close();
+
+  if (JSON_MODE) {
+    console.log(JSON.stringify({
+      products: results.length,
+      queries: new Set(queries.filter(Boolean)).size,
+      elapsedMs,
+      productsPerSec: results.length / Math.max(elapsedMs / 1000, 0.001),
+      ...pricing.stats,
+      results: results.map(r => ({ searchQuery: r.searchQuery, market: r.market, sampleProducts: r.sampleProducts })),
+    }));
   }
+  if (NO_REPORT) return;
 
   // JSON 저장
   fs.writeFileSync(REPORT_PATH, JSON.stringify(results, null, 2));
@@ -203,11 +180,11 @@ async function main() {
   fs.writeFileSync(MD_REPORT_PATH, md);
 
   // 최종 요약 출력
-  console.log(`\n═══ 분석 완료 ═══`);
-  console.log(`🔴 판매불가: ${grades['🔴'] || 0} | 🟠 매우높음: ${grades['🟠'] || 0} | 🟡 높음: ${grades['🟡'] || 0}`);
-  console.log(`🟢 적정: ${grades['🟢'] || 0} | ✅ 경쟁적: ${grades['✅'] || 0} | 💰 저렴: ${grades['💰'] || 0} | ❓ 부족: ${grades['❓'] || 0}`);
-  console.log(`📊 JSON: ${REPORT_PATH}`);
-  console.log(`📝 보고서: ${MD_REPORT_PATH}`);
+  log(`\n═══ 분석 완료 ═══`);
+  log(`🔴 판매불가: ${grades['🔴'] || 0} | 🟠 매우높음: ${grades['🟠'] || 0} | 🟡 높음: ${grades['🟡'] || 0}`);
+  log(`🟢 적정: ${grades['🟢'] || 0} | ✅ 경쟁적: ${grades['✅'] || 0} | 💰 저렴: ${grades['💰'] || 0} | ❓ 부족: ${grades['❓'] || 0}`);
+  log(`📊 JSON: ${REPORT_PATH}`);
+  log(`📝 보고서: ${MD_REPORT_PATH}`);
 }
 
 main().catch(e => { console.error(e); process.exit(1); });
@@ -12,8 +12,8 @@ const path = require('path');
 require('dotenv').config({ path: '/home/dev/openclaw/.env' });
 
 const { cf, updateProductFull } = require('./lib/coupang_api');
+const { openQueue } = require('./lib/queue_store');
 
-const QUEUE_FILE = path.resolve(__dirname, '../data/register_queue.json');
 const DOMEGGOOK_API_KEY = process.env.DOMEGGOOK_API_KEY;
 const DRY_RUN = process.argv.includes('--dry-run');
 
@@ -123,7 +123,7 @@ async function main() {
     throw new Error('DOMEGGOOK_API_KEY 누락');
   }
 
-  const queue = JSON.parse(fs.readFileSync(QUEUE_FILE, 'utf-8'));
+  const queue = openQueue();
   const targets = queue.filter(item => item.productId);
 
   const holdList = [];
@@ -177,8 +177,9 @@ async function main() {
   }
 
   if (!DRY_RUN && changed) {
-    fs.writeFileSync(QUEUE_FILE, JSON.stringify(queue, null, 2));
+    queue.saveAll(targets);
   }
+  queue.close();
 
   console.log(`[임시저장 복구] ${DRY_RUN ? '(DRY RUN)' : ''}`.trim());
   printSection('보류 처리', holdList);
@@ -13,8 +13,8 @@ require('dotenv').config({ path: '/home/dev/openclaw/.env' });
 
 const { cf, updateItemPrice, updateItemQuantity, updateProductFull } = require('./lib/coupang_api');
 const { roundPrice10 } = require('./lib/image_utils');
+const { openQueue } = require('./lib/queue_store');
 
-const QUEUE_FILE = path.resolve(__dirname, '../data/register_queue.json');
 const DOMEGGOOK_API_KEY = process.env.DOMEGGOOK_API_KEY;
 
 const DRY_RUN = process.argv.includes('--dry-run');
@@ -188,11 +188,8 @@ async function main() {
     throw new Error('DOMEGGOOK_API_KEY 누락');
   }
 
-  const queue = JSON.parse(fs.readFileSync(QUEUE_FILE, 'utf-8'));
-  const targets = queue.filter(item =>
-    (item.status === 'registered' || item.status === 'approved') &&
-    item.productId
-  );
+  const queue = openQueue();
+  const targets = queue.filter(item => item.productId, { status: ['registered', 'approved'] });
 
   const moqChanges = [];
   const priceChanges = [];
@@ -335,8 +332,9 @@ async function main() {
   }
 
   if (!DRY_RUN) {
-    fs.writeFileSync(QUEUE_FILE, JSON.stringify(queue, null, 2));
+    queue.saveAll(targets);
   }
+  queue.close();
 
   console.log(buildReport({
     syncedCount,
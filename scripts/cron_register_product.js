@@ -6,54 +6,13 @@ require('dotenv').config({ path: '/home/dev/openclaw/.env' });
 
 const { cfJson, buildNotices, ensureRequiredAttributes, getConfig, predictCategory: predictCategoryShared } = require('./lib/coupang_api');
 const { INVALID_IMAGE_PATTERNS, isValidImageUrl, getSafeVendorPath } = require('./lib/image_utils');
+const { openQueue } = require('./lib/queue_store');
+const { isNonAttributeGroup, buildOptionVariants } = require('./lib/option_attributes');
 
 const { AK, SK, VID, VUID } = getConfig();
 
-const QUEUE_FILE = path.resolve(__dirname, '../data/register_queue.json');
 const LOG_FILE = path.resolve(__dirname, '../data/register_log.json');
 
-// ── 옵션 → 속성 변환 헬퍼 (호이스팅 안전) ──────────────────
-const COLOR_KEYWORDS = [
-  '다크그레이','라이트그레이','혼합색상',
-  '블랙','화이트','레드','블루','그린','옐로우','핑크','퍼플',
-  '그레이','실버','골드','브라운','베이지','네이비','아이보리',
-  '투명','클리어','혼합','랜덤','오렌지','민트','카키','와인',
-  '크림','차콜','스카이블루','라벤더','코랄','로즈골드','매트블랙'
-];
-
-function extractColorFromOption(optName) {
-  const paren = optName.match(/\(([^)]+)\)/);
-  if (paren) {
-    for (const c of COLOR_KEYWORDS) {
-      if (paren[1].includes(c)) return c;
-    }
-  }
-  for (const c of COLOR_KEYWORDS) {
-    if (optName.includes(c)) return c;
-  }
-  return null;
-}
-
-function extractSizeFromOption(optName) {
-  const m = optName.match(/(\d+(?:\.\d+)?)\s*(?:cm|mm|m|인치)/i);
-  return m ? m[1] : null;
-}
-
-function isNonAttributeGroup(groupName) {
-  return /발송|배송|수령|택배/.test(groupName);
-}
-
-function cleanOptionForAttribute(optName, attrTypeName) {
-  if (/색상|색/.test(attrTypeName)) {
-    return extractColorFromOption(optName) || optName;
-  }
-  if (/사이즈|크기/i.test(attrTypeName)) {
-    return extractSizeFromOption(optName) || optName;
-  }
-  return optName;
-}
-// ─────────────────────────────────────────────────────────────
-
 async function predictCategory(name){
   const j = await cfJson('POST', '/v2/providers/openapi/apis/api/v1/categorization/predict', { productName: name.slice(0,200) });
   return { id: j?.data?.predictedCategoryId, name: j?.data?.predictedCategoryName };
@@ -267,58 +226,18 @@ async function registerProduct(prod){
       return [{ ...baseItem, itemName: p.displayName, attributes: attrs }];
     }
 
-    // 옵션 있음 → 크로스 조인으로 모든 조합 생성
-    function crossJoin(groups) {
-      if (groups.length === 0) return [[]];
-      const [first, ...rest] = groups;
-      const restCombinations = crossJoin(rest);
-      const result = [];
-      for (const val of first.values) {
-        for (const combo of restCombinations) {
-          result.push([{ groupName: first.groupName, ...val }, ...combo]);
-        }
-      }
-      // 조합 폭발 방지: 최대 30개
-      return result.slice(0, 30);
-    }
-
-    const combinations = crossJoin(attrOpts);
-    const items = [];
-
-    for (const combo of combinations) {
-      const totalPriceAdd = combo.reduce((sum, c) => sum + (c.priceAdd || 0), 0);
-      const itemPrice = p.salePrice + totalPriceAdd;
+    // 옵션 있음 → 조합별 아이템 (최대 30개, 속성값은 옵션명에서 색상/사이즈 정제)
+    const items = buildOptionVariants(attrOpts, attrs).map(v => {
+      const itemPrice = p.salePrice + v.priceAdd;
       const correctedPrice = itemPrice % 10 !== 0 ? Math.ceil(itemPrice / 10) * 10 : itemPrice;
-
-      // itemName: 옵션값 조합
-      const optLabel = combo.map(c => c.name).join(' ');
-
-      // 속성: 기존 속성 복사 + 옵션 그룹에 매칭되는 속성값 치환 (정제된 값)
-      const optAttrs = attrs.map(a => {
-        for (const c of combo) {
-          const gn = c.groupName || '';
-          const isMatch =
-            a.attributeTypeName === gn ||
-            ((/선택|옵션|option/i.test(gn)) && /색상|색/.test(a.attributeTypeName) && extractColorFromOption(c.name)) ||
-            (/색상|색/.test(gn) && /색상|색/.test(a.attributeTypeName)) ||
-            (/사이즈|크기|size/i.test(gn) && /사이즈|크기/i.test(a.attributeTypeName));
-
-          if (isMatch) {
-            const cleaned = cleanOptionForAttribute(c.name, a.attributeTypeName);
-            return { ...a, attributeValueName: cleaned };
-          }
-        }
-        return { ...a };
-      });
-
-      items.push({
+      return {
         ...baseItem,
-        itemName: optLabel,
+        itemName: v.label,
         originalPrice: correctedPrice,
         salePrice: correctedPrice,
-        attributes: optAttrs,
-      });
-    }
+        attributes: v.attributes,
+      };
+    });
 
     return items.length > 0 ? items : [{ ...baseItem, itemName: p.displayName, attributes: attrs }];
   }
@@ -371,15 +290,6 @@ function validateItem(item){
   return null;
 }
 
-function loadQueue(){
-  if(!fs.existsSync(QUEUE_FILE)) return [];
-  return JSON.parse(fs.readFileSync(QUEUE_FILE, 'utf-8'));
-}
-
-function saveQueue(queue){
-  fs.writeFileSync(QUEUE_FILE, JSON.stringify(queue, null, 2));
-}
-
 function loadLog(){
   if(!fs.existsSync(LOG_FILE)) return [];
   return JSON.parse(fs.readFileSync(LOG_FILE, 'utf-8'));
@@ -397,7 +307,7 @@ const DENIED_BATCH = 2;
 const MAX_RETRY = 3;
 
 async function processDenied(queue) {
-  const denied = queue.filter(q => q.status === 'denied' && (q.retryCount || 0) < MAX_RETRY);
+  const denied = queue.filter(q => (q.retryCount || 0) < MAX_RETRY, { status: 'denied' });
   if (!denied.length) return 0;
 
   let processed = 0;
@@ -499,6 +409,7 @@ async function processDenied(queue) {
       console.log(`  → denied_permanent`);
     }
 
+    queue.save(item);
     processed++;
   }
 
@@ -518,20 +429,21 @@ async function main(){
   const now = new Date().toISOString();
   console.log(`[${now}] 크론 실행`);
 
-  const queue = loadQueue();
+  // 대기열 저널 (변경된 항목만 추가 기록)
+  const queue = openQueue();
   const log = loadLog();
 
   // 대기 중인 상품 찾기 (SEO 최적화 완료된 것 우선, 24h 초과 대기 항목 폴백)
   const SEO_TIMEOUT_MS = 24 * 60 * 60 * 1000; // 24시간
-  let pending = queue.find(q => q.status === 'pending' && q.optimized === true);
+  let pending = queue.find(q => q.optimized === true, { status: 'pending' });
 
   if(!pending){
     // SEO 최적화 24시간 초과 대기 항목 → 폴백 등록
     const timedOut = queue.find(q => {
-      if(q.status !== 'pending' || q.optimized) return false;
+      if(q.optimized) return false;
       const addedAt = q.addedAt ? new Date(q.addedAt).getTime() : 0;
       return addedAt > 0 && (Date.now() - addedAt) > SEO_TIMEOUT_MS;
-    });
+    }, { status: 'pending' });
     if(timedOut){
       timedOut.seoTimedOut = true;
       pending = timedOut;
@@ -540,7 +452,7 @@ async function main(){
   }
 
   if(!pending){
-    const unoptimized = queue.filter(q => q.status === 'pending' && !q.optimized).length;
+    const unoptimized = queue.filter(q => !q.optimized, { status: 'pending' }).length;
     if(unoptimized > 0){
       console.log(`SEO 최적화 대기 중: ${unoptimized}개`);
     } else {
@@ -548,20 +460,21 @@ async function main(){
     }
 
     // 등록 완료된 상품 상태 체크
-    const registered = queue.filter(q => q.status === 'registered' && q.productId);
+    const registered = queue.filter(q => q.productId, { status: 'registered' });
     for(const item of registered){
       const status = await checkStatus(item.productId);
       console.log(`  체크: ${item.sellerName} | ${item.productId} | ${status}`);
       item.coupangStatus = status;
       if(status === '승인완료') item.status = 'approved';
       else if(status === '승인반려') item.status = 'denied';
+      queue.save(item);
     }
 
     // denied 상품 자동 분석 + 재등록
     const deniedCount = await processDenied(queue);
     if(deniedCount) console.log(`denied 처리: ${deniedCount}건`);
 
-    saveQueue(queue);
+    queue.close();
     return;
   }
 
@@ -571,7 +484,8 @@ async function main(){
     pending.status = 'skip_invalid';
     pending.error = invalidity;
     console.log(`  SKIP (${invalidity}): ${pending.sellerName}`);
-    saveQueue(queue);
+    queue.save(pending);
+    queue.close();
     return;
   }
 
@@ -585,7 +499,8 @@ async function main(){
       pending.status = 'skip_invalid';
       pending.error = result.reason;
       console.log(`  SKIP (${result.reason}): ${pending.sellerName}`);
-      saveQueue(queue);
+      queue.save(pending);
+      queue.close();
       return;
     }
 
@@ -656,6 +571,8 @@ async function main(){
     });
   }
 
+  queue.save(pending);
+
   // denied 상품 자동 분석 + 재등록
   const deniedCount = await processDenied(queue);
   if(deniedCount) console.log(`denied 처리: ${deniedCount}건`);
@@ -667,7 +584,7 @@ async function main(){
     console.log(`  로그 트리밍: ${trimmed}건 제거 (${log.length}건 유지)`);
   }
 
-  saveQueue(queue);
+  queue.close();
   saveLog(log);
   console.log('완료.');
 }
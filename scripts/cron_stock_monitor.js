@@ -3,25 +3,36 @@
  * 도매꾹 품절 모니터링 → 쿠팡 자동 판매중지/재개
  *
  * 동작:
- * 1. register_queue.json에서 활성 상품(registered/approved) 조회
- * 2. 도매꾹 API로 재고/판매상태 확인
+ * 1. 대기열 저널(register_queue.jsonl)에서 활성 상품(registered/approved) 조회
+ * 2. 확인 시각이 된 상품만 최대 STOCK_BATCH_SIZE 개, STOCK_CONCURRENCY 개씩 도매꾹 API로 재고/판매상태 확인
+ *    (도매꾹 STOCK_DOMEGGOOK_RPS, 쿠팡 STOCK_COUPANG_RPS — 워커 수와 무관하게 전체 요청 속도 제한)
+ *    (상품별 주기는 재고/가격 변동성에 따라 조정 — lib/stock_scheduler.js)
+ *    ETag/응답 해시가 같고 처리할 게 없으면 판정 생략
  * 3. 품절 → 쿠팡 판매중지 (vendor-items/stop)
  * 4. 재입고 → 쿠팡 판매재개 (vendor-items/resume)
  * 5. 비정상 가격(100원 이하) 감지 시 seller-product 판매중지 + 중복 경고 방지
  *
- * 크론: 매 6시간 권장
+ * 크론: 매 30분 권장 (실행마다 밀린 상품만 확인)
+ * STOCK_FULL_SCAN=1 이면 스케줄 무시하고 전체 확인
  */
 const fs = require('fs');
 const path = require('path');
 require('dotenv').config({ path: '/home/dev/openclaw/.env' });
 
 const { cf, cfJson, deleteProduct } = require('./lib/coupang_api');
+const { openQueue } = require('./lib/queue_store');
+const { createThrottle } = require('./lib/throttle');
+const { StockScheduler, stockHash, runPool } = require('./lib/stock_scheduler');
 
-const QUEUE_FILE = path.resolve(__dirname, '../data/register_queue.json');
 const ALERT_STATE_FILE = path.resolve(__dirname, '../data/stock_alert_state.json');
 const DOMEGGOOK_API_KEY = process.env.DOMEGGOOK_API_KEY;
 const DISCORD_WEBHOOK_URL = process.env.STOCK_ALERT_DISCORD_WEBHOOK_URL || process.env.DISCORD_WEBHOOK_URL || '';
 const LOG_FILE = path.resolve(__dirname, '../data/stock_monitor.log');
+const BATCH_SIZE = Number(process.env.STOCK_BATCH_SIZE || 500);
+const CONCURRENCY = Number(process.env.STOCK_CONCURRENCY || 4);
+const DOMEGGOOK_RPS = Number(process.env.STOCK_DOMEGGOOK_RPS || 3); // 동시 처리와 별개로 도매꾹 전체 요청 속도 제한
+const COUPANG_RPS = Number(process.env.STOCK_COUPANG_RPS || 3); // 쿠팡 판매중지/재개 호출 (기존 순차 처리의 300ms 간격 수준)
+const FULL_SCAN = process.env.STOCK_FULL_SCAN === '1';
 const PRIORITY_STOP_TARGET_IDS = new Set([
   '16041404905',
   '16041439752',
@@ -76,22 +87,40 @@ function extractDomeggookNo(item) {
   return m ? m[1] : null;
 }
 
+// 요청 간격 (모든 워커 공유)
+const throttleDomeggook = createThrottle(DOMEGGOOK_RPS);
+const throttleCoupang = createThrottle(COUPANG_RPS);
+
+/**
+ * 쿠팡 API 호출 — STOCK_CONCURRENCY 워커가 동시에 판매중지/재개해도 COUPANG_RPS 를 넘지 않도록
+ */
+async function coupangCall(method, pathUrl, body, query) {
+  await throttleCoupang();
+  return cf(method, pathUrl, body, query);
+}
+
 /**
  * 도매꾹 상품 상태 조회 (ssl/api v4.1)
- * @returns {{ available: boolean, soldOut: boolean, price: number|null, reason: string }}
+ * etag 를 주면 If-None-Match 로 조회 — 304 면 { notModified: true } 만 반환
+ * @returns {{ available: boolean, soldOut: boolean, price: number|null, reason: string, hash: string, etag: string|null }}
  */
-async function checkDomeggookStock(productNo) {
+async function checkDomeggookStock(productNo, { etag } = {}) {
   if (!productNo || !DOMEGGOOK_API_KEY) {
     return { available: null, soldOut: false, price: null, reason: 'productNo 또는 API키 없음' };
   }
 
   try {
+    await throttleDomeggook();
     const url = `https://domeggook.com/ssl/api/?ver=4.1&mode=getItemView&aid=${DOMEGGOOK_API_KEY}&no=${productNo}&om=json`;
     const controller = new AbortController();
     const timer = setTimeout(() => controller.abort(), 10000);
-    const res = await fetch(url, { signal: controller.signal });
+    const res = await fetch(url, { signal: controller.signal, headers: etag ? { 'If-None-Match': etag } : {} });
     clearTimeout(timer);
 
+    if (res.status === 304) {
+      return { notModified: true, etag };
+    }
+
     if (!res.ok) {
       return { available: null, soldOut: false, price: null, reason: `HTTP ${res.status}` };
     }
@@ -122,7 +151,7 @@ async function checkDomeggookStock(productNo) {
 
     const available = saleStatus === '판매중' && !isExpired;
 
-    return {
+    const stock = {
       available,
       soldOut: isSoldOut,
       ended: isEnded || isExpired,
@@ -130,6 +159,7 @@ async function checkDomeggookStock(productNo) {
       saleStatus,
       reason: isSoldOut ? '품절' : (isEnded || isExpired) ? `판매종료(${saleStatus})` : '정상',
     };
+    return { ...stock, hash: stockHash(stock), etag: res.headers.get('etag') };
   } catch (e) {
     return { available: null, soldOut: false, price: null, reason: `에러: ${e.message}` };
   }
@@ -141,7 +171,7 @@ async function checkDomeggookStock(productNo) {
  * - 미지원 시 vendor-items 판매중지로 fallback
  */
 async function stopCoupangSellerProductSale(sellerProductId) {
-  const { json } = await cf('PUT', `/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/sales/stop/${sellerProductId}`);
+  const { json } = await coupangCall('PUT', `/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/sales/stop/${sellerProductId}`);
   if (json?.code === 'SUCCESS') {
     return { success: true, message: '판매중지 완료' };
   }
@@ -164,7 +194,7 @@ async function stopCoupangSellerProductSale(sellerProductId) {
  * 쿠팡 판매중지 (모든 vendor items)
  */
 async function stopCoupangSale(sellerProductId) {
-  const { json: detail } = await cf('GET', `/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/${sellerProductId}`);
+  const { json: detail } = await coupangCall('GET', `/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/${sellerProductId}`);
   if (detail?.code !== 'SUCCESS') return { success: false, message: '조회 실패' };
 
   const items = detail.data?.items || [];
@@ -173,7 +203,7 @@ async function stopCoupangSale(sellerProductId) {
   for (const item of items) {
     const vid = item.vendorItemId;
     if (!vid) continue;
-    const { json } = await cf('PUT', `/v2/providers/seller_api/apis/api/v1/marketplace/vendor-items/${vid}/sales/stop`);
+    const { json } = await coupangCall('PUT', `/v2/providers/seller_api/apis/api/v1/marketplace/vendor-items/${vid}/sales/stop`);
     if (json?.code !== 'SUCCESS') {
       console.log(`  판매중지 실패 [${vid}]: ${json?.message}`);
       allOk = false;
@@ -187,7 +217,7 @@ async function stopCoupangSale(sellerProductId) {
  * 쿠팡 판매재개 (모든 vendor items)
  */
 async function resumeCoupangSale(sellerProductId) {
-  const { json: detail } = await cf('GET', `/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/${sellerProductId}`);
+  const { json: detail } = await coupangCall('GET', `/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/${sellerProductId}`);
   if (detail?.code !== 'SUCCESS') return { success: false, message: '조회 실패' };
 
   const items = detail.data?.items || [];
@@ -196,7 +226,7 @@ async function resumeCoupangSale(sellerProductId) {
   for (const item of items) {
     const vid = item.vendorItemId;
     if (!vid) continue;
-    const { json } = await cf('PUT', `/v2/providers/seller_api/apis/api/v1/marketplace/vendor-items/${vid}/sales/resume`);
+    const { json } = await coupangCall('PUT', `/v2/providers/seller_api/apis/api/v1/marketplace/vendor-items/${vid}/sales/resume`);
     if (json?.code !== 'SUCCESS') {
       console.log(`  판매재개 실패 [${vid}]: ${json?.message}`);
       allOk = false;
@@ -206,6 +236,15 @@ async function resumeCoupangSale(sellerProductId) {
   return { success: allOk, message: allOk ? '판매재개 완료' : '일부 실패' };
 }
 
+/**
+ * 캐시된 재고 상태 기준으로 판매중지/재개가 아직 필요한지 (지난 시도 실패 등)
+ */
+function needsAction(item, stock) {
+  const selling = item.status === 'registered' || item.status === 'approved';
+  if (selling && (!stock.available || (stock.price !== null && Number(stock.price) <= 100))) return true;
+  return Boolean(stock.available) && item.status === 'stock_stopped';
+}
+
 function appendLog(msg) {
   const line = `[${new Date().toISOString()}] ${msg}\n`;
   fs.appendFileSync(LOG_FILE, line);
@@ -251,45 +290,70 @@ async function main() {
     process.exit(1);
   }
 
-  const queue = JSON.parse(fs.readFileSync(QUEUE_FILE, 'utf-8'));
+  const queue = openQueue();
   const alertState = loadAlertState();
+  const alertStateBefore = JSON.stringify(alertState);
 
   const active = queue.filter(i =>
-    (i.status === 'registered' || i.status === 'approved' || i.status === 'stock_stopped') &&
     i.productId &&
-    (i.domeggookProductNo || i.sourceUrl)
+    (i.domeggookProductNo || i.sourceUrl),
+    { status: ['registered', 'approved', 'stock_stopped'] }
   );
 
-  appendLog(`활성 상품: ${active.length}건`);
+  // 확인 시각이 된 상품만 (오래 밀린 순, 최대 BATCH_SIZE)
+  const scheduler = new StockScheduler().open();
+  scheduler.prune(active.map(i => String(i.productId)));
+  const byKey = new Map(active.map(i => [String(i.productId), i]));
+  const batch = FULL_SCAN
+    ? active
+    : scheduler.due(byKey.keys(), BATCH_SIZE).map(k => byKey.get(k));
+
+  appendLog(`활성 상품: ${active.length}건 / 이번 확인: ${batch.length}건 (동시 ${CONCURRENCY}, 도매꾹 ${DOMEGGOOK_RPS}rps, 쿠팡 ${COUPANG_RPS}rps)`);
 
   let stopped = 0;
   let resumed = 0;
   let unchanged = 0;
   let errors = 0;
+  let skipped = 0;
 
   const newAnomalyReports = [];
   const priorityStopAttempted = new Set();
   let priorityStopSuccess = 0;
   let priorityStopFail = 0;
   const priorityStopFailReasons = [];
+  const checked = [];
 
-  for (const item of active) {
+  const processItem = async (item) => {
     const itemKey = String(item.productId);
     const dgNo = extractDomeggookNo(item);
     if (!dgNo) {
+      // 확인 불가 — 일정을 남기지 않으면 due() 가 매번 맨 앞에 올려 BATCH_SIZE 자리를 차지함
+      scheduler.recordError(itemKey);
       errors++;
-      continue;
+      return;
     }
     // sourceUrl에서 추출한 번호를 저장 (다음 실행 시 재활용)
     if (!item.domeggookProductNo) item.domeggookProductNo = dgNo;
 
-    const stock = await checkDomeggookStock(dgNo);
+    const entry = scheduler.get(itemKey);
+    let stock = await checkDomeggookStock(dgNo, { etag: entry?.stock ? entry.etag : null });
+    if (stock.notModified) stock = { ...entry.stock, notModified: true, etag: stock.etag };
 
     if (stock.available === null) {
-      // 조회 실패 — 무시
+      // 조회 실패 — 재시도 예약 후 무시
+      scheduler.recordError(itemKey);
       appendLog(`  ⚠ [${item.productId}] 도매꾹 조회 실패: ${stock.reason} | ${(item.sellerName || '').slice(0, 30)}`);
       errors++;
-      continue;
+      return;
+    }
+
+    // 지난 확인 이후 그대로이고 처리할 것(판매중지/재개 재시도)이 없으면 판정 생략
+    const { unchanged: sameAsLastCheck } = scheduler.record(itemKey, stock);
+    if (sameAsLastCheck && !needsAction(item, stock)) {
+      skipped++;
+      unchanged++;
+      checked.push(item);
+      return;
     }
 
     const sourcePrice = Number.isFinite(Number(stock.price)) ? Number(stock.price) : null;
@@ -407,16 +471,20 @@ async function main() {
       }
     }
 
-    // rate limit 방지
-    await new Promise(r => setTimeout(r, 300));
-  }
+    checked.push(item);
+  };
+
+  await runPool(batch, CONCURRENCY, processItem);
+  scheduler.close();
+
+  // 이번에 확인한 상품 중 바뀐 것만 저널에 기록
+  queue.saveAll(checked);
 
   // 우선 대상 10건은 반드시 즉시 판매중지 시도
-  const queueByProductId = new Map(queue.map(item => [String(item.productId), item]));
   for (const targetId of PRIORITY_STOP_TARGET_IDS) {
     if (priorityStopAttempted.has(targetId)) continue;
 
-    const targetItem = queueByProductId.get(targetId);
+    const targetItem = queue.getByProductId(targetId);
     if (!targetItem) {
       priorityStopFail++;
       priorityStopFailReasons.push(`[${targetId}] register_queue에 없음`);
@@ -446,6 +514,7 @@ async function main() {
           domeggookNo: dgNo,
         };
       }
+      queue.save(targetItem);
       stopped++;
       appendLog(`    → 우선대상 판매중지 완료`);
     } else {
@@ -453,19 +522,18 @@ async function main() {
       priorityStopFailReasons.push(`[${targetId}] ${result.message}`);
       appendLog(`    → 우선대상 판매중지 실패: ${result.message}`);
     }
-
-    await new Promise(r => setTimeout(r, 300));
   }
 
-  // 큐/상태 저장
-  fs.writeFileSync(QUEUE_FILE, JSON.stringify(queue, null, 2));
-  saveAlertState(alertState);
+  // 큐/상태 저장 (알림 상태는 바뀐 경우에만)
+  queue.close();
+  if (JSON.stringify(alertState) !== alertStateBefore) saveAlertState(alertState);
 
   // 신규 이상만 Discord 보고
   await sendDiscordPriceAnomalyReport(newAnomalyReports);
 
   appendLog(`\n=== 결과 ===`);
-  appendLog(`판매중지: ${stopped} | 재개: ${resumed} | 변동없음: ${unchanged} | 에러: ${errors}`);
+  appendLog(`판매중지: ${stopped} | 재개: ${resumed} | 변동없음: ${unchanged} (판정 생략 ${skipped}) | 에러: ${errors}`);
+  appendLog(`확인 ${batch.length}/${active.length}건 — 이번 실행에서 건너뛴 조회 ${active.length - batch.length}건`);
   appendLog(`우선대상 10건 판매중지 시도: 성공 ${priorityStopSuccess}건 / 실패 ${priorityStopFail}건`);
   if (priorityStopFailReasons.length) {
     appendLog(`우선대상 실패 사유: ${priorityStopFailReasons.join(' | ')}`);
@@ -3,8 +3,8 @@ const path = require('path');
 require('dotenv').config({ path: '/home/dev/openclaw/.env' });
 
 const { cf } = require('./lib/coupang_api');
+const { openQueue } = require('./lib/queue_store');
 
-const QUEUE_PATH = path.join(__dirname, '..', 'data', 'register_queue.json');
 const LOG_PATH = path.join(__dirname, '..', 'data', 'price_fix_log.json');
 
 const BATCH_SIZE = 5;
@@ -14,16 +14,11 @@ function sleep(ms) {
   return new Promise(resolve => setTimeout(resolve, ms));
 }
 
-function loadQueue() {
-  const raw = fs.readFileSync(QUEUE_PATH, 'utf8');
-  return JSON.parse(raw);
-}
-
-function filterTargets(list) {
-  return list.filter(item => {
-    const statusOk = item.status === 'registered' || item.status === 'approved';
-    return statusOk && item.priceFixedAt && item.productId;
-  });
+function filterTargets(queue) {
+  return queue.filter(
+    item => item.priceFixedAt && item.productId,
+    { status: ['registered', 'approved'] }
+  );
 }
 
 async function getProduct(id) {
@@ -134,8 +129,9 @@ function appendLog(runLog) {
 }
 
 async function main() {
-  const queue = loadQueue();
+  const queue = openQueue();
   const targets = filterTargets(queue);
+  queue.close();
   console.log(`총 대상: ${targets.length}건`);
 
   let successCount = 0;
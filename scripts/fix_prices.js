@@ -9,10 +9,8 @@
  *   node scripts/fix_prices.js --apply       # 쿠팡 API 가격 업데이트까지
  */
 
-const fs = require('fs');
-const path = require('path');
+const { openQueue } = require('./lib/queue_store');
 
-const QUEUE_PATH = path.join(__dirname, '../data/register_queue.json');
 const COUPANG_FEE_RATE = 0.108;
 
 // 카테고리별 가격 배수 (pipeline_sourcing.js와 동일)
@@ -44,7 +42,8 @@ function roundPrice10(p) {
 const dryRun = process.argv.includes('--dry-run');
 const apply = process.argv.includes('--apply');
 
-const queue = JSON.parse(fs.readFileSync(QUEUE_PATH, 'utf8'));
+const store = openQueue();
+const queue = store.toArray();
 
 let fixCount = 0;
 const fixes = [];
@@ -112,8 +111,8 @@ for (const f of fixes) {
 }
 
 if (!dryRun && fixCount > 0) {
-  fs.writeFileSync(QUEUE_PATH, JSON.stringify(queue, null, 2));
-  console.log(`\n✅ register_queue.json 업데이트 완료 (${fixCount}건)`);
+  store.saveAll(queue);
+  console.log(`\n✅ 대기열 업데이트 완료 (${fixCount}건)`);
   
   if (apply) {
     console.log('\n⚠️  쿠팡 API 가격 업데이트는 별도 스크립트(update_coupang_products.js)로 실행하세요.');
@@ -122,3 +121,5 @@ if (!dryRun && fixCount > 0) {
 } else if (dryRun) {
   console.log(`\n📋 DRY RUN 완료. 실제 적용하려면: node scripts/fix_prices.js`);
 }
+
+store.close();
@@ -9,7 +9,7 @@
  */
 const crypto = require('crypto');
 
-const BASE_URL = 'https://api-gateway.coupang.com';
+const BASE_URL = process.env.COUPANG_API_BASE_URL || 'https://api-gateway.coupang.com';
 
 // 환경변수 — require 시점에서 읽기 (dotenv는 소비자 파일에서 먼저 로드)
 function getConfig() {
@@ -0,0 +1,259 @@
+/**
+ * 다나와 경쟁사 가격 조회 엔진
+ *
+ * - keep-alive 에이전트로 소켓 재사용 (요청마다 curl 프로세스를 띄우지 않음)
+ * - 동시 요청 수 제한 (DANAWA_CONCURRENCY) + 요청 간격 제한 (DANAWA_RPS)
+ * - 정규화한 검색어(extractSearchQuery 결과) 기준 디스크 캐시 (DANAWA_CACHE_TTL_MS)
+ *   가격이 하나도 안 나온 결과(차단/빈 페이지일 수 있음)는 DANAWA_EMPTY_CACHE_TTL_MS 동안만
+ *   같은 검색어를 쓰는 상품은 동시에 요청해도 한 번만 조회
+ * - 가격(쇼핑몰가/와우할인가/최저가) + 상품명을 HTML 한 번 훑어서 추출
+ *
+ * 사용처: competitor_analysis.js
+ * 벤치마크: testsprite_tests/danawa_bench.py (저장된 다나와 HTML 재생)
+ */
+const crypto = require('crypto');
+const fs = require('fs');
+const http = require('http');
+const https = require('https');
+const path = require('path');
+const zlib = require('zlib');
+const { createThrottle } = require('./throttle');
+
+const DANAWA_BASE_URL = process.env.DANAWA_BASE_URL || 'https://search.danawa.com';
+const CACHE_DIR = process.env.DANAWA_CACHE_DIR || path.resolve(__dirname, '../../data/cache/danawa');
+const CACHE_TTL_MS = Number(process.env.DANAWA_CACHE_TTL_MS || 24 * 60 * 60 * 1000);
+const EMPTY_CACHE_TTL_MS = Number(process.env.DANAWA_EMPTY_CACHE_TTL_MS || 30 * 60 * 1000);
+const CONCURRENCY = Number(process.env.DANAWA_CONCURRENCY || 4);
+const RPS = Number(process.env.DANAWA_RPS || 1); // 기존 순차 조회(1초 간격)와 같은 속도
+const TIMEOUT_MS = 15000;
+const MAX_BYTES = 2 * 1024 * 1024;
+const MAX_REDIRECTS = 5;
+const USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36';
+const EXTRACTOR_VERSION = 1; // 추출 규칙이 바뀌면 올려서 기존 캐시 무효화
+
+/**
+ * 캐시 키용 검색어 정규화 (유니코드 NFC, 소문자, 공백 1칸)
+ */
+function normalizeQuery(query) {
+  return String(query || '').normalize('NFC').toLowerCase().replace(/\s+/g, ' ').trim();
+}
+
+// ── 단일 패스 추출 ──────────────────────────────────────────
+
+// 패턴별로 전체 매치를 감싼 lookahead alternation — 위치마다 한 번만 시도하고,
+// 패턴별 직전 매치 끝 이전에서 시작한 매치는 버려서 패턴을 각각 /g 로 돌린 것과 같은 결과를 낸다.
+const PRICE = '(\\d{1,3}(?:,\\d{3})+)';
+const EXTRACT_PATTERNS = {
+  // 쇼핑몰 실판매가 (통합검색_상품블로그_유입 뒤 가격)
+  shop: `통합검색_상품블로그_유입[^>]*>[^<]*?${PRICE}원`,
+  // 와우할인가 (쿠팡)
+  wow: `와우할인가<\\/em><\\/span>${PRICE}원`,
+  // 일반 최저가 표시 (low-price 클래스 근처)
+  low: `low-price[^>]*>(?:<[^>]+>)*\\s*${PRICE}원`,
+  // 상품명
+  name: 'prod\\.danawa\\.com[^"]*"[^>]*title="([^"]{5,80})"',
+};
+const KINDS = Object.keys(EXTRACT_PATTERNS);
+const EXTRACT_RE = new RegExp(`(?=${KINDS.map((k) => `(${EXTRACT_PATTERNS[k]})`).join('|')})`, 'g');
+
+function extractDanawa(html) {
+  const found = { shop: [], wow: [], low: [], name: [] };
+  const lastEnd = { shop: 0, wow: 0, low: 0, name: 0 };
+  EXTRACT_RE.lastIndex = 0;
+  let m;
+  while ((m = EXTRACT_RE.exec(html)) !== null) {
+    // 그룹: [전체, 값] × 패턴 수
+    for (let k = 0; k < KINDS.length; k++) {
+      const whole = m[1 + k * 2];
+      if (whole === undefined) continue;
+      const kind = KINDS[k];
+      if (m.index >= lastEnd[kind]) {
+        found[kind].push(m[2 + k * 2]);
+        lastEnd[kind] = m.index + whole.length;
+      }
+      break;
+    }
+    EXTRACT_RE.lastIndex = m.index + 1;
+  }
+
+  const allPrices = [...found.shop, ...found.wow, ...found.low].map((p) => parseInt(p.replace(/,/g, '')));
+  // 가격 범위 필터 + 중복 제거
+  const prices = [...new Set(allPrices.filter((p) => p >= 1000 && p <= 3000000))].slice(0, 30);
+  const products = found.name.map((n) => n.replace(/&amp;/g, '&').trim());
+  return { prices, products, resultCount: prices.length };
+}
+
+// ── HTTP ────────────────────────────────────────────────────
+
+function createAgents(maxSockets) {
+  return {
+    'http:': new http.Agent({ keepAlive: true, maxSockets }),
+    'https:': new https.Agent({ keepAlive: true, maxSockets }),
+  };
+}
+
+/**
+ * GET → 본문 문자열 (리다이렉트 추적, gzip/deflate/br 해제, 최대 MAX_BYTES)
+ */
+function fetchText(url, { agents, timeoutMs = TIMEOUT_MS, redirects = MAX_REDIRECTS } = {}) {
+  return new Promise((resolve, reject) => {
+    const u = new URL(url);
+    const lib = u.protocol === 'https:' ? https : http;
+    const req = lib.get(u, {
+      agent: agents ? agents[u.protocol] : undefined,
+      headers: { 'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate, br' },
+      timeout: timeoutMs,
+    }, (res) => {
+      if (res.statusCode >= 300 && res.statusCode < 400 && res.headers.location) {
+        res.resume();
+        if (redirects <= 0) return reject(new Error('too many redirects'));
+        return resolve(fetchText(new URL(res.headers.location, u).toString(), { agents, timeoutMs, redirects: redirects - 1 }));
+      }
+      if (res.statusCode !== 200) {
+        res.resume();
+        return reject(new Error(`HTTP ${res.statusCode}`));
+      }
+      const enc = res.headers['content-encoding'];
+      const body = enc === 'gzip' ? res.pipe(zlib.createGunzip())
+        : enc === 'deflate' ? res.pipe(zlib.createInflate())
+        : enc === 'br' ? res.pipe(zlib.createBrotliDecompress())
+        : res;
+      const chunks = [];
+      let size = 0;
+      body.on('data', (c) => {
+        size += c.length;
+        if (size > MAX_BYTES) {
+          req.destroy(new Error('response too large'));
+          return;
+        }
+        chunks.push(c);
+      });
+      body.on('end', () => resolve(Buffer.concat(chunks).toString('utf-8')));
+      body.on('error', reject);
+    });
+    req.on('timeout', () => req.destroy(new Error(`timeout ${timeoutMs}ms`)));
+    req.on('error', reject);
+  });
+}
+
+// ── 엔진 ────────────────────────────────────────────────────
+
+class DanawaPricing {
+  constructor({ baseUrl = DANAWA_BASE_URL, cacheDir = CACHE_DIR, ttlMs = CACHE_TTL_MS, emptyTtlMs = EMPTY_CACHE_TTL_MS, concurrency = CONCURRENCY, rps = RPS, useCache = true } = {}) {
+    this.baseUrl = baseUrl.replace(/\/$/, '');
+    this.cacheDir = cacheDir;
+    this.ttlMs = ttlMs;
+    this.emptyTtlMs = emptyTtlMs;
+    this.concurrency = Math.max(1, concurrency);
+    this.agents = createAgents(this.concurrency); // 소켓 수 = 동시 요청 수
+    this._throttle = createThrottle(rps); // 요청 간격 (캐시 히트는 제한 밖)
+    this.useCache = useCache;
+    this.active = 0;
+    this.waiters = [];
+    this.inflight = new Map(); // 정규화 검색어 → Promise (이번 실행 동안 유지)
+    this.stats = { requests: 0, cacheHits: 0, sharedHits: 0, errors: 0 };
+  }
+
+  searchUrl(query) {
+    return `${this.baseUrl}/dsearch.php?query=${encodeURIComponent(query)}&tab=goods`;
+  }
+
+  /**
+   * 검색어 → { prices, products, resultCount, error? }
+   */
+  search(query) {
+    const key = normalizeQuery(query);
+    if (!key) return Promise.resolve({ prices: [], products: [], resultCount: 0 });
+    const pending = this.inflight.get(key);
+    if (pending) {
+      this.stats.sharedHits++;
+      return pending;
+    }
+    const promise = this._search(key, query);
+    this.inflight.set(key, promise);
+    return promise;
+  }
+
+  async _search(key, query) {
+    const cached = this.useCache ? await this._readCache(key) : null;
+    if (cached) {
+      this.stats.cacheHits++;
+      return cached;
+    }
+    await this._acquire();
+    try {
+      await this._throttle();
+      this.stats.requests++;
+      const result = extractDanawa(await fetchText(this.searchUrl(query), { agents: this.agents }));
+      if (this.useCache && (result.prices.length || this.emptyTtlMs > 0)) await this._writeCache(key, result);
+      return result;
+    } catch (e) {
+      this.stats.errors++;
+      this.inflight.delete(key); // 실패는 공유하지 않음 — 다음 상품에서 재시도
+      return { prices: [], products: [], resultCount: 0, error: e.message?.slice(0, 80) };
+    } finally {
+      this._release();
+    }
+  }
+
+  /**
+   * 검색어 목록을 동시에 조회, 입력 순서대로 결과 반환. onResult(i, result) 는 완료 순
+   */
+  async scan(queries, onResult) {
+    const results = new Array(queries.length);
+    await Promise.all(queries.map(async (q, i) => {
+      results[i] = await this.search(q);
+      if (onResult) onResult(i, results[i]);
+    }));
+    return results;
+  }
+
+  close() {
+    for (const agent of Object.values(this.agents)) agent.destroy();
+  }
+
+  // 동시 요청 제한 (캐시 히트는 제한 밖)
+  _acquire() {
+    if (this.active < this.concurrency) {
+      this.active++;
+      return Promise.resolve();
+    }
+    return new Promise((resolve) => this.waiters.push(resolve));
+  }
+
+  _release() {
+    const next = this.waiters.shift();
+    if (next) next();
+    else this.active--;
+  }
+
+  _cacheFile(key) {
+    const hash = crypto.createHash('sha1').update(`v${EXTRACTOR_VERSION}:${key}`).digest('hex');
+    return path.join(this.cacheDir, `${hash}.json`);
+  }
+
+  async _readCache(key) {
+    try {
+      const entry = JSON.parse(await fs.promises.readFile(this._cacheFile(key), 'utf-8'));
+      const ttlMs = entry.result?.prices?.length ? this.ttlMs : this.emptyTtlMs;
+      if (entry.query !== key || Date.now() - entry.fetchedAt > ttlMs) return null;
+      return entry.result;
+    } catch {
+      return null;
+    }
+  }
+
+  async _writeCache(key, result) {
+    const file = this._cacheFile(key);
+    const tmp = `${file}.${process.pid}.tmp`;
+    try {
+      await fs.promises.mkdir(this.cacheDir, { recursive: true });
+      await fs.promises.writeFile(tmp, JSON.stringify({ query: key, fetchedAt: Date.now(), result }));
+      await fs.promises.rename(tmp, file);
+    } catch (e) {
+      console.warn(`  ⚠ 다나와 캐시 저장 실패: ${e.message}`);
+    }
+  }
+}
+
+module.exports = { DanawaPricing, extractDanawa, normalizeQuery, fetchText, CACHE_DIR };
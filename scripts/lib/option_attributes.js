@@ -0,0 +1,242 @@
+/**
+ * 도매꾹 옵션 → 쿠팡 속성(색상/사이즈) 추출 엔진
+ *
+ * - 색상: COLOR_KEYWORDS 로 Aho-Corasick 오토마톤을 모듈 로드 시 1회 구성,
+ *   옵션명을 한 번만 훑어서 (괄호 안 우선) 목록 순서상 가장 앞선 키워드를 찾는다.
+ *   (기존 includes 선형 탐색 2회와 결과 동일)
+ * - 사이즈: 단위 목록을 하나의 정규식으로 컴파일
+ * - 옵션명별 추출 결과 메모이즈 (상한 있음)
+ * - 옵션 조합: 전체 카테시안 곱을 만들지 않고 앞에서부터 limit 개만 생성
+ * - 속성 ↔ 옵션그룹 매칭 규칙은 상품당 1회만 계산
+ * - 기준 구현(Python): testsprite_tests/option_attributes.py
+ *
+ * 사용처: cron_register_product.js
+ *
+ * CLI (TC012 가 Python 구현과 비교할 때 사용):
+ *   node scripts/lib/option_attributes.js eval < input.json
+ *     input : {"names": [...], "cases": [{"options": [...], "attributes": [...], "limit": 30}]}
+ *     output: {"names": [{"color", "size"}], "cases": [[{"label", "priceAdd", "attributes"}]]}
+ */
+
+const COLOR_KEYWORDS = [
+  '다크그레이','라이트그레이','혼합색상',
+  '블랙','화이트','레드','블루','그린','옐로우','핑크','퍼플',
+  '그레이','실버','골드','브라운','베이지','네이비','아이보리',
+  '투명','클리어','혼합','랜덤','오렌지','민트','카키','와인',
+  '크림','차콜','스카이블루','라벤더','코랄','로즈골드','매트블랙'
+];
+
+const SIZE_UNITS = ['cm', 'mm', 'm', '인치'];
+const SIZE_PATTERN = new RegExp(`(\\d+(?:\\.\\d+)?)\\s*(?:${SIZE_UNITS.join('|')})`, 'i');
+
+const DEFAULT_COMBINATION_LIMIT = 30; // 조합 폭발 방지
+const MEMO_MAX = 5000;
+
+// ── Aho-Corasick ────────────────────────────────────────────
+
+/**
+ * 키워드 목록 → 오토마톤. 노드마다 도달 가능한 키워드 중 (목록 순서상) 최우선 rank 와
+ * 그 키워드 길이를 함께 저장해 두면, 출력 링크를 따라갈 필요 없이 노드당 1회 비교로 끝난다.
+ */
+function buildAutomaton(keywords) {
+  const nodes = [{ next: new Map(), fail: 0, out: [] }];
+  keywords.forEach((kw, rank) => {
+    let cur = 0;
+    for (const ch of kw) {
+      let nxt = nodes[cur].next.get(ch);
+      if (nxt === undefined) {
+        nxt = nodes.length;
+        nodes.push({ next: new Map(), fail: 0, out: [] });
+        nodes[cur].next.set(ch, nxt);
+      }
+      cur = nxt;
+    }
+    nodes[cur].out.push({ rank, length: kw.length });
+  });
+
+  // BFS 로 실패 링크 + 출력 병합
+  const queue = [...nodes[0].next.values()];
+  for (let qi = 0; qi < queue.length; qi++) {
+    const u = queue[qi];
+    for (const [ch, v] of nodes[u].next) {
+      let f = nodes[u].fail;
+      while (f !== 0 && !nodes[f].next.has(ch)) f = nodes[f].fail;
+      const target = nodes[f].next.get(ch);
+      nodes[v].fail = target !== undefined && target !== v ? target : 0;
+      nodes[v].out = nodes[v].out.concat(nodes[nodes[v].fail].out);
+      queue.push(v);
+    }
+  }
+  return nodes;
+}
+
+const COLOR_AUTOMATON = buildAutomaton(COLOR_KEYWORDS);
+
+/**
+ * 텍스트 1회 순회 → [전체 최우선 rank, [from,to) 구간 안 최우선 rank] (-1 = 없음)
+ */
+function scanColors(text, from = -1, to = -1) {
+  const nodes = COLOR_AUTOMATON;
+  let state = 0;
+  let best = -1;
+  let bestInRange = -1;
+  for (let i = 0; i < text.length; i++) {
+    const ch = text[i];
+    while (state !== 0 && !nodes[state].next.has(ch)) state = nodes[state].fail;
+    state = nodes[state].next.get(ch) ?? 0;
+    for (const { rank, length } of nodes[state].out) {
+      if (best === -1 || rank < best) best = rank;
+      if (i + 1 <= to && i + 1 - length >= from && (bestInRange === -1 || rank < bestInRange)) bestInRange = rank;
+    }
+  }
+  return [best, bestInRange];
+}
+
+// ── 추출 ────────────────────────────────────────────────────
+
+const memo = new Map();
+
+/**
+ * 옵션명 → { color, size } (없으면 null). 괄호 안 색상이 우선
+ */
+function extractOptionAttributes(optName) {
+  const name = String(optName);
+  let hit = memo.get(name);
+  if (hit) return hit;
+
+  const paren = name.match(/\(([^)]+)\)/);
+  const [best, bestInParen] = paren
+    ? scanColors(name, paren.index + 1, paren.index + 1 + paren[1].length)
+    : scanColors(name);
+  const rank = bestInParen !== -1 ? bestInParen : best;
+  const size = name.match(SIZE_PATTERN);
+  hit = { color: rank === -1 ? null : COLOR_KEYWORDS[rank], size: size ? size[1] : null };
+
+  if (memo.size >= MEMO_MAX) memo.clear();
+  memo.set(name, hit);
+  return hit;
+}
+
+function extractColorFromOption(optName) {
+  return extractOptionAttributes(optName).color;
+}
+
+function extractSizeFromOption(optName) {
+  return extractOptionAttributes(optName).size;
+}
+
+const isColorName = (name) => /색상|색/.test(name);
+const isSizeAttr = (name) => /사이즈|크기/i.test(name);
+
+function isNonAttributeGroup(groupName) {
+  return /발송|배송|수령|택배/.test(groupName);
+}
+
+function cleanOptionForAttribute(optName, attrTypeName) {
+  if (isColorName(attrTypeName)) {
+    return extractColorFromOption(optName) || optName;
+  }
+  if (isSizeAttr(attrTypeName)) {
+    return extractSizeFromOption(optName) || optName;
+  }
+  return optName;
+}
+
+// ── 조합 ────────────────────────────────────────────────────
+
+/**
+ * 옵션 그룹 조합을 첫 그룹이 가장 바깥인 순서로 limit 개까지 생성 (필요한 만큼만 계산)
+ * 값이 없는 그룹이 하나라도 있으면 조합 없음
+ */
+function* iterCombinations(groups, limit = DEFAULT_COMBINATION_LIMIT) {
+  if (groups.some((g) => !g.values || g.values.length === 0)) return;
+  const idx = new Array(groups.length).fill(0);
+  for (let n = 0; n < limit; n++) {
+    yield groups.map((g, j) => ({ groupName: g.groupName, ...g.values[idx[j]] }));
+    // 마지막 그룹부터 자리올림
+    let j = groups.length - 1;
+    while (j >= 0 && ++idx[j] === groups[j].values.length) idx[j--] = 0;
+    if (j < 0) return;
+  }
+}
+
+/**
+ * 속성별로 어떤 옵션 그룹이 값을 채우는지 — 상품당 1회 계산
+ *   always : 그룹 이름만으로 매칭 (동일 이름 / 색상↔색상 / 사이즈↔사이즈)
+ *   ifColor: '선택/옵션' 그룹 + 색상 속성 → 옵션값에 색상 키워드가 있을 때만
+ */
+function compileAttributeRules(groups, attrs) {
+  return attrs.map((a) => {
+    const type = a.attributeTypeName;
+    const rules = [];
+    for (let j = 0; j < groups.length; j++) {
+      const gn = groups[j].groupName || '';
+      if (
+        type === gn ||
+        (isColorName(gn) && isColorName(type)) ||
+        (/사이즈|크기|size/i.test(gn) && isSizeAttr(type))
+      ) {
+        rules.push({ group: j, ifColor: false });
+        break; // 뒤 그룹은 볼 필요 없음
+      }
+      if (/선택|옵션|option/i.test(gn) && isColorName(type)) rules.push({ group: j, ifColor: true });
+    }
+    return rules;
+  });
+}
+
+/**
+ * 옵션 그룹 + 기본 속성 → 조합별 { values, label, priceAdd, attributes }
+ * (비속성 그룹은 호출 전에 걸러낼 것 — isNonAttributeGroup)
+ */
+function buildOptionVariants(groups, attrs, { limit = DEFAULT_COMBINATION_LIMIT } = {}) {
+  const rules = compileAttributeRules(groups, attrs);
+  const variants = [];
+  for (const combo of iterCombinations(groups, limit)) {
+    const attributes = attrs.map((a, i) => {
+      for (const { group, ifColor } of rules[i]) {
+        const c = combo[group];
+        if (!ifColor || extractColorFromOption(c.name)) {
+          return { ...a, attributeValueName: cleanOptionForAttribute(c.name, a.attributeTypeName) };
+        }
+      }
+      return { ...a };
+    });
+    variants.push({
+      values: combo,
+      label: combo.map((c) => c.name).join(' '),
+      priceAdd: combo.reduce((sum, c) => sum + (c.priceAdd || 0), 0),
+      attributes,
+    });
+  }
+  return variants;
+}
+
+module.exports = {
+  COLOR_KEYWORDS,
+  SIZE_UNITS,
+  DEFAULT_COMBINATION_LIMIT,
+  extractOptionAttributes,
+  extractColorFromOption,
+  extractSizeFromOption,
+  isNonAttributeGroup,
+  cleanOptionForAttribute,
+  iterCombinations,
+  buildOptionVariants,
+};
+
+if (require.main === module) {
+  const [cmd] = process.argv.slice(2);
+  if (cmd !== 'eval') {
+    console.error('사용법: node scripts/lib/option_attributes.js eval < input.json');
+    process.exit(1);
+  }
+  const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+  const out = {
+    names: (input.names || []).map(extractOptionAttributes),
+    cases: (input.cases || []).map((c) =>
+      buildOptionVariants(c.options.filter((o) => !isNonAttributeGroup(o.groupName)), c.attributes || [], { limit: c.limit })
+        .map(({ label, priceAdd, attributes }) => ({ label, priceAdd, attributes }))),
+  };
+  console.log(JSON.stringify(out));
+}
@@ -0,0 +1,19 @@
+/**
+ * CLI 진행 로그
+ *
+ * --json 모드에서는 마지막 줄의 요약 JSON 을 벤치마크(testsprite_tests/*_bench.py)가 stdout 에서 파싱하므로
+ * 진행 로그는 stderr 로 보낸다.
+ *
+ * 사용처: pipeline_sourcing.js, competitor_analysis.js
+ */
+const JSON_MODE = process.argv.includes('--json');
+
+/**
+ * 진행 로그 함수 — timestamp 면 줄 앞에 [ISO 시각]
+ */
+function createLogger({ json = JSON_MODE, timestamp = false } = {}) {
+  const write = json ? (...m) => console.error(...m) : (...m) => console.log(...m);
+  return timestamp ? (...m) => write(`[${new Date().toISOString()}]`, ...m) : write;
+}
+
+module.exports = { createLogger, JSON_MODE };
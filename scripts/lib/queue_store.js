@@ -0,0 +1,543 @@
+/**
+ * 등록 대기열 저장소 (append-only 저널 + 인덱스)
+ *
+ * register_queue.json 전체를 읽고 다시 쓰는 대신, 항목 단위로
+ * data/register_queue.jsonl 에 한 줄씩 추가 기록한다.
+ *   {"k":12,"v":{...항목...}}   ← 항목 12 의 최신 값
+ *   {"k":12,"d":1}               ← 항목 12 삭제
+ * 같은 키의 마지막 줄이 유효하며, 쓰레기 줄이 쌓이면 compact() 로 정리.
+ *
+ * - 상태(status) / 도매꾹 상품번호(domeggookProductNo) / 쿠팡 productId 인덱스
+ * - 단건 저장 O(1) (파일 끝에 한 줄 추가), 변경 없는 항목은 기록 생략
+ * - 여러 크론이 동시에 써도 필드 단위로 병합 (쓰기 전후 lock + 재스캔, saveAll 참고)
+ * - 저널이 없으면 기존 register_queue.json 을 자동 import (lock 안에서 1회)
+ *   → 이후 register_queue.json 은 갱신되지 않는 import 용 시드 (현재 상태는 export 로 확인)
+ * - 포맷은 testsprite_tests/queue_store.py 와 동일
+ *
+ * 사용처: cron_register_product.js, cron_stock_monitor.js, pipeline_sourcing.js,
+ *         cron_fix_temp_save.js, cron_product_sync.js, reset_errors.js,
+ *         fix_prices.js, fix_coupang_prices.js
+ *
+ * CLI:
+ *   node scripts/lib/queue_store.js stats
+ *   node scripts/lib/queue_store.js export [out.json]
+ *   node scripts/lib/queue_store.js import <in.json>
+ *   node scripts/lib/queue_store.js compact
+ */
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+const DATA_DIR = path.resolve(__dirname, '../../data');
+const JOURNAL_FILE = path.join(DATA_DIR, 'register_queue.jsonl');
+const LEGACY_JSON_FILE = path.join(DATA_DIR, 'register_queue.json');
+
+const LOCK_STALE_MS = 30 * 1000;
+const LOCK_RETRY_MS = 20;
+const COMPACT_MIN_DEAD = 1000; // 쓰레기 줄이 이 수 이상 + 유효 줄보다 많으면 자동 compact
+const READ_CHUNK = 1 << 20;
+
+function sleepSync(ms) {
+  Atomics.wait(new Int32Array(new SharedArrayBuffer(4)), 0, 0, ms);
+}
+
+/**
+ * fd 의 start 오프셋부터 줄 단위로 읽기 (전체 파일을 메모리에 올리지 않음)
+ * cb(lineString, offset, byteLength)
+ */
+function forEachLine(fd, start, cb) {
+  const chunk = Buffer.allocUnsafe(READ_CHUNK);
+  let pos = start;
+  let carry = Buffer.alloc(0);
+  let lineStart = start;
+  for (;;) {
+    const n = fs.readSync(fd, chunk, 0, READ_CHUNK, pos);
+    if (n === 0) break;
+    pos += n;
+    let buf = carry.length ? Buffer.concat([carry, chunk.subarray(0, n)]) : chunk.subarray(0, n);
+    let from = 0;
+    let nl;
+    while ((nl = buf.indexOf(10, from)) !== -1) {
+      const len = nl - from + 1;
+      if (len > 1) cb(buf.toString('utf-8', from, nl), lineStart, len);
+      lineStart += len;
+      from = nl + 1;
+    }
+    carry = Buffer.from(buf.subarray(from));
+  }
+  // 개행 없는 마지막 줄은 기록 중인 줄로 보고 다음 스캔에서 처리
+  return pos - carry.length;
+}
+
+class QueueStore {
+  constructor(file = JOURNAL_FILE, { legacyFile = LEGACY_JSON_FILE } = {}) {
+    this.file = file;
+    this.lockFile = `${file}.lock`;
+    this.legacyFile = legacyFile;
+    this.fd = null;
+    this.ino = null;
+    this.size = 0;
+    this.nextKey = 1;
+    this.entries = new Map();      // key → { off, len, status, productNo, productId }
+    this.byStatus = new Map();     // status → Set<key>
+    this.byProductNo = new Map();  // domeggookProductNo → Set<key>
+    this.byProductId = new Map();  // productId → key
+    this.byOrigin = new Map();     // sourceUrl + addedAt → key (productId 가 없는 항목의 식별)
+    this.dead = 0;
+    this.loaded = new WeakMap();   // item 객체 → { key, json }
+  }
+
+  // ── 열기 / 인덱스 ──────────────────────────────
+
+  open() {
+    if (this.fd !== null) return this;
+    if (!fs.existsSync(this.file)) {
+      fs.mkdirSync(path.dirname(this.file), { recursive: true });
+      // 크론 여러 개가 동시에 처음 열어도 import 는 한 번만
+      this._withLock(() => {
+        if (fs.existsSync(this.file)) return;
+        if (this.legacyFile && fs.existsSync(this.legacyFile)) {
+          this._rewrite(legacyLines(this.legacyFile));
+        } else {
+          fs.writeFileSync(this.file, '');
+        }
+      });
+    }
+    if (this.fd === null) this._reload();
+    return this;
+  }
+
+  close() {
+    if (this.fd === null) return;
+    if (this.dead >= COMPACT_MIN_DEAD && this.dead > this.entries.size) {
+      this.compact();
+    }
+    fs.closeSync(this.fd);
+    this.fd = null;
+  }
+
+  _reload() {
+    if (this.fd !== null) fs.closeSync(this.fd);
+    this.fd = fs.openSync(this.file, 'r');
+    this.ino = fs.fstatSync(this.fd).ino;
+    this.size = 0;
+    this.nextKey = 1;
+    this.dead = 0;
+    this.entries.clear();
+    this.byStatus.clear();
+    this.byProductNo.clear();
+    this.byProductId.clear();
+    this.byOrigin.clear();
+    this._scan();
+  }
+
+  /** 다른 프로세스가 추가한 줄 반영 (compact 로 파일이 바뀌었으면 전체 재로딩) */
+  _refresh() {
+    let st;
+    try {
+      st = fs.statSync(this.file);
+    } catch {
+      return;
+    }
+    if (st.ino !== this.ino || st.size < this.size) {
+      this._reload();
+    } else if (st.size > this.size) {
+      this._scan();
+    }
+  }
+
+  _scan() {
+    this.size = forEachLine(this.fd, this.size, (line, off, len) => {
+      let rec;
+      try {
+        rec = JSON.parse(line);
+      } catch {
+        this.dead++;
+        return;
+      }
+      if (!Number.isInteger(rec.k)) return;
+      if (rec.k >= this.nextKey) this.nextKey = rec.k + 1;
+      if (this.entries.has(rec.k)) {
+        this._unindex(rec.k);
+        this.dead++;
+      }
+      if (rec.d) {
+        this.dead++;
+        return;
+      }
+      this._index(rec.k, rec.v || {}, off, len);
+    });
+  }
+
+  _index(key, item, off, len) {
+    const entry = {
+      off,
+      len,
+      status: item.status || null,
+      productNo: item.domeggookProductNo != null ? String(item.domeggookProductNo) : null,
+      productId: item.productId != null ? String(item.productId) : null,
+      origin: originOf(item),
+    };
+    this.entries.set(key, entry);
+    addToSet(this.byStatus, entry.status, key);
+    if (entry.productNo) addToSet(this.byProductNo, entry.productNo, key);
+    if (entry.productId) this.byProductId.set(entry.productId, key);
+    if (entry.origin) this.byOrigin.set(entry.origin, key);
+  }
+
+  _unindex(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+    removeFromSet(this.byStatus, entry.status, key);
+    if (entry.productNo) removeFromSet(this.byProductNo, entry.productNo, key);
+    if (entry.productId && this.byProductId.get(entry.productId) === key) {
+      this.byProductId.delete(entry.productId);
+    }
+    if (entry.origin && this.byOrigin.get(entry.origin) === key) {
+      this.byOrigin.delete(entry.origin);
+    }
+    this.entries.delete(key);
+  }
+
+  _read(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+    const buf = Buffer.allocUnsafe(entry.len);
+    fs.readSync(this.fd, buf, 0, entry.len, entry.off);
+    const rec = JSON.parse(buf.toString('utf-8'));
+    const item = rec.v;
+    this.loaded.set(item, { key, json: JSON.stringify(item) });
+    return item;
+  }
+
+  // ── 조회 ───────────────────────────────────────
+
+  count(status) {
+    if (status === undefined) return this.entries.size;
+    return this.byStatus.get(status)?.size || 0;
+  }
+
+  statusCounts() {
+    const out = {};
+    for (const [status, keys] of this.byStatus) out[status] = keys.size;
+    return out;
+  }
+
+  /** 이 저장소에서 읽은 객체면 그 키, 아니면 productId → sourceUrl+addedAt 로 찾은 키 */
+  keyOf(item) {
+    const meta = this.loaded.get(item);
+    if (meta) return meta.key;
+    const byId = item.productId != null ? this.byProductId.get(String(item.productId)) : undefined;
+    if (byId !== undefined) return byId;
+    const origin = originOf(item);
+    return (origin && this.byOrigin.get(origin)) ?? null;
+  }
+
+  get(key) {
+    return this._read(key);
+  }
+
+  getByProductId(productId) {
+    const key = this.byProductId.get(String(productId));
+    return key === undefined ? null : this._read(key);
+  }
+
+  /** 도매꾹 상품번호가 이미 대기열에 있는지 (항목을 읽지 않고 인덱스만 확인) */
+  hasProductNo(productNo) {
+    return (this.byProductNo.get(String(productNo))?.size || 0) > 0;
+  }
+
+  findByProductNo(productNo) {
+    const keys = this.byProductNo.get(String(productNo));
+    if (!keys) return [];
+    return [...keys].sort((a, b) => a - b).map(k => this._read(k));
+  }
+
+  /** 키 순서(= 등록 순서)로 스트리밍. statuses 지정 시 해당 상태 인덱스만 순회 */
+  *iterate({ status } = {}) {
+    let keys;
+    if (status === undefined) {
+      keys = [...this.entries.keys()];
+    } else {
+      const statuses = Array.isArray(status) ? status : [status];
+      keys = statuses.flatMap(s => [...(this.byStatus.get(s) || [])]);
+    }
+    keys.sort((a, b) => a - b);
+    for (const key of keys) {
+      if (!this.entries.has(key)) continue;
+      yield this._read(key);
+    }
+  }
+
+  find(pred, opts) {
+    for (const item of this.iterate(opts)) {
+      if (pred(item)) return item;
+    }
+    return null;
+  }
+
+  filter(pred, opts) {
+    const out = [];
+    for (const item of this.iterate(opts)) {
+      if (!pred || pred(item)) out.push(item);
+    }
+    return out;
+  }
+
+  toArray() {
+    return this.filter();
+  }
+
+  // ── 쓰기 ───────────────────────────────────────
+
+  _withLock(fn) {
+    for (;;) {
+      try {
+        fs.closeSync(fs.openSync(this.lockFile, 'wx'));
+        break;
+      } catch (e) {
+        if (e.code !== 'EEXIST') throw e;
+        try {
+          const age = Date.now() - fs.statSync(this.lockFile).mtimeMs;
+          if (age > LOCK_STALE_MS) fs.unlinkSync(this.lockFile);
+        } catch {}
+        sleepSync(LOCK_RETRY_MS);
+      }
+    }
+    try {
+      this._refresh();
+      return fn();
+    } finally {
+      try { fs.unlinkSync(this.lockFile); } catch {}
+    }
+  }
+
+  _appendLines(lines) {
+    if (!lines.length) return;
+    fs.appendFileSync(this.file, lines.join(''));
+    this._scan();
+  }
+
+  /** 새 항목 추가 → 키 반환 */
+  append(item) {
+    return this.appendMany([item])[0];
+  }
+
+  appendMany(items) {
+    return this._withLock(() => {
+      const keys = [];
+      const lines = items.map(item => {
+        const key = this.nextKey++;
+        const json = JSON.stringify(item);
+        this.loaded.set(item, { key, json });
+        keys.push(key);
+        return `{"k":${key},"v":${json}}\n`;
+      });
+      this._appendLines(lines);
+      return keys;
+    });
+  }
+
+  put(key, item) {
+    this._withLock(() => {
+      const json = JSON.stringify(item);
+      this.loaded.set(item, { key, json });
+      this._appendLines([`{"k":${key},"v":${json}}\n`]);
+    });
+  }
+
+  /** 필드 일부 갱신 (undefined 값은 필드 삭제). 최신 값 기준으로 병합 */
+  update(key, patch) {
+    return this._withLock(() => {
+      const item = this._read(key);
+      if (!item) return null;
+      for (const [k, v] of Object.entries(patch)) {
+        if (v === undefined) delete item[k];
+        else item[k] = v;
+      }
+      const json = JSON.stringify(item);
+      this.loaded.set(item, { key, json });
+      this._appendLines([`{"k":${key},"v":${json}}\n`]);
+      return item;
+    });
+  }
+
+  remove(key) {
+    this._withLock(() => {
+      if (this.entries.has(key)) this._appendLines([`{"k":${key},"d":1}\n`]);
+    });
+  }
+
+  /** 항목을 수정 후 저장 (변경 없으면 기록 생략). 대기열에 없는 항목이면 추가 */
+  save(item) {
+    return this.saveAll([item]);
+  }
+
+  /**
+   * 여러 항목 저장 — 읽어온 시점 대비 바뀐 항목만 한 번에 추가 기록.
+   * 기존 `saveQueue(queue)` 호출을 그대로 대체할 수 있다.
+   * 그 사이 다른 프로세스가 같은 항목을 고쳤으면 이쪽에서 바꾼 필드만 최신 값 위에 병합
+   * (같은 필드를 둘 다 바꿨으면 나중에 저장한 쪽). item 객체도 병합 결과로 맞춰진다.
+   * 읽은 객체가 아닌 사본은 keyOf() 로 기존 항목을 찾아 그 값을 통째로 교체 (중복 추가 안 함).
+   */
+  saveAll(items) {
+    return this._withLock(() => {
+      const lines = [];
+      for (const item of items) {
+        const json = JSON.stringify(item);
+        const meta = this.loaded.get(item);
+        if (meta && meta.json === json) continue;
+        const found = meta ? meta.key : this.keyOf(item);
+        const key = found ?? this.nextKey++;
+        const merged = meta ? this._mergeChanged(key, meta.json, item) : json;
+        this.loaded.set(item, { key, json: merged });
+        lines.push(`{"k":${key},"v":${merged}}\n`);
+      }
+      this._appendLines(lines);
+      return lines.length;
+    });
+  }
+
+  /** 읽은 시점(baseJson) 대비 item 에서 바뀐 최상위 필드만 저널의 최신 값에 적용 → 병합 JSON */
+  _mergeChanged(key, baseJson, item) {
+    const entry = this.entries.get(key);
+    if (!entry) return JSON.stringify(item); // 그 사이 삭제됨 → 이쪽 값으로 다시 기록
+    const buf = Buffer.allocUnsafe(entry.len);
+    fs.readSync(this.fd, buf, 0, entry.len, entry.off);
+    const latest = JSON.parse(buf.toString('utf-8')).v;
+    if (JSON.stringify(latest) === baseJson) return JSON.stringify(item);
+
+    const base = JSON.parse(baseJson);
+    for (const k of new Set([...Object.keys(base), ...Object.keys(item)])) {
+      if (JSON.stringify(base[k]) === JSON.stringify(item[k])) continue;
+      if (item[k] === undefined) delete latest[k];
+      else latest[k] = item[k];
+    }
+    for (const k of Object.keys(item)) if (!(k in latest)) delete item[k];
+    Object.assign(item, latest);
+    return JSON.stringify(item);
+  }
+
+  // ── import / export / compact ────────────────
+
+  /** 유효 항목만 새 파일로 다시 쓰고 교체 (다른 프로세스는 inode 변경을 감지해 재로딩) */
+  compact() {
+    this._withLock(() => this._rewrite(this.iterateRaw()));
+  }
+
+  *iterateRaw() {
+    const keys = [...this.entries.keys()].sort((a, b) => a - b);
+    for (const key of keys) {
+      const entry = this.entries.get(key);
+      const buf = Buffer.allocUnsafe(entry.len);
+      fs.readSync(this.fd, buf, 0, entry.len, entry.off);
+      yield buf.toString('utf-8');
+    }
+  }
+
+  _rewrite(lines) {
+    // 프로세스마다 다른 임시 파일 (같은 이름을 동시에 쓰면 서로 덮어씀)
+    const tmp = path.join(
+      path.dirname(this.file),
+      `.${path.basename(this.file)}.${process.pid}.${crypto.randomBytes(4).toString('hex')}.tmp`
+    );
+    const fd = fs.openSync(tmp, 'w');
+    try {
+      for (const line of lines) fs.writeSync(fd, line);
+      fs.fsyncSync(fd);
+    } finally {
+      fs.closeSync(fd);
+    }
+    fs.renameSync(tmp, this.file);
+    this._reload();
+  }
+
+  /** 기존 register_queue.json 형식(배열) → 저널 전체 교체 */
+  importJson(jsonFile = LEGACY_JSON_FILE) {
+    const lines = legacyLines(jsonFile);
+    this._withLock(() => this._rewrite(lines));
+    return lines.length;
+  }
+
+  /** 저널 → register_queue.json 형식(들여쓰기 2칸 배열)으로 내보내기 */
+  exportJson(jsonFile = LEGACY_JSON_FILE) {
+    const fd = fs.openSync(`${jsonFile}.tmp`, 'w');
+    try {
+      let first = true;
+      fs.writeSync(fd, '[');
+      for (const item of this.iterate()) {
+        const body = JSON.stringify(item, null, 2).replace(/\n/g, '\n  ');
+        fs.writeSync(fd, `${first ? '' : ','}\n  ${body}`);
+        first = false;
+      }
+      fs.writeSync(fd, first ? ']' : '\n]');
+    } finally {
+      fs.closeSync(fd);
+    }
+    fs.renameSync(`${jsonFile}.tmp`, jsonFile);
+    return this.entries.size;
+  }
+}
+
+/** register_queue.json (배열) → 저널 줄 */
+function legacyLines(jsonFile) {
+  const items = JSON.parse(fs.readFileSync(jsonFile, 'utf-8'));
+  return items.map((item, i) => `{"k":${i + 1},"v":${JSON.stringify(item)}}\n`);
+}
+
+/** productId 가 생기기 전에도 변하지 않는 항목 식별자 (대기열 추가 시 정해짐) */
+function originOf(item) {
+  return item.sourceUrl && item.addedAt ? `${item.sourceUrl}\u0000${item.addedAt}` : null;
+}
+
+function addToSet(map, key, value) {
+  let set = map.get(key);
+  if (!set) {
+    set = new Set();
+    map.set(key, set);
+  }
+  set.add(value);
+}
+
+function removeFromSet(map, key, value) {
+  const set = map.get(key);
+  if (!set) return;
+  set.delete(value);
+  if (!set.size) map.delete(key);
+}
+
+/**
+ * 기본 대기열 열기 (저널 없으면 register_queue.json 자동 import)
+ */
+function openQueue(file = JOURNAL_FILE, opts) {
+  return new QueueStore(file, opts).open();
+}
+
+module.exports = { QueueStore, openQueue, JOURNAL_FILE, LEGACY_JSON_FILE };
+
+if (require.main === module) {
+  const [cmd, arg] = process.argv.slice(2);
+  const store = openQueue();
+  switch (cmd) {
+    case 'export':
+      console.log(`export: ${store.exportJson(arg || LEGACY_JSON_FILE)}건 → ${arg || LEGACY_JSON_FILE}`);
+      break;
+    case 'import':
+      if (!arg) {
+        console.error('사용법: node scripts/lib/queue_store.js import <file.json>');
+        process.exit(1);
+      }
+      console.log(`import: ${store.importJson(arg)}건 ← ${arg}`);
+      break;
+    case 'compact': {
+      const before = store.dead;
+      store.compact();
+      console.log(`compact: 쓰레기 ${before}줄 제거, 유효 ${store.count()}건`);
+      break;
+    }
+    default:
+      console.log(`총 ${store.count()}건 (쓰레기 ${store.dead}줄)`);
+      console.log(store.statusCounts());
+  }
+  store.close();
+}
@@ -0,0 +1,272 @@
+/**
+ * 쿠팡 검색태그 확장 엔진 (batch_seo_update.js)
+ *
+ * 기존 태그 + 상품명 키워드 + 동의어/관련어 + 복합어로 검색태그를 최대 20개까지 채운다.
+ * - 동의어 사전은 모듈 로드 시 1회 컴파일: 정확한 키 Map + 소문자 키 역색인
+ *   (태그마다 사전 전체를 소문자 비교로 훑던 루프 대체, 결과 동일)
+ * - 불용어 / 품질 필터 단어는 모듈 상수 (호출마다 Set 재생성 안 함)
+ * - 상품명 토큰화는 정규식 1회 split + 메모이즈 (상한 있음) — 같은 상품명이 반복되는 카탈로그용
+ * - tagCatalogue: 카탈로그 전체 태그를 한 번에 생성하고 기존 태그와 달라진 상품을 표시
+ *   (--diff 모드에서 바뀐 상품만 PUT)
+ * - 기준 구현(Python) / 벤치마크: testsprite_tests/seo_tags.py
+ *
+ * 사용처: batch_seo_update.js
+ *
+ * CLI (seo_tags.py 가 기준 구현과 비교할 때 사용):
+ *   node scripts/lib/seo_tags.js eval < input.json
+ *     input : {"products": [{"pid", "tags", "displayName", "sellerName", "currentTags"?}]}
+ *     output: {"results": [{"pid", "tags", "changed"}]}   (changed: currentTags 없으면 tags 기준)
+ */
+
+const MAX_TAGS = 20;
+const MAX_TAG_LENGTH = 20;
+const MEMO_MAX = 5000;
+
+/**
+ * 한국어 쇼핑 동의어/관련어 사전
+ * key: 기존 태그 → values: 추가할 관련 태그들
+ */
+const SYNONYM_MAP = {
+  // 전자기기
+  '보조배터리': ['충전기', '휴대용충전기', '미니배터리', '급속충전', '대용량배터리'],
+  '이어폰': ['이어폰잭', '오디오', '음악', '유선이어폰', '이어버드'],
+  'C타입': ['USB-C', 'Type-C', '타입C', 'C타입충전'],
+  'USB': ['USB충전', '유에스비'],
+  '충전': ['충전식', '무선충전', '급속충전'],
+  '강화유리': ['보호필름', '스크린보호', '액정필름', '강화필름', '유리필름'],
+  '풀커버': ['풀커버필름', '전면보호'],
+  '필름': ['보호필름', '액정필름', '스킨'],
+  '카메라': ['카메라보호', '카메라필름', '렌즈보호'],
+  '선풍기': ['미니선풍기', '휴대선풍기', '탁상선풍기', '팬'],
+  '클립형': ['집게형', '클립온', '거치형'],
+  'VR': ['VR안경', '가상현실', '3D안경', 'VR기기'],
+  '모터': ['모터제어', '속도제어', '전동모터'],
+  'PWM': ['속도컨트롤러', '전압제어'],
+  'DC': ['직류', 'DC모터'],
+  'LCD': ['디스플레이', '화면', '전자표시'],
+  '계수기': ['카운터', '측정기', '수량계'],
+
+  // 뷰티/화장품
+  '메이크업': ['화장', '뷰티', '코스메틱', '기초화장'],
+  '파운데이션': ['베이스메이크업', '파데', '파운데이션퍼프'],
+  '퍼프': ['화장퍼프', '메이크업도구', '뷰티툴', '스펀지'],
+  '선크림': ['자외선차단', '썬크림', 'SPF', 'UV차단'],
+  '물광': ['광채', '윤기', '글로우'],
+  '블랙헤드': ['모공관리', '피지', '클렌저', '각질'],
+  '세안': ['세안용품', '클렌징', '폼클렌징', '세수'],
+  '거품기': ['거품망', '폼클렌저', '버블', '거품네트'],
+  '핸드크림': ['수분크림', '핸드케어', '보습크림', '핸드로션'],
+
+  // 패션/액세서리
+  '키링': ['열쇠고리', '키홀더', '가방고리', '장식'],
+  '파우치': ['미니파우치', '수납파우치', '화장품파우치', '가방'],
+  '양말': ['발목양말', '기능성양말', '패션양말'],
+  '보트양말': ['덧신', '페이크삭스', '실리콘양말', '슬립온양말'],
+  '페이크삭스': ['덧신', '보트양말', '안보이는양말'],
+  '모자': ['캡', '비니', '햇', '방한모자'],
+  '겨울모자': ['비니', '니트모자', '방한모자', '털모자'],
+  '비녀': ['머리핀', '한복장신구', '헤어핀', '뒤꽂이', '머리장식'],
+  '뒤꽂이': ['비녀', '한복머리장식', '헤어스틱'],
+  '운동화': ['스니커즈', '신발', '캐주얼화'],
+  '방한': ['보온', '겨울', '따뜻한', '방한용품'],
+
+  // 생활용품
+  '텀블러': ['보온병', '물병', '보냉컵', '텀블러컵', '스텐텀블러'],
+  '대용량': ['빅사이즈', '점보', '가성비'],
+  '빨대': ['빨대컵', '스테인리스빨대', '실리콘빨대'],
+  '바구니': ['수납함', '정리함', '수납바구니', '정리바구니'],
+  '욕실': ['욕실용품', '화장실', '목욕용품', '욕실수납'],
+  '가위': ['문구가위', '공작가위', '사무용가위', '다용도가위'],
+
+  // 완구/취미
+  '블록': ['조립블록', '레고호환', '장난감', '피규어'],
+  '로봇': ['합체로봇', '변신로봇', '로봇장난감'],
+  '합체': ['합체변신', '변신합체', '6종합체'],
+  '굿즈': ['캐릭터상품', '피규어', '팬시', 'MD상품'],
+  '배지': ['브로치', '핀배지', '뱃지', '핀'],
+
+  // 자전거
+  '자전거': ['사이클', '라이딩', '바이크'],
+  '가민': ['Garmin', '속도계', '자전거컴퓨터'],
+  '거치대': ['마운트', '홀더', '브라켓'],
+
+  // 기타
+  '손목시계': ['시계', '워치', '패션시계', '아날로그시계'],
+  '커플': ['커플아이템', '커플시계', '남녀공용'],
+  '임밍아웃': ['임신축하', '태교', '임신소식', '임신알림'],
+  '연필': ['필기구', '색연필', '문구'],
+  '채점': ['첨삭', '교육용', '학교용품', '선생님'],
+  '완장': ['암밴드', '캡틴완장', '주장밴드', '스포츠밴드'],
+};
+
+// 불용어 (소문자 비교)
+const STOPWORDS = new Set([
+  '및', '등', '외', '용', '형', '개', '개입', '1개', '세트',
+  'the', 'a', 'an', 'of', 'for', 'and', 'or', 'with', 'from',
+  '제공', '포함', '호환', '가능',
+]);
+
+// 품질 필터: 의미없는 조각
+const JUNK_WORDS = new Set([
+  '주변', '작은', '비행사와', '봉투제', '저소', '간결한',
+  '대비색', '보이지', '나른한', '수치',
+]);
+
+// ── 동의어 사전 컴파일 ──────────────────────────────────────
+
+/**
+ * SYNONYM_MAP → { exact: Map(키 → 값), lower: Map(소문자 키 → 값 목록, 사전 순서) }
+ * 대소문자만 다른 키가 여럿이면 lower 쪽에 사전 순서대로 이어 붙인다.
+ */
+function compileSynonyms(map) {
+  const exact = new Map();
+  const lower = new Map();
+  for (const [key, vals] of Object.entries(map)) {
+    exact.set(key, vals);
+    const k = key.toLowerCase();
+    const merged = lower.get(k);
+    lower.set(k, merged ? merged.concat(vals) : vals);
+  }
+  return { exact, lower };
+}
+
+const SYNONYMS = compileSynonyms(SYNONYM_MAP);
+
+/** 태그의 동의어/관련어 (정확한 키 → 소문자 키 순서) — 없으면 null */
+function lookupSynonyms(tag) {
+  const exact = SYNONYMS.exact.get(tag);
+  const lower = SYNONYMS.lower.get(tag.toLowerCase());
+  if (!exact) return lower || null;
+  return lower && lower !== exact ? exact.concat(lower) : exact;
+}
+
+// ── 토큰화 ─────────────────────────────────────────────────
+
+// 한글/영문/숫자/_ 가 아닌 문자 연속 = 구분자 (기존: 치환 후 공백 split 과 같은 토큰)
+const TOKEN_SPLIT = /[^\w가-힣]+/;
+const BRAND_TAG = /\[.*?\]/g;
+
+const memo = new Map();
+
+/**
+ * 상품명에서 의미 있는 키워드 추출 (2자 이상, 불용어 제외, 중복 제거)
+ * 반환 배열은 메모이즈 캐시와 공유 — 수정하지 말 것
+ */
+function extractKeywords(text) {
+  if (!text) return [];
+  let hit = memo.get(text);
+  if (hit) return hit;
+
+  const seen = new Set();
+  for (const t of text.replace(BRAND_TAG, ' ').split(TOKEN_SPLIT)) {
+    if (t.length >= 2 && !STOPWORDS.has(t.toLowerCase())) seen.add(t);
+  }
+  hit = [...seen];
+
+  if (memo.size >= MEMO_MAX) memo.clear();
+  memo.set(text, hit);
+  return hit;
+}
+
+/**
+ * 2개 키워드 조합으로 복합 태그 생성 (합친 길이 10자 이하만)
+ * 키워드는 모두 2자 이상이므로 8자 넘는 키워드는 어떤 조합에도 못 들어감 → 미리 제외
+ */
+function generateCompoundTags(keywords, maxCount = 5) {
+  const short = keywords.filter(k => k.length >= 2 && k.length <= 8);
+  const compounds = [];
+  for (let i = 0; i < short.length && compounds.length < maxCount; i++) {
+    for (let j = i + 1; j < short.length && compounds.length < maxCount; j++) {
+      const k1 = short[i], k2 = short[j];
+      if (k1.length + k2.length <= 10) compounds.push(k1 + k2);
+    }
+  }
+  return compounds;
+}
+
+function isQualityTag(t) {
+  if (t.length < 2) return false;
+  if (/^\d{1,2}$/.test(t)) return false; // 1-2자리 순수 숫자 제거
+  return !JUNK_WORDS.has(t);
+}
+
+/**
+ * 태그를 최대 20개까지 확장
+ * 1) 기존 태그 + 상품명(displayName + sellerName) 키워드
+ * 2) 1) 의 각 태그 동의어/관련어
+ * 3) 20개 미만이면 상품명 키워드 복합어
+ * 4) 20자로 자르고 품질 필터
+ */
+function expandTags(existingTags, displayName, sellerName) {
+  const tagSet = new Set();
+  for (const t of existingTags || []) {
+    const trimmed = t.trim();
+    if (trimmed) tagSet.add(trimmed);
+  }
+
+  const nameKeywords = extractKeywords(`${displayName} ${sellerName}`);
+  for (const k of nameKeywords) tagSet.add(k);
+
+  for (const tag of [...tagSet]) {
+    const synonyms = lookupSynonyms(tag);
+    if (synonyms) for (const s of synonyms) tagSet.add(s);
+  }
+
+  if (tagSet.size < MAX_TAGS) {
+    for (const c of generateCompoundTags(nameKeywords, MAX_TAGS - tagSet.size)) tagSet.add(c);
+  }
+
+  const result = [];
+  for (const tag of tagSet) {
+    const t = tag.slice(0, MAX_TAG_LENGTH);
+    if (!isQualityTag(t)) continue;
+    result.push(t);
+    if (result.length >= MAX_TAGS) break;
+  }
+  return result;
+}
+
+/** 두 태그 목록이 (순서 무관, 앞뒤 공백 무시) 다른지 */
+function tagsChanged(oldTags, newTags) {
+  const before = new Set((oldTags || []).map(t => String(t).trim()).filter(Boolean));
+  const after = new Set((newTags || []).map(t => String(t).trim()).filter(Boolean));
+  if (before.size !== after.size) return true;
+  for (const t of after) if (!before.has(t)) return true;
+  return false;
+}
+
+/**
+ * 카탈로그 전체 태그 생성
+ * products: [{pid, tags, displayName, sellerName}]
+ * currentTags(product): 비교 기준 태그 (기본: product.tags) — 이전 실행에서 이미 보낸 태그 등
+ * → [{pid, tags, changed}] (입력 순서)
+ */
+function tagCatalogue(products, { currentTags = (p) => p.tags } = {}) {
+  return products.map((p) => {
+    const tags = expandTags(p.tags || [], p.displayName || '', p.sellerName || '');
+    return { pid: p.pid, tags, changed: tagsChanged(currentTags(p), tags) };
+  });
+}
+
+module.exports = {
+  SYNONYM_MAP,
+  STOPWORDS,
+  JUNK_WORDS,
+  MAX_TAGS,
+  extractKeywords,
+  generateCompoundTags,
+  expandTags,
+  tagsChanged,
+  tagCatalogue,
+};
+
+if (require.main === module) {
+  const [cmd] = process.argv.slice(2);
+  if (cmd !== 'eval') {
+    console.error('사용법: node scripts/lib/seo_tags.js eval < input.json');
+    process.exit(1);
+  }
+  const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+  const results = tagCatalogue(input.products || [], { currentTags: (p) => p.currentTags || p.tags });
+  console.log(JSON.stringify({ results }));
+}
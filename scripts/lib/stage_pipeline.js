@@ -0,0 +1,182 @@
+/**
+ * 스트리밍 단계 파이프라인 (bounded 채널 + 단계별 카운터)
+ *
+ * 단계마다 입력 채널에서 항목을 꺼내 handle 을 돌리고, emit 으로 다음 단계 채널에 넘긴다.
+ * 앞 단계가 끝날 때까지 기다리지 않고 항목 단위로 흘러간다.
+ * - 채널은 capacity 개까지만 쌓임 → 다음 단계가 밀리면 emit 이 대기 (backpressure)
+ * - concurrency: 단계 안에서 동시에 처리하는 항목(배치) 수
+ * - batchSize: 지정하면 handle 이 배열을 받음 (최대 batchSize 개, 쌓인 게 부족하면 lingerMs 까지 더 모음)
+ * - 단계별 in/out/errors, 처리 시간(busyMs, emit 대기 포함), emit 대기(blockedMs), 분당 처리량
+ *
+ * 사용처: pipeline_sourcing.js
+ * 벤치마크: testsprite_tests/sourcing_bench.py
+ */
+const { performance } = require('perf_hooks');
+
+const DONE = Symbol('done');
+const TIMEOUT = Symbol('timeout');
+
+class Channel {
+  constructor(capacity = 64) {
+    this.capacity = Math.max(1, capacity);
+    this.items = [];
+    this.closed = false;
+    this.readers = []; // 항목을 기다리는 소비자 resolve
+    this.writers = []; // 빈 자리를 기다리는 생산자 resolve
+  }
+
+  async push(item) {
+    if (this.closed) throw new Error('channel closed');
+    while (!this.readers.length && this.items.length >= this.capacity) {
+      await new Promise((resolve) => this.writers.push(resolve));
+      if (this.closed) throw new Error('channel closed');
+    }
+    const reader = this.readers.shift();
+    if (reader) reader(item);
+    else this.items.push(item);
+  }
+
+  /** 다음 항목 (닫혔고 비었으면 DONE) */
+  shift() {
+    if (this.items.length) return Promise.resolve(this._take());
+    if (this.closed) return Promise.resolve(DONE);
+    return new Promise((resolve) => this.readers.push(resolve));
+  }
+
+  /** 최대 max 개 (첫 항목은 기다리고, 나머지는 lingerMs 까지만) — 닫혔고 비었으면 DONE */
+  async shiftBatch(max, lingerMs = 0) {
+    const first = await this.shift();
+    if (first === DONE) return DONE;
+    const batch = [first];
+    while (batch.length < max) {
+      if (this.items.length) {
+        batch.push(this._take());
+        continue;
+      }
+      if (this.closed || lingerMs <= 0) break;
+      const next = await this._shiftWithin(lingerMs);
+      if (next === DONE || next === TIMEOUT) break;
+      batch.push(next);
+    }
+    return batch;
+  }
+
+  close() {
+    this.closed = true;
+    for (const reader of this.readers.splice(0)) reader(DONE);
+    for (const writer of this.writers.splice(0)) writer();
+  }
+
+  get size() {
+    return this.items.length;
+  }
+
+  _take() {
+    const item = this.items.shift();
+    const writer = this.writers.shift();
+    if (writer) writer();
+    return item;
+  }
+
+  _shiftWithin(ms) {
+    return new Promise((resolve) => {
+      const reader = (item) => {
+        clearTimeout(timer);
+        resolve(item);
+      };
+      const timer = setTimeout(() => {
+        const i = this.readers.indexOf(reader);
+        if (i !== -1) this.readers.splice(i, 1);
+        resolve(TIMEOUT);
+      }, ms);
+      this.readers.push(reader);
+    });
+  }
+}
+
+class StageStats {
+  constructor(name) {
+    this.name = name;
+    this.in = 0;
+    this.out = 0;
+    this.errors = 0;
+    this.busyMs = 0;
+    this.blockedMs = 0;
+    this.startedAt = null;
+    this.endedAt = null;
+  }
+
+  toJSON() {
+    const elapsedMs = this.startedAt === null ? 0 : (this.endedAt ?? performance.now()) - this.startedAt;
+    const perMin = (n) => (elapsedMs > 0 ? Math.round((n * 60000) / elapsedMs) : 0);
+    return {
+      name: this.name,
+      in: this.in,
+      out: this.out,
+      errors: this.errors,
+      busyMs: Math.round(this.busyMs),
+      blockedMs: Math.round(this.blockedMs),
+      elapsedMs: Math.round(elapsedMs),
+      inPerMin: perMin(this.in),
+      outPerMin: perMin(this.out),
+    };
+  }
+}
+
+async function runStage(stage, input, output, stats) {
+  const { concurrency = 1, batchSize = 0, lingerMs = 0, handle, onError } = stage;
+
+  const emit = async (item) => {
+    stats.out++;
+    if (!output) return;
+    const t0 = performance.now();
+    await output.push(item);
+    stats.blockedMs += performance.now() - t0;
+  };
+
+  const worker = async () => {
+    for (;;) {
+      const work = batchSize ? await input.shiftBatch(batchSize, lingerMs) : await input.shift();
+      if (work === DONE) return;
+      const n = batchSize ? work.length : 1;
+      stats.in += n;
+      if (stats.startedAt === null) stats.startedAt = performance.now();
+      const t0 = performance.now();
+      try {
+        await handle(work, emit);
+      } catch (e) {
+        stats.errors += n;
+        if (onError) onError(e, work);
+      }
+      stats.busyMs += performance.now() - t0;
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.max(1, concurrency) }, worker));
+  stats.endedAt = performance.now();
+  if (output) output.close();
+}
+
+/**
+ * source(배열/이터러블/async 이터러블) → stages 순서대로 흘려보냄. 끝나면 단계별 통계 배열
+ * stage: { name, handle(itemOrBatch, emit), concurrency?, batchSize?, lingerMs?, onError?(err, work) }
+ * 마지막 단계의 emit 은 out 카운트만 올림
+ */
+async function runStages(source, stages, { capacity = 64 } = {}) {
+  const channels = stages.map(() => new Channel(capacity));
+  const stats = stages.map((s) => new StageStats(s.name));
+
+  const feed = (async () => {
+    try {
+      for await (const item of source) await channels[0].push(item);
+    } finally {
+      channels[0].close();
+    }
+  })();
+  const workers = stages.map((s, i) => runStage(s, channels[i], channels[i + 1] || null, stats[i]));
+
+  await Promise.all([feed, ...workers]);
+  return stats.map((s) => s.toJSON());
+}
+
+module.exports = { Channel, StageStats, runStages, DONE };
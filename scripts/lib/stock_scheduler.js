@@ -0,0 +1,252 @@
+/**
+ * 재고 모니터링 스케줄러 (상품별 다음 확인 시각 + 변동성 기반 적응형 주기)
+ *
+ * 매 실행마다 전체 활성 상품을 조회하는 대신, 확인 시각이 된 상품만 골라
+ * 최대 batchSize 개를 확인한다.
+ *   - 변동성: 확인할 때마다 재고/가격 변동 여부와 경과 시간을 감쇠 누적 → 시간당 변동 추정치(rate)
+ *   - 주기 = TARGET_CHANGES_PER_CHECK / rate (MIN~MAX) → 확인 1회당 변동 기대값이 일정하도록
+ *     (자주 바뀌는 상품은 1시간, 거의 안 바뀌는 상품은 기존 크론 주기인 6시간 —
+ *      STOCK_CHECK_MAX_INTERVAL_MS 로 늘리면(예: 24시간) 조회가 더 줄지만 그만큼 늦게 감지)
+ *   - 조회 실패 시 ERROR_RETRY 후 재시도 (연속 실패면 두 배씩)
+ *   - ETag / 응답 해시를 저장해 두고 변하지 않았으면 판정을 건너뜀
+ *
+ * 상태는 data/stock_schedule.jsonl 에 append-only 로 기록 (같은 키의 마지막 줄이 유효)
+ *   {"k":"16041404905","v":{"nextCheckAt":..., "intervalMs":..., "changes":..., "hours":..., "hash":..., "etag":...}}
+ * 확인한 상품만 한 줄씩 추가하고, 쓰레기 줄이 쌓이면 close() 시 compact.
+ *
+ * 정책(nextInterval)은 testsprite_tests/stock_scheduler.py 와 동일 (TC013 이 비교)
+ *
+ * 사용처: cron_stock_monitor.js
+ *
+ * CLI:
+ *   node scripts/lib/stock_scheduler.js stats
+ *   node scripts/lib/stock_scheduler.js eval < input.json   ← {"sequences": [[[changed, 경과시간h], ...]]} → 주기 목록
+ */
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+const SCHEDULE_FILE = path.resolve(__dirname, '../../data/stock_schedule.jsonl');
+
+const HOUR = 60 * 60 * 1000;
+const MIN_INTERVAL_MS = Number(process.env.STOCK_CHECK_MIN_INTERVAL_MS || 1 * HOUR);
+const MAX_INTERVAL_MS = Number(process.env.STOCK_CHECK_MAX_INTERVAL_MS || 6 * HOUR); // 기존 전체 확인 주기보다 길게는 명시적으로만
+const ERROR_RETRY_MS = Number(process.env.STOCK_CHECK_ERROR_RETRY_MS || 30 * 60 * 1000);
+const TARGET_CHANGES_PER_CHECK = 0.25;
+const DECAY = 0.8;          // 확인 1회마다 과거 이력 가중치
+const PRIOR_CHANGES = 0.25; // 사전값: 6시간에 0.25회 → 처음 보는 상품은 6시간 주기 (기존 크론과 같음)
+const PRIOR_HOURS = 6;
+const VOLATILE_RATE = 0.1;  // stats() 의 volatile 기준 (시간당)
+const JITTER = 0.1;         // ±10% — 같은 시각에 몰리지 않도록
+const COMPACT_MIN_DEAD = 1000;
+
+/**
+ * 이번 확인 결과(변동 여부, 지난 확인 후 경과)를 반영한 감쇠 누적값 / 추정 변동률 / 다음 주기
+ */
+function nextInterval(prev, changed, elapsedMs, { minMs = MIN_INTERVAL_MS, maxMs = MAX_INTERVAL_MS } = {}) {
+  const changes = (prev ? prev.changes : 0) * DECAY + (changed ? 1 : 0);
+  const hours = (prev ? prev.hours : 0) * DECAY + elapsedMs / HOUR;
+  const rate = (changes + PRIOR_CHANGES) / (hours + PRIOR_HOURS); // 시간당 추정 변동 횟수
+  const intervalMs = Math.round(Math.min(maxMs, Math.max(minMs, (TARGET_CHANGES_PER_CHECK / rate) * HOUR)));
+  return { changes, hours, rate, intervalMs };
+}
+
+/**
+ * 재고 판정에 쓰는 필드만으로 만든 해시 (응답의 다른 필드 변화는 무시)
+ */
+function stockHash(stock) {
+  const key = [stock.available, stock.soldOut, stock.ended, stock.price, stock.saleStatus].join('|');
+  return crypto.createHash('sha1').update(key).digest('hex').slice(0, 16);
+}
+
+class StockScheduler {
+  constructor(file = SCHEDULE_FILE, { minMs = MIN_INTERVAL_MS, maxMs = MAX_INTERVAL_MS, errorRetryMs = ERROR_RETRY_MS, now = Date.now } = {}) {
+    this.file = file;
+    this.minMs = minMs;
+    this.maxMs = maxMs;
+    this.errorRetryMs = errorRetryMs;
+    this.now = now;
+    this.entries = new Map(); // key → entry
+    this.dirty = new Map();   // 이번 실행에서 바뀐 entry (flush 대상)
+    this.persisted = new Set(); // 파일에 줄이 있는 키 (다시 쓰면 이전 줄은 쓰레기)
+    this.dead = 0;
+  }
+
+  open() {
+    if (!fs.existsSync(this.file)) return this;
+    for (const line of fs.readFileSync(this.file, 'utf-8').split('\n')) {
+      if (!line) continue;
+      let rec;
+      try {
+        rec = JSON.parse(line);
+      } catch {
+        continue; // 기록 중 끊긴 줄
+      }
+      if (this.persisted.has(rec.k)) this.dead++;
+      this.persisted.add(rec.k);
+      if (rec.d) this.entries.delete(rec.k);
+      else this.entries.set(rec.k, rec.v);
+    }
+    return this;
+  }
+
+  get(key) {
+    return this.entries.get(String(key));
+  }
+
+  /**
+   * 확인 시각이 된 키를 오래 밀린 순으로 최대 limit 개 (처음 보는 키가 가장 먼저)
+   */
+  due(keys, limit = Infinity) {
+    const now = this.now();
+    const due = [];
+    for (const key of keys) {
+      const e = this.entries.get(String(key));
+      const at = e ? e.nextCheckAt : 0;
+      if (at <= now) due.push([at, key]);
+    }
+    due.sort((a, b) => a[0] - b[0]);
+    return due.slice(0, limit).map(([, key]) => key);
+  }
+
+  /**
+   * 조회 결과 반영 → { changed, unchanged, entry }
+   * stock: checkDomeggookStock 결과 + { hash, etag, notModified }  (notModified = HTTP 304)
+   */
+  record(key, stock = {}) {
+    key = String(key);
+    const { hash = null, etag = null, notModified = false, available, soldOut, ended, price, saleStatus, reason } = stock;
+    const prev = this.entries.get(key);
+    const now = this.now();
+    const sameContent = notModified || (prev && hash !== null && prev.hash === hash);
+    // 처음 보는 상품은 기준값만 저장 (변동으로 세지 않음)
+    const changed = Boolean(prev) && !sameContent;
+    const elapsedMs = prev?.checkedAt !== undefined ? Math.max(0, now - prev.checkedAt) : 0;
+    const { changes, hours, intervalMs } = nextInterval(prev, changed, elapsedMs, { minMs: this.minMs, maxMs: this.maxMs });
+    const entry = {
+      nextCheckAt: now + jitter(intervalMs),
+      intervalMs,
+      changes,
+      hours,
+      hash: notModified ? prev?.hash ?? null : hash,
+      etag: etag || (notModified ? prev?.etag ?? null : null),
+      // 304 일 때 판정에 재사용할 마지막 결과
+      stock: notModified ? prev?.stock ?? null : { available, soldOut, ended, price, saleStatus, reason },
+      checkedAt: now,
+      changedAt: changed ? now : prev?.changedAt ?? now,
+      errors: 0,
+    };
+    this._set(key, entry);
+    return { changed, unchanged: Boolean(prev) && sameContent, entry };
+  }
+
+  /**
+   * 조회 실패 — 변동 이력은 그대로 두고 ERROR_RETRY 후 재시도 (checkedAt 도 유지)
+   */
+  recordError(key) {
+    key = String(key);
+    const prev = this.entries.get(key);
+    const now = this.now();
+    const errors = (prev?.errors || 0) + 1;
+    // 연속 실패 시 재시도 간격을 두 배씩 (최대 MAX)
+    const retry = Math.min(this.maxMs, this.errorRetryMs * 2 ** (errors - 1));
+    this._set(key, { ...(prev || { intervalMs: this.minMs, changes: 0, hours: 0, hash: null, etag: null }), nextCheckAt: now + retry, errors });
+  }
+
+  /** 활성 목록에서 빠진 상품 정리 */
+  prune(activeKeys) {
+    const keep = new Set([...activeKeys].map(String));
+    for (const key of [...this.entries.keys()]) {
+      if (!keep.has(key)) {
+        this.entries.delete(key);
+        this.dirty.set(key, null);
+      }
+    }
+  }
+
+  _set(key, entry) {
+    this.entries.set(key, entry);
+    this.dirty.set(key, entry);
+  }
+
+  /** 바뀐 entry 만 파일 끝에 추가 */
+  flush() {
+    if (this.dirty.size === 0) return 0;
+    const lines = [];
+    for (const [k, v] of this.dirty) {
+      lines.push(JSON.stringify(v ? { k, v } : { k, d: 1 }));
+      if (this.persisted.has(k)) this.dead++;
+      this.persisted.add(k);
+    }
+    fs.mkdirSync(path.dirname(this.file), { recursive: true });
+    fs.appendFileSync(this.file, lines.join('\n') + '\n');
+    const n = this.dirty.size;
+    this.dirty.clear();
+    return n;
+  }
+
+  close() {
+    this.flush();
+    if (this.dead >= COMPACT_MIN_DEAD && this.dead > this.entries.size) this.compact();
+  }
+
+  compact() {
+    const tmp = `${this.file}.tmp`;
+    const lines = [...this.entries].map(([k, v]) => JSON.stringify({ k, v }));
+    fs.writeFileSync(tmp, lines.length ? lines.join('\n') + '\n' : '');
+    fs.renameSync(tmp, this.file);
+    this.persisted = new Set(this.entries.keys());
+    this.dead = 0;
+  }
+
+  stats() {
+    const now = this.now();
+    let due = 0;
+    let volatile = 0;
+    for (const e of this.entries.values()) {
+      if (e.nextCheckAt <= now) due++;
+      if ((e.changes + PRIOR_CHANGES) / (e.hours + PRIOR_HOURS) >= VOLATILE_RATE) volatile++;
+    }
+    return { total: this.entries.size, due, volatile, dead: this.dead };
+  }
+}
+
+function jitter(ms) {
+  return Math.round(ms * (1 + (Math.random() * 2 - 1) * JITTER));
+}
+
+/**
+ * items 를 최대 concurrency 개씩 동시에 처리 (순서 무관)
+ */
+async function runPool(items, concurrency, fn) {
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const i = next++;
+      await fn(items[i], i);
+    }
+  };
+  await Promise.all(Array.from({ length: Math.max(1, Math.min(concurrency, items.length)) }, worker));
+}
+
+module.exports = { StockScheduler, nextInterval, stockHash, runPool, SCHEDULE_FILE, MIN_INTERVAL_MS, MAX_INTERVAL_MS };
+
+if (require.main === module) {
+  const [cmd] = process.argv.slice(2);
+  if (cmd === 'eval') {
+    // {"sequences": [[[changed, 경과시간h], ...]], "minMs"?, "maxMs"?} → 확인 이력별 주기 목록 (jitter 없음)
+    const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+    const opts = { minMs: input.minMs ?? MIN_INTERVAL_MS, maxMs: input.maxMs ?? MAX_INTERVAL_MS };
+    const out = (input.sequences || []).map((seq) => {
+      let prev = null;
+      return seq.map(([changed, hours]) => {
+        prev = nextInterval(prev, changed, hours * HOUR, opts);
+        return prev.intervalMs;
+      });
+    });
+    console.log(JSON.stringify(out));
+  } else {
+    const s = new StockScheduler().open();
+    console.log(s.stats());
+  }
+}
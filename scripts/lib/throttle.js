@@ -0,0 +1,22 @@
+/**
+ * 호출 간 최소 간격 (초당 rps 회, 0 이하면 제한 없음)
+ *
+ * 반환한 함수를 호출 직전에 await — 다음 슬롯을 동기적으로 예약하므로 동시에 부른 쪽도 순서대로 간격을 둔다.
+ * 같은 API 를 여러 워커/단계가 나눠 쓸 때는 throttle 하나를 공유한다.
+ *
+ * 사용처: pipeline_sourcing.js (도매꾹 search + enrich), cron_stock_monitor.js (도매꾹, 쿠팡),
+ *        lib/danawa_pricing.js (다나와 검색)
+ */
+function createThrottle(rps) {
+  const interval = rps > 0 ? 1000 / rps : 0;
+  let nextAt = 0;
+  return async () => {
+    if (!interval) return;
+    const now = Date.now();
+    const wait = Math.max(0, nextAt - now);
+    nextAt = Math.max(now, nextAt) + interval;
+    if (wait) await new Promise((r) => setTimeout(r, wait));
+  };
+}
+
+module.exports = { createThrottle };
@@ -6,9 +6,19 @@
  * 1. candidate_keywords.json에서 score 기반 키워드 추출 (>=80 우선, >=50 일반, <50 스킵)
  * 2. 트위터 인텔에서 model/agent 카테고리 키워드 병합
  * 3. keyword_history.json으로 최근 7일 내 중복 키워드 스킵
- * 4. 각 키워드로 도매꾹 API 검색 (상위 3개, 1,000~50,000원)
- * 5. 마진 계산 → 마진율 30% 이상만 통과
- * 6. register_queue.json에 pending으로 추가 (중복 방지)
+ * 4. 키워드들을 단계 파이프라인으로 흘려보냄 (lib/stage_pipeline.js — 단계 사이 bounded 채널)
+ *    search  : 도매꾹 API 검색 (상위 3개, 1,000~50,000원)
+ *    dedup   : MOQ/블랙리스트 + 기존 대기열 상품번호 인덱스로 중복 제거
+ *    enrich  : 상세 조회 (동시 ENRICH_CONCURRENCY 개, 재시도) + 이미지 검사
+ *    margin  : 모인 상품을 한 번에 마진 계산 → 마진율 30% 이상만 통과
+ *    append  : 대기열 저널(register_queue.jsonl)에 pending으로 배치 추가
+ *    도매꾹 API 호출(search/enrich)은 DOMEGGOOK_RPS 로 함께 간격 제한
+ *
+ * 실행: node scripts/pipeline_sourcing.js [--concurrency=N] [--rps=N]
+ *   --keywords=파일  키워드 JSON 배열 (candidate/트위터 추출 대신 사용)
+ *   --queue=파일     대기열 저널 경로 (기본 data/register_queue.jsonl)
+ *   --history=파일   키워드 이력 경로 (기본 data/keyword_history.json)
+ *   --json           진행 로그는 stderr, 마지막 줄에 단계별 통계 JSON (testsprite_tests/sourcing_bench.py 가 파싱)
  */
 
 const fs = require('fs');
@@ -16,13 +26,21 @@ const path = require('path');
 require('dotenv').config({ path: '/home/dev/openclaw/.env' });
 
 const { INVALID_IMAGE_PATTERNS, isValidImageUrl, getSafeVendorPath, roundPrice10 } = require('./lib/image_utils');
+const { openQueue, JOURNAL_FILE } = require('./lib/queue_store');
+const { createLogger, JSON_MODE } = require('./lib/progress_log');
+const { runStages } = require('./lib/stage_pipeline');
+const { createThrottle } = require('./lib/throttle');
 
 const DOMEGGOOK_API_KEY = process.env.DOMEGGOOK_API_KEY;
+const DOMEGGOOK_API_URL = process.env.DOMEGGOOK_API_URL || 'https://domeggook.com/ssl/api/';
+
+const arg = (name) => process.argv.find(a => a.startsWith(`--${name}=`))?.split('=').slice(1).join('=');
+const KEYWORDS_PATH = arg('keywords');
+const QUEUE_PATH = arg('queue');
 
 const CANDIDATE_FILE = '/home/dev/openclaw/config/workspace/candidate_keywords.json';
-const QUEUE_FILE = path.resolve(__dirname, '../data/register_queue.json');
 const LOG_FILE = path.resolve(__dirname, '../data/pipeline.log');
-const KEYWORD_HISTORY_FILE = path.resolve(__dirname, '../data/keyword_history.json');
+const KEYWORD_HISTORY_FILE = arg('history') || path.resolve(__dirname, '../data/keyword_history.json');
 const TWITTER_INTEL_DIR = '/home/dev/openclaw/config/workspace/data/twitter-intel/raw';
 const KEYWORD_HISTORY_DAYS = 7;
 
@@ -32,6 +50,16 @@ const PRODUCTS_PER_KEYWORD = 3;
 const COUPANG_FEE_RATE = 0.108; // 10.8%
 const DEFAULT_MULTIPLIER = 2.5;
 const MIN_MARGIN_RATE = 0.30; // 30%
+const MAX_MOQ = 10; // MOQ >= 10: 위탁판매 불가
+
+const SEARCH_CONCURRENCY = 2;
+const ENRICH_CONCURRENCY = parseInt(arg('concurrency') || process.env.ENRICH_CONCURRENCY || '4', 10);
+const DOMEGGOOK_RPS = Number(arg('rps') ?? process.env.DOMEGGOOK_RPS ?? 2);
+const ENRICH_RETRY_BASE_MS = Number(process.env.ENRICH_RETRY_BASE_MS || 2000);
+const CHANNEL_CAPACITY = 32;
+const MARGIN_BATCH = 32;
+const APPEND_BATCH = 20;
+const BATCH_LINGER_MS = 50;
 
 // 카테고리별 가격 배수
 const CATEGORY_MULTIPLIERS = {
@@ -88,11 +116,7 @@ function isBlockedProduct(name) {
   return { blocked: false, matchedKeyword: null };
 }
 
-function log(msg) {
-  const ts = new Date().toISOString();
-  const line = `[${ts}] ${msg}`;
-  console.log(line);
-}
+const log = createLogger({ timestamp: true });
 
 function loadJson(filePath) {
   if (!fs.existsSync(filePath)) return null;
@@ -230,7 +254,7 @@ function extractKeywords(candidates) {
  * 도매꾹 API: 키워드로 상품 목록 검색
  */
 async function searchViaApi(keyword) {
-  const url = `https://domeggook.com/ssl/api/?ver=4.0&mode=getItemList&aid=${DOMEGGOOK_API_KEY}&market=dome&om=json&kw=${encodeURIComponent(keyword)}&mnp=${MIN_PRICE}&mxp=${MAX_PRICE}&sz=20&so=se`;
+  const url = `${DOMEGGOOK_API_URL}?ver=4.0&mode=getItemList&aid=${DOMEGGOOK_API_KEY}&market=dome&om=json&kw=${encodeURIComponent(keyword)}&mnp=${MIN_PRICE}&mxp=${MAX_PRICE}&sz=20&so=se`;
   const res = await fetch(url);
   if (!res.ok) throw new Error(`도매꾹 API 검색 실패: ${res.status}`);
   const data = await res.json();
@@ -256,7 +280,7 @@ async function searchViaApi(keyword) {
 async function enrichViaApi(product) {
   if (!product.productNo) return { ...product, detailImages: [], imageUsageStatus: 'unknown' };
 
-  const url = `https://domeggook.com/ssl/api/?ver=4.1&mode=getItemView&aid=${DOMEGGOOK_API_KEY}&no=${product.productNo}&om=json`;
+  const url = `${DOMEGGOOK_API_URL}?ver=4.1&mode=getItemView&aid=${DOMEGGOOK_API_KEY}&no=${product.productNo}&om=json`;
   const res = await fetch(url);
   if (!res.ok) throw new Error(`도매꾹 API 상세 조회 실패: ${res.status}`);
   const raw = await res.json();
@@ -392,28 +416,42 @@ async function enrichViaApi(product) {
 }
 
 /**
- * Step 3: 마진 계산
+ * Step 3: 마진 계산 (배치) — 단계에 모인 상품을 열(Float64Array) 단위로 한 번에 계산
+ * 반환: { unitCost, suggestedRetail, coupangFee, margin, marginRate } 각 열은 products 와 같은 순서
  */
-function calculateMargin(product, keyword) {
-  const price = product.price;
-  const minOrder = product.minOrderQuantity || 1;
-  const shipping = product.shippingCost || 0;
-
-  const multiplier = getMultiplier(keyword, product.name);
-  // MOQ 반영: 고객에게 minOrder개 묶음으로 판매하므로 총 원가 기준 가격 산정
-  const perUnitCost = price + Math.round(shipping / minOrder);
-  const totalCost = perUnitCost * minOrder;
-  const suggestedRetail = Math.round(totalCost * multiplier);
-  const coupangFee = Math.round(suggestedRetail * COUPANG_FEE_RATE);
-  const margin = suggestedRetail - totalCost - coupangFee;
-  const marginRate = margin / suggestedRetail;
+function calculateMargins(products, keywords) {
+  const n = products.length;
+  const unitCost = new Float64Array(n);
+  const multiplier = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    const p = products[i];
+    const minOrder = p.minOrderQuantity || 1;
+    // MOQ 반영: 고객에게 minOrder개 묶음으로 판매하므로 총 원가 기준 가격 산정
+    unitCost[i] = (p.price + Math.round((p.shippingCost || 0) / minOrder)) * minOrder;
+    multiplier[i] = getMultiplier(keywords[i], p.name);
+  }
+
+  const suggestedRetail = new Float64Array(n);
+  const coupangFee = new Float64Array(n);
+  const margin = new Float64Array(n);
+  const marginRate = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    suggestedRetail[i] = Math.round(unitCost[i] * multiplier[i]);
+    coupangFee[i] = Math.round(suggestedRetail[i] * COUPANG_FEE_RATE);
+    margin[i] = suggestedRetail[i] - unitCost[i] - coupangFee[i];
+    marginRate[i] = margin[i] / suggestedRetail[i];
+  }
+  return { unitCost, suggestedRetail, coupangFee, margin, marginRate };
+}
 
+/** calculateMargins 결과의 i 번째 → toQueueItem 용 marginInfo */
+function marginAt(cols, i) {
   return {
-    unitCost: totalCost,   // 판매 1건당 실제 원가 (MOQ개 합산)
-    suggestedRetail,
-    coupangFee,
-    margin,
-    marginRate
+    unitCost: cols.unitCost[i],   // 판매 1건당 실제 원가 (MOQ개 합산)
+    suggestedRetail: cols.suggestedRetail[i],
+    coupangFee: cols.coupangFee[i],
+    margin: cols.margin[i],
+    marginRate: cols.marginRate[i]
   };
 }
 
@@ -525,8 +563,158 @@ function buildSetName(name, moq) {
 }
 
 /**
- * Step 2-4: API 검색 → 마진 계산 → 큐에 추가
+ * Step 5: API enrichment (상세 조회) — 최대 2회 재시도 + exponential backoff, 실패하면 null
  */
+async function enrichWithRetry(product, throttle) {
+  for (let attempt = 0; attempt < 3; attempt++) {
+    try {
+      await throttle();
+      return await enrichViaApi(product);
+    } catch (enrichErr) {
+      if (attempt < 2) {
+        const delay = ENRICH_RETRY_BASE_MS * Math.pow(2, attempt); // 2s, 4s
+        log(`  enrichment 재시도 ${attempt + 1}/2 (${delay}ms 후): ${enrichErr.message}`);
+        await new Promise(r => setTimeout(r, delay));
+      } else {
+        log(`  SKIP (enrichment 실패 3회): ${enrichErr.message}`);
+      }
+    }
+  }
+  return null;
+}
+
+/**
+ * Step 2-4: 키워드 → 검색 → 중복 제거 → 상세 조회 → 마진 필터 → 대기열 추가 (단계별 스트리밍)
+ * 반환: { counts, stages } — stages 는 단계별 in/out/분당 처리량 (lib/stage_pipeline.js)
+ */
+async function sourceKeywords(keywords, queue) {
+  const throttle = createThrottle(DOMEGGOOK_RPS); // search + enrich 가 함께 씀
+  const counts = { searched: 0, passed: 0, duplicate: 0, blocked: 0 };
+
+  // 중복 체크: 기존 항목은 대기열의 상품번호 인덱스, 이번 실행에서 넘긴 상품은 claimed
+  const claimed = new Set();
+  let queueNames = null; // 상품번호 없는 상품이 나올 때만 기존 상품명 로드
+  const dedupKey = (product) => product.productNo || `name:${product.name}`;
+  const isDuplicate = (product) => {
+    if (claimed.has(dedupKey(product))) return true;
+    if (product.productNo) return queue.hasProductNo(product.productNo);
+    if (!queueNames) {
+      queueNames = new Set();
+      for (const q of queue.iterate()) queueNames.add(q.displayName);
+    }
+    return queueNames.has(product.name);
+  };
+  const logError = (stage) => (err) => log(`  ERROR ${stage}: ${err.message}`);
+
+  const stages = [
+    {
+      name: 'search',
+      concurrency: SEARCH_CONCURRENCY,
+      handle: async (keyword, emit) => {
+        await throttle();
+        const products = await searchViaApi(keyword);
+        // 가격 필터링
+        const filtered = products.filter(p => p.price >= MIN_PRICE && p.price <= MAX_PRICE);
+        const topProducts = filtered.slice(0, PRODUCTS_PER_KEYWORD);
+        counts.searched += topProducts.length;
+        log(`--- 키워드: "${keyword}" 검색 결과: ${products.length}개 → 가격 필터: ${filtered.length}개 → 상위 ${topProducts.length}개 선택`);
+        for (const product of topProducts) await emit({ keyword, product });
+      },
+      onError: (err, keyword) => log(`  ERROR API 검색 실패 ("${keyword}"): ${err.message}`),
+    },
+    {
+      name: 'dedup',
+      handle: async ({ keyword, product }, emit) => {
+        // MOQ >= 10 필터: 위탁판매 불가
+        const moq = product.minOrderQuantity || 1;
+        if (moq >= MAX_MOQ) {
+          log(`  SKIP (MOQ ${moq} >= ${MAX_MOQ}): ${product.name.slice(0, 40)}`);
+          return;
+        }
+        // 블랙리스트 체크
+        const { blocked, matchedKeyword } = isBlockedProduct(product.name);
+        if (blocked) {
+          log(`  SKIP (블랙리스트 "${matchedKeyword}"): ${product.name.slice(0, 40)}`);
+          counts.blocked++;
+          return;
+        }
+        if (isDuplicate(product)) {
+          log(`  SKIP (중복): ${product.name.slice(0, 40)}`);
+          counts.duplicate++;
+          return;
+        }
+        claimed.add(dedupKey(product));
+        await emit({ keyword, product });
+      },
+      onError: logError('dedup'),
+    },
+    {
+      name: 'enrich',
+      concurrency: ENRICH_CONCURRENCY,
+      handle: async ({ keyword, product }, emit) => {
+        const enriched = await enrichWithRetry(product, throttle);
+        if (!enriched) return;
+
+        // 이미지 사용 불가 상품 제외
+        if (enriched.imageUsageStatus === 'unavailable') {
+          log(`  SKIP (이미지 사용 불가): ${product.name.slice(0, 40)}`);
+          return;
+        }
+        // enrichment 후에도 유효한 이미지가 없으면 제외
+        const hasValidImage = getSafeVendorPath(enriched.imageUrl) ||
+          (enriched.detailImages || []).some(url => getSafeVendorPath(url));
+        if (!hasValidImage) {
+          log(`  SKIP (유효한 이미지 없음): ${product.name.slice(0, 40)}`);
+          return;
+        }
+        await emit({ keyword, product: enriched });
+      },
+      onError: logError('enrich'),
+    },
+    {
+      name: 'margin',
+      batchSize: MARGIN_BATCH,
+      lingerMs: BATCH_LINGER_MS,
+      handle: async (batch, emit) => {
+        const cols = calculateMargins(batch.map(b => b.product), batch.map(b => b.keyword));
+        for (let i = 0; i < batch.length; i++) {
+          const { keyword, product } = batch[i];
+          if (cols.marginRate[i] < MIN_MARGIN_RATE) {
+            log(`  SKIP (마진 ${Math.round(cols.marginRate[i] * 100)}%): ${product.name.slice(0, 40)}`);
+            continue;
+          }
+          // 상세 조회로 MOQ 가 바뀐 경우 다시 확인
+          const moq = product.minOrderQuantity || 1;
+          if (moq >= MAX_MOQ) {
+            log(`  SKIP (MOQ ${moq} >= ${MAX_MOQ}): ${product.name.slice(0, 40)}`);
+            continue;
+          }
+          const marginInfo = marginAt(cols, i);
+          await emit({ item: toQueueItem(product, marginInfo, keyword), marginInfo });
+        }
+      },
+      onError: logError('margin'),
+    },
+    {
+      name: 'append',
+      batchSize: APPEND_BATCH,
+      lingerMs: BATCH_LINGER_MS,
+      handle: async (batch, emit) => {
+        queue.appendMany(batch.map(b => b.item));
+        for (const { item, marginInfo } of batch) {
+          counts.passed++;
+          log(`  PASS (마진 ${Math.round(marginInfo.marginRate * 100)}%, ₩${marginInfo.margin}): ${item.domeggookProductName.slice(0, 40)} → 판매가 ₩${marginInfo.suggestedRetail}`);
+          await emit(item);
+        }
+      },
+      onError: logError('append'),
+    },
+  ];
+
+  const stageStats = await runStages(keywords, stages, { capacity: CHANNEL_CAPACITY });
+  return { counts, stages: stageStats };
+}
+
 async function runPipeline() {
   log('=== 파이프라인 소싱 시작 ===');
 
@@ -535,29 +723,35 @@ async function runPipeline() {
     process.exit(1);
   }
 
-  // Step 1: 키워드 추출
-  const candidates = loadJson(CANDIDATE_FILE);
-  if (!candidates) {
-    log('ERROR: candidate_keywords.json 없음. 트렌드 수집이 먼저 실행되어야 합니다.');
-    process.exit(1);
-  }
+  let allKeywords;
+  if (KEYWORDS_PATH) {
+    allKeywords = loadJson(KEYWORDS_PATH) || [];
+    log(`키워드 파일 ${allKeywords.length}개: ${KEYWORDS_PATH}`);
+  } else {
+    // Step 1: 키워드 추출
+    const candidates = loadJson(CANDIDATE_FILE);
+    if (!candidates) {
+      log('ERROR: candidate_keywords.json 없음. 트렌드 수집이 먼저 실행되어야 합니다.');
+      process.exit(1);
+    }
 
-  const candidateKeywords = extractKeywords(candidates);
+    const candidateKeywords = extractKeywords(candidates);
 
-  // 트위터 인텔 키워드 병합 (중복 제거)
-  const twitterKeywords = loadTwitterKeywords();
-  const candidateSet = new Set(candidateKeywords);
-  const mergedTwitter = twitterKeywords.filter(kw => !candidateSet.has(kw));
-  // 트위터 키워드는 뒤에 배치 (candidate 우선)
-  const allKeywords = [...candidateKeywords, ...mergedTwitter];
+    // 트위터 인텔 키워드 병합 (중복 제거)
+    const twitterKeywords = loadTwitterKeywords();
+    const candidateSet = new Set(candidateKeywords);
+    const mergedTwitter = twitterKeywords.filter(kw => !candidateSet.has(kw));
+    // 트위터 키워드는 뒤에 배치 (candidate 우선)
+    allKeywords = [...candidateKeywords, ...mergedTwitter];
+    if (mergedTwitter.length > 0) {
+      log(`트위터 인텔에서 ${mergedTwitter.length}개 키워드 병합: ${mergedTwitter.join(', ')}`);
+    }
+  }
 
   if (allKeywords.length === 0) {
     log('키워드 없음 (candidate + twitter). 종료.');
     return;
   }
-  if (mergedTwitter.length > 0) {
-    log(`트위터 인텔에서 ${mergedTwitter.length}개 키워드 병합: ${mergedTwitter.join(', ')}`);
-  }
 
   // 키워드 이력 로드 — 최근 7일 내 소싱한 키워드 스킵
   const keywordHistory = loadKeywordHistory();
@@ -579,113 +773,16 @@ async function runPipeline() {
   }
   log(`키워드 이력 필터 후 ${keywords.length}개 (스킵 ${totalHistorySkipped}개)`);
 
-  // 기존 대기열 로드
-  const queue = loadJson(QUEUE_FILE) || [];
-  const existingNames = new Set(queue.map(q => q.displayName));
-  log(`기존 대기열: ${queue.length}개 (${queue.filter(q => q.status === 'pending').length}개 pending)`);
-
-  let totalSearched = 0;
-  let totalPassed = 0;
-  let totalDuplicate = 0;
-  let totalBlocked = 0;
+  // 기존 대기열 (중복 체크는 저널 인덱스의 상품번호로 — 항목 본문은 읽지 않음)
+  const queue = QUEUE_PATH ? openQueue(QUEUE_PATH, { legacyFile: null }) : openQueue(JOURNAL_FILE);
+  log(`기존 대기열: ${queue.count()}개 (${queue.count('pending')}개 pending)`);
 
-  // Step 2: 키워드별 도매꾹 API 검색
-  for (const keyword of keywords) {
-    log(`--- 키워드: "${keyword}" API 검색 중 ---`);
+  const started = Date.now();
+  const { counts, stages } = await sourceKeywords(keywords, queue);
+  const elapsedMs = Date.now() - started;
 
-    try {
-      const products = await searchViaApi(keyword);
-      // 가격 필터링
-      const filtered = products.filter(p => p.price >= MIN_PRICE && p.price <= MAX_PRICE);
-      const topProducts = filtered.slice(0, PRODUCTS_PER_KEYWORD);
-      totalSearched += topProducts.length;
-      log(`  검색 결과: ${products.length}개 → 가격 필터: ${filtered.length}개 → 상위 ${topProducts.length}개 선택`);
-
-      // Step 3: 마진 계산 + 필터링
-      for (const product of topProducts) {
-        const marginInfo = calculateMargin(product, keyword);
-
-        if (marginInfo.marginRate < MIN_MARGIN_RATE) {
-          log(`  SKIP (마진 ${Math.round(marginInfo.marginRate * 100)}%): ${product.name.slice(0, 40)}`);
-          continue;
-        }
-
-        // MOQ >= 10 필터: 위탁판매 불가
-        const enrichedMoq = product.minOrderQuantity || 1;
-        if (enrichedMoq >= 10) {
-          log(`  SKIP (MOQ ${enrichedMoq} >= 10): ${product.name.slice(0, 40)}`);
-          continue;
-        }
-
-        // 블랙리스트 체크
-        const { blocked, matchedKeyword } = isBlockedProduct(product.name);
-        if (blocked) {
-          log(`  SKIP (블랙리스트 "${matchedKeyword}"): ${product.name.slice(0, 40)}`);
-          totalBlocked++;
-          continue;
-        }
-
-        // Step 4: 중복 체크
-        if (existingNames.has(product.name)) {
-          log(`  SKIP (중복): ${product.name.slice(0, 40)}`);
-          totalDuplicate++;
-          continue;
-        }
-
-        // Step 5: API enrichment (상세 조회) — 최대 2회 재시도 + exponential backoff
-        log(`  enriching via API: ${product.name.slice(0, 40)}...`);
-        let enriched;
-        let enrichSuccess = false;
-        for (let attempt = 0; attempt < 3; attempt++) {
-          try {
-            enriched = await enrichViaApi(product);
-            enrichSuccess = true;
-            break;
-          } catch (enrichErr) {
-            if (attempt < 2) {
-              const delay = 2000 * Math.pow(2, attempt); // 2s, 4s
-              log(`  enrichment 재시도 ${attempt + 1}/2 (${delay}ms 후): ${enrichErr.message}`);
-              await new Promise(r => setTimeout(r, delay));
-            } else {
-              log(`  SKIP (enrichment 실패 3회): ${enrichErr.message}`);
-            }
-          }
-        }
-        if (!enrichSuccess) continue;
-
-        // 이미지 사용 불가 상품 제외
-        if (enriched.imageUsageStatus === 'unavailable') {
-          log(`  SKIP (이미지 사용 불가): ${product.name.slice(0, 40)}`);
-          continue;
-        }
-
-        // enrichment 후에도 유효한 이미지가 없으면 제외
-        const hasValidImage = getSafeVendorPath(enriched.imageUrl) ||
-          (enriched.detailImages || []).some(url => getSafeVendorPath(url));
-        if (!hasValidImage) {
-          log(`  SKIP (유효한 이미지 없음): ${product.name.slice(0, 40)}`);
-          continue;
-        }
-
-        const queueItem = toQueueItem(enriched, marginInfo, keyword);
-        queue.push(queueItem);
-        existingNames.add(product.name);
-        totalPassed++;
-        log(`  PASS (마진 ${Math.round(marginInfo.marginRate * 100)}%, ₩${marginInfo.margin}): ${product.name.slice(0, 40)} → 판매가 ₩${marginInfo.suggestedRetail}`);
-
-        // API 호출 간 딜레이
-        await new Promise(r => setTimeout(r, 500));
-      }
-    } catch (err) {
-      log(`  ERROR API 검색 실패: ${err.message}`);
-    }
-
-    // 키워드 간 딜레이
-    await new Promise(r => setTimeout(r, 1000));
-  }
-
-  // 대기열 저장
-  saveJson(QUEUE_FILE, queue);
+  // 대기열 저장 (통과 항목은 append 단계에서 이미 기록됨)
+  queue.close();
 
   // 소싱한 키워드 이력 저장
   for (const kw of keywords) {
@@ -701,9 +798,23 @@ async function runPipeline() {
   }
   saveKeywordHistory(keywordHistory);
 
-  log(`=== 파이프라인 완료 ===`);
-  log(`  검색: ${totalSearched}개 | 통과: ${totalPassed}개 | 중복: ${totalDuplicate}개 | 차단: ${totalBlocked}개 | 이력스킵: ${totalHistorySkipped}개`);
-  log(`  대기열 총: ${queue.length}개 (pending: ${queue.filter(q => q.status === 'pending').length}개)`);
+  log(`=== 파이프라인 완료 (${(elapsedMs / 1000).toFixed(1)}s) ===`);
+  log(`  검색: ${counts.searched}개 | 통과: ${counts.passed}개 | 중복: ${counts.duplicate}개 | 차단: ${counts.blocked}개 | 이력스킵: ${totalHistorySkipped}개`);
+  for (const s of stages) {
+    log(`  [${s.name}] ${s.in} → ${s.out} (분당 ${s.outPerMin}건, 처리 ${s.busyMs}ms, 대기 ${s.blockedMs}ms, 오류 ${s.errors})`);
+  }
+  log(`  대기열 총: ${queue.count()}개 (pending: ${queue.count('pending')}개)`);
+
+  if (JSON_MODE) {
+    console.log(JSON.stringify({
+      keywords: keywords.length,
+      historySkipped: totalHistorySkipped,
+      elapsedMs,
+      ...counts,
+      queueTotal: queue.count(),
+      stages,
+    }));
+  }
 }
 
 runPipeline().catch(err => {
@@ -11,28 +11,18 @@
  *   - retryCount 추적 (최대 3회까지만 리셋)
  *   - error 필드 초기화
  */
-const fs = require('fs');
-const path = require('path');
+const { openQueue } = require('./lib/queue_store');
 
-const QUEUE_FILE = path.resolve(__dirname, '../data/register_queue.json');
 const MAX_RETRIES = 3;
 
-function loadQueue() {
-  if (!fs.existsSync(QUEUE_FILE)) return [];
-  return JSON.parse(fs.readFileSync(QUEUE_FILE, 'utf-8'));
-}
-
-function saveQueue(queue) {
-  fs.writeFileSync(QUEUE_FILE, JSON.stringify(queue, null, 2));
-}
-
 function main() {
   const dryRun = process.argv.includes('--dry-run');
-  const queue = loadQueue();
+  const queue = openQueue();
 
-  const errors = queue.filter(q => q.status === 'error');
+  const errors = queue.filter(null, { status: 'error' });
   if (errors.length === 0) {
     console.log('에러 상태 항목 없음.');
+    queue.close();
     return;
   }
 
@@ -64,8 +54,9 @@ function main() {
   }
 
   if (!dryRun && resetCount > 0) {
-    saveQueue(queue);
+    queue.saveAll(errors);
   }
+  queue.close();
 
   console.log(`\n결과: 리셋 ${resetCount}개 | 스킵 ${skipCount}개 (최대 재시도 ${MAX_RETRIES}회 초과)${dryRun ? ' [DRY RUN — 변경 없음]' : ''}`);
 }
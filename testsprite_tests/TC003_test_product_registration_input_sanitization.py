@@ -1,8 +1,13 @@
 import requests
 
+from html_sanitizer import bench, find_violations, fuzz_corpus, image_sources, load_detail_pages, run_sanitizer
+
 BASE_URL = "http://localhost:3000/api/coupang/register"
 TIMEOUT = 30
 HEADERS = {"Content-Type": "application/json"}
+FUZZ_CORPUS_SIZE = 2000
+BENCH_MB = 20
+MIN_SANITIZER_MBPS = 10
 
 def test_product_registration_input_sanitization():
     # Prepare product data containing harmful HTML tags in the product description
@@ -30,4 +35,43 @@ def test_product_registration_input_sanitization():
     # Additional check: If the API returns some sanitized description or fields,
     # verify those do not contain <script> tags as well, but here only productName is provided in the schema
 
+
+def test_detail_html_sanitizer_fuzz_corpus():
+    """
+    Run the shared detail-page sanitizer (packages/utils/sanitizeHtml.js) over the
+    real detail pages in the register queue journal (register_queue.jsonl) plus a seeded fuzz corpus of XSS
+    vectors and mutated page fragments. Re-parse every output with Python's
+    html.parser: only allowlisted tags/attributes, no handlers, no unsafe URLs/CSS,
+    no comments, no newlines. Sanitizing twice must not change the result, and
+    real pages must keep all of their product images.
+    """
+    pages = load_detail_pages()
+    assert pages, "register queue has no detailHtml"
+    corpus = fuzz_corpus(FUZZ_CORPUS_SIZE)
+    out = run_sanitizer(corpus)
+    assert len(out["outputs"]) == len(corpus)
+
+    for s, got in zip(corpus, out["outputs"]):
+        violations = find_violations(got, out["allowedTags"], out["allowedAttributes"])
+        assert not violations, f"{s[:120]!r} -> {got[:120]!r}: {violations}"
+        assert got == got.strip(), f"{s[:120]!r}: output is not trimmed"
+
+    again = run_sanitizer(out["outputs"])["outputs"]
+    for s, first, second in zip(corpus, out["outputs"], again):
+        assert first == second, f"{s[:120]!r}: not idempotent {first[:120]!r} -> {second[:120]!r}"
+
+    for page, got in zip(pages, out["outputs"]):
+        assert image_sources(got) == image_sources(page), "detail page lost product images"
+
+
+def test_detail_html_sanitizer_throughput():
+    """MB/s of the sanitizer on the real detail pages (old 10-regex chain reported alongside)."""
+    r = bench(mb=BENCH_MB)
+    print(f"sanitizer {r['sanitizer_mbps']:.1f} MB/s, legacy regex chain {r['legacy_mbps']:.1f} MB/s "
+          f"({r['pages']} pages x{r['repeat']}, {r['mb']:.1f} MB)")
+    assert r["sanitizer_mbps"] >= MIN_SANITIZER_MBPS, f"sanitizer too slow: {r['sanitizer_mbps']:.1f} MB/s"
+
+
+test_detail_html_sanitizer_fuzz_corpus()
+test_detail_html_sanitizer_throughput()
 test_product_registration_input_sanitization()
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import requests
+
+from margin_engine import margins, pricing_scenarios, queue_columns
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000") + "/margin"
+TIMEOUT = 30
+
+
+def test_batch_margin_endpoint_matches_engine():
+    """
+    Price the whole register queue in one /margin call (items + columns batch modes)
+    and compare every row with the NumPy batch engine.
+    """
+    cost, sale_price = queue_columns()
+    assert cost.size > 0, "register queue has no items with unitCost"
+
+    platforms = np.resize(np.array(["rocket", "wing", "consignment"]), cost.size)
+
+    # 1. items 배치: 도매가/판매가/플랫폼 → 순수익, 마진율
+    resp = requests.post(
+        BASE_URL,
+        json={
+            "items": [
+                {"wholesalePrice": c, "sellingPrice": p, "platform": pl}
+                for c, p, pl in zip(cost.tolist(), sale_price.tolist(), platforms.tolist())
+            ]
+        },
+        timeout=TIMEOUT,
+    )
+    assert resp.status_code == 200, f"Expected 200, got {resp.status_code}: {resp.text}"
+    results = resp.json()["results"]
+    assert len(results) == cost.size
+
+    expected = margins(cost, sale_price, platforms)
+    for i, row in enumerate(results):
+        assert round(row["netProfit"], 2) == round(float(expected["netProfit"][i]), 2), (
+            f"netProfit mismatch at row {i}: {row['netProfit']} != {expected['netProfit'][i]}"
+        )
+        assert round(row["marginPercent"], 2) == round(float(expected["marginPercent"][i]), 2), (
+            f"marginPercent mismatch at row {i}: {row['marginPercent']} != {expected['marginPercent'][i]}"
+        )
+
+    # 2. columns 배치: 최소/권장/최대/손익분기 가격
+    n = cost.size
+    columns = {
+        "baseCost": cost.tolist(),
+        "targetMarginRate": [30] * n,
+        "platformFeeRate": [10.8] * n,
+        "shippingCost": [0] * n,
+        "extraCost": [0] * n,
+    }
+    resp = requests.post(BASE_URL, json={"columns": columns}, timeout=TIMEOUT)
+    assert resp.status_code == 200, f"Expected 200, got {resp.status_code}: {resp.text}"
+    data = resp.json()["data"]
+
+    expected = pricing_scenarios(cost, platform_fee_rate=10.8, target_margin_rate=30)
+    for key in ("minPrice", "recPrice", "maxPrice", "breakEvenPrice", "expectedNetProfit"):
+        assert data[key] == expected[key].tolist(), f"{key} mismatch between endpoint and engine"
+
+    # 3. 컬럼 길이 불일치 → 400
+    columns["extraCost"] = columns["extraCost"][:-1]
+    resp = requests.post(BASE_URL, json={"columns": columns}, timeout=TIMEOUT)
+    assert resp.status_code == 400, f"Expected 400 for ragged columns, got {resp.status_code}"
+
+
+test_batch_margin_endpoint_matches_engine()
@@ -0,0 +1,99 @@
+import json
+from urllib.parse import quote
+
+import requests
+
+from coupang_stub import sign, start_stub
+
+ACCESS_KEY = "tc-access-key"
+SECRET_KEY = "tc-secret-key"
+VENDOR_ID = "A00000000"
+TIMEOUT = 30
+
+
+def signed(method, base_url, path, query="", body=None, secret_key=SECRET_KEY):
+    headers = {"Content-Type": "application/json", "X-Requested-By": VENDOR_ID}
+    headers.update(sign(method, path, query, ACCESS_KEY, secret_key))
+    url = f"{base_url}{path}" + (f"?{query}" if query else "")
+    return requests.request(method, url, headers=headers, data=json.dumps(body) if body else None, timeout=TIMEOUT)
+
+
+def test_coupang_stub_signed_registration_flow():
+    """
+    Run the offline Coupang stub and walk the same call sequence as the register route:
+    outbound list/create → return list → category predict → product create.
+    Also verify that bad signatures get 401 and the rate limiter answers 429.
+    """
+    server, _ = start_stub(access_key=ACCESS_KEY, secret_key=SECRET_KEY, seed=1)
+    base = server.base_url
+    try:
+        # 1. 잘못된 서명 → 401
+        outbound_list = "/v2/providers/marketplace_openapi/apis/api/v2/vendor/shipping-place/outbound"
+        resp = signed("GET", base, outbound_list, "pageNum=1&pageSize=50", secret_key="wrong-secret")
+        assert resp.status_code == 401, f"Expected 401 for bad signature, got {resp.status_code}"
+
+        # 2. 출고지 생성 후 이름으로 조회
+        place_name = "테스트 출고지"
+        create_path = f"/v2/providers/openapi/apis/api/v5/vendors/{VENDOR_ID}/outboundShippingCenters"
+        resp = signed("POST", base, create_path, body={"shippingPlaceName": place_name, "placeAddresses": []})
+        assert resp.status_code == 200, resp.text
+        code = resp.json()["data"]["outboundShippingPlaceCode"]
+
+        query = f"pageNum=1&pageSize=50&placeNames={quote(place_name)}"
+        resp = signed("GET", base, outbound_list, query)
+        assert resp.status_code == 200, resp.text
+        content = resp.json()["content"]
+        assert [p["outboundShippingPlaceCode"] for p in content] == [code]
+
+        # 3. 기본 반품지('로드') 조회
+        return_path = f"/v2/providers/openapi/apis/api/v4/vendors/{VENDOR_ID}/returnShippingCenters"
+        resp = signed("GET", base, return_path, "pageNum=1&pageSize=50")
+        assert resp.status_code == 200, resp.text
+        return_code = resp.json()["data"]["content"][0]["returnCenterCode"]
+
+        # 4. 카테고리 예측
+        resp = signed("POST", base, "/v2/providers/openapi/apis/api/v1/categorization/predict",
+                      body={"productName": "Test Product"})
+        assert resp.status_code == 200, resp.text
+        category = resp.json()["data"]["predictedCategoryId"]
+
+        # 5. 상품 생성 (기록된 성공 응답 재생, 새 sellerProductId 발급)
+        product_path = "/v2/providers/seller_api/apis/api/v1/marketplace/seller-products"
+        product = {
+            "displayCategoryCode": category,
+            "sellerProductName": "Test Product Without Options",
+            "returnCenterCode": return_code,
+            "outboundShippingPlaceCode": code,
+            "items": [{"itemName": "단일상품", "salePrice": 15000}],
+        }
+        resp = signed("POST", base, product_path, body=product)
+        assert resp.status_code == 200, resp.text
+        created = resp.json()
+        assert created["code"] == "SUCCESS", created
+        product_id = created["data"]
+
+        resp = signed("GET", base, f"{product_path}/{product_id}")
+        assert resp.status_code == 200 and resp.json()["data"]["sellerProductId"] == product_id
+
+        # 반품지 코드 누락 → 기록된 오류 메시지
+        resp = signed("POST", base, product_path, body=dict(product, returnCenterCode=None))
+        assert resp.json()["code"] == "ERROR" and "반품지센터코드" in resp.json()["message"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # 6. 초당 요청 제한 → 429
+    server, _ = start_stub(access_key=ACCESS_KEY, secret_key=SECRET_KEY, rate_limit=2)
+    try:
+        statuses = [
+            signed("GET", server.base_url, outbound_list, "pageNum=1&pageSize=50").status_code
+            for _ in range(6)
+        ]
+        assert 429 in statuses, f"Expected a 429 under rate limit, got {statuses}"
+        assert statuses[0] == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+test_coupang_stub_signed_registration_flow()
@@ -0,0 +1,50 @@
+import os
+import uuid
+
+import requests
+
+from clerk_auth import authed_session
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+REGISTER_ENDPOINT = f"{BASE_URL}/api/coupang/register"
+# 앱 서버가 COUPANG_API_BASE_URL 로 바라보는 스텁 (python coupang_stub.py --port 8787)
+STUB_URL = os.environ.get("COUPANG_STUB_URL", "http://127.0.0.1:8787")
+TIMEOUT = 30
+REGISTRATIONS = 50
+
+
+def test_repeated_registrations_reuse_cached_shipping_place():
+    """
+    Register 50 products back-to-back for the same supplier and verify that the
+    register route resolved the outbound shipping place upstream only once:
+    the first call looks it up (and creates it), the other 49 hit the per-vendor cache.
+    """
+    # 이전 실행의 캐시와 겹치지 않도록 실행마다 새 출고지명 사용
+    place_name = f"TC010 출고지 {uuid.uuid4().hex[:8]}"
+
+    # register 라우트는 auth() 로 사용자 인증을 요구 (clerk_auth 환경변수 참고)
+    session = authed_session()
+
+    resp = requests.post(f"{STUB_URL}/__stub/reset", timeout=TIMEOUT)
+    assert resp.status_code == 200, f"Stub reset failed: {resp.status_code}"
+
+    for i in range(REGISTRATIONS):
+        payload = {
+            "productName": f"Cache Test Product {i + 1}",
+            "wholesalePrice": 10000,
+            "price": 15000,
+            "shippingPlaceName": place_name,
+            "supplier": {"supplierName": "TC010 공급사", "supplierContact": "010-1234-5678", "zipCode": "06236"},
+        }
+        resp = session.post(REGISTER_ENDPOINT, json=payload, timeout=TIMEOUT)
+        assert resp.status_code == 200, f"Registration {i + 1} failed: {resp.status_code} {resp.text[:200]}"
+        body = resp.json()
+        assert body.get("outbound", {}).get("code"), f"Registration {i + 1} has no outbound code: {body}"
+
+    stats = requests.get(f"{STUB_URL}/__stub/stats", timeout=TIMEOUT).json()
+    assert stats.get("outbound_list", 0) == 1, f"Expected 1 upstream shipping-place lookup, got {stats.get('outbound_list', 0)} ({stats})"
+    assert stats.get("outbound_create", 0) <= 1, f"Shipping place created more than once: {stats}"
+    assert stats.get("return_list", 0) <= 1, f"Return center looked up more than once: {stats}"
+
+
+test_repeated_registrations_reuse_cached_shipping_place()
@@ -0,0 +1,72 @@
+import json
+import os
+import time
+
+from clerk_auth import authed_session
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+REGISTER_ENDPOINT = f"{BASE_URL}/api/coupang/register"
+BULK_ENDPOINT = f"{BASE_URL}/api/coupang/register/bulk"
+TIMEOUT = 300
+ITEMS = 20
+
+
+def make_payload(prefix, i):
+    return {
+        "productName": f"{prefix} Product {i + 1}",
+        "wholesalePrice": 10000,
+        "price": 15000,
+        "platform": "rocket",
+    }
+
+
+def test_bulk_registration_streams_ndjson_faster_than_single():
+    """
+    1. A batch with one invalid item (missing price) is rejected up front with 400.
+    2. A valid batch streams one NDJSON line per item plus a summary line.
+    3. items/minute through the bulk endpoint beats the same number of single-item POSTs.
+    """
+    # register / bulk 라우트는 auth() 로 사용자 인증을 요구 (clerk_auth 환경변수 참고)
+    session = authed_session()
+
+    # 1. 사전 검증 — 하나라도 필수 필드가 없으면 전체 400, 등록 시작 안 함
+    invalid = [make_payload("Invalid", 0), {"productName": "No Price", "wholesalePrice": 1000}]
+    resp = session.post(BULK_ENDPOINT, json={"items": invalid}, timeout=TIMEOUT)
+    assert resp.status_code == 400, f"Expected 400 for invalid batch, got {resp.status_code}"
+    body = resp.json()
+    assert "price" in body.get("message", "").lower(), f"Error should mention price: {body}"
+    assert [e["index"] for e in body.get("errors", [])] == [1], body
+
+    # 2. 단건 경로 기준선
+    t0 = time.perf_counter()
+    for i in range(ITEMS):
+        resp = session.post(REGISTER_ENDPOINT, json=make_payload("Single", i), timeout=TIMEOUT)
+        assert resp.status_code == 200, f"Single registration {i + 1} failed: {resp.status_code}"
+    single_sec = time.perf_counter() - t0
+
+    # 3. 일괄 경로 (NDJSON 스트리밍)
+    items = [make_payload("Bulk", i) for i in range(ITEMS)]
+    t0 = time.perf_counter()
+    lines = []
+    with session.post(BULK_ENDPOINT, json={"items": items}, stream=True, timeout=TIMEOUT) as resp:
+        assert resp.status_code == 200, f"Bulk registration failed: {resp.status_code} {resp.text[:200]}"
+        assert resp.headers.get("Content-Type", "").startswith("application/x-ndjson")
+        for raw in resp.iter_lines():
+            if raw:
+                lines.append(json.loads(raw))
+    bulk_sec = time.perf_counter() - t0
+
+    item_lines = [line for line in lines if line.get("type") == "item"]
+    summary = lines[-1]
+    assert sorted(line["index"] for line in item_lines) == list(range(ITEMS)), "Each item must be reported exactly once"
+    assert summary.get("type") == "summary" and summary["total"] == ITEMS, summary
+    assert summary["succeeded"] + summary["failed"] == ITEMS, summary
+
+    single_rate = ITEMS / single_sec * 60
+    bulk_rate = ITEMS / bulk_sec * 60
+    print(f"single: {single_rate:.1f} items/min  bulk: {bulk_rate:.1f} items/min "
+          f"(concurrency={summary['concurrency']}, rate={summary['ratePerSec']}/s, x{bulk_rate / single_rate:.1f})")
+    assert bulk_rate > single_rate, f"Bulk path ({bulk_rate:.1f}/min) should beat single path ({single_rate:.1f}/min)"
+
+
+test_bulk_registration_streams_ndjson_faster_than_single()
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+
+from option_attributes import (
+    build_option_variants,
+    extract_option_attributes,
+    legacy_build_option_variants,
+    legacy_extract_color,
+    queue_cases,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE_JS = os.path.join(ROOT, "scripts", "lib", "option_attributes.js")
+TIMEOUT = 60
+
+# 목록 순서 우선 / 괄호 우선 / 겹치는 키워드 / 사이즈 단위 경계 케이스
+EDGE_NAMES = [
+    "매트블랙", "스카이블루 우산", "로즈골드 (라이트그레이)", "혼합색상 랜덤발송", "블랙(화이트)",
+    "(무지) 블랙", "()블랙", "(레드", "색상없음", "12.5 cm 블루", "3인치 거울", "2M 케이블",
+    "150MM 화이트", "수박돼지-20cm", "(네이비)(베이지)", "",
+]
+
+
+def run_engine(payload):
+    proc = subprocess.run(
+        ["node", ENGINE_JS, "eval"],
+        input=json.dumps(payload, ensure_ascii=False),
+        capture_output=True, text=True, timeout=TIMEOUT,
+    )
+    assert proc.returncode == 0, f"option_attributes.js failed: {proc.stderr}"
+    return json.loads(proc.stdout)
+
+
+def test_option_attribute_engine_matches_reference():
+    """
+    Run scripts/lib/option_attributes.js over every option in the register queue journal
+    (plus multi-group and edge cases) and compare with the Python reference engine,
+    which itself must agree with the previous includes-scan / full cross join logic.
+    """
+    cases = queue_cases()
+    assert cases, "register queue has no items with domeggookOptions"
+    # 조합 상한 (지연 생성) 확인용: 그룹 3개를 묶은 케이스에 작은 limit
+    cases += [dict(c, limit=5) for c in cases if len(c["options"]) > 1][:3]
+    names = EDGE_NAMES + [v["name"] for c in cases for g in c["options"] for v in g.get("values") or []]
+
+    out = run_engine({"names": names, "cases": cases})
+
+    for name, got in zip(names, out["names"]):
+        expected = extract_option_attributes(name)
+        assert got == expected, f"{name!r}: js={got} python={expected}"
+        assert expected["color"] == legacy_extract_color(name), f"{name!r}: color differs from legacy scan"
+
+    assert len(out["cases"]) == len(cases)
+    for i, (case, got) in enumerate(zip(cases, out["cases"])):
+        limit = case.get("limit", 30)
+        expected = build_option_variants(case["options"], case["attributes"], limit)
+        assert got == expected, f"case {i}: js and python variants differ"
+        assert expected == legacy_build_option_variants(case["options"], case["attributes"])[:limit], (
+            f"case {i}: engine differs from legacy cross join"
+        )
+        assert len(got) <= limit
+
+
+test_option_attribute_engine_matches_reference()
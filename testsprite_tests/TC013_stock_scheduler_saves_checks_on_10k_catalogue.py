@@ -0,0 +1,73 @@
+import json
+import os
+import random
+import subprocess
+
+from stock_scheduler import HOUR_MS, next_interval, simulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEDULER_JS = os.path.join(ROOT, "scripts", "lib", "stock_scheduler.js")
+TIMEOUT = 60
+PRODUCTS = 10000
+
+
+def test_stock_scheduler_saves_checks_on_10k_catalogue():
+    """
+    1. scripts/lib/stock_scheduler.js nextInterval must match the Python policy for random check histories.
+    2. Simulate 3 days of 30-minute cron runs over a synthetic 10k-product catalogue.
+       With the default 6h cap no profile may be detected later than by the old 6-hourly full scan.
+       With the opt-in 24h cap the scheduler must skip most products per cycle, and volatile products
+       must be checked more often and detected faster than the old full scan.
+    """
+    rng = random.Random(7)
+    sequences = [
+        [[rng.random() < p, round(rng.uniform(0.5, 30), 3)] for _ in range(20)]
+        for p in (0.0, 0.05, 0.3, 0.8, 1.0)
+    ]
+    proc = subprocess.run(
+        ["node", SCHEDULER_JS, "eval"], input=json.dumps({"sequences": sequences}),
+        capture_output=True, text=True, timeout=TIMEOUT,
+    )
+    assert proc.returncode == 0, f"stock_scheduler.js failed: {proc.stderr}"
+    for seq, got in zip(sequences, json.loads(proc.stdout)):
+        prev, expected = None, []
+        for changed, hours in seq:
+            changes, total_hours, _, interval = next_interval(prev, changed, hours * HOUR_MS)
+            prev = {"changes": changes, "hours": total_hours}
+            expected.append(interval)
+        assert got == expected, f"JS/Python interval mismatch: {got} != {expected}"
+
+    # 기본 최대 주기(6h) — 조회는 비슷하지만 어떤 상품도 기존 전체 확인보다 늦게 감지하지 않음
+    # (batch 는 6시간에 카탈로그 전체를 돌 수 있는 크기)
+    r = simulate(products=PRODUCTS, days=3, cycle_min=30, batch=1000)
+    for name, p in r["profiles"].items():
+        print(f"  default {name:>9}: latency={p['latency_h']:.1f}h (full scan {p['latency_full_h']:.1f}h)")
+        assert p["latency_h"] <= p["latency_full_h"] * 1.05, (name, p)
+
+    # STOCK_CHECK_MAX_INTERVAL_MS=24h 로 늘린 경우 — 조회 절약
+    r = simulate(products=PRODUCTS, days=3, cycle_min=30, batch=500, max_hours=24)
+    cycles = r["cycles"]
+    # 초기 적재(모두 due) 이후 마지막 하루 = 정상 상태
+    steady = cycles[-48:]
+    saved = [c["saved"] for c in steady]
+    avg_checks = sum(c["checks"] for c in steady) / len(steady)
+    print(f"checks/cycle (steady): {avg_checks:.0f} of {PRODUCTS}, saved/cycle min={min(saved)} avg={sum(saved) / len(saved):.0f}")
+    print(f"total checks: scheduler={r['checks']} 6h-full-scan={r['full_checks']}")
+    for name, p in r["profiles"].items():
+        print(f"  {name:>9}: checks/product={p['checks'] / p['products']:.1f} "
+              f"latency={p['latency_h']:.1f}h (full scan {p['latency_full_h']:.1f}h)")
+
+    assert all(c["checks"] <= 500 for c in cycles), "batch cap exceeded"
+    assert min(saved) >= PRODUCTS - 500, "every cycle must skip all but the due batch"
+    assert r["checks"] < r["full_checks"] / 2, "scheduler should need less than half the checks of a 6h full scan"
+    assert r["writes"] == r["checks"], "state rows must be written only for checked products"
+
+    profiles = r["profiles"]
+    per_product = {k: p["checks"] / p["products"] for k, p in profiles.items()}
+    assert per_product["volatile"] > 3 * per_product["stable"], per_product
+    assert profiles["volatile"]["latency_h"] < profiles["volatile"]["latency_full_h"], profiles["volatile"]
+    # 잘 안 바뀌는 상품도 최대 주기(24h) 안에는 확인
+    assert profiles["stable"]["latency_h"] < 24, profiles["stable"]
+
+
+test_stock_scheduler_saves_checks_on_10k_catalogue()
@@ -0,0 +1,86 @@
+import os
+import statistics
+import time
+
+from clerk_auth import authed_session
+from stage_metrics import diff, quantile, scrape
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+REGISTER_ENDPOINT = f"{BASE_URL}/api/coupang/register"
+SETTINGS_ENDPOINT = f"{BASE_URL}/api/settings/coupang"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+TIMEOUT = 30
+SAMPLES = 20
+ROUTE = "coupang_register"
+STAGE = "credentials"
+
+
+def make_payload(kind, i):
+    return {
+        "productName": f"TC014 {kind} Product {i + 1}",
+        "wholesalePrice": 10000,
+        "price": 15000,
+    }
+
+
+def active_credential_id(session):
+    resp = session.get(SETTINGS_ENDPOINT, timeout=TIMEOUT)
+    assert resp.status_code == 200, f"Listing credentials failed: {resp.status_code} {resp.text[:200]}"
+    active = [c for c in resp.json().get("credentials", []) if c.get("isActive")]
+    assert active, "An active Coupang credential is required for this test"
+    return active[0]["id"]
+
+
+def register(session, kind, i):
+    t0 = time.perf_counter()
+    resp = session.post(REGISTER_ENDPOINT, json=make_payload(kind, i), timeout=TIMEOUT)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    assert resp.status_code == 200, f"{kind} registration {i + 1} failed: {resp.status_code} {resp.text[:200]}"
+    return elapsed_ms
+
+
+def credentials_stage(before, after):
+    hist = diff(before, after).get((ROUTE, STAGE))
+    assert hist and hist["count"] == SAMPLES, f"Expected {SAMPLES} '{STAGE}' samples, got {hist and hist['count']}"
+    return hist
+
+
+def test_repeated_registrations_credential_cache_cold_vs_warm():
+    """
+    Register the same user's products twice over:
+    - cold: the active credential is re-saved via PUT /api/settings/coupang before each call,
+      which invalidates the per-user signing context, so every register reloads it;
+    - warm: back-to-back calls reuse the cached context.
+    The 'credentials' stage p50 (from /api/metrics) must drop on the warm path.
+    """
+    # settings / register 라우트는 auth() 로 사용자 인증을 요구 (clerk_auth 환경변수 참고)
+    session = authed_session()
+    cred_id = active_credential_id(session)
+
+    # 콜드: 매 호출 전 설정 저장 → 사용자 컨텍스트 무효화
+    before = scrape(BASE_URL, session, METRICS_TOKEN)
+    assert before is not None, "/api/metrics is not reachable"
+    cold_ms = []
+    for i in range(SAMPLES):
+        resp = session.put(SETTINGS_ENDPOINT, json={"id": cred_id, "isActive": True}, timeout=TIMEOUT)
+        assert resp.status_code == 200, f"Re-saving credential failed: {resp.status_code} {resp.text[:200]}"
+        cold_ms.append(register(session, "Cold", i))
+    middle = scrape(BASE_URL, session, METRICS_TOKEN)
+
+    # 웜: 첫 호출이 컨텍스트를 채우고 이후는 캐시 히트
+    register(session, "Prime", 0)
+    primed = scrape(BASE_URL, session, METRICS_TOKEN)
+    warm_ms = [register(session, "Warm", i) for i in range(SAMPLES)]
+    after = scrape(BASE_URL, session, METRICS_TOKEN)
+
+    cold_stage = quantile(credentials_stage(before, middle), 0.5)
+    warm_stage = quantile(credentials_stage(primed, after), 0.5)
+    cold_p50, warm_p50 = statistics.median(cold_ms), statistics.median(warm_ms)
+    print(f"'{STAGE}' stage p50: cold {cold_stage:.2f}ms → warm {warm_stage:.2f}ms")
+    print(f"register end-to-end p50: cold {cold_p50:.1f}ms → warm {warm_p50:.1f}ms")
+
+    assert warm_stage < cold_stage, f"Warm credential lookup ({warm_stage:.2f}ms) is not faster than cold ({cold_stage:.2f}ms)"
+    assert warm_p50 <= cold_p50, f"Warm registrations ({warm_p50:.1f}ms) are slower than cold ({cold_p50:.1f}ms)"
+
+
+test_repeated_registrations_credential_cache_cold_vs_warm()
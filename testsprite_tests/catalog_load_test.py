@@ -0,0 +1,211 @@
+"""
+상품 목록 keyset 페이지네이션 부하 테스트 (GET /api/products)
+
+한 사용자에게 상품 100,000개(+ 일부 Registration)를 psql COPY 로 시드한 뒤
+nextCursor 를 따라 첫 페이지부터 마지막 페이지까지 순서대로 넘기며 페이지별 지연을 잰다.
+OFFSET 방식이면 뒤 페이지일수록 느려지지만 keyset(id < cursor, (userId, id) 인덱스)이면 평평해야 한다:
+  - 처음 --window 페이지와 마지막 --window 페이지의 p50 비율이 --max-ratio 이하
+  - 모든 id 가 정확히 한 번, 내림차순으로 나오는지 (중복/누락 없음)
+--filters 를 주면 category / status / q 필터로도 끝까지 넘겨 같은 조건을 확인한다.
+status 필터는 최신 Registration 기준이라 일부 상품에 더 최근 FAILED 등록을 덧붙여 두고, 받은 항목의 status 가 모두 일치하는지 본다.
+
+시드 행은 source='catalog_load_test' 로 표시하고 끝나면 지운다 (--keep 으로 유지, --no-seed 로 재사용).
+API 는 Clerk 인증이 필요하다 (clerk_auth.py): 세션 토큰을 Authorization 헤더로 보내고
+토큰 주인을 시드 사용자 id 로 쓴다 (--user-id 로 지정 가능).
+
+사용 예:
+    python catalog_load_test.py
+    python catalog_load_test.py --products 100000 --limit 50 --window 20 --max-ratio 1.5
+    python catalog_load_test.py --no-seed --filters --keep
+
+환경변수:
+    SELPIX_BASE_URL       대상 서버 (기본 http://localhost:3000)
+    CLERK_SECRET_KEY      + SELPIX_TEST_USER_ID 또는 SELPIX_SESSION_TOKEN — clerk_auth.py 참고
+    DATABASE_URL          시드/정리용 Postgres (psql 사용)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import time
+
+from clerk_auth import ClerkSessionAuth, authed_session
+from load_test import make_session, percentile
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+PRODUCTS_ENDPOINT = "/api/products"
+SEED_SOURCE = "catalog_load_test"
+CATEGORIES = ["Living", "Kitchen", "Digital", "Beauty", "Pet", "Sports", "Baby", "Office"]
+STATUSES = ["PENDING", "REGISTERED", "FAILED"]
+TIMEOUT = 30
+
+
+def psql(sql, stdin=None, database_url=DATABASE_URL):
+    proc = subprocess.run(
+        ["psql", database_url, "-v", "ON_ERROR_STOP=1", "-qAt", "-c", sql],
+        input=stdin, capture_output=True, text=True, timeout=600,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"psql failed: {proc.stderr.strip()}")
+    return proc.stdout.strip()
+
+
+def seed_rows(user_id, count):
+    """COPY 입력 (탭 구분) — 카테고리 순환, 상품명에 검색용 키워드 섞기"""
+    now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    lines = []
+    for i in range(count):
+        keyword = "텀블러" if i % 10 == 0 else "머그컵"
+        lines.append("\t".join([
+            f"로드테스트 {keyword} {i}", str(10000 + i % 5000), str(20000 + i % 5000), "30",
+            "Low", "0", CATEGORIES[i % len(CATEGORIES)], "", SEED_SOURCE, "N/A", "0", user_id, now,
+        ]))
+    return "\n".join(lines) + "\n"
+
+
+def seed(user_id, count):
+    """상품 count 개 + 3개 중 1개꼴로 Registration, 그중 절반에 더 최근 FAILED 등록 → (소요 초)"""
+    t0 = time.perf_counter()
+    psql(
+        'COPY "Product" ("name", "wholesalePrice", "recommendedPrice", "margin", "competition", "searchVolume", '
+        '"category", "image", "source", "trend", "score", "userId", "updatedAt") FROM STDIN',
+        stdin=seed_rows(user_id, count),
+    )
+    statuses = "ARRAY[" + ",".join(f"'{s}'" for s in STATUSES) + "]"
+    psql(
+        'INSERT INTO "Registration" ("productId", "productName", "category", "recommendedTitle", "price", '
+        '"wholesalePrice", "status", "platform", "userId", "updatedAt") '
+        f'SELECT "id", "name", "category", "name", "recommendedPrice", "wholesalePrice", '
+        f'({statuses})[1 + ("id" / 3) % {len(STATUSES)}], \'COUPANG\', "userId", now() '
+        f'FROM "Product" WHERE "source" = \'{SEED_SOURCE}\' AND "userId" = \'{user_id}\' AND "id" % 3 = 0'
+    )
+    psql(
+        'INSERT INTO "Registration" ("productId", "productName", "category", "recommendedTitle", "price", '
+        '"wholesalePrice", "status", "platform", "userId", "updatedAt") '
+        'SELECT "id", "name", "category", "name", "recommendedPrice", "wholesalePrice", \'FAILED\', \'COUPANG\', '
+        f'"userId", now() FROM "Product" WHERE "source" = \'{SEED_SOURCE}\' AND "userId" = \'{user_id}\' '
+        'AND "id" % 6 = 0'
+    )
+    psql('ANALYZE "Product"; ANALYZE "Registration"')
+    return time.perf_counter() - t0
+
+
+def cleanup(user_id):
+    where = f'"source" = \'{SEED_SOURCE}\' AND "userId" = \'{user_id}\''
+    psql(f'DELETE FROM "Registration" WHERE "productId" IN (SELECT "id" FROM "Product" WHERE {where})')
+    psql(f'DELETE FROM "Product" WHERE {where}')
+
+
+def walk(session, base_url, params, max_pages=None):
+    """nextCursor 가 없을 때까지 순서대로 → (페이지별 지연 ms 목록, 받은 항목 목록)"""
+    latencies, items, cursor = [], [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        t0 = time.perf_counter()
+        res = session.get(f"{base_url}{PRODUCTS_ENDPOINT}", params=query, timeout=TIMEOUT)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        assert res.status_code == 200, f"page {len(latencies)}: {res.status_code} {res.text[:200]}"
+        page = res.json()
+        items.extend(page["items"])
+        cursor = page["nextCursor"]
+        if not cursor or (max_pages and len(latencies) >= max_pages):
+            return latencies, items
+
+
+def flatness(latencies, window):
+    first, last = latencies[:window], latencies[-window:]
+    return {
+        "pages": len(latencies),
+        "first_p50": percentile(first, 50),
+        "first_p95": percentile(first, 95),
+        "last_p50": percentile(last, 50),
+        "last_p95": percentile(last, 95),
+        "ratio": percentile(last, 50) / max(percentile(first, 50), 0.001),
+    }
+
+
+def check_walk(name, latencies, items, window, max_ratio, expected=None, status=None):
+    """지연 평평함 + id 중복/누락/정렬 (+ status 필터면 항목 status) 확인 → 실패 사유 목록"""
+    ids = [item["id"] for item in items]
+    r = flatness(latencies, window)
+    print(f"[{name}] pages={r['pages']} items={len(ids)}")
+    print(f"  처음 {window}p  p50 {r['first_p50']:7.1f}ms  p95 {r['first_p95']:7.1f}ms")
+    print(f"  마지막 {window}p p50 {r['last_p50']:7.1f}ms  p95 {r['last_p95']:7.1f}ms   x{r['ratio']:.2f}")
+    errors = []
+    if r["ratio"] > max_ratio:
+        errors.append(f"{name}: last/first p50 x{r['ratio']:.2f} > x{max_ratio}")
+    if len(set(ids)) != len(ids):
+        errors.append(f"{name}: duplicate ids across pages")
+    if any(a <= b for a, b in zip(ids, ids[1:])):
+        errors.append(f"{name}: ids not strictly descending")
+    if expected is not None and len(ids) < expected:
+        errors.append(f"{name}: {len(ids)} items < {expected} seeded")
+    mismatched = [item["id"] for item in items if status and item.get("status") != status]
+    if mismatched:
+        errors.append(f"{name}: {len(mismatched)} items whose latest status != {status} (e.g. id {mismatched[0]})")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="상품 목록 keyset 페이지네이션 부하 테스트")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--user-id", default=None, help="시드 사용자 (기본: Clerk 세션의 사용자)")
+    parser.add_argument("--products", type=int, default=100000, help="시드 상품 수")
+    parser.add_argument("--limit", type=int, default=50, help="페이지 크기")
+    parser.add_argument("--fields", default="id,name,category,recommendedPrice,createdAt")
+    parser.add_argument("--window", type=int, default=20, help="처음/마지막 비교 페이지 수")
+    parser.add_argument("--max-ratio", type=float, default=1.5, help="마지막/처음 p50 허용 배수")
+    parser.add_argument("--filters", action="store_true", help="category / status / q 필터로도 끝까지 넘기기")
+    parser.add_argument("--no-seed", action="store_true", help="이미 시드된 상품 재사용")
+    parser.add_argument("--keep", action="store_true", help="끝나고 시드 행을 지우지 않음")
+    parser.add_argument("--json", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    auth = ClerkSessionAuth()
+    if not auth.configured:
+        print("Clerk 인증 정보가 없습니다: CLERK_SECRET_KEY + SELPIX_TEST_USER_ID 또는 SELPIX_SESSION_TOKEN 필요")
+        return 1
+    session = authed_session(make_session(1), auth)
+    user_id = args.user_id or auth.user
+    if not args.no_seed and not DATABASE_URL:
+        print("DATABASE_URL 이 없습니다 (시드에 psql 사용, 기존 데이터면 --no-seed)")
+        return 1
+
+    if not args.no_seed:
+        print(f"seed: products={args.products} user={user_id} ... ", end="", flush=True)
+        print(f"{seed(user_id, args.products):.1f}s")
+
+    errors, report = [], {}
+    try:
+        base = {"limit": args.limit, "fields": args.fields}
+        walk(session, args.base_url, base, max_pages=args.window)  # 워밍업 (라우트 컴파일, 커넥션)
+        latencies, items = walk(session, args.base_url, base)
+        errors += check_walk("all", latencies, items, args.window, args.max_ratio,
+                             expected=None if args.no_seed else args.products)
+        report["all"] = flatness(latencies, args.window)
+
+        if args.filters:
+            for name, extra in [("category", {"category": CATEGORIES[0]}),
+                                ("status", {"status": "REGISTERED", "fields": args.fields + ",status"}),
+                                ("q", {"q": "텀블러"})]:
+                latencies, items = walk(session, args.base_url, dict(base, **extra))
+                window = max(1, min(args.window, len(latencies) // 4))
+                errors += check_walk(name, latencies, items, window, args.max_ratio, status=extra.get("status"))
+                report[name] = flatness(latencies, window)
+    finally:
+        if not args.no_seed and not args.keep:
+            cleanup(user_id)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "errors": errors}, f, ensure_ascii=False, indent=2)
+    for e in errors:
+        print(f"  ✗ {e}")
+    print("PASS" if not errors else "FAIL")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
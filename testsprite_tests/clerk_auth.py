@@ -0,0 +1,101 @@
+"""
+Clerk 인증 세션 — auth() 로 userId 를 요구하는 /api 라우트(/api/coupang/register, /api/settings/coupang 등)용
+
+clerkMiddleware 는 /api 에서도 Authorization: Bearer <세션 토큰> 을 읽으므로
+테스트 사용자 세션의 토큰을 헤더로 붙이면 브라우저 쿠키 없이 인증된 요청이 된다.
+세션 토큰은 60초짜리라서 CLERK_SECRET_KEY 가 있으면 Backend API 로
+  POST /v1/sessions {user_id}            → 테스트 사용자 세션 생성 (프로세스당 1회)
+  POST /v1/sessions/{id}/tokens          → 토큰 발급, 만료 전에 다시 발급
+해서 요청마다 유효한 토큰을 붙인다. 짧은 실행이면 SELPIX_SESSION_TOKEN 에 토큰을 직접 줘도 된다.
+
+사용 예:
+    from clerk_auth import authed_session
+    session = authed_session()            # 인증 정보가 없으면 AssertionError
+    session.post(f"{BASE_URL}/api/coupang/register", json=payload)
+
+환경변수:
+    CLERK_SECRET_KEY      Clerk Backend API 키 (sk_test_..., 앱 서버와 같은 인스턴스)
+    SELPIX_TEST_USER_ID   세션을 만들 Clerk 사용자 id (user_...)
+    SELPIX_SESSION_TOKEN  위 둘 대신 쓸 고정 세션 토큰 (__session 쿠키 값)
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.auth import AuthBase
+
+CLERK_API_URL = os.environ.get("CLERK_API_URL", "https://api.clerk.com/v1")
+CLERK_SECRET_KEY = os.environ.get("CLERK_SECRET_KEY", "")
+TEST_USER_ID = os.environ.get("SELPIX_TEST_USER_ID", "")
+SESSION_TOKEN = os.environ.get("SELPIX_SESSION_TOKEN", "")
+REFRESH_MARGIN_SEC = 15  # 만료 이만큼 전에 새 토큰 발급
+TIMEOUT = 30
+
+
+def token_claims(token):
+    """세션 JWT payload (서명 검증 없이 읽기만) — 형식이 아니면 {}"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return {}
+
+
+class ClerkSessionAuth(AuthBase):
+    """요청마다 유효한 세션 토큰을 Authorization 헤더로 붙인다 (스레드 안전)"""
+
+    def __init__(self, secret_key=CLERK_SECRET_KEY, user_id=TEST_USER_ID, token=SESSION_TOKEN):
+        self.secret_key = secret_key
+        self.user_id = user_id
+        self.token = None if secret_key and user_id else token
+        self.expires_at = float("inf") if self.token else 0
+        self.session_id = None
+        self.lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return bool(self.token or (self.secret_key and self.user_id))
+
+    def _backend(self, path, body):
+        resp = requests.post(
+            f"{CLERK_API_URL}{path}",
+            headers={"Authorization": f"Bearer {self.secret_key}"},
+            json=body, timeout=TIMEOUT,
+        )
+        assert resp.status_code == 200, f"Clerk {path} failed: {resp.status_code} {resp.text[:200]}"
+        return resp.json()
+
+    def current_token(self):
+        with self.lock:
+            if self.token and time.time() < self.expires_at - REFRESH_MARGIN_SEC:
+                return self.token
+            if not self.session_id:
+                self.session_id = self._backend("/sessions", {"user_id": self.user_id})["id"]
+            self.token = self._backend(f"/sessions/{self.session_id}/tokens", {})["jwt"]
+            self.expires_at = token_claims(self.token).get("exp", time.time() + 60)
+            return self.token
+
+    @property
+    def user(self):
+        """토큰 주인 (Clerk user id)"""
+        return self.user_id or token_claims(self.token or "").get("sub")
+
+    def __call__(self, req):
+        req.headers["Authorization"] = f"Bearer {self.current_token()}"
+        return req
+
+
+def authed_session(session=None, auth=None):
+    """session(기본 새 Session)에 Clerk 인증을 붙여 돌려준다 — 설정이 없으면 AssertionError"""
+    auth = auth or ClerkSessionAuth()
+    assert auth.configured, (
+        "Clerk 인증이 필요합니다: CLERK_SECRET_KEY + SELPIX_TEST_USER_ID 또는 SELPIX_SESSION_TOKEN 을 설정하세요"
+    )
+    session = session or requests.Session()
+    session.auth = auth
+    return session
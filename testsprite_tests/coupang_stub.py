@@ -0,0 +1,452 @@
+"""
+오프라인 쿠팡 셀러 API 스텁 서버
+
+api-gateway.coupang.com 대신 띄워 두고 COUPANG_API_BASE_URL 로 지정하면
+register 라우트(direct 모드), proxy/server.js, scripts/lib/coupang_api.js 가
+네트워크 없이 전체 등록 경로를 탄다.
+
+- CEA HmacSHA256 서명 검증 (signed-date + method + path + query)
+- 출고지 조회/생성, 반품지 조회/생성, 카테고리 예측, 상품 생성/조회
+- 상품 생성 응답은 data/scraping/coupang_response_*.json 기록을 재생
+- 지연시간, 오류율(5xx), 초당 요청 제한(429) 설정 가능
+- GET /__stub/stats 로 엔드포인트별 호출 수 확인, POST /__stub/reset 으로 초기화
+
+사용 예:
+    python coupang_stub.py --port 8787 --latency-ms 80 --jitter-ms 40 --error-rate 0.02 --rate-limit 10
+    COUPANG_API_BASE_URL=http://127.0.0.1:8787 COUPANG_ACCESS_KEY=stub-access-key \\
+        COUPANG_SECRET_KEY=stub-secret-key pnpm --filter app dev
+"""
+
+import argparse
+import glob
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "scraping")
+DEFAULT_ACCESS_KEY = os.environ.get("COUPANG_ACCESS_KEY", "stub-access-key")
+DEFAULT_SECRET_KEY = os.environ.get("COUPANG_SECRET_KEY", "stub-secret-key")
+DEFAULT_RETURN_NAME = os.environ.get("COUPANG_RETURN_CHARGE_NAME", "로드")
+DEFAULT_CATEGORY = ("81283", "기타 생활용품")
+MAX_CLOCK_SKEW_SEC = 300
+
+AUTH_RE = re.compile(
+    r"^CEA algorithm=(?P<algorithm>[^,]+),\s*access-key=(?P<access_key>[^,]+),\s*"
+    r"signed-date=(?P<signed_date>[^,]+),\s*signature=(?P<signature>[0-9a-f]+)$"
+)
+
+ROUTES = [
+    ("GET", re.compile(r"^/v2/providers/marketplace_openapi/apis/api/v2/vendor/shipping-place/outbound$"), "outbound_list"),
+    ("POST", re.compile(r"^/v2/providers/openapi/apis/api/v\d/vendors/[^/]+/outboundShippingCenters$"), "outbound_create"),
+    ("GET", re.compile(r"^/v2/providers/openapi/apis/api/v\d/vendors/[^/]+/returnShippingCenters$"), "return_list"),
+    ("POST", re.compile(r"^/v2/providers/openapi/apis/api/v\d/vendors/[^/]+/returnShippingCenters$"), "return_create"),
+    ("POST", re.compile(r"^/v2/providers/openapi/apis/api/v1/categorization/predict$"), "category_predict"),
+    ("POST", re.compile(r"^/v2/providers/seller_api/apis/api/v1/marketplace/seller-products$"), "product_create"),
+    ("GET", re.compile(r"^/v2/providers/seller_api/apis/api/v1/marketplace/seller-products/(?P<id>\d+)$"), "product_get"),
+]
+
+
+def sign(method, path, query, access_key, secret_key, now=None):
+    """클라이언트와 같은 방식의 CEA 서명 (테스트/부하 스크립트용)"""
+    now = now or datetime.now(timezone.utc)
+    signed_date = now.strftime("%y%m%dT%H%M%SZ")
+    message = f"{signed_date}{method}{path}{query}"
+    signature = hmac.new(secret_key.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).hexdigest()
+    return {
+        "Authorization": f"CEA algorithm=HmacSHA256, access-key={access_key}, signed-date={signed_date}, signature={signature}",
+        "X-Coupang-Date": signed_date,
+    }
+
+
+def load_product_fixtures(fixture_dir=FIXTURE_DIR):
+    """coupang_response_*.json → (상품명별 응답, 성공 응답 목록, 실패 응답 목록)"""
+    by_name, successes, failures = {}, [], []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, "coupang_response_*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        body = record.get("body") or {}
+        entry = {"status": record.get("status", 200), "body": body}
+        if record.get("product"):
+            by_name[record["product"]] = entry
+        (successes if body.get("code") == "SUCCESS" else failures).append(entry)
+    return by_name, successes, failures
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class StubState:
+    """스텁 설정 + 메모리 상태 (출고지/반품지/상품, 호출 통계)"""
+
+    def __init__(self, access_key=DEFAULT_ACCESS_KEY, secret_key=DEFAULT_SECRET_KEY, latency_ms=0,
+                 jitter_ms=0, error_rate=0.0, rate_limit=0.0, verify=True, replay_errors=False,
+                 fixture_dir=FIXTURE_DIR, seed=None):
+        self.keys = {access_key: secret_key}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.verify = verify
+        self.replay_errors = replay_errors
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.by_name, self.successes, self.failures = load_product_fixtures(fixture_dir)
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.buckets = {}
+            self.stats = {}
+            self.outbound = {}
+            self.returns = {
+                DEFAULT_RETURN_NAME: {
+                    "returnCenterCode": "1000000001",
+                    "shippingPlaceName": DEFAULT_RETURN_NAME,
+                    "deliverCode": "CJGLS",
+                    "usable": True,
+                },
+            }
+            self.products = {}
+            self.next_code = 2000000001
+            self.next_product_id = 17000000001
+            self.replay_index = 0
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def allow(self, access_key):
+        if self.rate_limit <= 0:
+            return True
+        with self.lock:
+            bucket = self.buckets.setdefault(access_key, TokenBucket(self.rate_limit))
+            return bucket.take()
+
+    def new_code(self):
+        with self.lock:
+            code = self.next_code
+            self.next_code += 1
+            return str(code)
+
+    def verify_signature(self, headers, method, path, query):
+        """(ok, access_key, error_message)"""
+        auth = headers.get("Authorization", "")
+        m = AUTH_RE.match(auth.strip())
+        if not m:
+            return False, None, "Authorization header is missing or malformed"
+        access_key = m.group("access_key").strip()
+        if not self.verify:
+            return True, access_key, None
+        if m.group("algorithm").strip() != "HmacSHA256":
+            return False, access_key, "Unsupported algorithm"
+        secret_key = self.keys.get(access_key)
+        if secret_key is None:
+            return False, access_key, "Unknown access key"
+        signed_date = m.group("signed_date").strip()
+        try:
+            signed_at = datetime.strptime(signed_date, "%y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return False, access_key, "Invalid signed-date"
+        if abs((datetime.now(timezone.utc) - signed_at).total_seconds()) > MAX_CLOCK_SKEW_SEC:
+            return False, access_key, "Request is expired (signed-date)"
+        message = f"{signed_date}{method}{path}{query}"
+        expected = hmac.new(secret_key.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, m.group("signature")):
+            return False, access_key, "Invalid signature"
+        return True, access_key, None
+
+    # ── 엔드포인트 ────────────────────────────────
+
+    def outbound_list(self, params, body, match):
+        names = params.get("placeNames", [])
+        with self.lock:
+            content = [p for p in self.outbound.values() if not names or p["shippingPlaceName"] in names]
+        return 200, {
+            "code": "SUCCESS",
+            "content": content,
+            "pagination": {"currentPage": 1, "totalPages": 1, "totalElements": len(content), "countPerPage": 50},
+        }
+
+    def outbound_create(self, params, body, match):
+        name = (body or {}).get("shippingPlaceName")
+        if not name:
+            return 400, {"code": "ERROR", "message": "출고지명을 입력하세요."}
+        with self.lock:
+            if name in self.outbound:
+                return 400, {"code": "ERROR", "message": f"이미 등록된 출고지명입니다. ({name})"}
+        code = self.new_code()
+        with self.lock:
+            self.outbound[name] = {
+                "outboundShippingPlaceCode": int(code),
+                "shippingPlaceName": name,
+                "placeAddresses": body.get("placeAddresses", []),
+                "usable": True,
+            }
+        return 200, {
+            "code": "200",
+            "message": "SUCCESS",
+            "data": {"resultCode": "SUCCESS", "resultMessage": code, "outboundShippingPlaceCode": int(code)},
+        }
+
+    def return_list(self, params, body, match):
+        with self.lock:
+            content = list(self.returns.values())
+        return 200, {
+            "code": "200",
+            "message": "SUCCESS",
+            "data": {
+                "content": content,
+                "pagination": {"currentPage": 1, "totalPages": 1, "totalElements": len(content), "countPerPage": 50},
+            },
+        }
+
+    def return_create(self, params, body, match):
+        name = (body or {}).get("shippingPlaceName")
+        if not name:
+            return 400, {"code": "ERROR", "message": "반품지명을 입력하세요."}
+        with self.lock:
+            if name in self.returns:
+                return 400, {"code": "ERROR", "message": f"이미 등록된 반품지명입니다. ({name})"}
+        code = self.new_code()
+        with self.lock:
+            self.returns[name] = {"returnCenterCode": code, "shippingPlaceName": name, "usable": True}
+        return 200, {
+            "code": "200",
+            "message": "SUCCESS",
+            "data": {"resultCode": "SUCCESS", "resultMessage": code, "returnCenterCode": code},
+        }
+
+    def category_predict(self, params, body, match):
+        name = (body or {}).get("productName")
+        if not name:
+            return 400, {"code": 400, "message": "productName is required"}
+        category_id, category_name = DEFAULT_CATEGORY
+        return 200, {
+            "code": 200,
+            "message": "OK",
+            "data": {
+                "autoCategorizationPredictionResultType": "SUCCESS",
+                "predictedCategoryId": category_id,
+                "predictedCategoryName": category_name,
+                "comment": None,
+            },
+        }
+
+    def product_create(self, params, body, match):
+        body = body or {}
+        if not body.get("returnCenterCode"):
+            return 200, {"code": "ERROR", "message": "[반품지센터코드를 입력하세요.]", "data": None,
+                         "details": None, "errorItems": None}
+        if not body.get("items"):
+            return 200, {"code": "ERROR", "message": "[옵션(items)을 입력하세요.]", "data": None,
+                         "details": None, "errorItems": None}
+
+        name = body.get("sellerProductName") or body.get("displayProductName") or ""
+        fixture = self.by_name.get(name)
+        if fixture is None:
+            pool = self.successes + (self.failures if self.replay_errors else [])
+            with self.lock:
+                fixture = pool[self.replay_index % len(pool)] if pool else None
+                self.replay_index += 1
+
+        response = dict(fixture["body"]) if fixture else {"code": "SUCCESS", "message": "[]", "data": None}
+        if response.get("code") == "SUCCESS":
+            with self.lock:
+                product_id = self.next_product_id
+                self.next_product_id += 1
+                self.products[product_id] = {"sellerProductId": product_id, "statusName": "승인대기중", "request": body}
+            response["data"] = product_id
+        return (fixture or {}).get("status", 200), response
+
+    def product_get(self, params, body, match):
+        with self.lock:
+            product = self.products.get(int(match.group("id")))
+        if not product:
+            return 404, {"code": "ERROR", "message": "상품을 찾을 수 없습니다."}
+        req = product["request"]
+        return 200, {
+            "code": "SUCCESS",
+            "message": "",
+            "data": {
+                "sellerProductId": product["sellerProductId"],
+                "sellerProductName": req.get("sellerProductName"),
+                "statusName": product["statusName"],
+                "items": req.get("items", []),
+            },
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "CoupangStub/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, payload, extra_headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (extra_headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        path, query = url.path, url.query
+        body = self._read_body()
+
+        if path == "/__stub/stats":
+            with self.state.lock:
+                stats = dict(self.state.stats)
+            return self._send(200, stats)
+        if path == "/__stub/reset" and method == "POST":
+            self.state.reset()
+            return self._send(200, {"ok": True})
+
+        route = None
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                route = (name, match)
+                break
+        if route is None:
+            self.state.count("not_found")
+            return self._send(404, {"code": "ERROR", "message": f"No route for {method} {path}"})
+
+        name, match = route
+        self.state.count(name)
+
+        ok, access_key, error = self.state.verify_signature(self.headers, method, path, query)
+        if not ok:
+            self.state.count("401")
+            return self._send(401, {"code": "ERROR", "message": error})
+
+        if not self.state.allow(access_key):
+            self.state.count("429")
+            return self._send(429, {"code": "ERROR", "message": "Too many requests"}, {"Retry-After": "1"})
+
+        delay = self.state.latency_ms + self.state.random.uniform(0, self.state.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if self.state.error_rate and self.state.random.random() < self.state.error_rate:
+            self.state.count("5xx")
+            return self._send(500, {"code": "ERROR", "message": "Internal Server Error (stub)"})
+
+        status, payload = getattr(self.state, name)(parse_qs(query, keep_blank_values=True), body, match)
+        self._send(status, payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state, verbose=False):
+        super().__init__(address, StubHandler)
+        self.state = state
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub(host="127.0.0.1", port=0, verbose=False, **options):
+    """백그라운드 스레드로 스텁 실행 → (server, thread). server.base_url 로 접속"""
+    server = StubServer((host, port), StubState(**options), verbose=verbose)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 쿠팡 셀러 API 스텁")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--access-key", default=DEFAULT_ACCESS_KEY)
+    parser.add_argument("--secret-key", default=DEFAULT_SECRET_KEY)
+    parser.add_argument("--latency-ms", type=float, default=0, help="기본 지연시간")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="추가 무작위 지연 (0~N ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="access-key 당 초당 요청 수 (초과 시 429)")
+    parser.add_argument("--no-verify", action="store_true", help="서명 검증 생략")
+    parser.add_argument("--replay-errors", action="store_true", help="실패 기록도 상품 생성 응답으로 재생")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    state = StubState(
+        access_key=args.access_key,
+        secret_key=args.secret_key,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        verify=not args.no_verify,
+        replay_errors=args.replay_errors,
+        fixture_dir=args.fixtures,
+        seed=args.seed,
+    )
+    server = StubServer((args.host, args.port), state, verbose=args.verbose)
+    print(f"▶ coupang stub: {server.base_url} "
+          f"(fixtures: {len(state.successes)} success / {len(state.failures)} error)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+도매꾹 crawler farm 벤치마크 (저장된 HTML 픽스처 재생)
+
+fixtures/domeggook/*.html 검색 결과 페이지를 로컬 HTTP 서버로 띄우고
+DOMEGGOOK_BASE_URL 을 그쪽으로 돌린 뒤 proxy/crawl_batch.js 를
+워커(페이지 풀) 수별로 실행해 pages/sec 를 비교한다.
+실제 도매꾹에 요청하지 않으므로 결과는 네트워크 상태와 무관하다.
+
+사용 예:
+    python crawler_bench.py                              # 워커 1,2,4,8 / 키워드 40개
+    python crawler_bench.py --workers 1,4,16 --keywords 100 --latency-ms 300
+    python crawler_bench.py --write-fixtures             # register_queue.jsonl 로 픽스처 재생성
+
+필요: node + proxy/node_modules (puppeteer, cheerio)
+"""
+
+import argparse
+import glob
+import html
+import json
+import os
+import subprocess
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from queue_store import JOURNAL_FILE as QUEUE_FILE, load_items
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+PROXY_DIR = os.path.join(ROOT, "proxy")
+FIXTURE_DIR = os.path.join(HERE, "fixtures", "domeggook")
+SEARCH_PATH = "/main/item/itemList.php"
+ITEMS_PER_FIXTURE = 30
+
+
+def load_fixtures(directory=FIXTURE_DIR):
+    """픽스처 HTML 목록 (파일명 정렬)"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "search_*.html"))):
+        with open(path, "rb") as f:
+            fixtures.append(f.read())
+    return fixtures
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """검색 URL(?sw=키워드) → 키워드 해시로 고른 픽스처 응답. 그 외 경로는 빈 200"""
+
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, latency_ms=0):
+        super().__init__(address, FixtureHandler)
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.in_flight = self.max_in_flight = 0
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        srv = self.server
+        parsed = urlparse(self.path)
+        if parsed.path != SEARCH_PATH:
+            self._send(200, b"", "text/plain")
+            return
+        with srv.lock:
+            srv.hits += 1
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+        try:
+            if srv.latency:
+                time.sleep(srv.latency)
+            keyword = parse_qs(parsed.query).get("sw", [""])[0]
+            body = srv.fixtures[zlib.crc32(keyword.encode("utf-8")) % len(srv.fixtures)]
+            self._send(200, body, "text/html; charset=utf-8")
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def start_fixture_server(fixtures, host="127.0.0.1", port=0, latency_ms=0):
+    server = FixtureServer((host, port), fixtures, latency_ms)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def run_batch(base_url, keywords, pool, host_rps=0, timeout=600):
+    """crawl_batch.js 1회 실행 → 요약 dict"""
+    cmd = ["node", "crawl_batch.js", "--keywords", ",".join(keywords),
+           "--pool", str(pool), "--host-rps", str(host_rps), "--json"]
+    env = dict(os.environ, DOMEGGOOK_BASE_URL=base_url)
+    proc = subprocess.run(cmd, cwd=PROXY_DIR, env=env, capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"crawl_batch.js exited with {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# --- 픽스처 생성 ---
+
+def _item_html(item):
+    name = html.escape(item.get("domeggookProductName") or item.get("displayName") or "상품")
+    no = item.get("domeggookProductNo") or ""
+    price = int(float(item.get("sourcePrice") or item.get("unitCost") or 0))
+    moq = int(float(item.get("minOrderQuantity") or 1))
+    image = html.escape(item.get("imageUrl") or "")
+    return (
+        '<li>'
+        f'<a class="thumb" href="/{no}?from=lstGen"><img data-original="{image}" src="/img/blank.gif" alt=""></a>'
+        f'<a class="title" href="/{no}?from=lstGen">{name}</a>'
+        '<div class="amtqty amtQtyMargin">'
+        f'<div class="amt"><b>{price:,}</b>원</div>'
+        f'<span class="unitQty">{moq}개</span>'
+        '<span class="infoDeli">3,000원</span>'
+        '</div>'
+        '<div class="seller"><span class="nick"><a href="/main/item/itemList.php?sf=id&amp;sw=seller">판매자</a></span></div>'
+        '</li>'
+    )
+
+
+def write_fixtures(queue_file=QUEUE_FILE, directory=FIXTURE_DIR, pages=3):
+    """register_queue.jsonl 상품으로 도매꾹 검색 결과 구조(ol.lItemList > li)의 페이지 생성"""
+    queue = [q for q in load_items(queue_file) if q.get("sourceSite") == "domeggook"]
+    if not queue:
+        raise SystemExit("도매꾹 상품이 큐에 없습니다")
+    os.makedirs(directory, exist_ok=True)
+    for page in range(pages):
+        items = [queue[(page * ITEMS_PER_FIXTURE + i) % len(queue)] for i in range(ITEMS_PER_FIXTURE)]
+        body = (
+            '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>도매꾹 검색</title></head>'
+            '<body><div id="lBody"><ol class="lItemList">'
+            + "".join(_item_html(i) for i in items)
+            + '</ol></div></body></html>\n'
+        )
+        with open(os.path.join(directory, f"search_{page + 1}.html"), "w", encoding="utf-8") as f:
+            f.write(body)
+    print(f"{pages}개 픽스처 생성 → {directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="도매꾹 crawler farm 벤치마크")
+    parser.add_argument("--workers", default="1,2,4,8", help="쉼표 구분 페이지 풀 크기")
+    parser.add_argument("--keywords", type=int, default=40, help="워커 수별 크롤링할 키워드 수")
+    parser.add_argument("--latency-ms", type=float, default=150, help="픽스처 서버 응답 지연")
+    parser.add_argument("--host-rps", type=float, default=0, help="crawler 호스트별 rps 제한 (0=해제)")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--write-fixtures", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.write_fixtures:
+        write_fixtures(directory=args.fixtures)
+        return 0
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"픽스처가 없습니다: {args.fixtures} (--write-fixtures 로 생성)")
+        return 1
+
+    server, _ = start_fixture_server(fixtures, latency_ms=args.latency_ms)
+    keywords = [f"키워드{i:03d}" for i in range(args.keywords)]
+    print(f"fixtures={len(fixtures)}  keywords={len(keywords)}  latency={args.latency_ms:g}ms  "
+          f"host_rps={args.host_rps:g}  server={server.base_url}")
+    print(f"{'workers':>7} {'pages/s':>9} {'elapsed':>9} {'items':>6} {'empty':>5} {'peak':>5} {'contexts':>8}")
+
+    failed = 0
+    baseline = None
+    try:
+        for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+            server.reset_stats()
+            try:
+                summary = run_batch(server.base_url, keywords, workers, args.host_rps)
+            except (RuntimeError, subprocess.TimeoutExpired, ValueError) as e:
+                print(f"{workers:>7}  실패: {e}")
+                failed += 1
+                continue
+            rate = summary["pagesPerSec"]
+            baseline = baseline or rate
+            print(f"{workers:>7} {rate:>9.2f} {summary['elapsedMs'] / 1000:>8.2f}s {summary['items']:>6} "
+                  f"{summary['empty']:>5} {server.max_in_flight:>5} {summary['pool']['contextsCreated']:>8}"
+                  f"   x{rate / baseline:.1f}")
+    finally:
+        server.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
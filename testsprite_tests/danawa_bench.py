@@ -0,0 +1,300 @@
+"""
+다나와 경쟁사 가격 조회 벤치마크 (저장된 HTML 픽스처 재생)
+
+fixtures/danawa/*.html 검색 결과 페이지를 로컬 HTTP 서버로 띄우고
+  - 기존 방식: 상품마다 curl 프로세스 1회(직렬) + 가격 패턴별 정규식 3회 + 상품명 1회
+  - 엔진: node scripts/competitor_analysis.js --json
+          (lib/danawa_pricing.js — keep-alive, 동시 요청 제한, 검색어 디스크 캐시, 단일 패스 추출)
+          캐시 없이 1회(cold) + 같은 캐시로 1회 더(warm)
+를 돌려 products/sec 를 비교하고, 상품별 시장가 통계/샘플 상품명이 같은지 확인한다.
+실제 다나와에 요청하지 않으므로 결과는 네트워크 상태와 무관하다.
+
+사용 예:
+    python danawa_bench.py                          # our_products_detail.json 상품 전체
+    python danawa_bench.py --products 200 --latency-ms 300 --concurrency 8
+    python danawa_bench.py --write-fixtures         # our_products_detail.json 으로 픽스처 재생성
+
+필요: node, curl
+"""
+
+import argparse
+import glob
+import html
+import json
+import os
+import random
+import re
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SCRIPT = os.path.join(ROOT, "scripts", "competitor_analysis.js")
+FIXTURE_DIR = os.path.join(HERE, "fixtures", "danawa")
+PRODUCTS_FILE = os.path.join(ROOT, "data", "our_products_detail.json")
+SEARCH_PATH = "/dsearch.php"
+ITEMS_PER_FIXTURE = 40
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+
+# 기존 searchDanawa 의 패턴 (패턴별로 HTML 전체를 한 번씩 훑음)
+SHOP_RE = re.compile(r"통합검색_상품블로그_유입[^>]*>[^<]*?(\d{1,3}(?:,\d{3})+)원")
+WOW_RE = re.compile(r"와우할인가</em></span>(\d{1,3}(?:,\d{3})+)원")
+LOW_RE = re.compile(r"low-price[^>]*>(?:<[^>]+>)*\s*(\d{1,3}(?:,\d{3})+)원")
+NAME_RE = re.compile(r'prod\.danawa\.com[^"]*"[^>]*title="([^"]{5,80})"')
+
+
+def load_fixtures(directory=FIXTURE_DIR):
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "search_*.html"))):
+        with open(path, "rb") as f:
+            fixtures.append(f.read())
+    return fixtures
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """/dsearch.php?query=검색어 → 검색어 해시로 고른 픽스처 응답 (keep-alive 지원)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, latency_ms=0):
+        super().__init__(address, FixtureHandler)
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.connections = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.connections = 0
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        srv = self.server
+        parsed = urlparse(self.path)
+        if parsed.path != SEARCH_PATH:
+            self._send(404, b"")
+            return
+        with srv.lock:
+            srv.hits += 1
+        if srv.latency:
+            time.sleep(srv.latency)
+        query = parse_qs(parsed.query).get("query", [""])[0]
+        self._send(200, srv.fixtures[zlib.crc32(query.encode("utf-8")) % len(srv.fixtures)])
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def start_fixture_server(fixtures, host="127.0.0.1", port=0, latency_ms=0):
+    server = FixtureServer((host, port), fixtures, latency_ms)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+# ── 기존 방식 (직렬 curl + 다중 패스) ──────────────────
+
+
+def price_stats(prices):
+    """competitor_analysis.js priceStats 와 동일"""
+    if not prices:
+        return None
+    s = sorted(prices)
+    n = len(s)
+    return {
+        "min": s[0],
+        "max": s[-1],
+        "median": s[n // 2],
+        "avg": int(sum(s) / n + 0.5),
+        "count": n,
+        "p25": s[int(n * 0.25)],
+        "p75": s[int(n * 0.75)],
+    }
+
+
+def legacy_search(base_url, query):
+    url = f"{base_url}{SEARCH_PATH}?query={quote(query, safe='')}&tab=goods"
+    proc = subprocess.run(["curl", "-sL", url, "-H", f"User-Agent: {USER_AGENT}"],
+                          capture_output=True, timeout=15)
+    page = proc.stdout.decode("utf-8", errors="replace")
+    all_prices = []
+    for pattern in (SHOP_RE, WOW_RE, LOW_RE):
+        all_prices += [int(m.group(1).replace(",", "")) for m in pattern.finditer(page)]
+    prices = list(dict.fromkeys(p for p in all_prices if 1000 <= p <= 3000000))[:30]
+    products = [m.group(1).replace("&amp;", "&").strip() for m in NAME_RE.finditer(page)]
+    return prices, products
+
+
+def run_legacy(base_url, queries, sleep_sec=0.0):
+    """기존 competitor_analysis.js 루프와 같은 순서/방식"""
+    started = time.perf_counter()
+    results = []
+    for q in queries:
+        prices, products = legacy_search(base_url, q)
+        results.append({"searchQuery": q, "market": price_stats(prices), "sampleProducts": products[:5]})
+        if sleep_sec:
+            time.sleep(sleep_sec)
+    return results, time.perf_counter() - started
+
+
+# ── 엔진 ───────────────────────────────────────────
+
+
+def run_engine(base_url, products_file, cache_dir, concurrency, rps=0, timeout=600):
+    """competitor_analysis.js --json 1회 실행 → 요약 dict"""
+    cmd = ["node", SCRIPT, "--json", "--no-report", f"--input={products_file}", f"--concurrency={concurrency}"]
+    env = dict(os.environ, DANAWA_BASE_URL=base_url, DANAWA_CACHE_DIR=cache_dir, DANAWA_RPS=str(rps))
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip()[-500:] or f"competitor_analysis.js exited with {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def load_products(count=None, products_file=PRODUCTS_FILE):
+    """our_products_detail.json (에러 제외) — count 가 더 크면 순환 복제 (같은 검색어 공유)"""
+    with open(products_file, "r", encoding="utf-8") as f:
+        products = [p for p in json.load(f) if not p.get("error")]
+    if count:
+        products = [dict(products[i % len(products)], pid=i) for i in range(count)]
+    return products
+
+
+# ── 픽스처 생성 ────────────────────────────────────
+
+
+def _item_html(rng, name, base_price, n):
+    pcode = 10000000 + n
+    title = html.escape(name[:70])
+    price = lambda: f"{max(1000, int(base_price * rng.uniform(0.4, 2.5)) // 10 * 10):,}"  # noqa: E731
+    specs = " / ".join(f"사양{j}: {rng.choice(['일반형', '대용량', '휴대용', '무선', '유선', '국내산'])}" for j in range(12))
+    shops = "".join(
+        '<li class="opt_item">'
+        f'<a href="https://prod.danawa.com/bridge/loadingBridge.html?pcode={pcode}&amp;shop={s}" target="_blank" '
+        f"onclick=\"_trackEvent('통합검색_상품블로그_유입', '{s}');\">"
+        f'{price()}원</a><span class="mall">쇼핑몰{s}</span></li>'
+        for s in range(rng.randint(1, 3))
+    )
+    wow = (f'<span class="wow"><span><em>와우할인가</em></span>{price()}원</span>' if rng.random() < 0.3 else "")
+    return (
+        f'<li class="prod_item" id="productItem{pcode}">'
+        '<div class="prod_main_info">'
+        f'<div class="thumb_image"><a href="https://prod.danawa.com/info/?pcode={pcode}&amp;keyword=" target="_blank" '
+        f'title="{title}"><img src="//img.danawa.com/prod_img/{pcode}.jpg" alt="{title}"></a></div>'
+        f'<div class="prod_info"><p class="prod_name"><a href="https://prod.danawa.com/info/?pcode={pcode}" '
+        f'name="productName">{title}</a></p><div class="spec_list">{html.escape(specs)}</div></div>'
+        f'<div class="prod_pricelist"><ul>{shops}</ul>'
+        f'<p class="price_sect"><span class="low-price"><em class="txt">최저가</em> <strong>{price()}원</strong></span></p>'
+        f'{wow}</div></div></li>\n'
+    )
+
+
+def write_fixtures(products_file=PRODUCTS_FILE, directory=FIXTURE_DIR, pages=3, seed=1):
+    """our_products_detail.json 상품명/가격으로 다나와 검색 결과 구조(ul.product_list > li.prod_item) 페이지 생성"""
+    products = load_products(products_file=products_file)
+    if not products:
+        raise SystemExit("상품이 없습니다")
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for page in range(pages):
+        items = []
+        for i in range(ITEMS_PER_FIXTURE):
+            p = products[(page * ITEMS_PER_FIXTURE + i) % len(products)]
+            items.append(_item_html(rng, p["displayName"], p.get("minPrice") or 10000, page * ITEMS_PER_FIXTURE + i))
+        body = (
+            '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>다나와 통합검색</title></head>'
+            '<body><div id="danawa_container"><div class="main_prodlist"><ul class="product_list">\n'
+            + "".join(items)
+            + "</ul></div></div></body></html>\n"
+        )
+        with open(os.path.join(directory, f"search_{page + 1}.html"), "w", encoding="utf-8") as f:
+            f.write(body)
+    print(f"{pages}개 픽스처 생성 → {directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="다나와 경쟁사 가격 조회 벤치마크")
+    parser.add_argument("--products", type=int, default=0, help="상품 수 (0=our_products_detail.json 전체, 크면 순환)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=150, help="픽스처 서버 응답 지연")
+    parser.add_argument("--legacy-sleep", type=float, default=0, help="기존 방식 상품 간 대기(초), 원래 스크립트는 1")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--write-fixtures", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.write_fixtures:
+        write_fixtures(directory=args.fixtures)
+        return 0
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"픽스처가 없습니다: {args.fixtures} (--write-fixtures 로 생성)")
+        return 1
+
+    products = load_products(args.products or None)
+    server, _ = start_fixture_server(fixtures, latency_ms=args.latency_ms)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            products_file = os.path.join(tmp, "products.json")
+            with open(products_file, "w", encoding="utf-8") as f:
+                json.dump(products, f, ensure_ascii=False)
+            cache_dir = os.path.join(tmp, "cache")
+
+            server.reset_stats()
+            cold = run_engine(server.base_url, products_file, cache_dir, args.concurrency)
+            cold_hits, cold_conns = server.hits, server.connections
+            server.reset_stats()
+            warm = run_engine(server.base_url, products_file, cache_dir, args.concurrency)
+            warm_hits = server.hits
+
+        queries = [r["searchQuery"] for r in cold["results"]]
+        server.reset_stats()
+        legacy, legacy_sec = run_legacy(server.base_url, queries, args.legacy_sleep)
+        legacy_hits, legacy_conns = server.hits, server.connections
+    finally:
+        server.shutdown()
+
+    mismatches = sum(
+        1 for a, b in zip(legacy, cold["results"])
+        if a["market"] != b["market"] or a["sampleProducts"] != b["sampleProducts"]
+    )
+    n = len(products)
+    legacy_rate = n / legacy_sec
+    print(f"fixtures={len(fixtures)}  products={n}  queries={cold['queries']}  latency={args.latency_ms:g}ms  "
+          f"concurrency={args.concurrency}")
+    print(f"{'path':>22} {'products/s':>11} {'elapsed':>9} {'requests':>9} {'conns':>6}")
+    print(f"{'legacy (serial curl)':>22} {legacy_rate:>11.1f} {legacy_sec:>8.2f}s {legacy_hits:>9} {legacy_conns:>6}")
+    for label, r, hits, conns in (("engine (cold cache)", cold, cold_hits, cold_conns), ("engine (warm cache)", warm, warm_hits, "-")):
+        print(f"{label:>22} {r['productsPerSec']:>11.1f} {r['elapsedMs'] / 1000:>8.2f}s {hits:>9} {conns:>6}"
+              f"   x{r['productsPerSec'] / legacy_rate:.1f}")
+    print(f"결과 불일치: {mismatches}건")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,352 @@
+"""
+상세페이지 HTML sanitizer — 퍼즈 코퍼스 / 안전성 검사 / 처리량 벤치마크
+
+packages/utils/sanitizeHtml.js (쿠팡 등록: coupang-register.ts, proxy/server.js 공용)
+- fuzz_corpus: 실제 상세페이지 조각 + XSS 벡터 + 변형(대소문자, 공백/제어문자 삽입,
+  엔티티 인코딩, 잘린 태그/따옴표)을 섞은 결정적 코퍼스
+- find_violations: 표준 라이브러리 html.parser 로 결과를 다시 파싱해서
+  허용 목록 밖 태그/속성, on* 핸들러, 위험한 URL/CSS, 주석이 남았는지 확인
+  (sanitizer 와 다른 파서로 검사해야 토크나이저 차이로 빠져나가는 경우가 보인다)
+- legacy_sanitize: 기존 정규식 10회 치환 버전 (비교용)
+- 벤치마크: register_queue.jsonl 의 실제 detailHtml 을 반복 처리해 MB/s 측정
+  (node 안에서 신규 sanitizer 와 기존 정규식 체인을 같은 입력으로 측정)
+
+사용 예:
+    python html_sanitizer.py                  # 퍼즈 + 벤치마크
+    python html_sanitizer.py --corpus 5000 --mb 50
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+from html.parser import HTMLParser
+
+from queue_store import JOURNAL_FILE as QUEUE_FILE, load_items
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SANITIZER_JS = os.path.join(ROOT, "packages", "utils", "sanitizeHtml.js")
+TIMEOUT = 120
+
+SAFE_SCHEMES = {"http", "https", "mailto", "tel"}
+UNSAFE_STYLE_RE = re.compile(r"expression|javascript|vbscript|behavior|-moz-binding|@import|\\", re.I)
+SCHEME_RE = re.compile(r"^([a-z][a-z0-9+.\-]*):")
+CONTROL_RE = re.compile(r"[\x00-\x20\x7f]+")
+
+# 알려진 우회 벡터 (태그/속성/스킴/파서 혼동)
+PAYLOADS = [
+    "<script>alert(1)</script>",
+    "<SCRIPT SRC=//evil.example/x.js></SCRIPT>",
+    "<script\n>alert(1)</script\n>",
+    "<scr<script>ipt>alert(1)</script>",
+    "<script>document.write('</scr'+'ipt>')</script>",
+    "<img src=x onerror=alert(1)>",
+    "<img src=x onerror=\"alert(1)\"/>",
+    "<img src=x ONERROR = 'alert(1)'>",
+    "<img/src=x/onerror=alert(1)>",
+    "<img src=\"x\"onerror=\"alert(1)\">",
+    "<img src=`x` onerror=alert(1)>",
+    "<img src=\"javascript:alert(1)\">",
+    "<img src=\"data:image/png;base64,iVBORw0KGgo=\">",
+    "<a href=\"javascript:alert(1)\">x</a>",
+    "<a href='JaVaScRiPt:alert(1)'>x</a>",
+    "<a href=javascript:alert(1)>x</a>",
+    "<a href=\" javascript:alert(1)\">x</a>",
+    "<a href=\"java\tscript:alert(1)\">x</a>",
+    "<a href=\"java&#x09;script:alert(1)\">x</a>",
+    "<a href=\"jav&#x61;script:alert(1)\">x</a>",
+    "<a href=\"&#106;&#97;&#118;&#97;&#115;&#99;&#114;&#105;&#112;&#116;&#58;alert(1)\">x</a>",
+    "<a href=\"javascript&colon;alert(1)\">x</a>",
+    "<a href=\"vbscript:msgbox(1)\">x</a>",
+    "<a href=\"data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==\">x</a>",
+    "<a href=\"https://example.com/?q=<script>\">ok</a>",
+    "<iframe src=\"https://www.youtube.com/embed/x\" allowfullscreen></iframe>",
+    "<iframe src=javascript:alert(1)>",
+    "<object data=\"x.swf\"><param name=a value=b></object>",
+    "<embed src=\"x.swf\">",
+    "<style>body{background:url(javascript:alert(1))}</style>",
+    "<div style=\"width:expression(alert(1))\">x</div>",
+    "<div style=\"background:url(&#106;avascript:alert(1))\">x</div>",
+    "<div style=\"x:\\65xpression(alert(1))\">x</div>",
+    "<svg onload=alert(1)>",
+    "<svg><script>alert(1)</script></svg>",
+    "<math><mtext><script>alert(1)</script></mtext></math>",
+    "<body onload=alert(1)>",
+    "<form action=javascript:alert(1)><input type=submit></form>",
+    "<button formaction=javascript:alert(1)>x</button>",
+    "<meta http-equiv=\"refresh\" content=\"0;url=javascript:alert(1)\">",
+    "<link rel=stylesheet href=javascript:alert(1)>",
+    "<base href=\"javascript:alert(1)//\">",
+    "<!--<script>alert(1)</script>-->",
+    "<!--[if IE]><script>alert(1)</script><![endif]-->",
+    "<![CDATA[<script>alert(1)</script>]]>",
+    "<?xml version=\"1.0\"?>",
+    "<!DOCTYPE html>",
+    "<noscript><p title=\"</noscript><img src=x onerror=alert(1)>\"></noscript>",
+    "<textarea><script>alert(1)</script></textarea>",
+    "<title><script>alert(1)</script></title>",
+    "<template><script>alert(1)</script></template>",
+    "<p title=\"a>b\" onclick=\"alert(1)\">x</p>",
+    "<p title='\"><script>alert(1)</script>'>x</p>",
+    "<div data-src=\"x\" data-focus=\"true\" id=\"a\">x</div>",
+    "<a href=\"#\" target=\"_blank\">x</a>",
+    "<font color=\"red\" size=\"5\" face=\"굴림\">할인</font>",
+    "<table border=0 cellpadding=0><tr><td colspan=2 onmouseover=alert(1)>x</td></tr></table>",
+    "1 < 2 && 3 > 2",
+    "<<script>alert(1)//<</script>",
+    "</p><p>",
+    "<p",
+    "<p title=\"unterminated",
+    "<img src=x onerror=alert(1) ",
+    "<",
+    "< p>text",
+    "<3 하트",
+]
+
+# 변형용 조각
+_NOISE = ["\n", "\r\n", "\t", " ", "\x00", "\x0c", "&#x0A;", "&#9;", "/", "'", "\"", "<", ">", "=", "<!--", "-->"]
+
+
+def load_detail_pages(queue_file=QUEUE_FILE):
+    queue = load_items(queue_file)
+    return [item["detailHtml"] for item in queue if item.get("detailHtml")]
+
+
+def _mutate(rng, s):
+    op = rng.randrange(6)
+    if op == 0:  # 대소문자 섞기
+        return "".join(c.upper() if rng.random() < 0.5 else c for c in s)
+    if op == 1:  # 임의 위치에 공백/제어문자/특수문자
+        i = rng.randrange(len(s) + 1)
+        return s[:i] + rng.choice(_NOISE) + s[i:]
+    if op == 2:  # 잘라내기 (태그/따옴표 중간에서 끝남)
+        return s[:rng.randrange(len(s) + 1)]
+    if op == 3:  # 문자 하나를 숫자 엔티티로
+        i = rng.randrange(len(s)) if s else 0
+        return s[:i] + (f"&#{ord(s[i])};" if s else "") + s[i + 1:]
+    if op == 4:  # 중첩
+        i = rng.randrange(len(s) + 1)
+        return s[:i] + rng.choice(PAYLOADS) + s[i:]
+    return s + s
+
+
+def fuzz_corpus(size=2000, seed=1, pages=None):
+    """실제 페이지 전체 + 벡터 원본 + 무작위 조합/변형 → 입력 목록 (seed 가 같으면 항상 같음)"""
+    rng = random.Random(seed)
+    pages = load_detail_pages() if pages is None else pages
+    corpus = list(pages) + list(PAYLOADS)
+    while len(corpus) < size:
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            if pages and rng.random() < 0.4:
+                page = rng.choice(pages)
+                start = rng.randrange(len(page))
+                parts.append(page[start:start + rng.randint(1, 400)])
+            else:
+                parts.append(rng.choice(PAYLOADS))
+        s = "".join(parts)
+        for _ in range(rng.randint(0, 3)):
+            s = _mutate(rng, s)
+        corpus.append(s)
+    return corpus[:size] if size >= len(pages) + len(PAYLOADS) else corpus
+
+
+# ── 안전성 검사 ─────────────────────────────────────
+
+
+def is_safe_url(tag, attr, value):
+    url = CONTROL_RE.sub("", value).lower()
+    m = SCHEME_RE.match(url)
+    if not m or m.group(1) in SAFE_SCHEMES:
+        return True
+    return tag == "img" and attr == "src" and url.startswith("data:image/")
+
+
+class _Checker(HTMLParser):
+    def __init__(self, allowed_tags, allowed_attributes):
+        super().__init__(convert_charrefs=True)
+        self.allowed_tags = allowed_tags
+        self.allowed_attributes = allowed_attributes
+        self.violations = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in self.allowed_tags:
+            self.violations.append(f"tag <{tag}>")
+        for name, value in attrs:
+            if name not in self.allowed_attributes:
+                self.violations.append(f"attribute {name} on <{tag}>")
+            elif value is not None and name in ("href", "src") and not is_safe_url(tag, name, value):
+                self.violations.append(f"url {name}={value!r}")
+            elif value is not None and name == "style" and UNSAFE_STYLE_RE.search(value):
+                self.violations.append(f"style {value!r}")
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        if tag not in self.allowed_tags:
+            self.violations.append(f"end tag </{tag}>")
+
+    def handle_comment(self, data):
+        self.violations.append("comment")
+
+    def handle_decl(self, decl):
+        self.violations.append(f"declaration {decl!r}")
+
+    def handle_pi(self, data):
+        self.violations.append(f"processing instruction {data!r}")
+
+    def unknown_decl(self, data):
+        self.violations.append(f"declaration {data!r}")
+
+
+def find_violations(output, allowed_tags, allowed_attributes):
+    """sanitizer 결과 → 위반 목록 (비어 있어야 정상)"""
+    checker = _Checker(set(allowed_tags), set(allowed_attributes))
+    try:
+        checker.feed(output)
+        checker.close()
+    except AssertionError as e:  # 깨진 <![ ... 선언
+        checker.violations.append(f"parse error {e}")
+    violations = checker.violations
+    if "\n" in output or "\r" in output:
+        violations.append("newline")
+    return violations
+
+
+def image_sources(page):
+    """페이지의 http(s) 이미지 주소 목록 (등록 후에도 남아 있어야 하는 것)"""
+    found = []
+
+    class _Images(HTMLParser):
+        def handle_starttag(self, tag, attrs):
+            if tag == "img":
+                src = dict(attrs).get("src") or ""
+                if src.startswith(("http://", "https://")):
+                    found.append(src.replace("\n", "").replace("\r", ""))
+
+    parser = _Images(convert_charrefs=True)
+    parser.feed(page)
+    parser.close()
+    return found
+
+
+# ── 기존 구현 (정규식 10회 치환) ─────────────────────
+
+
+LEGACY_PATTERNS = [
+    (r"<script[\s\S]*?</script>", ""),
+    (r"<iframe[\s\S]*?</iframe>", ""),
+    (r"<object[\s\S]*?</object>", ""),
+    (r"<embed[^>]*>", ""),
+    (r"<style[\s\S]*?</style>", ""),
+    (r"\son[a-z]+\s*=\s*\"[^\"]*\"", ""),
+    (r"\son[a-z]+\s*=\s*'[^']*'", ""),
+    (r"\son[a-z]+\s*=\s*[^\s>]+", ""),
+    (r"(href|src)\s*=\s*\"(javascript:[^\"]*)\"", r'\1="#"'),
+    (r"(\r\n|\n|\r)", ""),
+]
+_LEGACY_RES = [(re.compile(p, re.I), r) for p, r in LEGACY_PATTERNS]
+
+
+def legacy_sanitize(s):
+    if not s:
+        return ""
+    for pattern, repl in _LEGACY_RES:
+        s = pattern.sub(repl, s)
+    return s.strip()
+
+
+# ── node 실행 ───────────────────────────────────────
+
+
+def run_sanitizer(inputs):
+    """packages/utils/sanitizeHtml.js eval → {"outputs", "allowedTags", "allowedAttributes"}"""
+    proc = subprocess.run(
+        ["node", SANITIZER_JS, "eval"],
+        input=json.dumps({"inputs": inputs}, ensure_ascii=False),
+        capture_output=True, text=True, encoding="utf-8", timeout=TIMEOUT,
+    )
+    assert proc.returncode == 0, f"sanitizeHtml.js failed: {proc.stderr}"
+    return json.loads(proc.stdout)
+
+
+# 같은 node 프로세스에서 같은 입력으로 두 구현을 측정 (워밍업 후 repeat 회)
+BENCH_JS = r"""
+const { sanitizeDetailHtml } = require(process.argv[1]);
+const legacy = JSON.parse(process.argv[2]).map(([p, r]) => [new RegExp(p, 'gi'), r.replace(/\\(\d)/g, '$$$1')]);
+function legacySanitize(html) {
+  if (!html) return '';
+  let clean = html;
+  for (const [re, r] of legacy) clean = clean.replace(re, r);
+  return clean.trim();
+}
+const { pages, repeat } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const bytes = pages.reduce((n, p) => n + Buffer.byteLength(p), 0) * repeat;
+function time(fn) {
+  for (const p of pages) fn(p);
+  const t0 = process.hrtime.bigint();
+  let sink = 0;
+  // charCodeAt 로 결과 문자열을 평탄화 (응답 JSON 직렬화 때 어차피 치르는 비용)
+  for (let r = 0; r < repeat; r++) for (const p of pages) sink += fn(p).charCodeAt(0) || 0;
+  return { ms: Number(process.hrtime.bigint() - t0) / 1e6, sink };
+}
+console.log(JSON.stringify({ bytes, sanitizer: time(sanitizeDetailHtml), legacy: time(legacySanitize) }));
+"""
+
+
+def bench(pages=None, mb=20):
+    """→ {"pages", "repeat", "mb", "sanitizer_mbps", "legacy_mbps"}"""
+    pages = load_detail_pages() if pages is None else pages
+    page_bytes = sum(len(p.encode("utf-8")) for p in pages)
+    repeat = max(1, round(mb * 1024 * 1024 / page_bytes))
+    proc = subprocess.run(
+        ["node", "-e", BENCH_JS, SANITIZER_JS, json.dumps(LEGACY_PATTERNS)],
+        input=json.dumps({"pages": pages, "repeat": repeat}, ensure_ascii=False),
+        capture_output=True, text=True, encoding="utf-8", timeout=TIMEOUT * 5,
+    )
+    assert proc.returncode == 0, f"benchmark failed: {proc.stderr}"
+    r = json.loads(proc.stdout)
+    total_mb = r["bytes"] / 1024 / 1024
+    return {
+        "pages": len(pages),
+        "repeat": repeat,
+        "mb": total_mb,
+        "sanitizer_mbps": total_mb / (r["sanitizer"]["ms"] / 1000),
+        "legacy_mbps": total_mb / (r["legacy"]["ms"] / 1000),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="상세페이지 HTML sanitizer 퍼즈 + 벤치마크")
+    parser.add_argument("--corpus", type=int, default=2000, help="퍼즈 입력 수")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mb", type=float, default=20, help="벤치마크 처리량 (MB)")
+    args = parser.parse_args(argv)
+
+    corpus = fuzz_corpus(args.corpus, args.seed)
+    out = run_sanitizer(corpus)
+    failed = 0
+    legacy_failed = 0
+    for s, got in zip(corpus, out["outputs"]):
+        violations = find_violations(got, out["allowedTags"], out["allowedAttributes"])
+        if violations:
+            failed += 1
+            if failed <= 5:
+                print(f"  ✗ {s[:80]!r} → {got[:80]!r}: {violations[:3]}")
+        # 기존 구현은 허용 목록이 없으므로 실행 가능한 요소만 본다
+        legacy = find_violations(legacy_sanitize(s), out["allowedTags"], out["allowedAttributes"])
+        if any(v.startswith(("tag <script", "tag <svg", "attribute on", "url ")) for v in legacy):
+            legacy_failed += 1
+    print(f"fuzz corpus={len(corpus)} 위반: 신규 {failed}건 / 기존 정규식 {legacy_failed}건")
+
+    r = bench(mb=args.mb)
+    print(f"benchmark pages={r['pages']} x{r['repeat']} ({r['mb']:.1f} MB)")
+    print(f"  신규 sanitizer (단일 패스, 허용 목록): {r['sanitizer_mbps']:8.1f} MB/s")
+    print(f"  기존 정규식 10회 치환             : {r['legacy_mbps']:8.1f} MB/s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,259 @@
+"""
+/api/coupang/register 동시 부하 테스트
+
+TC002~TC007 페이로드(payloads.py)를 클래스별로 반복 전송해
+처리량(req/s)과 지연시간 p50/p95/p99 를 측정한다.
+단건 순차 호출로는 드러나지 않는 cold path(동적 import, 인증정보 조회,
+출고지/반품지 조회) 비용을 동시성 하에서 확인하기 위한 용도.
+라우트가 Clerk 인증을 먼저 확인하므로 clerk_auth 세션으로 보낸다 (없으면 401 경로만 재게 됨).
+
+사용 예:
+    python load_test.py --concurrency 16 --rate 50 --duration 30
+    python load_test.py --classes missing_fields,no_options --requests 500 --json out.json
+
+환경변수:
+    SELPIX_BASE_URL  대상 서버 (기본 http://localhost:3000)
+    CLERK_SECRET_KEY + SELPIX_TEST_USER_ID 또는 SELPIX_SESSION_TOKEN — clerk_auth.py 참고
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from clerk_auth import authed_session
+from payloads import REGISTER_PAYLOAD_CLASSES
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+REGISTER_ENDPOINT = "/api/coupang/register"
+TIMEOUT = 30
+HEADERS = {"Content-Type": "application/json"}
+
+
+def make_session(pool_size=10):
+    """keep-alive 커넥션 풀을 공유하는 세션 (워커 수만큼 풀 확보)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def percentile(samples, pct):
+    """nearest-rank 백분위수 (samples 비어 있으면 0)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RateLimiter:
+    """토큰 버킷 — 전체 워커 합산 초당 요청 수 제한 (rate <= 0 이면 무제한)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate or 0)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.perf_counter()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_jobs(class_names):
+    """(클래스, 기대 상태코드, 페이로드) 를 라운드로빈으로 무한 반복"""
+    flat = []
+    for name in class_names:
+        spec = REGISTER_PAYLOAD_CLASSES[name]
+        for payload in spec["payloads"]:
+            flat.append((name, spec["expected_status"], payload))
+    return itertools.cycle(flat)
+
+
+def run_load(url, jobs, concurrency=8, rate=0, total_requests=None, duration=None, session=None):
+    """
+    jobs 이터레이터에서 (label, expected_status, payload) 를 꺼내 동시에 POST.
+    total_requests 또는 duration(초) 중 먼저 도달하는 조건에서 종료.
+    반환: (records, elapsed_sec)
+    """
+    if total_requests is None and duration is None:
+        raise ValueError("total_requests 또는 duration 중 하나는 필요합니다")
+
+    session = session or authed_session(make_session(concurrency))
+    limiter = RateLimiter(rate)
+    job_lock = threading.Lock()
+    records = []
+    record_lock = threading.Lock()
+    issued = [0]
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    def next_job():
+        with job_lock:
+            if total_requests is not None and issued[0] >= total_requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            issued[0] += 1
+            return next(jobs)
+
+    def worker():
+        while True:
+            job = next_job()
+            if job is None:
+                return
+            label, expected_status, payload = job
+            limiter.acquire()
+            t0 = time.perf_counter()
+            status, error = None, None
+            try:
+                resp = session.post(url, json=payload, timeout=TIMEOUT)
+                status = resp.status_code
+            except requests.RequestException as e:
+                error = type(e).__name__
+            latency_ms = (time.perf_counter() - t0) * 1000
+            with record_lock:
+                records.append({
+                    "label": label,
+                    "status": status,
+                    "expected": expected_status,
+                    "latency_ms": latency_ms,
+                    "error": error,
+                    "ts": t0 - started,
+                })
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+
+    return records, time.perf_counter() - started
+
+
+def summarize(records, elapsed):
+    """클래스별 처리량/지연시간 분포 요약"""
+    by_label = {}
+    for r in sorted(records, key=lambda r: r["ts"]):
+        by_label.setdefault(r["label"], []).append(r)
+
+    summary = {}
+    for label, rows in by_label.items():
+        latencies = [r["latency_ms"] for r in rows if r["error"] is None]
+        summary[label] = {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if r["error"] is not None),
+            "unexpected_status": sum(
+                1 for r in rows if r["error"] is None and r["status"] != r["expected"]
+            ),
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed > 0 else 0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies), 2) if latencies else 0,
+        }
+
+    all_latencies = [r["latency_ms"] for r in records if r["error"] is None]
+    # cold path 는 프로세스당 한 번 — 전체 실행에서 기대 상태로 끝난 첫 요청
+    first_ok = next((r for r in sorted(records, key=lambda r: r["ts"])
+                     if r["error"] is None and r["status"] == r["expected"]), None)
+    summary["_total"] = {
+        "requests": len(records),
+        "elapsed_sec": round(elapsed, 2),
+        "throughput_rps": round(len(records) / elapsed, 2) if elapsed > 0 else 0,
+        "cold_ms": round(first_ok["latency_ms"], 2) if first_ok else None,
+        "p50_ms": round(percentile(all_latencies, 50), 2),
+        "p95_ms": round(percentile(all_latencies, 95), 2),
+        "p99_ms": round(percentile(all_latencies, 99), 2),
+    }
+    return summary
+
+
+def print_report(summary):
+    header = f"{'class':<18}{'req':>7}{'err':>6}{'bad':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    print("-" * len(header))
+    for label, s in summary.items():
+        if label == "_total":
+            continue
+        print(
+            f"{label:<18}{s['requests']:>7}{s['errors']:>6}{s['unexpected_status']:>6}"
+            f"{s['throughput_rps']:>9}{s['p50_ms']:>9}{s['p95_ms']:>9}{s['p99_ms']:>9}"
+        )
+    t = summary["_total"]
+    print("-" * len(header))
+    print(
+        f"total {t['requests']} req / {t['elapsed_sec']}s = {t['throughput_rps']} req/s "
+        f"(p50 {t['p50_ms']}ms, p95 {t['p95_ms']}ms, p99 {t['p99_ms']}ms)"
+    )
+    print(f"cold (첫 정상 응답) {t['cold_ms']}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="coupang register 동시 부하 테스트")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 워커 수")
+    parser.add_argument("--rate", type=float, default=0, help="초당 요청 수 제한 (0=무제한)")
+    parser.add_argument("--requests", type=int, default=None, help="총 요청 수")
+    parser.add_argument("--duration", type=float, default=None, help="실행 시간(초)")
+    parser.add_argument(
+        "--classes",
+        default=",".join(REGISTER_PAYLOAD_CLASSES),
+        help="페이로드 클래스 (쉼표 구분): " + ", ".join(REGISTER_PAYLOAD_CLASSES),
+    )
+    parser.add_argument("--json", dest="json_path", default=None, help="요약 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    class_names = [c.strip() for c in args.classes.split(",") if c.strip()]
+    unknown = [c for c in class_names if c not in REGISTER_PAYLOAD_CLASSES]
+    if unknown:
+        parser.error(f"알 수 없는 페이로드 클래스: {', '.join(unknown)}")
+    if args.requests is None and args.duration is None:
+        args.requests = 200
+
+    url = args.base_url.rstrip("/") + REGISTER_ENDPOINT
+    print(f"▶ {url} — concurrency={args.concurrency}, rate={args.rate or 'unlimited'}, "
+          f"requests={args.requests}, duration={args.duration}")
+
+    records, elapsed = run_load(
+        url,
+        build_jobs(class_names),
+        concurrency=args.concurrency,
+        rate=args.rate,
+        total_requests=args.requests,
+        duration=args.duration,
+    )
+    summary = summarize(records, elapsed)
+    print_report(summary)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"요약 저장: {args.json_path}")
+
+    bad = sum(s["errors"] + s["unexpected_status"] for k, s in summary.items() if k != "_total")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
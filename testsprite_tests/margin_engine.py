@@ -0,0 +1,186 @@
+"""
+NumPy 기반 배치 마진/가격 계산 엔진
+
+apps/app/src/features/analysis/lib/pricing-calculator.ts 와 같은 공식을
+컬럼 배열 단위로 한 번에 계산한다 (상품 N개 → 배열 연산 1회).
+
+- pricing_scenarios(): 최소/권장/최대/손익분기 판매가 + 예상 순수익
+  판매가 = 총원가 / (1 - 마진% - 수수료%), 100원 단위 올림
+- margins(): 도매가/판매가/플랫폼별 순수익·마진율 (TC001 /margin 과 동일)
+
+사용 예:
+    python margin_engine.py                       # register_queue.jsonl 기준 벤치마크
+    python margin_engine.py --rows 200000 --margin 25
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from queue_store import JOURNAL_FILE as QUEUE_FILE, load_items
+
+# 플랫폼별 수수료율 (%) — pricing-calculator.ts PLATFORM_FEE_RATES 와 동일
+PLATFORM_FEE_RATES = {
+    "rocket": 10.8,
+    "wing": 6.5,
+    "consignment": 8.0,
+}
+
+DEFAULT_TARGET_MARGIN = 30.0  # pipeline_sourcing.js MIN_MARGIN_RATE
+DEFAULT_FEE_RATE = PLATFORM_FEE_RATES["rocket"]
+
+
+def _column(values, n=None):
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim == 0 and n is not None:
+        arr = np.full(n, float(arr))
+    return arr
+
+
+def round_half_up(values, digits=2):
+    """JS Math.round(x * 100) / 100 과 같은 반올림"""
+    scale = 10.0 ** digits
+    return np.floor(values * scale + 0.5) / scale
+
+
+def ceil_to(values, unit=100):
+    """단위 올림 (기본 100원)"""
+    return np.ceil(values / unit) * unit
+
+
+def target_prices(total_cost, target_margin_rate, platform_fee_rate):
+    """목표 마진율(%)·수수료율(%) 기준 판매가. 분모 <= 0 인 행은 0"""
+    denominator = 1 - (target_margin_rate / 100) - (platform_fee_rate / 100)
+    valid = denominator > 0
+    raw = np.divide(total_cost, denominator, out=np.zeros_like(total_cost), where=valid)
+    return np.where(valid, ceil_to(raw), 0.0)
+
+
+def pricing_scenarios(base_cost, shipping_cost=0, extra_cost=0,
+                      platform_fee_rate=DEFAULT_FEE_RATE, target_margin_rate=DEFAULT_TARGET_MARGIN):
+    """
+    컬럼 배열 입력 → 시나리오별 가격 배열 (generatePricingScenarios 와 동일 규칙)
+    스칼라 인자는 전체 행에 브로드캐스트된다.
+    """
+    base_cost = _column(base_cost)
+    n = base_cost.shape[0]
+    shipping_cost = _column(shipping_cost, n)
+    extra_cost = _column(extra_cost, n)
+    fee = _column(platform_fee_rate, n)
+    margin = _column(target_margin_rate, n)
+
+    total_cost = base_cost + shipping_cost + extra_cost
+    rec_price = target_prices(total_cost, margin, fee)
+
+    return {
+        "minPrice": target_prices(total_cost, np.maximum(5, margin - 10), fee),
+        "recPrice": rec_price,
+        "maxPrice": target_prices(total_cost, margin + 15, fee),
+        "breakEvenPrice": target_prices(total_cost, np.zeros(n), fee),
+        "expectedNetProfit": np.floor(rec_price - total_cost - rec_price * (fee / 100)),
+    }
+
+
+def fee_rates_for(platforms):
+    """플랫폼 이름 배열 → 수수료율(%) 배열"""
+    platforms = np.asarray(platforms)
+    rates = np.full(platforms.shape, np.nan)
+    for name, rate in PLATFORM_FEE_RATES.items():
+        rates[platforms == name] = rate
+    if np.isnan(rates).any():
+        unknown = sorted(set(platforms[np.isnan(rates)].tolist()))
+        raise ValueError(f"Unknown platform: {', '.join(unknown)}")
+    return rates
+
+
+def margins(wholesale_price, selling_price, platform="rocket"):
+    """도매가/판매가 → 순수익, 마진율(%), 수수료 (소수 2자리, calculateMargin 과 동일)"""
+    wholesale_price = _column(wholesale_price)
+    n = wholesale_price.shape[0]
+    selling_price = _column(selling_price, n)
+    if isinstance(platform, str):
+        fee = np.full(n, PLATFORM_FEE_RATES[platform])
+    else:
+        fee = fee_rates_for(platform)
+
+    fee_amount = selling_price * (fee / 100)
+    net_profit = selling_price - wholesale_price - fee_amount
+    margin_percent = np.divide(
+        net_profit * 100, selling_price, out=np.zeros(n), where=selling_price > 0
+    )
+    return {
+        "feeAmount": round_half_up(fee_amount),
+        "netProfit": round_half_up(net_profit),
+        "marginPercent": round_half_up(margin_percent),
+    }
+
+
+def queue_columns(path=QUEUE_FILE):
+    """register_queue.jsonl → (원가, 현재 판매가) 컬럼. 원가 없는 항목은 제외"""
+    queue = load_items(path)
+    cost, price = [], []
+    for item in queue:
+        unit_cost = item.get("unitCost") or item.get("sourcePrice")
+        if not unit_cost:
+            continue
+        cost.append(unit_cost)
+        price.append(item.get("salePrice") or 0)
+    return np.asarray(cost, dtype=np.float64), np.asarray(price, dtype=np.float64)
+
+
+def _scalar_scenarios(base_cost, fee, margin):
+    """비교용 단건 구현 (기존 TC 의 스칼라 방식)"""
+    import math
+
+    def target(m):
+        d = 1 - m / 100 - fee / 100
+        return 0 if d <= 0 else math.ceil(base_cost / d / 100) * 100
+
+    rec = target(margin)
+    return {
+        "minPrice": target(max(5, margin - 10)),
+        "recPrice": rec,
+        "maxPrice": target(margin + 15),
+        "breakEvenPrice": target(0),
+        "expectedNetProfit": math.floor(rec - base_cost - rec * (fee / 100)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배치 마진 엔진 벤치마크")
+    parser.add_argument("--queue", default=QUEUE_FILE)
+    parser.add_argument("--rows", type=int, default=100000, help="큐를 반복해 만들 행 수")
+    parser.add_argument("--margin", type=float, default=DEFAULT_TARGET_MARGIN)
+    parser.add_argument("--fee", type=float, default=DEFAULT_FEE_RATE)
+    args = parser.parse_args(argv)
+
+    cost, _ = queue_columns(args.queue)
+    if cost.size == 0:
+        print("원가 정보가 있는 큐 항목이 없습니다")
+        return 1
+    cost = np.resize(cost, args.rows)
+
+    t0 = time.perf_counter()
+    batch = pricing_scenarios(cost, platform_fee_rate=args.fee, target_margin_rate=args.margin)
+    batch_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scalar = [_scalar_scenarios(c, args.fee, args.margin) for c in cost.tolist()]
+    scalar_sec = time.perf_counter() - t0
+
+    mismatches = sum(
+        1 for i, row in enumerate(scalar)
+        if any(row[k] != batch[k][i] for k in row)
+    )
+
+    print(f"rows={args.rows}  margin={args.margin}%  fee={args.fee}%")
+    print(f"  numpy : {batch_sec * 1000:9.2f} ms  ({args.rows / batch_sec:,.0f} rows/s)")
+    print(f"  scalar: {scalar_sec * 1000:9.2f} ms  ({args.rows / scalar_sec:,.0f} rows/s)")
+    print(f"  speedup x{scalar_sec / batch_sec:.1f}, mismatches={mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,295 @@
+"""
+도매꾹 옵션 → 쿠팡 속성(색상/사이즈) 추출 엔진 — Python 기준 구현
+
+scripts/lib/option_attributes.js 와 같은 결과를 내야 한다 (TC012 가 비교).
+- 색상: COLOR_KEYWORDS 를 목록 순서대로 이어 붙인 lookahead alternation 1개로 컴파일,
+  옵션명을 한 번 훑어 (괄호 안 우선) 목록 순서상 가장 앞선 키워드를 고른다.
+  위치마다 alternation 은 그 위치에서 시작하는 키워드 중 최우선 것을 돌려주므로
+  전체 최솟값 = 기존 includes 선형 탐색 결과.
+- 사이즈: 단위 목록을 정규식 1개로 컴파일
+- 옵션 조합: itertools.product 를 limit 개만 소비 (카테시안 곱 전체 생성 안 함)
+- legacy_*: 기존 cron_register_product.js 로직 그대로 (벤치마크/동치 확인용)
+
+사용 예:
+    python option_attributes.py                   # register_queue.jsonl 기준 벤치마크
+    python option_attributes.py --repeat 500 --groups 4
+"""
+
+import argparse
+import functools
+import itertools
+import os
+import re
+import time
+
+from queue_store import JOURNAL_FILE as QUEUE_FILE, load_items
+
+
+COLOR_KEYWORDS = [
+    "다크그레이", "라이트그레이", "혼합색상",
+    "블랙", "화이트", "레드", "블루", "그린", "옐로우", "핑크", "퍼플",
+    "그레이", "실버", "골드", "브라운", "베이지", "네이비", "아이보리",
+    "투명", "클리어", "혼합", "랜덤", "오렌지", "민트", "카키", "와인",
+    "크림", "차콜", "스카이블루", "라벤더", "코랄", "로즈골드", "매트블랙",
+]
+SIZE_UNITS = ["cm", "mm", "m", "인치"]
+DEFAULT_COMBINATION_LIMIT = 30
+
+_COLOR_RANK = {kw: i for i, kw in enumerate(COLOR_KEYWORDS)}
+_COLOR_RE = re.compile("(?=(" + "|".join(map(re.escape, COLOR_KEYWORDS)) + "))")
+_SIZE_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(?:" + "|".join(map(re.escape, SIZE_UNITS)) + ")", re.IGNORECASE)
+_PAREN_RE = re.compile(r"\(([^)]+)\)")
+_NON_ATTRIBUTE_RE = re.compile("발송|배송|수령|택배")
+_COLOR_NAME_RE = re.compile("색상|색")
+_SIZE_ATTR_RE = re.compile("사이즈|크기", re.IGNORECASE)
+_SIZE_GROUP_RE = re.compile("사이즈|크기|size", re.IGNORECASE)
+_OPTION_GROUP_RE = re.compile("선택|옵션|option", re.IGNORECASE)
+
+
+# ── 추출 ───────────────────────────────────────────
+
+
+@functools.lru_cache(maxsize=5000)
+def extract_option_attributes(name):
+    """옵션명 → {"color", "size"} (없으면 None). 괄호 안 색상이 우선"""
+    name = str(name)
+    paren = _PAREN_RE.search(name)
+    start, end = paren.span(1) if paren else (-1, -1)
+    best = best_in_paren = None
+    for m in _COLOR_RE.finditer(name):
+        rank = _COLOR_RANK[m.group(1)]
+        if best is None or rank < best:
+            best = rank
+        # 키워드에 ')' 가 없으므로 괄호 안에서 시작한 매치는 괄호 안에서 끝난다
+        if start <= m.start() < end and (best_in_paren is None or rank < best_in_paren):
+            best_in_paren = rank
+    rank = best_in_paren if best_in_paren is not None else best
+    size = _SIZE_RE.search(name)
+    return {"color": None if rank is None else COLOR_KEYWORDS[rank], "size": size.group(1) if size else None}
+
+
+def extract_color(name):
+    return extract_option_attributes(name)["color"]
+
+
+def extract_size(name):
+    return extract_option_attributes(name)["size"]
+
+
+def _is_color_name(name):
+    return bool(_COLOR_NAME_RE.search(str(name)))
+
+
+def _is_size_attr(name):
+    return bool(_SIZE_ATTR_RE.search(str(name)))
+
+
+def is_non_attribute_group(group_name):
+    return bool(_NON_ATTRIBUTE_RE.search(str(group_name)))
+
+
+def clean_option_for_attribute(name, attr_type_name):
+    if _is_color_name(attr_type_name):
+        return extract_color(name) or name
+    if _is_size_attr(attr_type_name):
+        return extract_size(name) or name
+    return name
+
+
+# ── 조합 ───────────────────────────────────────────
+
+
+def iter_combinations(groups, limit=DEFAULT_COMBINATION_LIMIT):
+    """첫 그룹이 가장 바깥인 순서로 limit 개까지 (값 없는 그룹이 있으면 없음)"""
+    values = [[{"groupName": g.get("groupName"), **v} for v in g.get("values") or []] for g in groups]
+    return itertools.islice(itertools.product(*values), limit)
+
+
+def compile_attribute_rules(groups, attrs):
+    """속성별 (그룹 인덱스, 색상 키워드 있을 때만 매칭 여부) 목록 — 상품당 1회"""
+    rules = []
+    for a in attrs:
+        kind = a.get("attributeTypeName")
+        matched = []
+        for j, g in enumerate(groups):
+            gn = g.get("groupName") or ""
+            if (
+                kind == gn
+                or (_is_color_name(gn) and _is_color_name(kind))
+                or (_SIZE_GROUP_RE.search(gn) and _is_size_attr(kind))
+            ):
+                matched.append((j, False))
+                break
+            if _OPTION_GROUP_RE.search(gn) and _is_color_name(kind):
+                matched.append((j, True))
+        rules.append(matched)
+    return rules
+
+
+def build_option_variants(groups, attrs, limit=DEFAULT_COMBINATION_LIMIT):
+    """옵션 그룹 + 기본 속성 → [{"label", "priceAdd", "attributes"}] (비속성 그룹은 미리 제외)"""
+    rules = compile_attribute_rules(groups, attrs)
+    variants = []
+    for combo in iter_combinations(groups, limit):
+        attributes = []
+        for a, matched in zip(attrs, rules):
+            for j, if_color in matched:
+                c = combo[j]
+                if not if_color or extract_color(c["name"]):
+                    attributes.append(dict(a, attributeValueName=clean_option_for_attribute(c["name"], a.get("attributeTypeName"))))
+                    break
+            else:
+                attributes.append(dict(a))
+        variants.append({
+            "label": " ".join(c["name"] for c in combo),
+            "priceAdd": sum(c.get("priceAdd") or 0 for c in combo),
+            "attributes": attributes,
+        })
+    return variants
+
+
+# ── 기존 구현 (cron_register_product.js 이전 버전) ──────────
+
+
+def legacy_extract_color(name):
+    paren = _PAREN_RE.search(name)
+    if paren:
+        for c in COLOR_KEYWORDS:
+            if c in paren.group(1):
+                return c
+    for c in COLOR_KEYWORDS:
+        if c in name:
+            return c
+    return None
+
+
+def legacy_clean(name, attr_type_name):
+    if _is_color_name(attr_type_name):
+        return legacy_extract_color(name) or name
+    if _is_size_attr(attr_type_name):
+        m = _SIZE_RE.search(name)
+        return m.group(1) if m else name
+    return name
+
+
+def legacy_cross_join(groups):
+    if not groups:
+        return [[]]
+    first, rest = groups[0], groups[1:]
+    rest_combinations = legacy_cross_join(rest)
+    result = []
+    for val in first.get("values") or []:
+        for combo in rest_combinations:
+            result.append([{"groupName": first.get("groupName"), **val}] + combo)
+    return result[:30]
+
+
+def legacy_build_option_variants(groups, attrs):
+    variants = []
+    for combo in legacy_cross_join(groups):
+        attributes = []
+        for a in attrs:
+            kind = a.get("attributeTypeName")
+            for c in combo:
+                gn = c.get("groupName") or ""
+                if (
+                    kind == gn
+                    or (_OPTION_GROUP_RE.search(gn) and _is_color_name(kind) and legacy_extract_color(c["name"]))
+                    or (_is_color_name(gn) and _is_color_name(kind))
+                    or (_SIZE_GROUP_RE.search(gn) and _is_size_attr(kind))
+                ):
+                    attributes.append(dict(a, attributeValueName=legacy_clean(c["name"], kind)))
+                    break
+            else:
+                attributes.append(dict(a))
+        variants.append({
+            "label": " ".join(c["name"] for c in combo),
+            "priceAdd": sum(c.get("priceAdd") or 0 for c in combo),
+            "attributes": attributes,
+        })
+    return variants
+
+
+# ── 벤치마크 ───────────────────────────────────────
+
+
+PROBE_ATTRIBUTES = [
+    {"attributeTypeName": "색상", "attributeValueName": "상세페이지 참조", "exposed": "EXPOSED"},
+    {"attributeTypeName": "사이즈", "attributeValueName": "FREE", "exposed": "EXPOSED"},
+]
+
+
+def queue_cases(queue_file=QUEUE_FILE, groups=3):
+    """
+    register_queue.jsonl 의 옵션 상품 → 비교/벤치마크용 케이스
+    - 상품별 옵션 그대로 (기존 속성 + 색상/사이즈 probe 속성)
+    - 여러 상품의 옵션 그룹을 groups 개씩 묶은 다중 그룹 케이스 (조합 폭발 상황)
+    """
+    queue = load_items(queue_file)
+    cases = []
+    option_groups = []
+    for item in queue:
+        opts = [o for o in item.get("domeggookOptions") or [] if not is_non_attribute_group(o.get("groupName"))]
+        if not opts:
+            continue
+        option_groups.extend(opts)
+        cases.append({"options": opts, "attributes": (item.get("attributes") or []) + PROBE_ATTRIBUTES})
+    for i in range(0, max(len(option_groups) - groups + 1, 0)):
+        cases.append({"options": option_groups[i:i + groups], "attributes": PROBE_ATTRIBUTES})
+    return cases
+
+
+def _bench(repeat, groups):
+    cases = queue_cases(groups=groups)
+    if not cases:
+        print("옵션 상품이 큐에 없습니다")
+        return 1
+    names = [v["name"] for c in cases for g in c["options"] for v in g.get("values") or []]
+
+    mismatches = sum(
+        build_option_variants(c["options"], c["attributes"]) != legacy_build_option_variants(c["options"], c["attributes"])
+        for c in cases
+    )
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for c in cases:
+            legacy_build_option_variants(c["options"], c["attributes"])
+    legacy_sec = time.perf_counter() - t0
+
+    extract_option_attributes.cache_clear()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for c in cases:
+            build_option_variants(c["options"], c["attributes"])
+    engine_sec = time.perf_counter() - t0
+
+    extract_option_attributes.cache_clear()
+    t0 = time.perf_counter()
+    for name in names:
+        extract_option_attributes(name)
+    cold_us = (time.perf_counter() - t0) / len(names) * 1e6
+    t0 = time.perf_counter()
+    for name in names:
+        legacy_extract_color(name)
+    legacy_us = (time.perf_counter() - t0) / len(names) * 1e6
+
+    n = repeat * len(cases)
+    print(f"cases={len(cases)} (groups<={groups}) option names={len(names)} repeat={repeat}")
+    print(f"  기존 (includes 선형 탐색 + 전체 cross join): {n / legacy_sec:10.0f} products/s")
+    print(f"  엔진 (alternation + 지연 조합 + 메모)      : {n / engine_sec:10.0f} products/s  x{legacy_sec / engine_sec:.1f}")
+    print(f"  색상 추출 1회 (캐시 없음): 기존 {legacy_us:.2f} us / 엔진 {cold_us:.2f} us")
+    print(f"  결과 불일치: {mismatches}건")
+    return 1 if mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="옵션 → 속성 추출 엔진 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200, help="케이스 전체 반복 횟수")
+    parser.add_argument("--groups", type=int, default=3, help="다중 그룹 케이스의 그룹 수")
+    args = parser.parse_args(argv)
+    return _bench(args.repeat, args.groups)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
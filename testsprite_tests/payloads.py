@@ -0,0 +1,91 @@
+"""
+/api/coupang/register 요청 페이로드 모음 (TC002~TC007 공통)
+
+각 TC 스크립트에 흩어져 있던 페이로드를 클래스별로 묶어 둔 모듈.
+부하 테스트(load_test.py)와 병렬 러너가 같은 입력을 재사용한다.
+
+REGISTER_PAYLOAD_CLASSES = {
+    클래스 이름: {
+        "source": 원본 TC,
+        "expected_status": 기대 HTTP 상태 코드,
+        "payloads": [요청 바디, ...],
+    }
+}
+"""
+
+# TC002 — 필수 필드 누락 (400 기대)
+MISSING_REQUIRED_FIELDS = [
+    {"wholesalePrice": 1000, "price": 1500, "platform": "rocket"},
+    {"productName": "Test Product", "price": 1500, "platform": "wing"},
+    {"productName": "Test Product", "wholesalePrice": 1000, "platform": "consignment"},
+    {"platform": "rocket"},
+]
+
+# TC003 — 상품명에 스크립트 태그 포함 (200 + 새니타이즈 기대)
+HARMFUL_HTML = [
+    {
+        "productName": "Test Product <script>alert('xss')</script>",
+        "wholesalePrice": 10000,
+        "price": 15000,
+        "platform": "rocket",
+    },
+]
+
+# TC004 — 국내 형식 전화번호 (200 + E.164 변환 기대)
+LOCAL_PHONE = [
+    {
+        "productName": "Test Product for Phone Format",
+        "wholesalePrice": 10000,
+        "price": 15000,
+        "platform": "rocket",
+        "phone": "01012345678",
+    },
+]
+
+# TC005 — 옵션 없는 단일 상품 (200 기대)
+SINGLE_NO_OPTIONS = [
+    {
+        "productName": "Test Product Without Options",
+        "wholesalePrice": 10000,
+        "price": 15000,
+        "platform": "rocket",
+    },
+]
+
+# TC006 / TC007 — 불완전/빈 상품명 (400 기대)
+INVALID_PARTIAL = [
+    {"wholesalePrice": 50, "price": 100},
+    {"productName": "", "wholesalePrice": 50, "price": 100},
+    {},
+    {"productName": "Test Product"},
+    {"productName": "Test Product", "price": 150},
+    {"productName": "Test Product", "wholesalePrice": 100},
+]
+
+REGISTER_PAYLOAD_CLASSES = {
+    "missing_fields": {
+        "source": "TC002",
+        "expected_status": 400,
+        "payloads": MISSING_REQUIRED_FIELDS,
+    },
+    "sanitization": {
+        "source": "TC003",
+        "expected_status": 200,
+        "payloads": HARMFUL_HTML,
+    },
+    "phone_format": {
+        "source": "TC004",
+        "expected_status": 200,
+        "payloads": LOCAL_PHONE,
+    },
+    "no_options": {
+        "source": "TC005",
+        "expected_status": 200,
+        "payloads": SINGLE_NO_OPTIONS,
+    },
+    "invalid_partial": {
+        "source": "TC006/TC007",
+        "expected_status": 400,
+        "payloads": INVALID_PARTIAL,
+    },
+}
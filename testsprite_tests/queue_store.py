@@ -0,0 +1,461 @@
+"""
+등록 대기열 저장소 (append-only 저널 + 인덱스) — Python 구현
+
+scripts/lib/queue_store.js 와 같은 data/register_queue.jsonl 포맷을 사용한다.
+    {"k":12,"v":{...항목...}}   ← 항목 12 의 최신 값
+    {"k":12,"d":1}               ← 항목 12 삭제
+같은 키의 마지막 줄이 유효하다.
+
+- status / domeggookProductNo / productId 인덱스
+- 단건 갱신 O(1) (파일 끝에 한 줄 추가)
+- 스트리밍 순회 (항목 값은 오프셋으로 필요할 때만 읽음)
+- register_queue.json (배열) import / export
+
+사용 예:
+    store = QueueStore.open()                 # 저널 없으면 register_queue.json import
+    for item in store.iter_items(status="pending"): ...
+    items = load_items()                      # 현재 항목 전체 (list)
+    store.update(key, {"status": "registered"})
+    python queue_store.py bench --rows 100000  # 전체 재기록 방식과 비교
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+JOURNAL_FILE = os.path.join(DATA_DIR, "register_queue.jsonl")
+LEGACY_JSON_FILE = os.path.join(DATA_DIR, "register_queue.json")
+
+LOCK_STALE_SEC = 30
+LOCK_RETRY_SEC = 0.02
+_DELETED = object()
+_ALL = object()
+
+
+def _dumps(value):
+    # JS JSON.stringify 와 같은 compact 형식 (한글 그대로)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class QueueStore:
+    def __init__(self, path=JOURNAL_FILE, legacy_file=LEGACY_JSON_FILE):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.legacy_file = legacy_file
+        self._fh = None
+        self._ino = None
+        self._size = 0
+        self.next_key = 1
+        self.dead = 0
+        self.entries = {}        # key → (offset, length, status, productNo, productId)
+        self.by_status = {}      # status → set(key)
+        self.by_product_no = {}  # productNo → set(key)
+        self.by_product_id = {}  # productId → key
+
+    # ── 열기 / 인덱스 ──────────────────────────────
+
+    @classmethod
+    def open(cls, path=JOURNAL_FILE, legacy_file=LEGACY_JSON_FILE):
+        store = cls(path, legacy_file)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            store._lock()  # 동시에 처음 열어도 import 는 한 번만
+            try:
+                if not os.path.exists(path):
+                    if legacy_file and os.path.exists(legacy_file):
+                        store._rewrite(_legacy_lines(legacy_file))
+                    else:
+                        open(path, "wb").close()
+            finally:
+                store._unlock()
+        if store._fh is None:
+            store._reload()
+        return store
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _reload(self):
+        if self._fh:
+            self._fh.close()
+        self._fh = open(self.path, "rb")
+        self._ino = os.fstat(self._fh.fileno()).st_ino
+        self._size = 0
+        self.next_key = 1
+        self.dead = 0
+        self.entries.clear()
+        self.by_status.clear()
+        self.by_product_no.clear()
+        self.by_product_id.clear()
+        self._scan()
+
+    def refresh(self):
+        """다른 프로세스가 추가한 줄 반영 (compact 로 파일이 바뀌었으면 재로딩)"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if st.st_ino != self._ino or st.st_size < self._size:
+            self._reload()
+        elif st.st_size > self._size:
+            self._scan()
+
+    def _scan(self):
+        fh = self._fh
+        fh.seek(self._size)
+        offset = self._size
+        while True:
+            line = fh.readline()
+            if not line:
+                break
+            if not line.endswith(b"\n"):
+                # 기록 중인 마지막 줄 — 다음 스캔에서 처리
+                break
+            length = len(line)
+            if length > 1:
+                self._apply(line, offset, length)
+            offset += length
+        self._size = offset
+
+    def _apply(self, line, offset, length):
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            self.dead += 1
+            return
+        key = rec.get("k")
+        if not isinstance(key, int):
+            return
+        if key >= self.next_key:
+            self.next_key = key + 1
+        if key in self.entries:
+            self._unindex(key)
+            self.dead += 1
+        if rec.get("d"):
+            self.dead += 1
+            return
+        self._index(key, rec.get("v") or {}, offset, length)
+
+    def _index(self, key, item, offset, length):
+        status = item.get("status")
+        product_no = item.get("domeggookProductNo")
+        product_no = str(product_no) if product_no is not None else None
+        product_id = item.get("productId")
+        product_id = str(product_id) if product_id is not None else None
+        self.entries[key] = (offset, length, status, product_no, product_id)
+        self.by_status.setdefault(status, set()).add(key)
+        if product_no:
+            self.by_product_no.setdefault(product_no, set()).add(key)
+        if product_id:
+            self.by_product_id[product_id] = key
+
+    def _unindex(self, key):
+        _, _, status, product_no, product_id = self.entries.pop(key)
+        _discard(self.by_status, status, key)
+        if product_no:
+            _discard(self.by_product_no, product_no, key)
+        if product_id and self.by_product_id.get(product_id) == key:
+            del self.by_product_id[product_id]
+
+    def _read(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self._fh.seek(entry[0])
+        return json.loads(self._fh.read(entry[1]))["v"]
+
+    # ── 조회 ───────────────────────────────────────
+
+    def count(self, status=_ALL):
+        if status is _ALL:
+            return len(self.entries)
+        return len(self.by_status.get(status, ()))
+
+    def status_counts(self):
+        return {status: len(keys) for status, keys in self.by_status.items()}
+
+    def get(self, key):
+        return self._read(key)
+
+    def get_by_product_id(self, product_id):
+        key = self.by_product_id.get(str(product_id))
+        return None if key is None else self._read(key)
+
+    def find_by_product_no(self, product_no):
+        keys = sorted(self.by_product_no.get(str(product_no), ()))
+        return [(k, self._read(k)) for k in keys]
+
+    def iter_keys(self, status=_ALL):
+        if status is _ALL:
+            keys = list(self.entries)
+        else:
+            statuses = status if isinstance(status, (list, tuple, set)) else [status]
+            keys = [k for s in statuses for k in self.by_status.get(s, ())]
+        return sorted(keys)
+
+    def iter_items(self, status=_ALL):
+        """(key, item) 을 등록 순서로 스트리밍"""
+        for key in self.iter_keys(status):
+            if key in self.entries:
+                yield key, self._read(key)
+
+    # ── 쓰기 ───────────────────────────────────────
+
+    def _lock(self):
+        while True:
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(self.lock_path).st_mtime > LOCK_STALE_SEC:
+                        os.unlink(self.lock_path)
+                except FileNotFoundError:
+                    pass
+                time.sleep(LOCK_RETRY_SEC)
+        self.refresh()
+
+    def _unlock(self):
+        try:
+            os.unlink(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+    def _append(self, records):
+        if not records:
+            return
+        self._lock()
+        try:
+            keys = []
+            lines = []
+            for key, value in records:
+                if key is None:
+                    key = self.next_key
+                    self.next_key += 1
+                keys.append(key)
+                if value is _DELETED:
+                    lines.append('{"k":%d,"d":1}\n' % key)
+                else:
+                    lines.append('{"k":%d,"v":%s}\n' % (key, _dumps(value)))
+            with open(self.path, "ab") as fh:
+                fh.write("".join(lines).encode("utf-8"))
+            self._scan()
+            return keys
+        finally:
+            self._unlock()
+
+    def append(self, item):
+        return self._append([(None, item)])[0]
+
+    def append_many(self, items):
+        return self._append([(None, item) for item in items]) or []
+
+    def put(self, key, item):
+        self._append([(key, item)])
+
+    def update(self, key, fields):
+        """필드 일부 갱신 (값이 QueueStore.DELETE 면 필드 삭제)"""
+        self._lock()
+        try:
+            item = self._read(key)
+            if item is None:
+                return None
+            for name, value in fields.items():
+                if value is QueueStore.DELETE:
+                    item.pop(name, None)
+                else:
+                    item[name] = value
+            with open(self.path, "ab") as fh:
+                fh.write(('{"k":%d,"v":%s}\n' % (key, _dumps(item))).encode("utf-8"))
+            self._scan()
+            return item
+        finally:
+            self._unlock()
+
+    def remove(self, key):
+        if key in self.entries:
+            self._append([(key, _DELETED)])
+
+    # ── import / export / compact ────────────────
+
+    def _rewrite(self, lines):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".register_queue.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            for line in lines:
+                fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self._reload()
+
+    def compact(self):
+        """유효 항목만 남기고 저널 재작성"""
+        self._lock()
+        try:
+            def live_lines():
+                for key in sorted(self.entries):
+                    offset, length = self.entries[key][:2]
+                    self._fh.seek(offset)
+                    yield self._fh.read(length)
+
+            self._rewrite(live_lines())
+        finally:
+            self._unlock()
+
+    def import_json(self, json_file=LEGACY_JSON_FILE):
+        """register_queue.json (배열) → 저널 전체 교체"""
+        lines = _legacy_lines(json_file)
+        self._lock()
+        try:
+            self._rewrite(lines)
+        finally:
+            self._unlock()
+        return len(lines)
+
+    def export_json(self, json_file=LEGACY_JSON_FILE):
+        """저널 → register_queue.json 형식 (들여쓰기 2칸) — 항목 단위로 스트리밍 기록"""
+        tmp = json_file + ".tmp"
+        count = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("[")
+            for _, item in self.iter_items():
+                body = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                f.write(("," if count else "") + "\n  " + body)
+                count += 1
+            f.write("\n]" if count else "]")
+        os.replace(tmp, json_file)
+        return count
+
+
+QueueStore.DELETE = _DELETED
+
+
+def load_items(path=JOURNAL_FILE, legacy_file=LEGACY_JSON_FILE, status=_ALL):
+    """
+    현재 항목 목록 (등록 순서) — 읽기 전용 도구/TC 용, 파일을 만들거나 쓰지 않는다.
+    저널이 아직 없으면 register_queue.json 내용 (그것도 없으면 [])
+    """
+    if not os.path.exists(path):
+        if not (legacy_file and os.path.exists(legacy_file)):
+            return []
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        if status is _ALL:
+            return items
+        statuses = set(status if isinstance(status, (list, tuple, set)) else [status])
+        return [item for item in items if item.get("status") in statuses]
+    store = QueueStore(path, legacy_file)
+    store._reload()
+    with store:
+        return [item for _, item in store.iter_items(status)]
+
+
+def _legacy_lines(json_file):
+    """register_queue.json (배열) → 저널 줄 (bytes)"""
+    with open(json_file, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    return [('{"k":%d,"v":%s}\n' % (i + 1, _dumps(item))).encode("utf-8") for i, item in enumerate(items)]
+
+
+def _discard(index, key, value):
+    keys = index.get(key)
+    if keys is None:
+        return
+    keys.discard(value)
+    if not keys:
+        del index[key]
+
+
+def _bench(rows, updates):
+    """전체 JSON 재기록 vs 저널 단건 갱신 비교 (임시 디렉터리 사용)"""
+    with open(LEGACY_JSON_FILE, "r", encoding="utf-8") as f:
+        seed = json.load(f)
+    # 상세 HTML 등 큰 필드는 빼고 복제 (메모리 절약)
+    heavy = ("detailHtml", "coupangPayload", "tiktokContent")
+    seed = [{k: v for k, v in item.items() if k not in heavy} for item in seed]
+    queue = [dict(seed[i % len(seed)], domeggookProductNo=str(100000 + i)) for i in range(rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "register_queue.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump(queue, f, ensure_ascii=False, indent=2)
+
+        t0 = time.perf_counter()
+        for i in range(updates):
+            with open(legacy, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data[i]["status"] = "approved"
+            with open(legacy, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        json_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        store = QueueStore.open(os.path.join(tmp, "register_queue.jsonl"), legacy)
+        open_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for key in store.iter_keys()[:updates]:
+            store.update(key, {"status": "approved"})
+        journal_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        registered = sum(1 for _ in store.iter_items(status="registered"))
+        scan_sec = time.perf_counter() - t0
+        store.close()
+
+    print(f"rows={rows} updates={updates}")
+    print(f"  JSON 전체 재기록 : {json_sec / updates * 1000:9.2f} ms/update")
+    print(f"  저널 단건 추가   : {journal_sec / updates * 1000:9.2f} ms/update  (open {open_sec:.2f}s)")
+    print(f"  status=registered 스트리밍 {registered}건: {scan_sec * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="register queue 저널 관리")
+    sub = parser.add_subparsers(dest="cmd")
+    sub.add_parser("stats")
+    p = sub.add_parser("export")
+    p.add_argument("out", nargs="?", default=LEGACY_JSON_FILE)
+    p = sub.add_parser("import")
+    p.add_argument("src")
+    sub.add_parser("compact")
+    p = sub.add_parser("bench")
+    p.add_argument("--rows", type=int, default=100000)
+    p.add_argument("--updates", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "bench":
+        _bench(args.rows, args.updates)
+        return 0
+
+    with QueueStore.open() as store:
+        if args.cmd == "export":
+            print(f"export: {store.export_json(args.out)}건 → {args.out}")
+        elif args.cmd == "import":
+            print(f"import: {store.import_json(args.src)}건 ← {args.src}")
+        elif args.cmd == "compact":
+            dead = store.dead
+            store.compact()
+            print(f"compact: 쓰레기 {dead}줄 제거, 유효 {len(store)}건")
+        else:
+            print(f"총 {len(store)}건 (쓰레기 {store.dead}줄)")
+            print(store.status_counts())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
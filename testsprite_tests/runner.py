@@ -0,0 +1,268 @@
+"""
+testsprite_tests 병렬 러너
+
+testsprite_backend_test_plan.json 의 TC 목록을 기준으로 케이스를 만들고
+워커 프로세스 풀에서 동시에 실행한 뒤, 케이스별 소요 시간을 tmp/test_results.json 에 기록한다.
+
+- /api/coupang/register 페이로드(payloads.py)는 페이로드 1개 = 케이스 1개로 펼쳐서 실행.
+  워커 프로세스마다 Clerk 인증(clerk_auth)을 붙인 keep-alive 세션 1개를 만들어 그 워커의 모든 요청이 재사용한다.
+- 페이로드 루프만 있는 TC(PAYLOAD_ONLY)는 스크립트 대신 펼친 케이스로 대체하고,
+  나머지 TC 는 스크립트를 그대로 실행(stage_metrics.run_case) — 이때 그 TC 의 페이로드는
+  스크립트가 직접 보내므로 펼치지 않는다 (같은 요청 중복 실행 방지).
+- 스텁 상태를 공유하거나 지연/처리량을 재는 TC(SERIAL)는 병렬 단계가 끝난 뒤 하나씩 실행
+  (다른 케이스와 겹치면 측정값이 흔들림).
+
+결과 파일의 TC 항목에는 testStatus / durationMs(하위 케이스 합) 와 함께
+cases: [{name, testStatus, testError, durationMs}] 가 붙는다.
+
+사용 예:
+    python runner.py                          # 계획서의 TC 전체, 워커 = CPU 수
+    python runner.py --workers 8 --cases TC002,TC006
+    python runner.py --no-serial              # 측정용 TC 는 건너뜀 (push 마다 빠르게)
+
+환경변수:
+    SELPIX_BASE_URL  대상 서버 (기본 http://localhost:3000)
+    register 페이로드 케이스는 Clerk 인증이 필요 — clerk_auth.py 의 CLERK_SECRET_KEY + SELPIX_TEST_USER_ID
+    또는 SELPIX_SESSION_TOKEN
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import requests
+
+from clerk_auth import authed_session
+from load_test import make_session
+from payloads import REGISTER_PAYLOAD_CLASSES
+from stage_metrics import (
+    PLAN_FILE,
+    RESULTS_FILE,
+    attach_results,
+    discover_cases,
+    load_json,
+    run_case,
+    write_results,
+)
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+REGISTER_ENDPOINT = "/api/coupang/register"
+TIMEOUT = 30
+CASE_TIMEOUT = 300
+
+# 스크립트가 register 페이로드 루프뿐인 TC — 펼친 케이스가 같은 검증을 대신함
+PAYLOAD_ONLY = {"TC002", "TC004", "TC005"}
+# 스텁 리셋/통계(TC009, TC010), 처리량·지연 비교(TC003, TC011, TC013, TC014)
+SERIAL = {"TC003", "TC009", "TC010", "TC011", "TC013", "TC014"}
+
+REQUIRED_FIELDS = ("productname", "wholesaleprice", "price")
+
+
+# ── 페이로드별 추가 검증 (상태 코드 외) ─────────────────────
+
+def _check_missing_fields(resp):
+    try:
+        data = resp.json()
+    except ValueError:
+        return
+    for key in ("error", "message", "errors"):
+        if key in data:
+            msg = str(data[key]).lower()
+            assert any(f in msg for f in REQUIRED_FIELDS), f"Error message does not mention missing fields: {data[key]}"
+            return
+    raise AssertionError("Error message not found in response body")
+
+
+def _check_sanitized(resp):
+    name = str(resp.json().get("productName", ""))
+    assert "<script>" not in name and "</script>" not in name, f"productName not sanitized: {name}"
+
+
+def _check_phone(resp):
+    data = resp.json()
+    if "phone" in data:
+        assert data["phone"] == "+821012345678", f"Phone not formatted to E.164: {data['phone']}"
+
+
+def _check_json_object(resp):
+    assert isinstance(resp.json(), dict), "Response JSON is not a dictionary"
+
+
+CHECKS = {
+    "missing_fields": _check_missing_fields,
+    "sanitization": _check_sanitized,
+    "phone_format": _check_phone,
+    "no_options": _check_json_object,
+}
+
+
+# ── 케이스 구성 ─────────────────────────────────────────────
+
+def _sources(spec):
+    return {s if s.startswith("TC") else f"TC{s}" for s in spec["source"].split("/")}
+
+
+def build_cases(selected=None, serial=True):
+    """
+    계획서 순서대로 케이스 목록 → (parallel, serial)
+    케이스: {"tc", "title", "name", "kind": "payload"|"script", ...}
+    """
+    plan = load_json(PLAN_FILE, [])
+    scripts = {os.path.basename(p)[:5]: p for p in discover_cases()}
+    wanted = {s.strip().upper() for s in selected or [] if s.strip()}
+    parallel, later = [], []
+
+    for entry in plan:
+        tc = entry["id"]
+        if wanted and tc not in wanted:
+            continue
+        title = f"{tc}-{entry['title']}"
+        runs_script = tc in scripts and tc not in PAYLOAD_ONLY
+        if not runs_script:
+            for cls, spec in REGISTER_PAYLOAD_CLASSES.items():
+                if tc not in _sources(spec):
+                    continue
+                for i, payload in enumerate(spec["payloads"]):
+                    parallel.append({
+                        "tc": tc, "title": title, "name": f"{cls}[{i}]", "kind": "payload",
+                        "cls": cls, "payload": payload, "expected_status": spec["expected_status"],
+                    })
+            continue
+        # 스크립트로 도는 TC 는 같은 페이로드를 스크립트 안에서 보내므로 펼치지 않음
+        case = {"tc": tc, "title": title, "name": "script", "kind": "script", "path": scripts[tc]}
+        if tc not in SERIAL:
+            parallel.append(case)
+        elif serial:
+            later.append(case)
+    return parallel, later
+
+
+# ── 실행 ────────────────────────────────────────────────────
+
+_worker = {}
+
+
+def _init_worker(base_url, pool_size):
+    _worker["base_url"] = base_url
+    _worker["session"] = authed_session(make_session(pool_size))
+
+
+def _run_payload(case, base_url, session):
+    resp = session.post(f"{base_url}{REGISTER_ENDPOINT}", json=case["payload"], timeout=TIMEOUT)
+    assert resp.status_code == case["expected_status"], \
+        f"Expected {case['expected_status']} for {case['payload']}, got {resp.status_code}: {resp.text[:200]}"
+    check = CHECKS.get(case["cls"])
+    if check:
+        check(resp)
+
+
+def execute(case, base_url=None, session=None, timeout=CASE_TIMEOUT):
+    """케이스 1개 실행 → (case, status, error, duration_ms)"""
+    base_url = base_url or _worker.get("base_url", BASE_URL)
+    if case["kind"] == "script":
+        return (case, *run_case(case["path"], base_url, timeout))
+
+    session = session or _worker.get("session") or authed_session(make_session(1))
+    t0 = time.perf_counter()
+    try:
+        _run_payload(case, base_url, session)
+        status, error = "PASSED", ""
+    except AssertionError as e:
+        status, error = "FAILED", str(e)
+    except requests.RequestException as e:
+        status, error = "FAILED", f"Request failed: {e}"
+    return case, status, error, round((time.perf_counter() - t0) * 1000, 2)
+
+
+def run_all(parallel, serial, base_url=BASE_URL, workers=None, on_result=None):
+    """parallel 은 워커 풀에서, serial 은 그 뒤 하나씩. 완료 순으로 on_result 호출"""
+    outcomes = []
+    needs_auth = any(case["kind"] == "payload" for case in parallel + serial)
+    if needs_auth:
+        authed_session()  # 워커 initializer 에서 AssertionError 가 나면 풀 전체가 깨지므로 여기서 먼저 확인
+
+    def record(outcome):
+        outcomes.append(outcome)
+        if on_result:
+            on_result(*outcome)
+
+    if parallel:
+        workers = workers or os.cpu_count() or 4
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(base_url, 1)) as pool:
+            for fut in as_completed([pool.submit(execute, case) for case in parallel]):
+                record(fut.result())
+
+    session = authed_session(make_session(1)) if needs_auth else None
+    for case in serial:
+        record(execute(case, base_url, session))
+    return outcomes
+
+
+def collect(outcomes, order=()):
+    """케이스 결과 → {title: {"testStatus", "testError", "durationMs", "cases"}} (order = 계획서의 title 순서 유지)"""
+    by_title = {}
+    for case, status, error, duration_ms in outcomes:
+        entry = by_title.setdefault(case["title"], {"cases": []})
+        entry["cases"].append({"name": case["name"], "testStatus": status, "testError": error, "durationMs": duration_ms})
+
+    report = {}
+    titles = [t for t in order if t in by_title] + [t for t in by_title if t not in order]
+    for title in titles:
+        entry = by_title[title]
+        cases = sorted(entry["cases"], key=lambda c: c["name"])
+        failed = [c for c in cases if c["testStatus"] != "PASSED"]
+        report[title] = {
+            "testStatus": "FAILED" if failed else "PASSED",
+            "testError": "\n".join(f"[{c['name']}] {c['testError']}" for c in failed),
+            "durationMs": round(sum(c["durationMs"] for c in cases), 2),
+            "cases": cases,
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="testsprite_tests 병렬 러너")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--cases", default="", help="쉼표 구분 TC ID (기본: 계획서 전체)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--results", default=RESULTS_FILE)
+    parser.add_argument("--no-serial", action="store_true", help="SERIAL TC 건너뜀")
+    args = parser.parse_args(argv)
+
+    parallel, serial = build_cases(args.cases.split(",") if args.cases else None, serial=not args.no_serial)
+    if not parallel and not serial:
+        print("실행할 케이스가 없습니다")
+        return 1
+    print(f"▶ {len(parallel)} parallel + {len(serial)} serial cases → {args.base_url}")
+
+    def on_result(case, status, error, duration_ms):
+        print(f"  {case['tc']} {case['name']:<20} {status} ({duration_ms:.0f} ms)")
+
+    t0 = time.perf_counter()
+    try:
+        outcomes = run_all(parallel, serial, args.base_url, args.workers, on_result)
+    except AssertionError as e:
+        print(f"✗ {e}")
+        return 1
+    wall_ms = (time.perf_counter() - t0) * 1000
+
+    plan_entries = load_json(PLAN_FILE, [])
+    plan = {c["id"]: c.get("description", "") for c in plan_entries}
+    results = load_json(args.results, [])
+    report = collect(outcomes, order=[f"{c['id']}-{c['title']}" for c in plan_entries])
+    for title, fields in report.items():
+        attach_results(results, title, fields, description=plan.get(title[:5], ""))
+    write_results(results, args.results)
+
+    failed = [t for t, r in report.items() if r["testStatus"] != "PASSED"]
+    total_ms = sum(r["durationMs"] for r in report.values())
+    print(f"\n{len(report) - len(failed)}/{len(report)} passed in {wall_ms / 1000:.1f}s "
+          f"(serial sum {total_ms / 1000:.1f}s) → {args.results}")
+    for title in failed:
+        print(f"  ✗ {title}\n    {report[title]['testError'][:300]}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
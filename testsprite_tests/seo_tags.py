@@ -0,0 +1,183 @@
+"""
+쿠팡 검색태그 확장 엔진 벤치마크 (scripts/lib/seo_tags.js, batch_seo_update.js 용)
+
+data/our_products_detail.json 상품(displayName / 첫 옵션명 / searchTags)으로 카탈로그를 만들고
+  - 기존 방식: batch_seo_update.js 에 있던 expandTags 그대로
+    (호출마다 불용어/품질 필터 Set 재생성, 태그마다 동의어 사전 전체 소문자 비교)
+  - 엔진: lib/seo_tags.js tagCatalogue (컴파일된 동의어 색인, 상품명 토큰 메모이즈)
+를 같은 node 프로세스에서 같은 입력으로 돌려 products/sec 를 비교하고 태그가 같은지 확인한다.
+이어서 eval CLI 로 --diff 동작을 확인한다:
+  1회차(기존 searchTags 기준) 변경 N건 → 그 결과를 보냈다고 치고 2회차 → 변경 0건이어야 함.
+
+사용 예:
+    python seo_tags.py                         # our_products_detail.json 을 10,000개로 순환 복제
+    python seo_tags.py --products 50000 --repeat 5
+    python seo_tags.py --products 0            # 원본 상품 수 그대로
+"""
+
+import argparse
+import json
+import os
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE_JS = os.path.join(ROOT, "scripts", "lib", "seo_tags.js")
+PRODUCTS_FILE = os.path.join(ROOT, "data", "our_products_detail.json")
+TIMEOUT = 300
+
+# 같은 node 프로세스에서 같은 카탈로그로 두 구현을 측정 (워밍업 1회 후 repeat 회)
+BENCH_JS = r"""
+const engine = require(process.argv[1]);
+const SYNONYM_MAP = engine.SYNONYM_MAP;
+
+// ── 기존 batch_seo_update.js 구현 ──
+function extractKeywords(text) {
+  if (!text) return [];
+  const stopwords = new Set([
+    '및', '등', '외', '용', '형', '개', '개입', '1개', '세트',
+    'the', 'a', 'an', 'of', 'for', 'and', 'or', 'with', 'from',
+    '제공', '포함', '호환', '가능',
+  ]);
+  const tokens = text
+    .replace(/\[.*?\]/g, ' ')
+    .replace(/[^\w가-힣a-zA-Z0-9]/g, ' ')
+    .split(/\s+/)
+    .map(t => t.trim())
+    .filter(t => t.length >= 2 && !stopwords.has(t.toLowerCase()));
+  return [...new Set(tokens)];
+}
+function generateCompoundTags(keywords, maxCount = 5) {
+  const compounds = [];
+  for (let i = 0; i < keywords.length && compounds.length < maxCount; i++) {
+    for (let j = i + 1; j < keywords.length && compounds.length < maxCount; j++) {
+      const k1 = keywords[i], k2 = keywords[j];
+      if (k1.length >= 2 && k2.length >= 2 && (k1.length + k2.length) <= 10) compounds.push(k1 + k2);
+    }
+  }
+  return compounds;
+}
+function legacyExpandTags(existingTags, displayName, sellerName) {
+  const tagSet = new Set(existingTags.map(t => t.trim()).filter(Boolean));
+  const nameKeywords = extractKeywords(`${displayName} ${sellerName}`);
+  nameKeywords.forEach(k => tagSet.add(k));
+  const allCurrent = [...tagSet];
+  for (const tag of allCurrent) {
+    const synonyms = SYNONYM_MAP[tag];
+    if (synonyms) synonyms.forEach(s => tagSet.add(s));
+    const lower = tag.toLowerCase();
+    for (const [key, vals] of Object.entries(SYNONYM_MAP)) {
+      if (key.toLowerCase() === lower) vals.forEach(s => tagSet.add(s));
+    }
+  }
+  if (tagSet.size < 20) generateCompoundTags(nameKeywords, 20 - tagSet.size).forEach(c => tagSet.add(c));
+  const junkWords = new Set([
+    '주변', '작은', '비행사와', '봉투제', '저소', '간결한',
+    '대비색', '보이지', '나른한', '수치',
+  ]);
+  return [...tagSet]
+    .map(t => t.slice(0, 20))
+    .filter(t => t.length >= 2 && !/^\d{1,2}$/.test(t) && !junkWords.has(t))
+    .slice(0, 20);
+}
+
+const { products, repeat } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+function time(fn) {
+  const out = fn();
+  const t0 = process.hrtime.bigint();
+  for (let r = 0; r < repeat; r++) fn();
+  return { ms: Number(process.hrtime.bigint() - t0) / 1e6, out };
+}
+const legacy = time(() => products.map(p => legacyExpandTags(p.tags, p.displayName, p.sellerName)));
+const tagged = time(() => engine.tagCatalogue(products));
+console.log(JSON.stringify({
+  legacy: { ms: legacy.ms, tags: legacy.out },
+  engine: { ms: tagged.ms, tags: tagged.out.map(r => r.tags), changed: tagged.out.filter(r => r.changed).length },
+}));
+"""
+
+
+def load_products(count=None, products_file=PRODUCTS_FILE):
+    """our_products_detail.json → [{pid, displayName, sellerName, tags}] — count 가 더 크면 순환 복제 (같은 상품명 반복)"""
+    with open(products_file, "r", encoding="utf-8") as f:
+        detail = [p for p in json.load(f) if not p.get("error") and p.get("displayName")]
+    products = [
+        {
+            "pid": p["pid"],
+            "displayName": p["displayName"],
+            "sellerName": ((p.get("items") or [{}])[0].get("itemName") or p["displayName"]),
+            "tags": p.get("searchTags") or [],
+        }
+        for p in detail
+    ]
+    if count:
+        products = [dict(products[i % len(products)], pid=i) for i in range(count)]
+    return products
+
+
+def run_eval(products):
+    """scripts/lib/seo_tags.js eval → [{"pid", "tags", "changed"}]"""
+    proc = subprocess.run(
+        ["node", ENGINE_JS, "eval"],
+        input=json.dumps({"products": products}, ensure_ascii=False),
+        capture_output=True, text=True, encoding="utf-8", timeout=TIMEOUT,
+    )
+    assert proc.returncode == 0, f"seo_tags.js failed: {proc.stderr}"
+    return json.loads(proc.stdout)["results"]
+
+
+def bench(products, repeat=3):
+    """→ {"legacy_pps", "engine_pps", "mismatches", "changed"}"""
+    proc = subprocess.run(
+        ["node", "-e", BENCH_JS, ENGINE_JS],
+        input=json.dumps({"products": products, "repeat": repeat}, ensure_ascii=False),
+        capture_output=True, text=True, encoding="utf-8", timeout=TIMEOUT * 2,
+    )
+    assert proc.returncode == 0, f"benchmark failed: {proc.stderr}"
+    r = json.loads(proc.stdout)
+    n = len(products) * repeat
+    mismatches = [i for i, (a, b) in enumerate(zip(r["legacy"]["tags"], r["engine"]["tags"])) if a != b]
+    return {
+        "legacy_pps": n / (r["legacy"]["ms"] / 1000),
+        "engine_pps": n / (r["engine"]["ms"] / 1000),
+        "mismatches": mismatches,
+        "legacy_tags": r["legacy"]["tags"],
+        "engine_tags": r["engine"]["tags"],
+        "changed": r["engine"]["changed"],
+    }
+
+
+def check_diff(products):
+    """1회차 결과를 현재 태그로 두고 2회차 → (1회차 변경 수, 2회차 변경 수)"""
+    first = run_eval(products)
+    sent = {r["pid"]: r["tags"] for r in first}
+    second = run_eval([dict(p, currentTags=sent[p["pid"]]) for p in products])
+    return sum(r["changed"] for r in first), sum(r["changed"] for r in second)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="검색태그 확장 엔진 벤치마크")
+    parser.add_argument("--products", type=int, default=10000, help="상품 수 (0=our_products_detail.json 그대로, 크면 순환)")
+    parser.add_argument("--repeat", type=int, default=3, help="카탈로그 전체 반복 횟수")
+    args = parser.parse_args(argv)
+
+    products = load_products(args.products or None)
+    if not products:
+        print(f"상품이 없습니다: {PRODUCTS_FILE}")
+        return 1
+
+    r = bench(products, args.repeat)
+    print(f"catalogue products={len(products)} x{args.repeat}")
+    print(f"  기존 expandTags (호출마다 Set 재생성, 사전 전체 비교): {r['legacy_pps']:>10.0f} products/s")
+    print(f"  엔진 tagCatalogue (컴파일된 색인, 토큰 메모이즈)    : {r['engine_pps']:>10.0f} products/s"
+          f"   x{r['engine_pps'] / r['legacy_pps']:.1f}")
+    print(f"태그 불일치: {len(r['mismatches'])}건")
+    for i in r["mismatches"][:5]:
+        print(f"  ✗ {products[i]['displayName'][:40]}\n    기존 {r['legacy_tags'][i]}\n    엔진 {r['engine_tags'][i]}")
+
+    first, second = check_diff(products)
+    print(f"diff 모드: 1회차 변경 {first}건 → 반영 후 2회차 변경 {second}건")
+    return 1 if r["mismatches"] or second else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
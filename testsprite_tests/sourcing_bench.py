@@ -0,0 +1,350 @@
+"""
+도매꾹 소싱 파이프라인 벤치마크 (API 픽스처 재생)
+
+fixtures/domeggook/api_items.json 상품 데이터로 도매꾹 Open API(getItemList / getItemView)
+흉내를 내는 로컬 HTTP 서버를 띄우고, DOMEGGOOK_API_URL 을 그쪽으로 돌린 뒤
+scripts/pipeline_sourcing.js --json 을 임시 대기열/키워드 이력으로 실행한다.
+  - 단계(search → dedup → enrich → margin → append)별 in/out, 분당 처리량, 처리/대기 시간 출력
+  - 상세 조회 동시성 1(순차)과 N 을 비교
+  - 기존 대기열에 있던 상품번호가 다시 들어가지 않았는지, 중복 추가가 없는지,
+    같은 키워드로 한 번 더 돌리면 새로 추가되는 상품이 없는지 확인
+실제 도매꾹에 요청하지 않으므로 결과는 네트워크 상태와 무관하다.
+
+사용 예:
+    python sourcing_bench.py                                   # 키워드 60개, 상세 조회 지연 80ms
+    python sourcing_bench.py --keywords 200 --concurrency 8 --latency-ms 200
+    python sourcing_bench.py --write-fixtures                  # register_queue.jsonl 로 픽스처 재생성
+
+필요: node + 루트 node_modules (dotenv)
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from queue_store import JOURNAL_FILE as QUEUE_FILE, load_items
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SCRIPT = os.path.join(ROOT, "scripts", "pipeline_sourcing.js")
+FIXTURE_FILE = os.path.join(HERE, "fixtures", "domeggook", "api_items.json")
+API_PATH = "/ssl/api/"
+LIST_SIZE = 20
+CATALOGUE_SIZE = 400
+SEEDED_RATIO = 0.2  # 카탈로그 중 기존 대기열에 이미 있는 비율
+STAGES = ("search", "dedup", "enrich", "margin", "append")
+# 검색 키워드 — 카테고리 배수/연관태그가 걸리는 단어 + 일반 단어
+KEYWORD_WORDS = ["텀블러", "충전기", "수납", "캠핑", "주방", "문구", "완구", "반려동물", "거울", "우산",
+                 "파우치", "케이블", "타올", "컵", "정리함", "조명", "스티커", "가방", "모자", "양말"]
+
+
+# ── 픽스처 ─────────────────────────────────────────
+
+
+def write_fixtures(queue_file=QUEUE_FILE, path=FIXTURE_FILE):
+    """register_queue.jsonl 도매꾹 상품 → 상세 조회 응답에 필요한 필드만 추린 목록"""
+    queue = [q for q in load_items(queue_file) if q.get("sourceSite") == "domeggook"]
+    items = []
+    for q in queue:
+        images = [u for u in q.get("detailImages") or [] if isinstance(u, str)][:5]
+        items.append({
+            "title": q.get("domeggookProductName") or q.get("displayName") or "상품",
+            "price": int(q.get("sourcePrice") or 1000),
+            "thumb": q.get("imageUrl"),
+            "moq": int(q.get("minOrderQuantity") or 1),
+            "deliFee": 3000,
+            "detailImages": images,
+            "options": q.get("domeggookOptions") or None,
+        })
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"{len(items)}개 상품 픽스처 생성 → {path}")
+
+
+def load_catalogue(size=CATALOGUE_SIZE, path=FIXTURE_FILE):
+    """픽스처 상품을 size 개까지 순환 복제 (상품번호/상품명은 각각 고유)"""
+    with open(path, "r", encoding="utf-8") as f:
+        seed = json.load(f)
+    catalogue = []
+    for i in range(size):
+        item = dict(seed[i % len(seed)])
+        item["no"] = str(60000000 + i)
+        if i >= len(seed):
+            item["title"] = f"{item['title']} {i // len(seed) + 1}호"
+        catalogue.append(item)
+    return catalogue
+
+
+def make_keywords(count, seed=7):
+    rng = random.Random(seed)
+    keywords = []
+    for i in range(count):
+        a, b = rng.sample(KEYWORD_WORDS, 2)
+        keywords.append(f"{a} {b}" if i % 3 else f"{a}{i}")
+    return keywords
+
+
+def _list_item(item):
+    return {
+        "no": item["no"],
+        "title": item["title"],
+        "price": item["price"],
+        "thumb": item["thumb"],
+        "url": f"http://domeggook.com/{item['no']}",
+        "unitQty": item["moq"],
+        "deli": {"fee": item["deliFee"]},
+    }
+
+
+def _view(item):
+    contents = "".join(f'<img src="{u}">' for u in item["detailImages"])
+    select_opt = None
+    if item.get("options"):
+        select_opt = json.dumps({"set": [
+            {"name": g.get("groupName") or "선택", "opts": [v.get("name") for v in g.get("values") or []]}
+            for g in item["options"]
+        ]}, ensure_ascii=False)
+    return {"domeggook": {
+        "basis": {"title": item["title"]},
+        "price": {"dome": f"1+{item['price']}|10+{max(100, item['price'] - 50)}"},
+        "thumb": {"original": item["thumb"]},
+        "desc": {"contents": {"item": contents}, "license": {"usable": "Y"}},
+        "detail": {"manufacturer": "셀픽스", "country": "중국"},
+        "qty": {"domeMoq": item["moq"], "inventory": 500},
+        "deli": {"dome": {"fee": item["deliFee"]}},
+        "selectOpt": select_opt,
+    }}
+
+
+class ApiServer(ThreadingHTTPServer):
+    """getItemList(kw) → 검색어 해시 위치부터 LIST_SIZE 개, getItemView(no) → 상세 (keep-alive 지원)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, catalogue, latency_ms=0):
+        super().__init__(address, ApiHandler)
+        self.catalogue = catalogue
+        self.by_no = {item["no"]: item for item in catalogue}
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.calls = {"getItemList": 0, "getItemView": 0}
+        self.viewed = set()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.calls = {"getItemList": 0, "getItemView": 0}
+            self.viewed = set()
+
+    def search(self, kw):
+        start = zlib.crc32(kw.encode("utf-8")) % len(self.catalogue)
+        return [self.catalogue[(start + i) % len(self.catalogue)] for i in range(LIST_SIZE)]
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        srv = self.server
+        parsed = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        mode = qs.get("mode")
+        if parsed.path != API_PATH or mode not in srv.calls:
+            self._send(404, {})
+            return
+        with srv.lock:
+            srv.calls[mode] += 1
+            if mode == "getItemView":
+                srv.viewed.add(qs.get("no"))
+        if srv.latency:
+            time.sleep(srv.latency)
+        if mode == "getItemList":
+            items = [_list_item(item) for item in srv.search(qs.get("kw", ""))]
+            self._send(200, {"domeggook": {"list": {"item": items}}})
+        else:
+            item = srv.by_no.get(qs.get("no"))
+            self._send(200 if item else 404, _view(item) if item else {})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def start_api_server(catalogue, host="127.0.0.1", port=0, latency_ms=0):
+    server = ApiServer((host, port), catalogue, latency_ms)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+# ── 실행 ───────────────────────────────────────────
+
+
+def seed_queue(path, catalogue, ratio=SEEDED_RATIO, seed=3):
+    """카탈로그 일부를 이미 등록된 항목으로 넣은 대기열 저널 → 그 상품번호 집합"""
+    rng = random.Random(seed)
+    seeded = [item for item in catalogue if rng.random() < ratio]
+    with open(path, "w", encoding="utf-8") as f:
+        for k, item in enumerate(seeded, 1):
+            v = {"displayName": item["title"], "domeggookProductNo": item["no"], "status": "registered"}
+            f.write(json.dumps({"k": k, "v": v}, ensure_ascii=False) + "\n")
+    return {item["no"] for item in seeded}
+
+
+def read_journal(path):
+    """저널의 유효 항목 (같은 키의 마지막 줄)"""
+    items = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            if rec.get("d"):
+                items.pop(rec["k"], None)
+            else:
+                items[rec["k"]] = rec["v"]
+    return [items[k] for k in sorted(items)]
+
+
+def run_pipeline(api_url, keywords_file, queue_file, history_file, concurrency, timeout=600):
+    """pipeline_sourcing.js --json 1회 실행 → 요약 dict"""
+    cmd = ["node", SCRIPT, "--json", f"--keywords={keywords_file}", f"--queue={queue_file}",
+           f"--history={history_file}", f"--concurrency={concurrency}", "--rps=0"]
+    env = dict(os.environ, DOMEGGOOK_API_URL=api_url, DOMEGGOOK_API_KEY="bench", ENRICH_RETRY_BASE_MS="20")
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip()[-500:] or f"pipeline_sourcing.js exited with {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def bench(keywords, catalogue, concurrency, latency_ms):
+    """
+    같은 키워드/카탈로그로 순차(동시성 1)와 concurrency 를 각각 새 대기열에서 실행하고,
+    concurrency 쪽은 같은 대기열로 한 번 더 실행(모두 중복이어야 함)
+    반환: {"runs": {label: summary}, "checks": {...}}
+    """
+    server, _ = start_api_server(catalogue, latency_ms=latency_ms)
+    runs, checks = {}, {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            keywords_file = os.path.join(tmp, "keywords.json")
+            with open(keywords_file, "w", encoding="utf-8") as f:
+                json.dump(keywords, f, ensure_ascii=False)
+
+            for label, n in (("sequential", 1), (f"concurrency={concurrency}", concurrency)):
+                queue_file = os.path.join(tmp, f"queue_{n}.jsonl")
+                seeded = seed_queue(queue_file, catalogue)
+                server.reset_stats()
+                summary = run_pipeline(server.base_url, keywords_file, queue_file, os.path.join(tmp, f"history_{n}.json"), n)
+                summary["apiCalls"] = dict(server.calls)
+                summary["viewedSeeded"] = len(server.viewed & seeded)
+                runs[label] = summary
+
+                added = read_journal(queue_file)[len(seeded):]
+                nos = [item["domeggookProductNo"] for item in added]
+                checks[label] = {
+                    "appended": len(nos),
+                    "reappendedSeeded": len(set(nos) & seeded),
+                    "duplicates": len(nos) - len(set(nos)),
+                }
+
+            # 같은 대기열 + 새 이력 파일로 재실행 → 새로 추가되는 상품 없어야 함
+            server.reset_stats()
+            again = run_pipeline(server.base_url, keywords_file, queue_file, os.path.join(tmp, "history_again.json"), concurrency)
+            checks["rerunAppended"] = again["passed"]
+            checks["rerunViews"] = server.calls["getItemView"]
+    finally:
+        server.shutdown()
+    return {"runs": runs, "checks": checks}
+
+
+def print_report(result):
+    for label, r in result["runs"].items():
+        e2e = r["passed"] * 60000 / max(r["elapsedMs"], 1)
+        print(f"\n[{label}] {r['elapsedMs'] / 1000:.2f}s  keywords={r['keywords']}  searched={r['searched']}  "
+              f"passed={r['passed']}  duplicate={r['duplicate']}  blocked={r['blocked']}  "
+              f"api={r['apiCalls']}  → {e2e:,.0f} items/min")
+        print(f"  {'stage':<8} {'in':>6} {'out':>6} {'in/min':>10} {'out/min':>10} {'busy ms':>9} {'blocked ms':>11} {'err':>4}")
+        for s in r["stages"]:
+            print(f"  {s['name']:<8} {s['in']:>6} {s['out']:>6} {s['inPerMin']:>10,} {s['outPerMin']:>10,} "
+                  f"{s['busyMs']:>9} {s['blockedMs']:>11} {s['errors']:>4}")
+    labels = list(result["runs"])
+    if len(labels) == 2:
+        a, b = (result["runs"][k]["elapsedMs"] for k in labels)
+        print(f"\n{labels[1]} vs {labels[0]}: x{a / max(b, 1):.1f}")
+    print(f"checks: {json.dumps(result['checks'], ensure_ascii=False)}")
+
+
+def failed_checks(result):
+    problems = []
+    for label in result["runs"]:
+        c = result["checks"][label]
+        if c["reappendedSeeded"]:
+            problems.append(f"{label}: 기존 대기열 상품 {c['reappendedSeeded']}개 재추가")
+        if c["duplicates"]:
+            problems.append(f"{label}: 중복 추가 {c['duplicates']}개")
+        if result["runs"][label]["viewedSeeded"]:
+            problems.append(f"{label}: 기존 대기열 상품 상세 조회 {result['runs'][label]['viewedSeeded']}회")
+        if c["appended"] != result["runs"][label]["passed"]:
+            problems.append(f"{label}: 저널 {c['appended']}개 ≠ 통과 {result['runs'][label]['passed']}개")
+    counts = {label: c["appended"] for label, c in result["checks"].items() if isinstance(c, dict)}
+    if len(set(counts.values())) > 1:
+        problems.append(f"동시성별 추가 수가 다름: {counts}")
+    if result["checks"]["rerunAppended"] or result["checks"]["rerunViews"]:
+        problems.append(f"재실행에서 추가 {result['checks']['rerunAppended']}개 / 상세 조회 {result['checks']['rerunViews']}회")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="도매꾹 소싱 파이프라인 벤치마크")
+    parser.add_argument("--keywords", type=int, default=60, help="키워드 수")
+    parser.add_argument("--catalogue", type=int, default=CATALOGUE_SIZE, help="카탈로그 상품 수 (픽스처 순환 복제)")
+    parser.add_argument("--concurrency", type=int, default=4, help="상세 조회 동시성")
+    parser.add_argument("--latency-ms", type=float, default=80, help="픽스처 API 응답 지연")
+    parser.add_argument("--fixtures", default=FIXTURE_FILE)
+    parser.add_argument("--write-fixtures", action="store_true")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    if args.write_fixtures:
+        write_fixtures(path=args.fixtures)
+        return 0
+    if not os.path.exists(args.fixtures):
+        print(f"픽스처가 없습니다: {args.fixtures} (--write-fixtures 로 생성)")
+        return 1
+
+    result = bench(make_keywords(args.keywords), load_catalogue(args.catalogue, args.fixtures), args.concurrency, args.latency_ms)
+    print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    problems = failed_checks(result)
+    for p in problems:
+        print(f"  ✗ {p}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
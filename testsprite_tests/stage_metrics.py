@@ -0,0 +1,269 @@
+"""
+TC 실행 + 단계별 지연 히스토그램 수집
+
+각 TC 스크립트를 순서대로 실행하면서 실행 전/후로 /api/metrics
+(Prometheus 텍스트, selpix_stage_duration_seconds) 를 긁어 차이를 구하고,
+route × stage 별 count / 평균 / p50·p95·p99 를 tmp/test_results.json 의
+해당 TC 항목에 stageMetrics 로 붙인다.
+pass/fail 만 있던 리포트에서 "어느 단계(인증정보 조회, 출고지 조회, AI, 쿠팡 왕복)가
+느려졌는지"를 숫자로 비교하기 위한 용도.
+
+사용 예:
+    python stage_metrics.py                         # TC*.py 전체 실행 후 결과 갱신
+    python stage_metrics.py --cases TC002,TC005
+    python stage_metrics.py --scrape-only           # 현재 누적 히스토그램만 출력
+
+환경변수:
+    SELPIX_BASE_URL  대상 서버 (기본 http://localhost:3000)
+    METRICS_TOKEN    /api/metrics 보호 토큰 (production 서버는 필수, 없으면 401)
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import requests
+
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+METRICS_ENDPOINT = "/api/metrics"
+METRIC_NAME = "selpix_stage_duration_seconds"
+TIMEOUT = 30
+CASE_TIMEOUT = 300
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(HERE, "tmp", "test_results.json")
+PLAN_FILE = os.path.join(HERE, "testsprite_backend_test_plan.json")
+
+_SAMPLE_RE = re.compile(r"^(?P<name>[a-zA-Z_:][\w:]*)\{(?P<labels>[^}]*)\}\s+(?P<value>\S+)$")
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_prometheus(text):
+    """
+    Prometheus 텍스트 → {(route, stage): {"buckets": [(le_ms, 누적count), ...], "sum_ms", "count"}}
+    le 는 ms 로 환산, +Inf 는 float("inf")
+    """
+    hists = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        m = _SAMPLE_RE.match(line.strip())
+        if not m or not m.group("name").startswith(METRIC_NAME):
+            continue
+        labels = {k: v.replace('\\"', '"').replace("\\\\", "\\") for k, v in _LABEL_RE.findall(m.group("labels"))}
+        key = (labels.get("route", ""), labels.get("stage", ""))
+        h = hists.setdefault(key, {"buckets": [], "sum_ms": 0.0, "count": 0})
+        suffix = m.group("name")[len(METRIC_NAME):]
+        value = float(m.group("value"))
+        if suffix == "_bucket":
+            le = labels.get("le", "+Inf")
+            h["buckets"].append((float("inf") if le == "+Inf" else float(le) * 1000, int(value)))
+        elif suffix == "_sum":
+            h["sum_ms"] = value * 1000
+        elif suffix == "_count":
+            h["count"] = int(value)
+    for h in hists.values():
+        h["buckets"].sort()
+    return hists
+
+
+def scrape(base_url=BASE_URL, session=None, token=None):
+    """/api/metrics 조회. 서버가 없거나 엔드포인트가 없으면 None"""
+    headers = {"x-metrics-token": token} if token else {}
+    try:
+        resp = (session or requests).get(f"{base_url}{METRICS_ENDPOINT}", headers=headers, timeout=TIMEOUT)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+    return parse_prometheus(resp.text)
+
+
+def diff(before, after):
+    """after - before (카운터 리셋/신규 시리즈는 after 그대로). count 0 인 시리즈는 제외"""
+    out = {}
+    for key, h in after.items():
+        prev = (before or {}).get(key)
+        if prev and prev["count"] <= h["count"]:
+            prev_buckets = dict(prev["buckets"])
+            h = {
+                "buckets": [(le, c - prev_buckets.get(le, 0)) for le, c in h["buckets"]],
+                "sum_ms": h["sum_ms"] - prev["sum_ms"],
+                "count": h["count"] - prev["count"],
+            }
+        if h["count"] > 0:
+            out[key] = h
+    return out
+
+
+def quantile(hist, q):
+    """histogram_quantile 과 같은 버킷 내 선형 보간 (+Inf 버킷이면 마지막 유한 경계)"""
+    total = hist["count"]
+    if total <= 0:
+        return 0.0
+    rank = q * total
+    lower, prev_count = 0.0, 0
+    for le, count in hist["buckets"]:
+        if count >= rank:
+            if le == float("inf"):
+                return lower
+            if count == prev_count:
+                return le
+            return lower + (le - lower) * (rank - prev_count) / (count - prev_count)
+        lower, prev_count = le, count
+    return lower
+
+
+def summarize(hists):
+    """{route: {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, buckets}}}"""
+    report = {}
+    for (route, stage), h in sorted(hists.items()):
+        report.setdefault(route, {})[stage] = {
+            "count": h["count"],
+            "mean_ms": round(h["sum_ms"] / h["count"], 2) if h["count"] else 0.0,
+            "p50_ms": round(quantile(h, 0.50), 2),
+            "p95_ms": round(quantile(h, 0.95), 2),
+            "p99_ms": round(quantile(h, 0.99), 2),
+            "buckets": {("+Inf" if le == float("inf") else f"{le:g}"): c for le, c in h["buckets"]},
+        }
+    return report
+
+
+def discover_cases(selected=None):
+    """TC###_*.py 목록 (selected 가 있으면 해당 ID 만)"""
+    paths = sorted(glob.glob(os.path.join(HERE, "TC[0-9][0-9][0-9]_*.py")))
+    if selected:
+        wanted = {s.strip().upper() for s in selected if s.strip()}
+        paths = [p for p in paths if os.path.basename(p)[:5].upper() in wanted]
+    return paths
+
+
+def run_case(path, base_url=BASE_URL, timeout=CASE_TIMEOUT):
+    """TC 스크립트 1개 실행 → (status, error, duration_ms)"""
+    env = dict(os.environ, SELPIX_BASE_URL=base_url)
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, path], cwd=HERE, env=env,
+            capture_output=True, text=True, timeout=timeout,
+        )
+        status = "PASSED" if proc.returncode == 0 else "FAILED"
+        error = "" if proc.returncode == 0 else (proc.stderr or proc.stdout).strip()
+    except subprocess.TimeoutExpired:
+        status, error = "FAILED", f"Timed out after {timeout}s"
+    return status, error, round((time.perf_counter() - t0) * 1000, 2)
+
+
+def _case_title(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name[:5]}-{name[6:]}"
+
+
+def load_json(path, default):
+    """JSON 파일 → 값 (파일이 없으면 default) — 계획서 / test_results.json 읽기용"""
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def attach_results(results, title, fields, description=""):
+    """test_results.json 항목(TC ID 로 매칭)에 필드 병합. 없으면 새 항목 추가"""
+    case_id = title[:5]
+    now = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    for entry in results:
+        if entry.get("title", "")[:5] == case_id:
+            entry.update(fields)
+            entry["modified"] = now
+            return entry
+    entry = {
+        "title": title,
+        "description": description,
+        "testType": "BACKEND",
+        "createFrom": "local",
+        "created": now,
+        "modified": now,
+    }
+    entry.update(fields)
+    results.append(entry)
+    return entry
+
+
+def write_results(results, path=RESULTS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def print_stage_report(report):
+    for route, stages in report.items():
+        print(f"  [{route}]")
+        for stage, s in stages.items():
+            print(f"    {stage:<24} n={s['count']:<5} mean={s['mean_ms']:>9.2f}ms "
+                  f"p50={s['p50_ms']:>9.2f}ms p95={s['p95_ms']:>9.2f}ms p99={s['p99_ms']:>9.2f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TC 실행 + 단계별 지연 히스토그램 수집")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--cases", default="", help="쉼표 구분 TC ID (기본: 전체)")
+    parser.add_argument("--results", default=RESULTS_FILE)
+    parser.add_argument("--token", default=os.environ.get("METRICS_TOKEN", ""))
+    parser.add_argument("--timeout", type=int, default=CASE_TIMEOUT, help="TC 1개당 제한 시간(초)")
+    parser.add_argument("--scrape-only", action="store_true", help="TC 실행 없이 현재 누적값만 출력")
+    args = parser.parse_args(argv)
+
+    session = requests.Session()
+
+    if args.scrape_only:
+        hists = scrape(args.base_url, session, args.token)
+        if hists is None:
+            print(f"{args.base_url}{METRICS_ENDPOINT} 조회 실패")
+            return 1
+        print_stage_report(summarize(hists))
+        return 0
+
+    cases = discover_cases(args.cases.split(",") if args.cases else None)
+    if not cases:
+        print("실행할 TC 가 없습니다")
+        return 1
+
+    plan = {c["id"]: c.get("description", "") for c in load_json(PLAN_FILE, [])}
+    results = load_json(args.results, [])
+    failed = 0
+
+    for path in cases:
+        title = _case_title(path)
+        before = scrape(args.base_url, session, args.token)
+        status, error, duration_ms = run_case(path, args.base_url, args.timeout)
+        after = scrape(args.base_url, session, args.token)
+        stage_report = summarize(diff(before, after)) if after is not None else None
+
+        attach_results(results, title, {
+            "testStatus": status,
+            "testError": error,
+            "durationMs": duration_ms,
+            "stageMetrics": stage_report,
+        }, description=plan.get(title[:5], ""))
+        failed += status != "PASSED"
+
+        print(f"{title}: {status} ({duration_ms:.0f} ms)")
+        if stage_report:
+            print_stage_report(stage_report)
+        elif stage_report is None:
+            print("  (metrics 엔드포인트 응답 없음 — stageMetrics 생략)")
+
+    write_results(results, args.results)
+    print(f"\n{len(cases) - failed}/{len(cases)} passed → {args.results}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+"""
+재고 모니터링 스케줄러 — Python 시뮬레이션
+
+scripts/lib/stock_scheduler.js 의 주기 정책(next_interval)을 그대로 옮기고,
+가상 카탈로그(기본 1만 개)에서 크론 주기마다
+  - 확인 시각이 된 상품만 최대 batch 개 확인 (적응형 스케줄러)
+  - 매번 전체 확인 (기존 cron_stock_monitor.js)
+를 비교해 사이클별 절약한 조회 수 / 변동 감지 지연을 보고한다.
+
+상품 변동성 구성 (시간당 재고/가격 변동 확률):
+    stable   80%  30일에 한 번
+    moderate 15%  2일에 한 번
+    volatile  5%  4시간에 한 번
+
+사용 예:
+    python stock_scheduler.py                        # 1만 개, 7일, 30분 크론
+    python stock_scheduler.py --products 50000 --days 3 --batch 1500
+    python stock_scheduler.py --max-hours 24                 # STOCK_CHECK_MAX_INTERVAL_MS=24시간으로 늘린 경우
+"""
+
+import argparse
+import math
+import random
+
+HOUR_MS = 60 * 60 * 1000
+MIN_INTERVAL_MS = 1 * HOUR_MS
+MAX_INTERVAL_MS = 6 * HOUR_MS  # 기존 크론 주기 (STOCK_CHECK_MAX_INTERVAL_MS 기본값)
+ERROR_RETRY_MS = 30 * 60 * 1000
+TARGET_CHANGES_PER_CHECK = 0.25
+DECAY = 0.8
+PRIOR_CHANGES = 0.25
+PRIOR_HOURS = 6
+JITTER = 0.1
+
+PROFILES = [
+    # (이름, 비율, 시간당 변동 횟수)
+    ("stable", 0.80, 1 / 720),
+    ("moderate", 0.15, 1 / 48),
+    ("volatile", 0.05, 1 / 4),
+]
+
+
+def next_interval(prev, changed, elapsed_ms, min_ms=MIN_INTERVAL_MS, max_ms=MAX_INTERVAL_MS):
+    """
+    stock_scheduler.js nextInterval 과 동일 → (changes, hours, rate, interval_ms)
+    감쇠 누적한 변동 횟수 / 경과 시간으로 시간당 변동률을 추정하고,
+    확인 1회당 변동 기대값이 TARGET_CHANGES_PER_CHECK 가 되도록 주기를 정한다.
+    (JS Math.round = 0.5 올림)
+    """
+    changes = (prev["changes"] if prev else 0) * DECAY + (1 if changed else 0)
+    hours = (prev["hours"] if prev else 0) * DECAY + elapsed_ms / HOUR_MS
+    rate = (changes + PRIOR_CHANGES) / (hours + PRIOR_HOURS)
+    interval = math.floor(min(max_ms, max(min_ms, TARGET_CHANGES_PER_CHECK / rate * HOUR_MS)) + 0.5)
+    return changes, hours, rate, interval
+
+
+class StockScheduler:
+    """stock_scheduler.js StockScheduler 의 메모리 버전 (파일 기록 대신 기록 줄 수만 셈)"""
+
+    def __init__(self, min_ms=MIN_INTERVAL_MS, max_ms=MAX_INTERVAL_MS, error_retry_ms=ERROR_RETRY_MS, rng=None):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.error_retry_ms = error_retry_ms
+        self.rng = rng or random.Random()
+        self.entries = {}  # key → {"next", "interval", "changes", "hours", "checked", "hash", "errors"}
+        self.writes = 0
+
+    def due(self, keys, now, limit=None):
+        due = [(self.entries[k]["next"] if k in self.entries else 0, k) for k in keys]
+        due = sorted((at, k) for at, k in due if at <= now)
+        return [k for _, k in due[:limit]]
+
+    def record(self, key, content_hash, now):
+        """→ (changed, unchanged)"""
+        prev = self.entries.get(key)
+        same = prev is not None and prev["hash"] == content_hash
+        changed = prev is not None and not same
+        elapsed = max(0, now - prev["checked"]) if prev and "checked" in prev else 0
+        changes, hours, _, interval = next_interval(prev, changed, elapsed, self.min_ms, self.max_ms)
+        jitter = 1 + (self.rng.random() * 2 - 1) * JITTER
+        self.entries[key] = {
+            "next": now + round(interval * jitter),
+            "interval": interval,
+            "changes": changes,
+            "hours": hours,
+            "checked": now,
+            "hash": content_hash,
+            "errors": 0,
+        }
+        self.writes += 1
+        return changed, same
+
+    def record_error(self, key, now):
+        prev = self.entries.setdefault(key, {
+            "interval": self.min_ms, "changes": 0, "hours": 0, "hash": None, "errors": 0,
+        })
+        prev["errors"] += 1
+        prev["next"] = now + min(self.max_ms, self.error_retry_ms * 2 ** (prev["errors"] - 1))
+        self.writes += 1
+
+
+def make_catalogue(products, rng):
+    """상품별 시간당 변동 확률 (PROFILES 비율대로)"""
+    catalogue = []
+    for name, share, rate in PROFILES:
+        catalogue += [(name, rate)] * round(products * share)
+    rng.shuffle(catalogue)
+    return catalogue[:products]
+
+
+def simulate(products=10000, days=7, cycle_min=30, batch=500, full_scan_hours=6, seed=1, max_hours=None):
+    """
+    크론 사이클마다 상품 변동을 발생시키고 두 방식으로 확인.
+    max_hours: 스케줄러 최대 주기 (None 이면 MAX_INTERVAL_MS)
+    반환: {"cycles": [...사이클별...], "profiles": {...}, 합계...}
+    """
+    rng = random.Random(seed)
+    catalogue = make_catalogue(products, rng)
+    n = len(catalogue)
+    cycle_ms = cycle_min * 60 * 1000
+    full_every = max(1, round(full_scan_hours * 60 / cycle_min))
+    cycles = round(days * 24 * 60 / cycle_min)
+
+    version = [0] * n                 # 실제 상태 (변동마다 +1)
+    first_change = [None] * n         # 마지막 확인 이후 첫 변동 시각 (스케줄러 기준)
+    first_change_full = [None] * n    # 〃 (전체 확인 기준)
+    max_ms = max_hours * HOUR_MS if max_hours else MAX_INTERVAL_MS
+    scheduler = StockScheduler(max_ms=max_ms, rng=random.Random(seed + 1))
+    keys = list(range(n))
+    latency = {name: [] for name, _, _ in PROFILES}
+    latency_full = {name: [] for name, _, _ in PROFILES}
+    checks_by_profile = {name: 0 for name, _, _ in PROFILES}
+    history = []
+
+    for c in range(cycles):
+        now = c * cycle_ms
+        for i, (_, rate) in enumerate(catalogue):
+            if rng.random() < 1 - math.exp(-rate * cycle_min / 60):
+                version[i] += 1
+                if first_change[i] is None:
+                    first_change[i] = now
+                if first_change_full[i] is None:
+                    first_change_full[i] = now
+
+        # 적응형: 확인 시각이 된 상품만
+        due = scheduler.due(keys, now, batch)
+        changed = unchanged = 0
+        for i in due:
+            was_changed, same = scheduler.record(i, version[i], now)
+            changed += was_changed
+            unchanged += same
+            checks_by_profile[catalogue[i][0]] += 1
+            if first_change[i] is not None:
+                latency[catalogue[i][0]].append(now - first_change[i])
+                first_change[i] = None
+
+        # 기존: full_scan_hours 마다 전체
+        full_checks = 0
+        if c % full_every == 0:
+            full_checks = n
+            for i in range(n):
+                if first_change_full[i] is not None:
+                    latency_full[catalogue[i][0]].append(now - first_change_full[i])
+                    first_change_full[i] = None
+
+        history.append({
+            "cycle": c,
+            "hour": now / HOUR_MS,
+            "checks": len(due),
+            "saved": n - len(due),
+            "changed": changed,
+            "unchanged": unchanged,
+            "full_checks": full_checks,
+        })
+
+    def avg_hours(values):
+        return sum(values) / len(values) / HOUR_MS if values else 0.0
+
+    return {
+        "products": n,
+        "cycles": history,
+        "checks": sum(h["checks"] for h in history),
+        "full_checks": sum(h["full_checks"] for h in history),
+        "writes": scheduler.writes,
+        "profiles": {
+            name: {
+                "products": sum(1 for p, _ in catalogue if p == name),
+                "checks": checks_by_profile[name],
+                "latency_h": avg_hours(latency[name]),
+                "latency_full_h": avg_hours(latency_full[name]),
+            }
+            for name, _, _ in PROFILES
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="재고 모니터링 스케줄러 시뮬레이션")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--cycle-min", type=int, default=30, help="크론 주기(분)")
+    parser.add_argument("--batch", type=int, default=500, help="사이클당 최대 확인 수")
+    parser.add_argument("--full-scan-hours", type=float, default=6, help="기존 방식 전체 확인 주기")
+    parser.add_argument("--max-hours", type=float, default=MAX_INTERVAL_MS / HOUR_MS, help="스케줄러 최대 주기")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    r = simulate(args.products, args.days, args.cycle_min, args.batch, args.full_scan_hours, args.seed, args.max_hours)
+    n = r["products"]
+    print(f"products={n} days={args.days:g} cron={args.cycle_min}min batch={args.batch} max={args.max_hours:g}h "
+          f"(기존: {args.full_scan_hours:g}시간마다 전체 확인)")
+    print(f"{'hour':>6} {'checks':>7} {'saved':>7} {'changed':>8} {'unchanged':>9}")
+    step = max(1, round(6 * 60 / args.cycle_min))
+    for h in r["cycles"][::step]:
+        print(f"{h['hour']:>6.0f} {h['checks']:>7} {h['saved']:>7} {h['changed']:>8} {h['unchanged']:>9}")
+
+    cycles = len(r["cycles"])
+    print(f"\n사이클당 평균 조회: {r['checks'] / cycles:.0f} (절약 {n - r['checks'] / cycles:.0f}/사이클, "
+          f"매 사이클 전체 확인 대비 {1 - r['checks'] / (n * cycles):.1%})")
+    print(f"총 조회: 스케줄러 {r['checks']} / 기존 {r['full_checks']} (x{r['full_checks'] / max(r['checks'], 1):.1f}), "
+          f"상태 기록 {r['writes']}줄")
+    print(f"{'profile':>9} {'products':>8} {'checks':>7} {'latency':>8} {'기존':>6}")
+    for name, p in r["profiles"].items():
+        print(f"{name:>9} {p['products']:>8} {p['checks']:>7} {p['latency_h']:>7.1f}h {p['latency_full_h']:>5.1f}h")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
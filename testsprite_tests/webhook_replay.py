@@ -0,0 +1,291 @@
+"""
+webhook 재생 하네스 (LemonSqueezy / Clerk → Postgres 큐 WebhookJob)
+
+기록된 webhook payload 를 서명해서 동시에 쏘고
+  - ack 지연: 요청 → 응답 p50/p95/p99/max (route 는 서명 검증 + WebhookJob insert 만 하고 응답, 처리는 after())
+  - 처리량: 첫 요청부터 큐가 비워질 때까지 (GET /api/webhooks/lemonsqueezy 의 queue 통계) events/sec
+    기다리는 동안 /api/cron/webhooks 를 --cron-interval 초마다 불러 Vercel Cron 역할을 한다 (재시도 대기분 처리)
+  - 중복: 같은 본문 재전송(--duplicates)이 적재되지 않고 "Event already processed" 로 끝나는지
+를 보고한다.
+
+payload:
+  - 기본: fixtures/webhooks/lemonsqueezy.json (구독 1개의 생성 → 결제 → 갱신 burst) 을
+    --subscriptions 개 구독으로 복제 (구독 id / 인보이스 id / event_id 치환)
+  - --recorded DIR: 실제로 기록한 payload(*.json, 객체 또는 배열)를 그대로 재생
+  - --clerk N: Clerk user.created → user.deleted 를 N 명분 (svix 서명, CLERK_WEBHOOK_SIGNING_SECRET)
+같은 구독(사용자)의 이벤트는 한 워커가 순서대로 보내고, 구독끼리는 동시에 보낸다.
+
+DB 에 없는 사용자/플랜이면 재시도 후 failed 로 넘어간다 (ack 지연 측정에는 영향 없음).
+재시도 간격은 서버의 WEBHOOK_QUEUE_RETRY_BASE_MS (기본 30초, 2배씩) 라서 로컬에서는 작게 주고 띄우는 편이 빠르다.
+처리까지 보려면 --user-id / --variant-id 로 시드된 사용자와 플랜을 지정.
+
+사용 예:
+    python webhook_replay.py --subscriptions 200 --concurrency 32
+    python webhook_replay.py --subscriptions 500 --duplicates 0.2 --user-id usr_seed --variant-id 500001
+    python webhook_replay.py --recorded ./recorded_webhooks --concurrency 8
+    python webhook_replay.py --clerk 100 --subscriptions 0
+
+환경변수:
+    SELPIX_BASE_URL                대상 서버 (기본 http://localhost:3000)
+    LEMONSQUEEZY_WEBHOOK_SECRET    X-Signature 서명 키 (서버와 같아야 함)
+    CLERK_WEBHOOK_SIGNING_SECRET   svix 서명 키 (whsec_...)
+    CRON_SECRET                    /api/cron/webhooks 호출용 (서버에 설정된 경우)
+"""
+
+import argparse
+import base64
+import copy
+import glob
+import hashlib
+import hmac
+import json
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from load_test import make_session, percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASE_URL = os.environ.get("SELPIX_BASE_URL", "http://localhost:3000")
+LEMON_ENDPOINT = "/api/webhooks/lemonsqueezy"
+CLERK_ENDPOINT = "/api/webhooks/clerk"
+CRON_ENDPOINT = "/api/cron/webhooks"
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
+FIXTURE_FILE = os.path.join(HERE, "fixtures", "webhooks", "lemonsqueezy.json")
+TIMEOUT = 30
+
+
+# ── payload ─────────────────────────────────────────────────
+
+def lemon_key(body):
+    """_util.ts lemonQueueKey 와 같은 키 (같은 구독의 구독/인보이스 이벤트)"""
+    data = body["data"]
+    if data["type"] == "subscriptions":
+        return f"sub:{data['id']}"
+    if data["type"] == "subscription-invoices":
+        return f"sub:{data['attributes'].get('subscription_id')}"
+    return f"{data['type']}:{data['id']}"
+
+
+def expand_fixture(subscriptions, user_id=None, variant_id=None, fixture_file=FIXTURE_FILE):
+    """구독 1개 분량 fixture → 구독 n 개 [[body, ...], ...] (실행마다 event_id 가 새로 생김)"""
+    with open(fixture_file, "r", encoding="utf-8") as f:
+        template = json.load(f)
+    run = uuid.uuid4().hex[:8]
+    groups = []
+    for i in range(subscriptions):
+        sub_id = 1000000 + i
+        events = []
+        for n, src in enumerate(template):
+            body = copy.deepcopy(src)
+            data, meta = body["data"], body["meta"]
+            meta["event_id"] = f"evt_{run}_{i}_{n}"
+            if user_id:
+                meta.setdefault("custom_data", {})["user_id"] = user_id
+            if data["type"] == "subscriptions":
+                data["id"] = str(sub_id)
+                if variant_id:
+                    data["attributes"]["variant_id"] = int(variant_id)
+            else:
+                data["id"] = f"inv_{run}_{i}_{n}"
+                data["attributes"]["subscription_id"] = sub_id
+            events.append(body)
+        groups.append(events)
+    return groups
+
+
+def load_recorded(directory):
+    """기록된 payload 파일들 → 큐 키별 그룹 (파일 이름 순서 = 도착 순서)"""
+    groups = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        for body in loaded if isinstance(loaded, list) else [loaded]:
+            groups.setdefault(lemon_key(body), []).append(body)
+    return list(groups.values())
+
+
+def clerk_events(users):
+    """Clerk 사용자 n 명의 user.created → user.deleted"""
+    run = uuid.uuid4().hex[:8]
+    groups = []
+    for i in range(users):
+        clerk_id = f"user_replay_{run}_{i}"
+        created = {
+            "type": "user.created",
+            "object": "event",
+            "data": {
+                "id": clerk_id,
+                "object": "user",
+                "username": f"replay_{run}_{i}",
+                "email_addresses": [{"id": f"idn_{run}_{i}", "email_address": f"replay+{run}_{i}@example.com"}],
+            },
+        }
+        deleted = {"type": "user.deleted", "object": "event", "data": {"id": clerk_id, "object": "user", "deleted": True}}
+        groups.append([created, deleted])
+    return groups
+
+
+# ── 서명 ────────────────────────────────────────────────────
+
+def lemon_headers(raw, secret):
+    return {"Content-Type": "application/json", "X-Signature": hmac.new(secret.encode(), raw, hashlib.sha256).hexdigest()}
+
+
+def svix_headers(raw, secret):
+    msg_id = f"msg_{uuid.uuid4().hex}"
+    timestamp = str(int(time.time()))
+    key = base64.b64decode(secret.split("_", 1)[1] if secret.startswith("whsec_") else secret)
+    signed = hmac.new(key, f"{msg_id}.{timestamp}.".encode() + raw, hashlib.sha256).digest()
+    return {
+        "Content-Type": "application/json",
+        "svix-id": msg_id,
+        "svix-timestamp": timestamp,
+        "svix-signature": "v1," + base64.b64encode(signed).decode(),
+    }
+
+
+# ── 재생 ────────────────────────────────────────────────────
+
+def queue_stats(base_url, session):
+    resp = session.get(f"{base_url}{LEMON_ENDPOINT}", timeout=TIMEOUT)
+    resp.raise_for_status()
+    return resp.json().get("queue") or {}
+
+
+def replay(base_url, jobs, concurrency, session):
+    """
+    jobs: [[(endpoint, raw, headers), ...], ...] — 그룹 안은 순서대로, 그룹끼리는 동시에
+    → [{"status", "ms", "duplicate"}]
+    """
+    def send_group(group):
+        records = []
+        for endpoint, raw, headers in group:
+            t0 = time.perf_counter()
+            try:
+                resp = session.post(f"{base_url}{endpoint}", data=raw, headers=headers, timeout=TIMEOUT)
+                status, text = resp.status_code, resp.text
+            except requests.RequestException as e:
+                status, text = 0, str(e)
+            records.append({
+                "status": status,
+                "ms": (time.perf_counter() - t0) * 1000,
+                "duplicate": "already processed" in text,
+            })
+        return records
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return [r for records in pool.map(send_group, jobs) for r in records]
+
+
+def run_cron(base_url, session):
+    """cron sweep 1회 (재시도 시각이 된 이벤트, after() 가 못 끝낸 이벤트 처리)"""
+    headers = {"Authorization": f"Bearer {CRON_SECRET}"} if CRON_SECRET else {}
+    resp = session.get(f"{base_url}{CRON_ENDPOINT}", headers=headers, timeout=TIMEOUT * 2)
+    resp.raise_for_status()
+
+
+def wait_drained(base_url, session, before, expected, timeout, cron_interval):
+    """queued 증가분만큼 processed + failed 가 늘고 대기/실행 중이 0 이 될 때까지 → (stats, 완료 여부)"""
+    deadline = time.monotonic() + timeout
+    next_cron = time.monotonic() + cron_interval
+    while True:
+        if cron_interval and time.monotonic() >= next_cron:
+            run_cron(base_url, session)
+            next_cron = time.monotonic() + cron_interval
+        stats = queue_stats(base_url, session)
+        finished = (stats.get("processed", 0) - before.get("processed", 0)) + (stats.get("failed", 0) - before.get("failed", 0))
+        if finished >= expected and not stats.get("pending") and not stats.get("running"):
+            return stats, True
+        if time.monotonic() > deadline:
+            return stats, False
+        time.sleep(0.05)
+
+
+def build_jobs(args):
+    lemon_secret = os.environ.get("LEMONSQUEEZY_WEBHOOK_SECRET", "")
+    clerk_secret = os.environ.get("CLERK_WEBHOOK_SIGNING_SECRET", "")
+    rng = random.Random(args.seed)
+
+    groups = load_recorded(args.recorded) if args.recorded else expand_fixture(args.subscriptions, args.user_id, args.variant_id)
+    jobs = []
+    for events in groups:
+        group = []
+        for body in events:
+            raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            sent = (LEMON_ENDPOINT, raw, lemon_headers(raw, lemon_secret))
+            group.append(sent)
+            if rng.random() < args.duplicates:
+                group.append(sent)  # 프로바이더 재전송 (같은 본문, 같은 서명)
+        jobs.append(group)
+
+    for events in clerk_events(args.clerk):
+        group = []
+        for body in events:
+            raw = json.dumps(body).encode("utf-8")
+            headers = svix_headers(raw, clerk_secret)
+            group.append((CLERK_ENDPOINT, raw, headers))
+            if rng.random() < args.duplicates:
+                group.append((CLERK_ENDPOINT, raw, headers))  # 같은 svix-id 재전송
+        jobs.append(group)
+
+    rng.shuffle(jobs)
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="webhook 재생 하네스 (ack 지연 / 큐 처리량)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--subscriptions", type=int, default=100, help="fixture 를 복제할 구독 수")
+    parser.add_argument("--recorded", default="", help="기록된 payload 디렉터리 (지정하면 fixture 대신 사용)")
+    parser.add_argument("--clerk", type=int, default=0, help="Clerk 사용자 수 (created → deleted)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="재전송 비율 (0~1)")
+    parser.add_argument("--user-id", default="", help="custom_data.user_id (시드된 사용자)")
+    parser.add_argument("--variant-id", default="", help="구독 variant_id (시드된 플랜)")
+    parser.add_argument("--drain-timeout", type=float, default=120, help="큐가 비워질 때까지 기다릴 시간(초)")
+    parser.add_argument("--cron-interval", type=float, default=5, help="기다리는 동안 cron sweep 호출 간격(초, 0 이면 안 부름)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    jobs = build_jobs(args)
+    total = sum(len(g) for g in jobs)
+    if not total:
+        print("보낼 payload 가 없습니다")
+        return 1
+
+    session = make_session(args.concurrency)
+    before = queue_stats(args.base_url, session)
+    print(f"▶ {total} webhooks ({len(jobs)} groups) → {args.base_url}  concurrency={args.concurrency}")
+
+    t0 = time.perf_counter()
+    records = replay(args.base_url, jobs, args.concurrency, session)
+    ack_sec = time.perf_counter() - t0
+    queued = queue_stats(args.base_url, session).get("queued", 0) - before.get("queued", 0)
+    after, drained = wait_drained(args.base_url, session, before, queued, args.drain_timeout, args.cron_interval)
+    drain_sec = time.perf_counter() - t0
+
+    latencies = [r["ms"] for r in records if r["status"]]
+    errors = [r for r in records if not 200 <= r["status"] < 300]
+    duplicates = sum(r["duplicate"] for r in records)
+    delta = {k: after.get(k, 0) - before.get(k, 0) for k in ("queued", "processed", "failed", "retries")}
+
+    print(f"ack     {len(records) / ack_sec:8.1f} req/s   p50={percentile(latencies, 50):.1f}ms  "
+          f"p95={percentile(latencies, 95):.1f}ms  p99={percentile(latencies, 99):.1f}ms  max={max(latencies or [0]):.1f}ms")
+    print(f"응답    2xx={len(records) - len(errors)}  오류={len(errors)}  중복 응답={duplicates}")
+    print(f"큐      " + "  ".join(f"{k}={v}" for k, v in delta.items()))
+    if drained:
+        print(f"처리    {delta['queued'] / drain_sec:8.1f} events/s (첫 요청 → 큐 비움 {drain_sec:.2f}s)")
+    else:
+        print(f"처리    {args.drain_timeout:.0f}s 안에 큐가 비워지지 않음 (pending={after.get('pending')}, running={after.get('running')})")
+    if errors:
+        print(f"  ✗ 첫 오류 상태: {sorted({r['status'] for r in errors})}")
+    return 1 if errors or not drained else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())